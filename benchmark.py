@@ -0,0 +1,486 @@
+"""
+Benchmark script for the stadium crowd monitoring system.
+This script generates synthetic stadium images and videos with a configurable number
+of fans, share of fighting/throwing fans and misplaced fans, runs process_image,
+process_video, process_live_feed and scan_and_monitor on them, and records frames/s,
+per-frame latency percentiles, peak memory and bytes written as JSON. Results can be
+compared against a stored baseline to catch performance regressions.
+"""
+
+import os
+import math
+import time
+import shutil
+import argparse
+import datetime
+import cv2
+import numpy as np
+
+from demo import draw_fan
+from src.system import StadiumMonitoringSystem
+from src.enhanced_system import EnhancedStadiumMonitoringSystem
+from src.inference import StadiumCrowdDetector
+from src.model import FanDetectionModel
+from src.crop_classifier import FanCropClassifier
+from src.profiling import (PeakMemorySampler, LatencyRecorder, directory_bytes, environment_info,
+                           save_results, load_results, compare_results)
+
+MODES = ('image', 'video', 'live', 'scan')
+ACTIONS = ('sitting', 'cheering', 'fighting', 'throwing')
+VIOLENT_ACTIONS = ('fighting', 'throwing')
+
+# Fans are drawn in team colors whose free channel encodes the action (0, 60, 120, 180),
+# so SceneDetector can read team and action back from any view of the frame
+ACTION_CODE_STEP = 60
+
+def fan_color(team, action):
+    """BGR body color of a fan: blue for Hilal, gold for Ittihad, shaded by action."""
+    code = ACTIONS.index(action) * ACTION_CODE_STEP
+    if team == 'hilal':
+        return (255, code, 0)
+    return (code, 215, 255)
+
+def create_scene(num_fans, violent_share=0.1, misplaced_share=0.05, width=1280, height=720, seed=0):
+    """
+    Lay out a synthetic stadium crowd.
+
+    Hilal fans sit in the left half and Ittihad fans in the right half, matching the
+    default stadium sections; misplaced fans sit in the other team's half.
+
+    Args:
+        num_fans: Number of fans
+        violent_share: Share of fans fighting or throwing
+        misplaced_share: Share of fans seated in the other team's section
+        width, height: Frame size
+        seed: Random seed
+
+    Returns:
+        List of fan dictionaries with position, scale, team, action and misplaced flag
+    """
+    rng = np.random.RandomState(seed)
+
+    teams = np.array(['hilal', 'ittihad'] * (num_fans // 2 + 1))[:num_fans]
+    num_violent = int(round(num_fans * violent_share))
+    actions = np.array(list(rng.choice(VIOLENT_ACTIONS, num_violent)) +
+                       list(rng.choice(('sitting', 'cheering'), num_fans - num_violent)))
+    rng.shuffle(actions)
+    misplaced = np.zeros(num_fans, dtype=bool)
+    misplaced[rng.choice(num_fans, int(round(num_fans * misplaced_share)), replace=False)] = True
+
+    # Seat each half's fans on a grid that fits them
+    fans = []
+    top = int(height * 0.15)
+    for half, x0 in (('hilal', 0), ('ittihad', width // 2)):
+        seated = [i for i in range(num_fans) if (teams[i] == half) != misplaced[i]]
+        if not seated:
+            continue
+
+        region_w, region_h = width // 2, height - top
+        cols = max(1, int(math.ceil(math.sqrt(len(seated) * region_w / region_h))))
+        rows = int(math.ceil(len(seated) / cols))
+        cell_w, cell_h = region_w / cols, region_h / rows
+
+        # A fan with raised arms spans 45x70 pixels at scale 1
+        scale = min(cell_w / 45.0, cell_h / 70.0, 2.0)
+        for slot, i in enumerate(seated):
+            row, col = divmod(slot, cols)
+            fans.append({
+                'x': x0 + col * cell_w + (cell_w - 45 * scale) / 2 + 12 * scale,
+                'y': top + row * cell_h + (cell_h - 70 * scale) / 2 + 25 * scale,
+                'scale': scale,
+                'team': teams[i],
+                'action': actions[i],
+                'misplaced': bool(misplaced[i])
+            })
+
+    return fans
+
+def render_scene(fans, width=1280, height=720, frame_index=0):
+    """
+    Draw a frame of a synthetic stadium scene.
+
+    Active fans alternate between their action pose and a resting pose every few
+    frames, so videos contain crowd movement.
+
+    Args:
+        fans: Fans from create_scene()
+        width, height: Frame size
+        frame_index: Frame number, which drives the arm animation
+
+    Returns:
+        BGR image array
+    """
+    image = np.full((height, width, 3), 150, dtype=np.uint8)  # Gray background
+
+    # Draw the seat rows
+    row_step = max(10, height // 13)
+    for y in range(int(height * 0.25), height - row_step // 2, row_step):
+        cv2.rectangle(image, (10, y), (width - 10, y + row_step * 2 // 3), (80, 80, 80), -1)
+
+    for i, fan in enumerate(fans):
+        pose = fan['action']
+        if pose != 'sitting' and (frame_index // 3 + i) % 2:
+            pose = 'sitting'
+        draw_fan(image, fan['x'], fan['y'], fan_color(fan['team'], fan['action']), pose, scale=fan['scale'])
+
+    return image
+
+def write_scene_video(path, fans, width=1280, height=720, num_frames=100, fps=25):
+    """Write a synthetic stadium video."""
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for frame_index in range(num_frames):
+        out.write(render_scene(fans, width, height, frame_index))
+    out.release()
+    return path
+
+class SceneDetector(StadiumCrowdDetector):
+    """
+    Detector for synthetic benchmark scenes.
+
+    Runs the real detector forward pass, so inference cost is measured, but takes
+    the detections from the color-coded fans in the frame. Downstream costs
+    (cropping, classification, tracking, alerts, artifacts) then scale with the
+    number of fans even with untrained models.
+    """
+
+    def __init__(self, model_path, min_area=4, **kwargs):
+        super().__init__(model_path, **kwargs)
+        self.min_area = min_area
+
+    def _detect_preprocessed(self, image):
+        self.model.predict(image)
+        return self.detect_scene(np.asarray(image))
+
+    def detect_batch(self, frames):
+        if not frames:
+            return []
+        batch = np.stack([self.preprocess_array(frame) for frame in frames])
+        self.model.predict(batch)
+        return [self.detect_scene(image) for image in batch]
+
+    def detect_scene(self, image):
+        """
+        Find the color-coded fans in a preprocessed RGB image.
+
+        Args:
+            image: RGB float array in model input space, normalized by preprocess_array()
+
+        Returns:
+            Detections in the format of StadiumCrowdDetector.detect()
+        """
+        # Back to 0-255 pixel values for the color thresholds
+        image = (np.asarray(image) + 1.0) * 127.5
+        red, green, blue = image[..., 0], image[..., 1], image[..., 2]
+        detections = []
+
+        # Hilal bodies are blue with the action in green; Ittihad bodies are gold with it in blue
+        for team, mask, code_channel in (('hilal', (blue > 200) & (red < 80), green),
+                                         ('ittihad', (red > 200) & (green > 185) & (green < 240), blue)):
+            count, labels, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+            if count <= 1:
+                continue
+
+            # Mean action code per component in one pass
+            sums = np.bincount(labels.ravel(), weights=code_channel.ravel(), minlength=count)
+            codes = sums / np.maximum(stats[:, cv2.CC_STAT_AREA], 1)
+
+            for label in range(1, count):
+                x, y, w, h, area = stats[label]
+                if area < self.min_area:
+                    continue
+
+                action = ACTIONS[int(np.clip(round(codes[label] / ACTION_CODE_STEP), 0, len(ACTIONS) - 1))]
+                detections.append({
+                    'bbox': [int(x), int(max(0, y - w)), int(x + w), int(y + h)],  # Include the head
+                    'team': team,
+                    'action': action,
+                    'class_score': 1.0,
+                    'team_score': 0.9,
+                    'action_score': 0.9
+                })
+
+        return detections
+
+def ensure_models(model_dir, input_shape, crop_shape):
+    """
+    Find trained models, or build and save untrained ones for benchmarking.
+
+    Returns:
+        Dictionary of initialize() keyword arguments
+    """
+    paths = {
+        'detector_path': os.path.join(model_dir, 'fan_detection_model.h5'),
+        'behavior_classifier_path': os.path.join(model_dir, 'behavior_classifier.h5'),
+        'team_detector_path': os.path.join(model_dir, 'team_detector.h5'),
+        'crop_classifier_path': os.path.join(model_dir, 'crop_classifier.h5')
+    }
+    os.makedirs(model_dir, exist_ok=True)
+
+    if not os.path.exists(paths['detector_path']):
+        print(f"No detector in {model_dir}, building an untrained one for benchmarking...")
+        detector = FanDetectionModel(input_shape=input_shape)
+        detector.build_model()
+        detector.save_model(paths['detector_path'])
+
+    has_separate = os.path.exists(paths['behavior_classifier_path']) or os.path.exists(paths['team_detector_path'])
+    if not os.path.exists(paths['crop_classifier_path']) and not has_separate:
+        print(f"No crop classifiers in {model_dir}, building an untrained fused one for benchmarking...")
+        classifier = FanCropClassifier(input_shape=crop_shape)
+        classifier.build_model()
+        classifier.save_model(paths['crop_classifier_path'])
+
+    return {name: path if os.path.exists(path) else None for name, path in paths.items()}
+
+def build_system(mode, scenario_dir, model_paths, args):
+    """Create and initialize a monitoring system writing into a scenario directory."""
+    config = {
+        'model_dir': args.model_dir,
+        'alerts_dir': os.path.join(scenario_dir, 'alerts'),
+        'inference_backend': args.backend,
+        'tflite_precision': args.tflite_precision,
+        'inference_threads': args.threads,
+        'live_display': False  # The live mode runs headless
+    }
+
+    if mode == 'scan':
+        config.update({
+            'camera_outputs_dir': os.path.join(scenario_dir, 'camera_outputs'),
+            'zoom_outputs_dir': os.path.join(scenario_dir, 'zoom_outputs')
+        })
+        system = EnhancedStadiumMonitoringSystem(config=config)
+        monitoring_system = system.monitoring_system
+    else:
+        system = monitoring_system = StadiumMonitoringSystem(config=config)
+
+    system.initialize(**model_paths)
+
+    if args.detections == 'scene':
+        # Load it like initialize() loads the detector: same backend, metrics, cache and batch sizes
+        detector = SceneDetector(model_paths['detector_path'], **monitoring_system.detector_options())
+        detector.model.backend.set_batch_sizes(monitoring_system.config['detector_batch_sizes'])
+        monitoring_system.detector = detector
+        if monitoring_system.config['warm_up']:
+            monitoring_system.warm_up()
+
+    return system, monitoring_system
+
+def run_scenario(mode, num_fans, inputs, model_paths, args):
+    """
+    Run one benchmark scenario.
+
+    Returns:
+        Dictionary of measured metrics
+    """
+    scenario_dir = os.path.join(args.work_dir, f"{mode}-{num_fans}")
+    shutil.rmtree(scenario_dir, ignore_errors=True)
+    os.makedirs(scenario_dir)
+
+    system, monitoring_system = build_system(mode, scenario_dir, model_paths, args)
+    recorder = LatencyRecorder()
+    detections = []
+    capture_latencies = []
+    warmup_end = None
+
+    with PeakMemorySampler() as memory:
+        start = time.perf_counter()
+
+        if mode == 'image':
+            process_image = recorder.wrap(system.process_image)
+            for i in range(args.repeats):
+                frame_detections, _ = process_image(inputs['image'], output_path=os.path.join(scenario_dir, f"output_{i}.png"))
+                detections.append(len(frame_detections))
+            frames = args.repeats
+
+        elif mode == 'scan':
+            scan_and_monitor = recorder.wrap(system.scan_and_monitor)
+            for i in range(args.scan_repeats):
+                frame_detections, _, _ = scan_and_monitor(inputs['image'], output_path=os.path.join(scenario_dir, f"scan_{i}.jpg"))
+                detections.append(len(frame_detections))
+            frames = args.scan_repeats
+
+        else:
+            # Time every processed frame inside the video/live loop
+            process_frame = monitoring_system.process_frame
+
+            def timed_process_frame(*a, **kw):
+                started = time.perf_counter()
+                frame_detections, alerts = process_frame(*a, **kw)
+                detections.append(len(frame_detections))
+                if mode == 'live':
+                    # Live frames carry their capture time
+                    capture_latencies.append((started, time.time() - kw['timestamp']))
+                return frame_detections, alerts
+
+            monitoring_system.process_frame = recorder.wrap(timed_process_frame)
+            output_path = os.path.join(scenario_dir, 'output.mp4')
+            if mode == 'video':
+                system.process_video(inputs['video'], output_path=output_path, frame_interval=args.frame_interval)
+                frames = args.frames
+            else:
+                # Frames processed in the first warmup_seconds are left out of the live statistics
+                warmup_end = time.perf_counter() + args.warmup_seconds
+                system.process_live_feed(camera_id=inputs['live_video'], output_path=output_path,
+                                         frame_interval=args.frame_interval)
+                frames = monitoring_system.live_stats[inputs['live_video']]['frames_captured']
+
+        monitoring_system.flush_artifacts()
+        end = time.perf_counter()
+        seconds = end - start
+
+    latency = recorder.summary(since=warmup_end)
+
+    # Processed frames/s over the measured part of the run: after warm-up in the live mode
+    measured_seconds = end - warmup_end if warmup_end is not None else seconds
+    result = {
+        'mode': mode,
+        'fans': num_fans,
+        'frames': frames,
+        'processed_frames': latency['count'],
+        'seconds': seconds,
+        'frames_per_second': frames / seconds if seconds > 0 else 0.0,
+        'processed_frames_per_second': latency['count'] / measured_seconds if measured_seconds > 0 else 0.0,
+        'mean_ms': latency['mean_ms'],
+        'p50_ms': latency['p50_ms'],
+        'p90_ms': latency['p90_ms'],
+        'p99_ms': latency['p99_ms'],
+        'max_ms': latency['max_ms'],
+        'peak_rss_mb': memory.peak / 2 ** 20,
+        'rss_growth_mb': (memory.peak - memory.baseline) / 2 ** 20,
+        'bytes_written': directory_bytes(scenario_dir),
+        'detections_per_frame': float(np.mean(detections)) if detections else 0.0,
+        'alerts': monitoring_system.alert_system.alert_count
+    }
+
+    # The live mode also reports how far results trail the camera and how many frames it skipped
+    if mode == 'live':
+        live_stats = monitoring_system.live_stats[inputs['live_video']]
+        measured = np.array([latency for started, latency in capture_latencies if started >= warmup_end]) * 1000
+        result.update({
+            'warmup_seconds': args.warmup_seconds,
+            'capture_to_result_p50_ms': float(np.percentile(measured, 50)) if len(measured) else 0.0,
+            'capture_to_result_p99_ms': float(np.percentile(measured, 99)) if len(measured) else 0.0,
+            'frames_dropped': live_stats['frames_dropped']
+        })
+
+    return result
+
+def print_summary(scenarios):
+    """Print a table of benchmark results."""
+    print(f"\n{'scenario':<20}{'frames/s':>10}{'proc/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}"
+          f"{'written MB':>12}{'dets':>8}")
+    for name, result in scenarios.items():
+        if 'error' in result:
+            print(f"{name:<20}  error: {result['error']}")
+            continue
+        print(f"{name:<20}{result['frames_per_second']:>10.2f}{result['processed_frames_per_second']:>10.2f}"
+              f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+              f"{result['peak_rss_mb']:>10.0f}{result['bytes_written'] / 2 ** 20:>12.2f}"
+              f"{result['detections_per_frame']:>8.1f}")
+
+def main():
+    """Main function to run the benchmark suite."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Stadium Crowd Monitoring benchmark suite')
+    parser.add_argument('--modes', type=str, nargs='+', default=list(MODES), choices=list(MODES),
+                        help='Entry points to benchmark (default: all)')
+    parser.add_argument('--fans', type=int, nargs='+', default=[10, 100, 1000],
+                        help='Numbers of fans per synthetic scene (default: 10 100 1000)')
+    parser.add_argument('--violent-share', type=float, default=0.1,
+                        help='Share of fans fighting or throwing (default: 0.1)')
+    parser.add_argument('--misplaced-share', type=float, default=0.05,
+                        help="Share of fans seated in the other team's section (default: 0.05)")
+    parser.add_argument('--width', type=int, default=1280, help='Synthetic frame width (default: 1280)')
+    parser.add_argument('--height', type=int, default=720, help='Synthetic frame height (default: 720)')
+    parser.add_argument('--frames', type=int, default=100,
+                        help='Frames per synthetic video for the video and live modes (default: 100)')
+    parser.add_argument('--repeats', type=int, default=20,
+                        help='process_image calls per scenario (default: 20)')
+    parser.add_argument('--scan-repeats', type=int, default=3,
+                        help='scan_and_monitor calls per scenario (default: 3)')
+    parser.add_argument('--live-seconds', type=float, default=30.0,
+                        help='Length of the paced video played to the live mode (default: 30)')
+    parser.add_argument('--warmup-seconds', type=float, default=5.0,
+                        help='Live mode: leave frames processed in the first seconds out of the statistics (default: 5)')
+    parser.add_argument('--frame-interval', type=int, default=None,
+                        help='Fixed frame interval for the video and live modes (default: motion-based)')
+    parser.add_argument('--detections', type=str, default='scene', choices=['scene', 'model'],
+                        help='Take detections from the synthetic scene (default) or from the detector outputs')
+    parser.add_argument('--model-dir', type=str, default='models',
+                        help='Directory with the models; untrained models are built there if missing')
+    parser.add_argument('--backend', type=str, default='keras',
+                        choices=['keras', 'tf-function', 'tflite', 'onnxruntime'],
+                        help='Inference backend (default: keras)')
+    parser.add_argument('--tflite-precision', type=str, default='int8', choices=['int8', 'fp16'],
+                        help='Exported TFLite models to load with the tflite backend (default: int8)')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='CPU threads for the tflite and onnxruntime backends')
+    parser.add_argument('--work-dir', type=str, default='benchmark_outputs',
+                        help='Directory for synthetic inputs and scenario outputs (default: benchmark_outputs)')
+    parser.add_argument('--output', type=str, default='benchmark_results.json',
+                        help='Path of the JSON results (default: benchmark_results.json)')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Baseline results to compare against; exits with status 1 on a regression')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Relative change that counts as a regression (default: 0.10)')
+    parser.add_argument('--save-baseline', type=str, default=None,
+                        help='Also write the results to this path as the new baseline')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the synthetic scenes')
+
+    args = parser.parse_args()
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    model_paths = ensure_models(args.model_dir, (384, 512, 3), (128, 128, 3))
+
+    scenarios = {}
+    for num_fans in args.fans:
+        # Generate the synthetic inputs for this crowd size
+        fans = create_scene(num_fans, args.violent_share, args.misplaced_share, args.width, args.height, args.seed)
+        inputs = {'image': os.path.join(args.work_dir, f"scene-{num_fans}.png")}
+        cv2.imwrite(inputs['image'], render_scene(fans, args.width, args.height))
+        if 'video' in args.modes:
+            inputs['video'] = write_scene_video(os.path.join(args.work_dir, f"scene-{num_fans}.mp4"), fans,
+                                                args.width, args.height, args.frames)
+        if 'live' in args.modes:
+            # Played at 25 frames/s, long enough to measure past the warm-up
+            inputs['live_video'] = write_scene_video(os.path.join(args.work_dir, f"scene-{num_fans}-live.mp4"), fans,
+                                                     args.width, args.height, int(args.live_seconds * 25))
+
+        for mode in args.modes:
+            name = f"{mode}/fans={num_fans}"
+            print(f"\nBenchmarking {name}...")
+            try:
+                scenarios[name] = run_scenario(mode, num_fans, inputs, model_paths, args)
+            except Exception as e:
+                # Keep going, e.g. when a backend's exported models are missing
+                print(f"Scenario {name} failed: {e}")
+                scenarios[name] = {'mode': mode, 'fans': num_fans, 'error': str(e).strip().splitlines()[0]}
+
+    results = {
+        'created': datetime.datetime.now().isoformat(),
+        'environment': environment_info(),
+        'settings': {key: value for key, value in vars(args).items()
+                     if key not in ('output', 'baseline', 'save_baseline', 'work_dir')},
+        'scenarios': scenarios
+    }
+
+    print_summary(scenarios)
+    save_results(results, args.output)
+    print(f"\nResults saved to {args.output}")
+    if args.save_baseline:
+        save_results(results, args.save_baseline)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    # Compare against the baseline
+    if args.baseline:
+        comparisons = compare_results(results, load_results(args.baseline), tolerance=args.tolerance)
+        regressions = [c for c in comparisons if c['regression']]
+        for c in comparisons:
+            flag = 'REGRESSION' if c['regression'] else 'ok'
+            print(f"{c['scenario']:<20}{c['metric']:<22}{c['baseline']:>12.2f} -> {c['current']:>12.2f} "
+                  f"({c['change'] * 100:+.1f}%) {flag}")
+        print(f"{len(regressions)} regressions beyond {args.tolerance * 100:.0f}% against {args.baseline}")
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
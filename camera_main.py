@@ -5,7 +5,6 @@ This script demonstrates the usage of the integrated system with camera movement
 
 import os
 import argparse
-import tensorflow as tf
 from src.camera_monitoring import CameraMonitoringSystem
 
 def main():
@@ -24,6 +23,8 @@ def main():
                         help='Path to trained behavior classifier model')
     parser.add_argument('--team', type=str, default='models/team_detector.h5',
                         help='Path to trained team detector model')
+    parser.add_argument('--crop-classifier', type=str, default='models/crop_classifier.h5',
+                        help='Path to trained fused team/behavior crop classifier (replaces --behavior and --team when present)')
     parser.add_argument('--camera', type=int, default=0,
                         help='Camera ID for live feed mode')
     parser.add_argument('--duration', type=int, default=None,
@@ -67,7 +68,8 @@ def main():
     system.initialize(
         detector_path=args.detector if os.path.exists(args.detector) else None,
         behavior_classifier_path=args.behavior if os.path.exists(args.behavior) else None,
-        team_detector_path=args.team if os.path.exists(args.team) else None
+        team_detector_path=args.team if os.path.exists(args.team) else None,
+        crop_classifier_path=args.crop_classifier if os.path.exists(args.crop_classifier) else None
     )
     
     # Process based on mode
@@ -164,6 +166,8 @@ def main():
     # Visualize alerts
     viz_path = 'alerts/alert_distribution.png' if args.output else None
     system.visualize_alerts(viz_path)
+    timeline_path = 'alerts/alerts_per_section.png' if args.output else None
+    system.visualize_section_timeline(timeline_path)
     
     print("Processing complete.")
     print(f"All detection crops and zoom sequences saved to: {camera_outputs_dir}")
@@ -9,6 +9,43 @@ import numpy as np
 import argparse
 from src.enhanced_system import EnhancedStadiumMonitoringSystem
 
+def draw_fan(image, x, y, color, action, scale=1.0):
+    """
+    Draw a fan with a body, head and arm pose for an action.
+    
+    Args:
+        image: BGR image to draw on
+        x, y: Top-left corner of the body
+        color: BGR body and arm color
+        action: 'sitting', 'cheering', 'fighting' or 'throwing'
+        scale: Size relative to the default 20x40 pixel body
+    """
+    def p(dx, dy):
+        return (int(round(x + dx * scale)), int(round(y + dy * scale)))
+    
+    thickness = max(1, int(round(3 * scale)))
+    
+    # Body
+    cv2.rectangle(image, p(0, 0), p(20, 40), color, -1)
+    # Head
+    cv2.circle(image, p(10, -10), max(1, int(round(10 * scale))), (255, 224, 189), -1)  # Face
+    
+    if action == 'cheering':
+        # Arms up
+        cv2.line(image, p(10, 5), p(-10, -15), color, thickness)  # Left arm
+        cv2.line(image, p(10, 5), p(30, -15), color, thickness)  # Right arm
+    elif action == 'fighting':
+        # Arms fighting
+        cv2.line(image, p(10, 5), p(-5, 15), color, thickness)  # Left arm
+        cv2.line(image, p(10, 5), p(25, 15), color, thickness)  # Right arm
+    elif action == 'throwing':
+        # Arm throwing
+        cv2.line(image, p(10, 5), p(30, 0), color, thickness)  # Right arm
+    elif action == 'sitting':
+        # Arms down
+        cv2.line(image, p(10, 5), p(-5, 20), color, thickness)  # Left arm
+        cv2.line(image, p(10, 5), p(25, 20), color, thickness)  # Right arm
+
 def create_sample_image(output_path, width=512, height=384):
     """Create a sample stadium image with fans for demonstration."""
     # Create a blank image
@@ -21,74 +58,20 @@ def create_sample_image(output_path, width=512, height=384):
     # Draw some "fans"
     # Hilal fans (blue)
     for i in range(5):
-        x = 50 + i * 40
-        y = 150
-        # Body
-        cv2.rectangle(image, (x, y), (x+20, y+40), (255, 0, 0), -1)  # Blue
-        # Head
-        cv2.circle(image, (x+10, y-10), 10, (255, 224, 189), -1)  # Face
-        
-        # Random action
-        action = np.random.choice(['sitting', 'cheering', 'fighting', 'throwing'])
-        if action == 'cheering':
-            # Arms up
-            cv2.line(image, (x+10, y+5), (x-10, y-15), (255, 0, 0), 3)  # Left arm
-            cv2.line(image, (x+10, y+5), (x+30, y-15), (255, 0, 0), 3)  # Right arm
-        elif action == 'fighting':
-            # Arms fighting
-            cv2.line(image, (x+10, y+5), (x-5, y+15), (255, 0, 0), 3)  # Left arm
-            cv2.line(image, (x+10, y+5), (x+25, y+15), (255, 0, 0), 3)  # Right arm
-        elif action == 'throwing':
-            # Arm throwing
-            cv2.line(image, (x+10, y+5), (x+30, y), (255, 0, 0), 3)  # Right arm
-        else:  # sitting
-            # Arms down
-            cv2.line(image, (x+10, y+5), (x-5, y+20), (255, 0, 0), 3)  # Left arm
-            cv2.line(image, (x+10, y+5), (x+25, y+20), (255, 0, 0), 3)  # Right arm
+        draw_fan(image, 50 + i * 40, 150, (255, 0, 0), np.random.choice(['sitting', 'cheering', 'fighting', 'throwing']))
     
     # Ittihad fans (gold)
     for i in range(5):
-        x = 300 + i * 40
-        y = 150
-        # Body
-        cv2.rectangle(image, (x, y), (x+20, y+40), (0, 215, 255), -1)  # Gold
-        # Head
-        cv2.circle(image, (x+10, y-10), 10, (255, 224, 189), -1)  # Face
-        
-        # Random action
-        action = np.random.choice(['sitting', 'cheering', 'fighting', 'throwing'])
-        if action == 'cheering':
-            # Arms up
-            cv2.line(image, (x+10, y+5), (x-10, y-15), (0, 215, 255), 3)  # Left arm
-            cv2.line(image, (x+10, y+5), (x+30, y-15), (0, 215, 255), 3)  # Right arm
-        elif action == 'fighting':
-            # Arms fighting
-            cv2.line(image, (x+10, y+5), (x-5, y+15), (0, 215, 255), 3)  # Left arm
-            cv2.line(image, (x+10, y+5), (x+25, y+15), (0, 215, 255), 3)  # Right arm
-        elif action == 'throwing':
-            # Arm throwing
-            cv2.line(image, (x+10, y+5), (x+30, y), (0, 215, 255), 3)  # Right arm
-        else:  # sitting
-            # Arms down
-            cv2.line(image, (x+10, y+5), (x-5, y+20), (0, 215, 255), 3)  # Left arm
-            cv2.line(image, (x+10, y+5), (x+25, y+20), (0, 215, 255), 3)  # Right arm
+        draw_fan(image, 300 + i * 40, 150, (0, 215, 255), np.random.choice(['sitting', 'cheering', 'fighting', 'throwing']))
     
     # Add a misplaced fan (Hilal fan in Ittihad section)
-    x, y = 350, 200
-    # Body
-    cv2.rectangle(image, (x, y), (x+20, y+40), (255, 0, 0), -1)  # Blue
-    # Head
-    cv2.circle(image, (x+10, y-10), 10, (255, 224, 189), -1)  # Face
+    draw_fan(image, 350, 200, (255, 0, 0), None)
     
     # Add some fighting fans
     x1, y1 = 150, 250
     x2, y2 = 170, 250
-    # Bodies
-    cv2.rectangle(image, (x1, y1), (x1+20, y1+40), (255, 0, 0), -1)  # Blue
-    cv2.rectangle(image, (x2, y2), (x2+20, y2+40), (0, 215, 255), -1)  # Gold
-    # Heads
-    cv2.circle(image, (x1+10, y1-10), 10, (255, 224, 189), -1)  # Face
-    cv2.circle(image, (x2+10, y2-10), 10, (255, 224, 189), -1)  # Face
+    draw_fan(image, x1, y1, (255, 0, 0), None)
+    draw_fan(image, x2, y2, (0, 215, 255), None)
     # Fighting arms
     cv2.line(image, (x1+10, y1+5), (x1+25, y1+15), (255, 0, 0), 3)  # Blue arm
     cv2.line(image, (x2+10, y2+5), (x2-5, y2+15), (0, 215, 255), 3)  # Gold arm
@@ -5,7 +5,6 @@ This script demonstrates the usage of the enhanced system with camera movement,
 
 import os
 import argparse
-import tensorflow as tf
 from src.enhanced_system import EnhancedStadiumMonitoringSystem
 
 def main():
@@ -24,6 +23,8 @@ def main():
                         help='Path to trained behavior classifier model')
     parser.add_argument('--team', type=str, default='models/team_detector.h5',
                         help='Path to trained team detector model')
+    parser.add_argument('--crop-classifier', type=str, default='models/crop_classifier.h5',
+                        help='Path to trained fused team/behavior crop classifier (replaces --behavior and --team when present)')
     parser.add_argument('--camera', type=int, default=0,
                         help='Camera ID for live feed mode')
     parser.add_argument('--duration', type=int, default=None,
@@ -38,6 +39,22 @@ def main():
                         help='Scan pattern for scanning mode')
     parser.add_argument('--scan-speed', type=int, default=15,
                         help='Scan speed in pixels (default: 15)')
+    parser.add_argument('--event-clips', action='store_true',
+                        help='Record a short clip around every alert in video and live modes (saved to clips/)')
+    parser.add_argument('--pre-roll', type=float, default=5.0,
+                        help='Seconds of video before an alert kept in each event clip (default: 5)')
+    parser.add_argument('--post-roll', type=float, default=5.0,
+                        help='Seconds of video after an alert kept in each event clip (default: 5)')
+    parser.add_argument('--headless', action='store_true',
+                        help='Run live mode without the preview window (for servers without a display)')
+    parser.add_argument('--all-frames', action='store_true',
+                        help='Hand every captured frame to live mode in order instead of only the newest one')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Record per-stage latencies and pipeline counters and print them at the end')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on http://127.0.0.1:<port>/metrics (implies --metrics)')
+    parser.add_argument('--metrics-snapshot', type=str, default=None,
+                        help='Write a JSON metrics snapshot to this file every 10 seconds (implies --metrics)')
     
     args = parser.parse_args()
     
@@ -61,6 +78,14 @@ def main():
         'zoom_level': args.zoom_level,
         'scan_speed': args.scan_speed,
         'scan_pattern': args.scan_pattern,
+        'metrics': args.metrics,
+        'metrics_port': args.metrics_port,
+        'metrics_snapshot_path': args.metrics_snapshot,
+        'event_clips': args.event_clips,
+        'clip_pre_roll': args.pre_roll,
+        'clip_post_roll': args.post_roll,
+        'live_display': not args.headless,
+        'live_latest_frame': not args.all_frames,
         'stadium_sections': {
             'hilal': [0, 0, 256, 384],  # Left half of stadium
             'ittihad': [256, 0, 512, 384]  # Right half of stadium
@@ -70,7 +95,8 @@ def main():
     system.initialize(
         detector_path=args.detector if os.path.exists(args.detector) else None,
         behavior_classifier_path=args.behavior if os.path.exists(args.behavior) else None,
-        team_detector_path=args.team if os.path.exists(args.team) else None
+        team_detector_path=args.team if os.path.exists(args.team) else None,
+        crop_classifier_path=args.crop_classifier if os.path.exists(args.crop_classifier) else None
     )
     
     # Process based on mode
@@ -126,6 +152,7 @@ def main():
         print(f"Zoom sequences: {len(results['sequences'])}")
         print(f"Zoom GIFs: {len(results['zooms'])}")
         print(f"Problematic frames: {len(results['frames'])}")
+        print(f"Event clips: {len(results.get('clips', []))}")
         print(f"Detection grids: {len(results['grids'])}")
         
         if args.output:
@@ -153,6 +180,7 @@ def main():
         print(f"Zoom sequences: {len(results['sequences'])}")
         print(f"Zoom GIFs: {len(results['zooms'])}")
         print(f"Problematic frames: {len(results['frames'])}")
+        print(f"Event clips: {len(results.get('clips', []))}")
         
         if args.output:
             print(f"Output video saved to: {args.output}")
@@ -193,6 +221,10 @@ def main():
         print(f"Zoom sequences saved to: {zoom_outputs_dir}/sequences")
         print(f"Zoom GIFs saved to: {zoom_outputs_dir}/gifs")
     
+    # Report per-stage latencies
+    system.report_metrics()
+    system.stop_metrics()
+    
     # Generate report
     report_path = 'alerts/report.txt' if args.output else None
     report = system.generate_report(report_path)
@@ -202,6 +234,8 @@ def main():
     # Visualize alerts
     viz_path = 'alerts/alert_distribution.png' if args.output else None
     system.visualize_alerts(viz_path)
+    timeline_path = 'alerts/alerts_per_section.png' if args.output else None
+    system.visualize_section_timeline(timeline_path)
     
     print("\nProcessing complete.")
     print(f"All detection crops and zoom sequences saved to: {zoom_outputs_dir}")
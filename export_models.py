@@ -0,0 +1,127 @@
+"""
+Model export script for the stadium crowd monitoring system.
+This script converts the trained .h5 models into TensorFlow Lite (float16 and int8)
+and ONNX models for the lightweight inference backends, and optionally compares
+the throughput of every backend.
+"""
+
+import os
+import argparse
+import numpy as np
+from tensorflow.keras import models
+
+from src.data_utils import StadiumDataset
+from src.backends import create_backend
+from src.export import EXPORT_FORMATS, export_model, detector_calibration_images, crop_calibration_images
+
+def benchmark_backends(model_path, input_shape, backends, batch_size=1, iterations=20):
+    """
+    Measure the throughput of a model on each backend.
+
+    Args:
+        model_path: Path to the .h5 model, or to an exported model for its backend
+        input_shape: Model input shape (height, width, channels)
+        backends: Backend names to measure
+        batch_size: Images per call
+        iterations: Timed calls per backend (after one warm-up call)
+
+    Returns:
+        Dictionary mapping backend names to throughput statistics
+    """
+    keras_model = None
+    batch = np.random.uniform(0, 255, (batch_size,) + tuple(input_shape)).astype(np.float32)
+
+    results = {}
+    for backend_name in backends:
+        if backend_name in ('keras', 'tf-function') and keras_model is None:
+            keras_model = models.load_model(model_path, compile=False)
+
+        try:
+            backend = create_backend(backend_name, model_path, keras_model=keras_model)
+        except (FileNotFoundError, ImportError) as e:
+            print(f"Skipping {backend_name}: {e}")
+            continue
+
+        # Warm up, then reset the counters so only steady-state calls are measured
+        backend.predict(batch)
+        backend.reset_stats()
+        for _ in range(iterations):
+            backend.predict(batch)
+
+        results[backend_name] = backend.throughput()
+        stats = results[backend_name]
+        print(f"  {backend_name}: {stats['images_per_second']:.1f} images/s, "
+              f"{stats['mean_latency_ms']:.1f} ms per call")
+
+    return results
+
+def main():
+    """Main function to export the trained models."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Export Stadium Crowd Monitoring models')
+    parser.add_argument('--detector', type=str, default='models/fan_detection_model.h5',
+                        help='Path to the detector model')
+    parser.add_argument('--behavior', type=str, default='models/behavior_classifier.h5',
+                        help='Path to the behavior classifier model')
+    parser.add_argument('--team', type=str, default='models/team_detector.h5',
+                        help='Path to the team detector model')
+    parser.add_argument('--crop-classifier', type=str, default='models/crop_classifier.h5',
+                        help='Path to the fused team/behavior crop classifier model')
+    parser.add_argument('--dataset', type=str, default='stadium_dataset',
+                        help='StadiumDataset directory used for int8 calibration')
+    parser.add_argument('--formats', type=str, nargs='+', default=list(EXPORT_FORMATS),
+                        choices=list(EXPORT_FORMATS),
+                        help='Export formats (default: all)')
+    parser.add_argument('--calibration-samples', type=int, default=100,
+                        help='Images (or crops) used for int8 calibration (default: 100)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Directory for exported models (default: next to each .h5 file)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare the throughput of all backends after exporting')
+
+    args = parser.parse_args()
+
+    # Load the calibration dataset if int8 export is requested
+    dataset = None
+    if 'tflite-int8' in args.formats:
+        dataset = StadiumDataset(args.dataset, image_size=(512, 384))
+        dataset.load_annotations()
+
+    detector_shape = (384, 512, 3)
+    crop_shape = (128, 128, 3)
+    targets = [
+        (args.detector, detector_shape,
+         lambda: detector_calibration_images(dataset, detector_shape, args.calibration_samples)),
+        (args.behavior, crop_shape,
+         lambda: crop_calibration_images(dataset, crop_shape, args.calibration_samples)),
+        (args.team, crop_shape,
+         lambda: crop_calibration_images(dataset, crop_shape, args.calibration_samples)),
+        (args.crop_classifier, crop_shape,
+         lambda: crop_calibration_images(dataset, crop_shape, args.calibration_samples))
+    ]
+
+    for model_path, input_shape, calibration_images in targets:
+        if not os.path.exists(model_path):
+            print(f"Warning: {model_path} not found, skipping.")
+            continue
+
+        print(f"Exporting {model_path}...")
+        exported = export_model(
+            model_path,
+            formats=args.formats,
+            calibration_images=calibration_images,
+            output_dir=args.output_dir
+        )
+
+        if args.benchmark:
+            print(f"Throughput of {model_path}:")
+            benchmark_backends(model_path, input_shape, ['keras', 'tf-function'])
+            for export_format, path in zip(args.formats, exported):
+                backend_name = 'onnxruntime' if export_format == 'onnx' else 'tflite'
+                print(f" {export_format}:")
+                benchmark_backends(path, input_shape, [backend_name])
+
+    print("Export complete.")
+
+if __name__ == '__main__':
+    main()
@@ -5,45 +5,110 @@ This script demonstrates the usage of the integrated system.
 
 import os
 import argparse
-import tensorflow as tf
 from src.system import StadiumMonitoringSystem
+from src.multi_camera import MultiCameraMonitoringSystem
+from src.offline_video import OfflineVideoProcessor
+from src.batch_images import BatchImageProcessor
 
 def main():
     """Main function to run the stadium crowd monitoring system."""
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Stadium Crowd Monitoring System')
-    parser.add_argument('--mode', type=str, default='image', choices=['image', 'video', 'live'],
-                        help='Processing mode: image, video, or live camera feed')
+    parser.add_argument('--mode', type=str, default='image', choices=['image', 'batch', 'video', 'live', 'multi'],
+                        help='Processing mode: image, batch of images, video, live camera feed, or multiple camera feeds')
     parser.add_argument('--input', type=str, default=None,
-                        help='Path to input image or video file')
+                        help='Path to input image or video file, or an image directory or glob pattern in batch mode')
     parser.add_argument('--output', type=str, default=None,
-                        help='Path to save output results')
+                        help='Path to save output results (a directory of annotated images in batch mode)')
     parser.add_argument('--detector', type=str, default='models/fan_detection_model.h5',
                         help='Path to trained detector model')
     parser.add_argument('--behavior', type=str, default='models/behavior_classifier.h5',
                         help='Path to trained behavior classifier model')
     parser.add_argument('--team', type=str, default='models/team_detector.h5',
                         help='Path to trained team detector model')
+    parser.add_argument('--crop-classifier', type=str, default='models/crop_classifier.h5',
+                        help='Path to trained fused team/behavior crop classifier (replaces --behavior and --team when present)')
     parser.add_argument('--camera', type=int, default=0,
                         help='Camera ID for live feed mode')
     parser.add_argument('--duration', type=int, default=None,
                         help='Duration in seconds for live feed processing')
     parser.add_argument('--no-alerts', action='store_true',
                         help='Disable alert generation')
+    parser.add_argument('--sources', type=str, nargs='+', default=None,
+                        help='Camera IDs, RTSP URLs or video files for multi mode')
+    parser.add_argument('--max-batch-size', type=int, default=8,
+                        help='Maximum frames per detector call in multi mode (default: 8)')
+    parser.add_argument('--max-batch-wait', type=float, default=20,
+                        help='Maximum milliseconds to wait for a batch to fill in multi mode (default: 20)')
+    parser.add_argument('--batch-size', type=int, default=8,
+                        help='Images per detector call in batch mode (default: 8)')
+    parser.add_argument('--result-cache', type=str, default='result_cache/results.db',
+                        help='Result cache of batch mode; unchanged images are not processed again (default: result_cache/results.db)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Process every image in batch mode without reading or writing the result cache')
+    parser.add_argument('--backend', type=str, default='keras',
+                        choices=['keras', 'tf-function', 'tflite', 'onnxruntime'],
+                        help='Inference backend (tflite/onnxruntime need models from export_models.py)')
+    parser.add_argument('--tflite-precision', type=str, default='int8', choices=['int8', 'fp16'],
+                        help='Exported TFLite models to load with the tflite backend (default: int8)')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='CPU threads for the tflite and onnxruntime backends')
+    parser.add_argument('--frame-interval', type=int, default=None,
+                        help='Process every Nth frame in video, live and multi modes (default: pick frames by motion)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for video mode; above 1 processes the video in parallel segments (default: 1)')
+    parser.add_argument('--event-clips', action='store_true',
+                        help='Record a short clip around every alert in video and live modes (saved to clips/)')
+    parser.add_argument('--pre-roll', type=float, default=5.0,
+                        help='Seconds of video before an alert kept in each event clip (default: 5)')
+    parser.add_argument('--post-roll', type=float, default=5.0,
+                        help='Seconds of video after an alert kept in each event clip (default: 5)')
+    parser.add_argument('--headless', action='store_true',
+                        help='Run live mode without the preview window (for servers without a display)')
+    parser.add_argument('--all-frames', action='store_true',
+                        help='Hand every captured frame to live mode in order instead of only the newest one')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Record per-stage latencies and pipeline counters and print them at the end')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on http://127.0.0.1:<port>/metrics (implies --metrics)')
+    parser.add_argument('--metrics-snapshot', type=str, default=None,
+                        help='Write a JSON metrics snapshot to this file every 10 seconds (implies --metrics)')
     
     args = parser.parse_args()
     
     # Create output directory if needed
-    if args.output and not os.path.exists(os.path.dirname(args.output)):
+    if args.output and os.path.dirname(args.output) and not os.path.exists(os.path.dirname(args.output)):
         os.makedirs(os.path.dirname(args.output), exist_ok=True)
     
     # Initialize the system
     print("Initializing stadium crowd monitoring system...")
-    system = StadiumMonitoringSystem()
+    config = {
+        'inference_backend': args.backend,
+        'tflite_precision': args.tflite_precision,
+        'inference_threads': args.threads,
+        'metrics': args.metrics,
+        'metrics_port': args.metrics_port,
+        'metrics_snapshot_path': args.metrics_snapshot,
+        'event_clips': args.event_clips,
+        'clip_pre_roll': args.pre_roll,
+        'clip_post_roll': args.post_roll,
+        'live_display': not args.headless,
+        'live_latest_frame': not args.all_frames
+    }
+    if args.mode == 'multi':
+        config.update({
+            'max_batch_size': args.max_batch_size,
+            'max_batch_wait_ms': args.max_batch_wait,
+            'frame_interval': args.frame_interval
+        })
+        system = MultiCameraMonitoringSystem(config=config)
+    else:
+        system = StadiumMonitoringSystem(config=config)
     system.initialize(
         detector_path=args.detector if os.path.exists(args.detector) else None,
         behavior_classifier_path=args.behavior if os.path.exists(args.behavior) else None,
-        team_detector_path=args.team if os.path.exists(args.team) else None
+        team_detector_path=args.team if os.path.exists(args.team) else None,
+        crop_classifier_path=args.crop_classifier if os.path.exists(args.crop_classifier) else None
     )
     
     # Process based on mode
@@ -65,17 +130,53 @@ def main():
         if args.output:
             print(f"Output saved to: {args.output}")
             
-    elif args.mode == 'video':
+    elif args.mode == 'batch':
         if not args.input:
-            raise ValueError("Input video path must be provided for video mode")
+            raise ValueError("Input image directory or glob pattern must be provided for batch mode")
             
-        print(f"Processing video: {args.input}")
-        all_detections, all_alerts = system.process_video(
+        # Stream the images through batched inference, skipping those cached by earlier runs
+        processor = BatchImageProcessor(
+            system,
+            batch_size=args.batch_size,
+            cache_path=None if args.no_cache else args.result_cache
+        )
+        results = processor.process_images(
             args.input,
-            output_path=args.output,
+            output_dir=args.output,
             generate_alerts=not args.no_alerts
         )
         
+        processed = [result for result in results.values() if result is not None]
+        print(f"Detected {sum(len(result['detections']) for result in processed)} fans in {len(processed)} images")
+        if not args.no_alerts:
+            new_alerts = sum(len(result['alerts']) for result in processed if not result['cached'])
+            print(f"Generated {new_alerts} alerts")
+            
+        if args.output:
+            print(f"Annotated images saved to: {args.output}")
+            
+    elif args.mode == 'video':
+        if not args.input:
+            raise ValueError("Input video path must be provided for video mode")
+            
+        print(f"Processing video: {args.input}")
+        if args.workers > 1:
+            # Process segments of the video in parallel worker processes
+            processor = OfflineVideoProcessor(system, num_workers=args.workers)
+            all_detections, all_alerts = processor.process_video(
+                args.input,
+                output_path=args.output,
+                generate_alerts=not args.no_alerts,
+                frame_interval=args.frame_interval
+            )
+        else:
+            all_detections, all_alerts = system.process_video(
+                args.input,
+                output_path=args.output,
+                generate_alerts=not args.no_alerts,
+                frame_interval=args.frame_interval
+            )
+        
         total_detections = sum(len(dets) for dets in all_detections)
         print(f"Detected {total_detections} fans across all processed frames")
         
@@ -91,7 +192,8 @@ def main():
             camera_id=args.camera,
             output_path=args.output,
             generate_alerts=not args.no_alerts,
-            duration=args.duration
+            duration=args.duration,
+            frame_interval=args.frame_interval
         )
         
         if not args.no_alerts:
@@ -100,6 +202,32 @@ def main():
         if args.output:
             print(f"Output saved to: {args.output}")
     
+    elif args.mode == 'multi':
+        if not args.sources:
+            raise ValueError("At least one source must be provided for multi mode")
+            
+        # Numeric sources are local camera IDs
+        sources = [int(source) if source.isdigit() else source for source in args.sources]
+        print(f"Processing {len(sources)} camera feeds")
+        all_alerts = system.process_feeds(
+            sources,
+            output_dir=args.output,
+            generate_alerts=not args.no_alerts,
+            duration=args.duration
+        )
+        
+        if not args.no_alerts:
+            for camera_id in all_alerts:
+                print(f"{camera_id}: generated {system.stats['cameras'][camera_id]['alerts']} alerts")
+                
+        if args.output:
+            print(f"Annotated frames saved to: {args.output}")
+    
+    # Report inference throughput and per-stage latencies
+    system.report_throughput()
+    system.report_metrics()
+    system.stop_metrics()
+    
     # Generate report
     report_path = 'alerts/report.txt' if args.output else None
     report = system.generate_report(report_path)
@@ -109,6 +237,8 @@ def main():
     # Visualize alerts
     viz_path = 'alerts/alert_distribution.png' if args.output else None
     system.visualize_alerts(viz_path)
+    timeline_path = 'alerts/alerts_per_section.png' if args.output else None
+    system.visualize_section_timeline(timeline_path)
     
     print("Processing complete.")
 
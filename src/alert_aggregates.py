@@ -0,0 +1,150 @@
+"""
+Running alert aggregates for the stadium security alert system.
+This module keeps alert counts per type, section and team, per-minute and per-5-minute
+rollups and a bounded heap of the newest alerts up to date as alerts are added, so
+reports and dashboards read them without scanning the alert log.
+"""
+
+import heapq
+import itertools
+
+class AlertAggregates:
+    """Counts, time-bucketed rollups and newest alerts, updated on every insert."""
+
+    def __init__(self, bucket_sizes=(60, 300), max_buckets=1440, recent_size=100):
+        """
+        Initialize the aggregates.
+
+        Args:
+            bucket_sizes: Lengths in seconds of the time buckets to roll alerts up into
+            max_buckets: Buckets kept per bucket size; the oldest are dropped beyond it
+                         (1440 one-minute buckets cover a day)
+            recent_size: Number of newest alerts kept for get_recent()
+        """
+        self.bucket_sizes = tuple(bucket_sizes)
+        self.max_buckets = max_buckets
+        self.recent_size = recent_size
+        self.total = 0
+        self.by_type = {}
+        self.by_section = {}
+        self.by_team = {}
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+        # Bucket start -> {'total', 'types', 'sections'} for every bucket size
+        self.buckets = {size: {} for size in self.bucket_sizes}
+
+        # Min-heap of (timestamp, sequence, alert) holding the newest alerts
+        self._recent = []
+        self._sequence = itertools.count()
+
+    def add(self, alert):
+        """
+        Add an alert to the aggregates.
+
+        Args:
+            alert: Alert dictionary as stored by SecurityAlertSystem.generate_alert()
+        """
+        alert_type = alert['alert_type']
+        section = alert.get('section')
+        team = alert.get('team')
+        timestamp = alert['timestamp']
+
+        # Running counts
+        self.total += 1
+        self.by_type[alert_type] = self.by_type.get(alert_type, 0) + 1
+        if section is not None:
+            self.by_section[section] = self.by_section.get(section, 0) + 1
+        if team is not None:
+            self.by_team[team] = self.by_team.get(team, 0) + 1
+
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+        # Time-bucketed rollups
+        for size, buckets in self.buckets.items():
+            start = timestamp - timestamp % size
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = {'total': 0, 'types': {}, 'sections': {}}
+                if len(buckets) > self.max_buckets:
+                    # New buckets appear once per bucket length, so finding the oldest is cheap
+                    del buckets[min(buckets)]
+            bucket['total'] += 1
+            bucket['types'][alert_type] = bucket['types'].get(alert_type, 0) + 1
+            if section is not None:
+                bucket['sections'][section] = bucket['sections'].get(section, 0) + 1
+
+        # Newest alerts; the oldest of the heap is replaced once it is full
+        entry = (timestamp, next(self._sequence), alert)
+        if len(self._recent) < self.recent_size:
+            heapq.heappush(self._recent, entry)
+        elif self.recent_size > 0 and entry[:2] > self._recent[0][:2]:
+            heapq.heapreplace(self._recent, entry)
+
+    def get_recent(self, count=10):
+        """
+        Get the newest alerts, newest first.
+
+        Args:
+            count: Number of alerts, at most recent_size
+
+        Returns:
+            List of alert dictionaries
+        """
+        return [alert for _, _, alert in heapq.nlargest(count, self._recent, key=lambda entry: entry[:2])]
+
+    def summary(self):
+        """
+        Snapshot of the running counts.
+
+        Returns:
+            Dictionary with the total and the counts per type, section and team
+        """
+        return {
+            'total': self.total,
+            'by_type': dict(self.by_type),
+            'by_section': dict(self.by_section),
+            'by_team': dict(self.by_team),
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp
+        }
+
+    def timeline(self, bucket_seconds=60, group='sections'):
+        """
+        Alert counts per time bucket.
+
+        Args:
+            bucket_seconds: Bucket length in seconds, one of bucket_sizes
+            group: 'sections' or 'types' to split the counts by, or None for totals only
+
+        Returns:
+            bucket_starts: Sorted bucket start timestamps, including empty buckets
+                           between the first and the last one
+            series: Dictionary mapping each section or type (or 'total') to its
+                    count in every bucket
+        """
+        if bucket_seconds not in self.buckets:
+            raise ValueError(f"No {bucket_seconds}s alert buckets; available: {self.bucket_sizes}")
+
+        buckets = self.buckets[bucket_seconds]
+        if not buckets:
+            return [], {}
+
+        # Fill the gaps so the buckets are evenly spaced
+        first, last = min(buckets), max(buckets)
+        bucket_starts = [first + i * bucket_seconds for i in range(int(round((last - first) / bucket_seconds)) + 1)]
+
+        if group is None:
+            return bucket_starts, {'total': [buckets[start]['total'] if start in buckets else 0 for start in bucket_starts]}
+
+        names = sorted({name for bucket in buckets.values() for name in bucket[group]}, key=str)
+        series = {name: [0] * len(bucket_starts) for name in names}
+        for i, start in enumerate(bucket_starts):
+            bucket = buckets.get(start)
+            if bucket is not None:
+                for name, count in bucket[group].items():
+                    series[name][i] = count
+        return bucket_starts, series
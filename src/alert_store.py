@@ -0,0 +1,325 @@
+"""
+Alert storage backends for the stadium security alert system.
+This module provides append-only alert stores with indexed lookups, replacing
+the full rewrite of alerts_log.json after every alert.
+"""
+
+import os
+import json
+import bisect
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+class AlertStore(ABC):
+    """Interface for alert storage backends."""
+
+    @abstractmethod
+    def append(self, alert):
+        """Persist a new alert."""
+
+    @abstractmethod
+    def get(self, alert_id):
+        """Get an alert by its ID, or None."""
+
+    @abstractmethod
+    def by_type(self, alert_type):
+        """Get all alerts of a type, oldest first."""
+
+    @abstractmethod
+    def by_section(self, section):
+        """Get all alerts raised in a stadium section, oldest first."""
+
+    @abstractmethod
+    def recent(self, count=10):
+        """Get the most recent alerts, newest first."""
+
+    @abstractmethod
+    def time_range(self, start_time=None, end_time=None):
+        """Get alerts with start_time <= timestamp <= end_time, oldest first."""
+
+    @abstractmethod
+    def iter_alerts(self):
+        """Stream all stored alerts in insertion order."""
+
+    @abstractmethod
+    def by_position(self, start, stop):
+        """Get the alerts stored at insertion positions start <= position < stop, oldest first."""
+
+    @abstractmethod
+    def count(self):
+        """Number of stored alerts."""
+
+    def close(self):
+        """Release any resources held by the store."""
+
+class JSONLAlertStore(AlertStore):
+    """
+    Append-only JSON Lines alert store with in-memory indexes.
+
+    Only the byte offset of each alert's line is kept in memory; alerts are read
+    back from the log when looked up, so memory does not grow with the alert data.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the store, streaming any existing log to rebuild the indexes.
+
+        Args:
+            path: Path to the .jsonl log file, or None to keep the alerts in memory only
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._alerts = []  # Alert dictionaries (in-memory store) or line offsets (file store)
+        self._by_id = {}
+        self._by_type = {}
+        self._by_section = {}
+        self._by_time = []  # Sorted (timestamp, position) pairs
+
+        self._file = None
+        self._reader = None
+        if path is None:
+            return
+
+        # Offsets are byte positions, so the log is read and appended in binary mode
+        self._end = 0
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line), self._end)
+                    self._end += len(line)
+
+        self._file = open(path, 'ab')
+        self._reader = open(path, 'rb')
+
+    def _index(self, alert, entry):
+        """Add an alert to the in-memory indexes; entry is the alert itself or its line offset."""
+        position = len(self._alerts)
+        self._alerts.append(entry)
+        self._by_id[alert['alert_id']] = position
+        self._by_type.setdefault(alert['alert_type'], []).append(position)
+        if alert.get('section') is not None:
+            self._by_section.setdefault(alert['section'], []).append(position)
+
+        # Alerts almost always arrive in time order, so this is an append in practice
+        entry = (alert['timestamp'], position)
+        if not self._by_time or entry >= self._by_time[-1]:
+            self._by_time.append(entry)
+        else:
+            bisect.insort(self._by_time, entry)
+
+    def _read(self, positions):
+        """Get the alerts at a list of positions, reading them from the log if it is on disk."""
+        if self._file is None:
+            return [self._alerts[i] for i in positions]
+
+        alerts = []
+        with self._lock:
+            for i in positions:
+                self._reader.seek(self._alerts[i])
+                alerts.append(json.loads(self._reader.readline()))
+        return alerts
+
+    def append(self, alert):
+        with self._lock:
+            if self._file is None:
+                self._index(alert, alert)
+                return
+
+            line = (json.dumps(alert) + '\n').encode('utf-8')
+            self._file.write(line)
+            self._file.flush()
+            self._index(alert, self._end)
+            self._end += len(line)
+
+    def get(self, alert_id):
+        position = self._by_id.get(alert_id)
+        return self._read([position])[0] if position is not None else None
+
+    def by_type(self, alert_type):
+        return self._read(self._by_type.get(alert_type, []))
+
+    def by_section(self, section):
+        return self._read(self._by_section.get(section, []))
+
+    def recent(self, count=10):
+        return self._read([i for _, i in reversed(self._by_time[-count:])]) if count > 0 else []
+
+    def time_range(self, start_time=None, end_time=None):
+        lo = 0 if start_time is None else bisect.bisect_left(self._by_time, (start_time, -1))
+        hi = len(self._by_time) if end_time is None else bisect.bisect_right(self._by_time, (end_time, float('inf')))
+        return self._read([i for _, i in self._by_time[lo:hi]])
+
+    def iter_alerts(self):
+        if self._file is None:
+            yield from list(self._alerts)
+            return
+
+        # Read the log sequentially up to the alerts stored when iteration started
+        count = len(self._alerts)
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if count == 0:
+                    break
+                if line.strip():
+                    count -= 1
+                    yield json.loads(line)
+
+    def by_position(self, start, stop):
+        return self._read(range(start, min(stop, len(self._alerts))))
+
+    def count(self):
+        return len(self._alerts)
+
+    def close(self):
+        with self._lock:
+            for f in (self._file, self._reader):
+                if f is not None and not f.closed:
+                    f.close()
+
+class SQLiteAlertStore(AlertStore):
+    """Local SQLite alert store with indexes on ID, type, section and timestamp."""
+
+    def __init__(self, path):
+        """
+        Initialize the store.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        # WAL keeps each insert to a single sequential append
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS alerts ('
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'alert_id TEXT UNIQUE NOT NULL, '
+            'timestamp REAL NOT NULL, '
+            'alert_type TEXT NOT NULL, '
+            'section TEXT, '
+            'data TEXT NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_type ON alerts (alert_type)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_section ON alerts (section)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts (timestamp)')
+        self._conn.commit()
+
+    def _query(self, sql, params=()):
+        """Run a query and decode the stored alert JSON."""
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def append(self, alert):
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO alerts (alert_id, timestamp, alert_type, section, data) VALUES (?, ?, ?, ?, ?)',
+                (alert['alert_id'], alert['timestamp'], alert['alert_type'], alert.get('section'), json.dumps(alert))
+            )
+            self._conn.commit()
+
+    def get(self, alert_id):
+        alerts = self._query('SELECT data FROM alerts WHERE alert_id = ?', (alert_id,))
+        return alerts[0] if alerts else None
+
+    def by_type(self, alert_type):
+        return self._query('SELECT data FROM alerts WHERE alert_type = ? ORDER BY seq', (alert_type,))
+
+    def by_section(self, section):
+        return self._query('SELECT data FROM alerts WHERE section = ? ORDER BY seq', (section,))
+
+    def recent(self, count=10):
+        return self._query('SELECT data FROM alerts ORDER BY timestamp DESC, seq DESC LIMIT ?', (count,))
+
+    def time_range(self, start_time=None, end_time=None):
+        start_time = float('-inf') if start_time is None else start_time
+        end_time = float('inf') if end_time is None else end_time
+        return self._query(
+            'SELECT data FROM alerts WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp, seq',
+            (start_time, end_time)
+        )
+
+    def iter_alerts(self):
+        # Use a separate cursor so large logs are streamed rather than fetched at once
+        with self._lock:
+            cursor = self._conn.execute('SELECT data FROM alerts ORDER BY seq')
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def by_position(self, start, stop):
+        if stop <= start:
+            return []
+        return self._query('SELECT data FROM alerts ORDER BY seq LIMIT ? OFFSET ?', (stop - start, start))
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM alerts').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class AlertLog(Sequence):
+    """Read-only list view of the alerts in a store, oldest first, read on demand."""
+
+    def __init__(self, store):
+        """
+        Initialize the view.
+
+        Args:
+            store: AlertStore holding the alerts
+        """
+        self.store = store
+
+    def __len__(self):
+        return self.store.count()
+
+    def __getitem__(self, index):
+        count = self.store.count()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(count)
+            if step == 1:
+                return self.store.by_position(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('alert log index out of range')
+        return self.store.by_position(index, index + 1)[0]
+
+    def __iter__(self):
+        return self.store.iter_alerts()
+
+    def __eq__(self, other):
+        if isinstance(other, (list, AlertLog)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"AlertLog({self.store.count()} alerts)"
+
+def create_alert_store(backend, output_dir):
+    """
+    Create an alert store backend.
+
+    Args:
+        backend: 'jsonl', 'sqlite' or 'memory' (not persisted)
+        output_dir: Directory holding the alert log
+
+    Returns:
+        AlertStore instance
+    """
+    if backend == 'jsonl':
+        return JSONLAlertStore(os.path.join(output_dir, 'alerts_log.jsonl'))
+    elif backend == 'sqlite':
+        return SQLiteAlertStore(os.path.join(output_dir, 'alerts.db'))
+    elif backend == 'memory':
+        return JSONLAlertStore(None)
+    raise ValueError(f"Unknown alert store backend: {backend}")
@@ -0,0 +1,486 @@
+"""
+Alert system for stadium security personnel.
+This module handles generating and sending alerts for problematic behaviors and misplaced fans.
+"""
+
+import os
+import math
+import time
+import json
+from PIL import Image, ImageDraw
+
+from src.artifact_writer import PRIORITY_ALERT
+from src.alert_aggregates import AlertAggregates
+from src.alert_store import AlertStore, AlertLog, create_alert_store
+from src.metrics import MetricsRegistry
+
+# PIL format and file extension of each alert image format
+IMAGE_FORMATS = {
+    'png': ('PNG', '.png'),
+    'jpeg': ('JPEG', '.jpg'),
+    'webp': ('WEBP', '.webp')
+}
+
+class SecurityAlertSystem:
+    """System for generating security alerts in stadium environments."""
+    
+    def __init__(self, output_dir='alerts', writer=None, store='jsonl', metrics=None, id_prefix='ALERT',
+                 bucket_sizes=(60, 300), artifact_policy='compact', image_format='jpeg', image_quality=90,
+                 thumbnail_width=160, crop_padding=0.25):
+        """
+        Initialize the alert system.
+        
+        Args:
+            output_dir: Directory to save alert images and data
+            writer: ArtifactWriter used to save alert images in the background (optional)
+            store: Alert store backend ('jsonl' or 'sqlite') or an AlertStore instance
+            metrics: MetricsRegistry counting alerts and timing alert images and store writes (optional)
+            id_prefix: Prefix of generated alert IDs; must differ between processes sharing output_dir
+            bucket_sizes: Lengths in seconds of the time buckets alerts are counted in
+            artifact_policy: 'compact' to save a tight crop and a context thumbnail per fan
+                             plus one annotated image per frame shared by all of its alerts,
+                             or 'full' to save an annotated copy of the whole image per alert
+            image_format: Alert image format: 'jpeg', 'webp' or 'png' (lossless)
+            image_quality: JPEG/WebP quality (1-100)
+            thumbnail_width: Width of the context thumbnails of the 'compact' policy
+            crop_padding: Context added around the fan box on each side of a crop,
+                          as a fraction of the box size
+        """
+        if artifact_policy not in ('compact', 'full'):
+            raise ValueError(f"Unknown alert artifact policy: {artifact_policy}")
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown alert image format: {image_format}")
+            
+        self.output_dir = output_dir
+        self.id_prefix = id_prefix
+        self.writer = writer
+        self.metrics = metrics if metrics is not None else MetricsRegistry(enabled=False)
+        self.alert_count = 0
+        self.aggregates = AlertAggregates(bucket_sizes=bucket_sizes)
+        self.artifact_policy = artifact_policy
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self.thumbnail_width = thumbnail_width
+        self.crop_padding = crop_padding
+        
+        # Alerts of the frame being processed, which share its annotated image
+        self._frame = None
+        
+        # Create output directory if it doesn't exist
+        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(os.path.join(output_dir, 'images'), exist_ok=True)
+        
+        # Open the append-only alert store and load the existing log
+        if isinstance(store, AlertStore):
+            self.store = store
+        else:
+            self.store = create_alert_store(store, output_dir)
+        self.alerts_log = AlertLog(self.store)
+        self.load_alerts_log()
+        
+    def generate_alert(self, image, detection, alert_type, location=None, confidence=None, details=None, section=None, track_id=None,
+                       clip_path=None, team=None, capture_timestamp=None, latency_ms=None):
+        """
+        Generate a security alert.
+        
+        Args:
+            image: Original image (PIL Image or path)
+            detection: Detection information (bounding box, etc.)
+            alert_type: Type of alert ('fighting', 'throwing', 'misplaced_fan')
+            location: Location information (section, seat, etc.)
+            confidence: Confidence score of the detection
+            details: Additional details about the alert
+            section: Stadium section the alert was raised in (optional)
+            track_id: ID of the tracked fan that raised the alert (optional)
+            clip_path: Path of the event clip recorded around the alert (optional)
+            team: Team of the fan that raised the alert (optional)
+            capture_timestamp: Time the live frame that raised the alert was captured (optional)
+            latency_ms: Latency from frame capture to the alert in milliseconds (optional)
+            
+        Returns:
+            alert_id: Unique identifier for the alert
+        """
+        # Generate alert ID
+        self.alert_count += 1
+        alert_id = f"{self.id_prefix}_{int(time.time())}_{self.alert_count}"
+        
+        # Load image if path is provided
+        if isinstance(image, str):
+            img = Image.open(image)
+        else:
+            img = image
+            
+        # Create and save alert images
+        if self.artifact_policy == 'compact':
+            image_path, thumbnail_path, frame_path = self._add_compact_artifacts(
+                img, detection, alert_id, alert_type, details
+            )
+        else:
+            image_path, thumbnail_path, frame_path = self._image_path(alert_id), None, None
+            self._submit(self._write_alert_image, img, detection, alert_type, details, image_path)
+        
+        # Create alert data
+        alert_data = {
+            'alert_id': alert_id,
+            'timestamp': time.time(),
+            'alert_type': alert_type,
+            'location': location,
+            'confidence': confidence,
+            'details': details,
+            'section': section,
+            'team': team,
+            'track_id': track_id,
+            'image_path': image_path,
+            'thumbnail_path': thumbnail_path,
+            'frame_path': frame_path,
+            'clip_path': clip_path,
+            'bbox': detection['bbox'] if isinstance(detection, dict) and 'bbox' in detection else detection
+        }
+        if capture_timestamp is not None:
+            alert_data['capture_timestamp'] = capture_timestamp
+            alert_data['latency_ms'] = latency_ms
+        
+        # Add to alerts log and append it to the store
+        self._record(alert_data)
+        
+        return alert_id
+    
+    def _record(self, alert_data):
+        """Append an alert to the store and add it to the running aggregates."""
+        with self.metrics.timer('alert_store'):
+            self.store.append(alert_data)
+        self.aggregates.add(alert_data)
+        self.metrics.increment('alerts', type=alert_data['alert_type'])
+    
+    def _image_path(self, alert_id, suffix=None):
+        """Path of an alert image in the configured format."""
+        name = f"{alert_id}_{suffix}" if suffix else alert_id
+        return os.path.join(self.output_dir, 'images', name + IMAGE_FORMATS[self.image_format][1])
+    
+    def _submit(self, fn, *args):
+        """Run an alert image job in the background if there is a writer, inline otherwise."""
+        if self.writer is not None:
+            # Alert images go ahead of other artifacts
+            self.writer.submit(PRIORITY_ALERT, fn, *args)
+        else:
+            fn(*args)
+            
+    def _add_compact_artifacts(self, image, detection, alert_id, alert_type, details):
+        """
+        Queue the crop and thumbnail of an alert and add it to its frame's shared image.
+        
+        Returns:
+            Paths of the crop, the thumbnail and the shared frame image
+        """
+        bbox = detection['bbox'] if isinstance(detection, dict) and 'bbox' in detection else detection
+        
+        # An alert on another image finishes the shared image of the previous frame
+        if self._frame is not None and self._frame['image'] is not image:
+            self.finish_frame()
+        if self._frame is None:
+            self._frame = {'image': image, 'path': self._image_path(alert_id, 'frame'), 'alerts': [], 'fans': {}}
+        frame = self._frame
+        frame['alerts'].append((bbox, self._alert_text(alert_type, details)))
+        
+        # Alerts on the same fan of a frame (e.g. fighting and misplaced) share its crop and thumbnail
+        key = tuple(int(round(float(v))) for v in bbox)
+        paths = frame['fans'].get(key)
+        if paths is None:
+            paths = frame['fans'][key] = (self._image_path(alert_id, 'crop'), self._image_path(alert_id, 'thumb'))
+            self._submit(self._write_fan_images, image, bbox, *paths)
+            
+        return paths[0], paths[1], frame['path']
+    
+    def finish_frame(self):
+        """
+        Queue the annotated image shared by the alerts of the current frame.
+        
+        Called after the alerts of a frame have been generated; alerts on a new
+        image and close() also finish the previous frame.
+        """
+        frame, self._frame = self._frame, None
+        if frame is not None:
+            self._submit(self._write_frame_image, frame['image'], frame['alerts'], frame['path'])
+            
+    def _write_fan_images(self, image, bbox, crop_path, thumbnail_path):
+        """Save the tight crop of a fan and a downscaled thumbnail of the frame around it."""
+        with self.metrics.timer('alert_image'):
+            width, height = image.size
+            x1, y1, x2, y2 = [float(v) for v in bbox]
+            
+            # Crop the fan with some context, inside the image
+            pad_x = (x2 - x1) * self.crop_padding
+            pad_y = (y2 - y1) * self.crop_padding
+            left = min(max(0, int(x1 - pad_x)), width - 1)
+            top = min(max(0, int(y1 - pad_y)), height - 1)
+            right = max(min(width, int(math.ceil(x2 + pad_x))), left + 1)
+            bottom = max(min(height, int(math.ceil(y2 + pad_y))), top + 1)
+            self._save_image(image.crop((left, top, right, bottom)), crop_path, 'alert_crop')
+            
+            # Downscaled frame with the fan highlighted, to locate it in the stands
+            scale = min(1.0, self.thumbnail_width / width)
+            thumbnail = image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.BILINEAR)
+            ImageDraw.Draw(thumbnail).rectangle([x1 * scale, y1 * scale, x2 * scale, y2 * scale], outline='red', width=2)
+            self._save_image(thumbnail, thumbnail_path, 'alert_thumbnail')
+        return crop_path
+    
+    def _write_frame_image(self, image, alerts, image_path):
+        """Annotate every alert of a frame on one copy of the frame and save it."""
+        with self.metrics.timer('alert_frame'):
+            frame_image = image.copy()
+            draw = ImageDraw.Draw(frame_image)
+            for bbox, alert_text in alerts:
+                self._draw_alert(draw, bbox, alert_text)
+            self._save_image(frame_image, image_path, 'alert_frame')
+        return image_path
+    
+    def _write_alert_image(self, image, detection, alert_type, details, image_path):
+        """Create the annotated alert image and save it."""
+        with self.metrics.timer('alert_image'):
+            alert_image = self._create_alert_image(image, detection, alert_type, details)
+            self._save_image(alert_image, image_path, 'alert_image')
+        return image_path
+    
+    def _save_image(self, image, path, kind):
+        """Encode an alert image in the configured format and quality."""
+        pil_format = IMAGE_FORMATS[self.image_format][0]
+        if pil_format != 'PNG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        options = {} if pil_format == 'PNG' else {'quality': self.image_quality}
+        image.save(path, pil_format, **options)
+        self.metrics.add_file_bytes(path, kind)
+    
+    def _create_alert_image(self, image, detection, alert_type, details=None):
+        """Create an annotated image for the alert."""
+        # Create a copy of the image
+        alert_image = image.copy()
+        draw = ImageDraw.Draw(alert_image)
+        
+        # Get bounding box
+        if isinstance(detection, dict) and 'bbox' in detection:
+            bbox = detection['bbox']
+        else:
+            bbox = detection
+            
+        self._draw_alert(draw, bbox, self._alert_text(alert_type, details))
+        
+        return alert_image
+    
+    def _alert_text(self, alert_type, details=None):
+        """Label drawn next to an alert's bounding box."""
+        alert_text = f"ALERT: {alert_type.upper()}"
+        if details:
+            alert_text += f" - {details}"
+        return alert_text
+    
+    def _draw_alert(self, draw, bbox, alert_text):
+        """Draw an alert's bounding box and label."""
+        # Draw bounding box
+        draw.rectangle(bbox, outline='red', width=3)
+        
+        # Draw text with background for visibility
+        text_position = (bbox[0], bbox[1] - 20)
+        text_background = (bbox[0], bbox[1] - 20, bbox[0] + len(alert_text) * 7, bbox[1])
+        draw.rectangle(text_background, fill='red')
+        draw.text(text_position, alert_text, fill='white')
+    
+    def load_alerts_log(self):
+        """
+        Load the alerts log by streaming it from the alert store.
+        
+        A legacy alerts_log.json is imported into the store the first time
+        an empty store is opened next to it. Alerts are not kept in memory:
+        alerts_log reads them from the store on demand.
+        """
+        legacy_path = os.path.join(self.output_dir, 'alerts_log.json')
+        if self.store.count() == 0 and os.path.exists(legacy_path):
+            with open(legacy_path, 'r') as f:
+                for alert in json.load(f):
+                    self.store.append(alert)
+                    
+        self.alert_count = self.store.count()
+        
+        # Aggregates are built once here and kept up to date by every new alert
+        self.aggregates = AlertAggregates(bucket_sizes=self.aggregates.bucket_sizes)
+        for alert in self.store.iter_alerts():
+            self.aggregates.add(alert)
+                
+    def add_alerts(self, alerts):
+        """
+        Append alerts generated by another alert system (e.g. in a worker process) to this log.
+        
+        Args:
+            alerts: List of alert dictionaries as stored by generate_alert()
+        """
+        for alert_data in alerts:
+            self._record(alert_data)
+            
+    def get_recent_alerts(self, count=10):
+        """Get the most recent alerts, newest first."""
+        # The aggregates keep the newest alerts; only longer lists are read from the store
+        if count <= self.aggregates.recent_size:
+            return self.aggregates.get_recent(count)
+        return self.store.recent(count)
+    
+    def get_alerts_by_type(self, alert_type):
+        """Get alerts of a specific type."""
+        return self.store.by_type(alert_type)
+    
+    def get_alerts_by_section(self, section):
+        """Get alerts raised in a specific stadium section."""
+        return self.store.by_section(section)
+    
+    def get_alerts_in_range(self, start_time=None, end_time=None):
+        """Get alerts with a timestamp between start_time and end_time (inclusive)."""
+        return self.store.time_range(start_time, end_time)
+    
+    def get_alert_by_id(self, alert_id):
+        """Get an alert by its ID."""
+        return self.store.get(alert_id)
+    
+    def close(self):
+        """Write the shared image of the current frame and close the alert store."""
+        self.finish_frame()
+        self.store.close()
+    
+    def generate_alert_report(self, output_path=None):
+        """
+        Generate a summary report of all alerts.
+        
+        Args:
+            output_path: Path to save the report (optional)
+            
+        Returns:
+            Report text
+        """
+        summary = self.aggregates.summary()
+        if not summary['total']:
+            report = "No alerts have been generated."
+            return report
+            
+        # Generate report from the running counts
+        report = "STADIUM SECURITY ALERT REPORT\n"
+        report += "=" * 30 + "\n\n"
+        report += f"Total Alerts: {summary['total']}\n"
+        report += "Alert Types:\n"
+        
+        for alert_type, count in summary['by_type'].items():
+            report += f"  - {alert_type}: {count}\n"
+            
+        if summary['by_section']:
+            report += "\nAlerts by Section:\n"
+            for section, count in sorted(summary['by_section'].items(), key=lambda item: -item[1]):
+                report += f"  - {section}: {count}\n"
+                
+        if summary['by_team']:
+            report += "\nAlerts by Team:\n"
+            for team, count in sorted(summary['by_team'].items(), key=lambda item: -item[1]):
+                report += f"  - {team}: {count}\n"
+                
+        report += "\nMost Recent Alerts:\n"
+        recent_alerts = self.get_recent_alerts(5)
+        
+        for i, alert in enumerate(recent_alerts):
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(alert['timestamp']))
+            report += f"{i+1}. [{timestamp}] {alert['alert_type'].upper()}"
+            if alert['location']:
+                report += f" at {alert['location']}"
+            report += "\n"
+            
+        # Save report if output path is provided
+        if output_path:
+            with open(output_path, 'w') as f:
+                f.write(report)
+                
+        return report
+    
+    def visualize_alert_distribution(self, output_path=None):
+        """
+        Visualize the distribution of alerts by type.
+        
+        Args:
+            output_path: Path to save the visualization (optional)
+            
+        Returns:
+            Matplotlib figure
+        """
+        # Read the running counts by type
+        alert_types = self.aggregates.summary()['by_type']
+        if not alert_types:
+            print("No alerts to visualize.")
+            return None
+            
+        # Import matplotlib only when a chart is requested; it is slow to import
+        import matplotlib.pyplot as plt
+        
+        # Create visualization
+        fig, ax = plt.subplots(figsize=(10, 6))
+        
+        types = list(alert_types.keys())
+        counts = list(alert_types.values())
+        
+        # Bar chart
+        bars = ax.bar(types, counts, color=['red' if t in ['fighting', 'throwing'] else 'orange' for t in types])
+        
+        # Add labels and title
+        ax.set_xlabel('Alert Type')
+        ax.set_ylabel('Count')
+        ax.set_title('Distribution of Security Alerts by Type')
+        
+        # Add count labels on top of bars
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                   f'{int(height)}', ha='center', va='bottom')
+            
+        plt.tight_layout()
+        
+        # Save figure if output path is provided
+        if output_path:
+            plt.savefig(output_path)
+            
+        return fig
+    
+    def visualize_section_timeline(self, output_path=None, bucket_seconds=60):
+        """
+        Visualize the number of alerts per stadium section over time.
+        
+        Args:
+            output_path: Path to save the visualization (optional)
+            bucket_seconds: Length of the time buckets in seconds (one of bucket_sizes)
+            
+        Returns:
+            Matplotlib figure
+        """
+        # Read the per-section counts of every time bucket
+        bucket_starts, series = self.aggregates.timeline(bucket_seconds, group='sections')
+        if not series:
+            print("No section alerts to visualize.")
+            return None
+            
+        # Import matplotlib only when a chart is requested; it is slow to import
+        import matplotlib.pyplot as plt
+        from datetime import datetime
+        
+        # Create visualization
+        fig, ax = plt.subplots(figsize=(12, 6))
+        times = [datetime.fromtimestamp(start) for start in bucket_starts]
+        
+        # One line per section
+        for section, counts in series.items():
+            ax.plot(times, counts, marker='o', markersize=3, label=str(section))
+            
+        # Add labels and title
+        ax.set_xlabel('Time')
+        ax.set_ylabel(f'Alerts per {bucket_seconds}s')
+        ax.set_title('Security Alerts per Section over Time')
+        ax.legend(title='Section')
+        fig.autofmt_xdate()
+        
+        plt.tight_layout()
+        
+        # Save figure if output path is provided
+        if output_path:
+            plt.savefig(output_path)
+            
+        return fig
@@ -0,0 +1,162 @@
+"""
+Asynchronous artifact writer for the stadium monitoring system.
+This module moves image, GIF and video encoding off the inference loop onto a small
+pool of background threads with a bounded priority queue.
+"""
+
+import atexit
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+import cv2
+
+from src.metrics import MetricsRegistry
+
+# Lower values are written first
+PRIORITY_ALERT = 0
+PRIORITY_CROP = 1
+PRIORITY_FRAME = 2
+PRIORITY_SEQUENCE = 3
+PRIORITY_GRID = 4
+PRIORITY_ANIMATION = 5
+
+class ArtifactWriter:
+    """Background writer for alert images, crops, sequences, GIFs and MP4s."""
+
+    def __init__(self, num_workers=2, max_pending=64, metrics=None):
+        """
+        Initialize the artifact writer.
+
+        Args:
+            num_workers: Number of background writer threads
+            max_pending: Maximum queued jobs; submit() blocks when the queue is full
+            metrics: MetricsRegistry timing image writes and counting bytes written (optional)
+        """
+        self.num_workers = num_workers
+        self.max_pending = max_pending
+        self.metrics = metrics if metrics is not None else MetricsRegistry(enabled=False)
+        self.jobs = queue.PriorityQueue(maxsize=max_pending)
+        self.pending_images = {}
+        self.jobs_written = 0
+        self.jobs_failed = 0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Start worker threads
+        self._workers = []
+        for i in range(num_workers):
+            worker = threading.Thread(target=self._run, name=f"artifact-writer-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        # Make sure queued artifacts land on disk when the process exits
+        atexit.register(self.shutdown)
+
+    def submit(self, priority, fn, *args, **kwargs):
+        """
+        Queue a write job.
+
+        Blocks while the queue is full, which applies backpressure to the producer
+        instead of letting pending frames grow without bound.
+
+        Args:
+            priority: Job priority (one of the PRIORITY_* constants)
+            fn: Callable performing the write
+            *args, **kwargs: Arguments passed to fn
+
+        Returns:
+            Future resolving to the return value of fn
+        """
+        if self._closed:
+            raise RuntimeError("Artifact writer has been shut down")
+
+        future = Future()
+        with self.metrics.timer('artifact_queue_wait'):
+            self.jobs.put((priority, next(self._sequence), future, fn, args, kwargs))
+        return future
+
+    def write_image(self, path, image, priority=PRIORITY_CROP):
+        """
+        Queue an image array to be written with cv2.imwrite.
+
+        Until the write completes the buffer is available through read_image(),
+        so later artifacts built from it (GIFs, grids) do not have to wait for
+        or re-read the file.
+
+        Args:
+            path: Output path
+            image: BGR image array (not modified after submission)
+            priority: Job priority
+
+        Returns:
+            Future resolving to the output path
+        """
+        with self._lock:
+            self.pending_images[path] = image
+
+        future = self.submit(priority, self._write_image, path, image)
+        return future
+
+    def read_image(self, path):
+        """
+        Read an image, preferring a buffer that is still queued for writing.
+
+        Args:
+            path: Image path
+
+        Returns:
+            BGR image array, or None if it cannot be loaded
+        """
+        with self._lock:
+            image = self.pending_images.get(path)
+        if image is not None:
+            return image
+        return cv2.imread(path)
+
+    def flush(self):
+        """Block until every queued job has been written."""
+        self.jobs.join()
+
+    def shutdown(self):
+        """Flush pending jobs and stop the worker threads."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        for _ in self._workers:
+            self.jobs.put((float('inf'), next(self._sequence), None, None, (), {}))
+        for worker in self._workers:
+            worker.join()
+
+    def _write_image(self, path, image):
+        """Write an image and release its pending buffer."""
+        try:
+            with self.metrics.timer('image_write'):
+                cv2.imwrite(path, image)
+            self.metrics.add_file_bytes(path, 'image')
+        finally:
+            with self._lock:
+                if self.pending_images.get(path) is image:
+                    del self.pending_images[path]
+        return path
+
+    def _run(self):
+        """Worker loop."""
+        while True:
+            priority, _, future, fn, args, kwargs = self.jobs.get()
+            try:
+                if fn is None:
+                    return
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                    self.jobs_written += 1
+                except Exception as e:
+                    self.jobs_failed += 1
+                    print(f"Error writing artifact: {e}")
+                    future.set_exception(e)
+            finally:
+                self.jobs.task_done()
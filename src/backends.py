@@ -0,0 +1,340 @@
+"""
+Inference backends for the stadium crowd detection models.
+This module runs the detector and crop classifiers through Keras, a compiled
+tf.function, TensorFlow Lite or ONNX Runtime behind one predict() interface,
+and records the throughput of each backend.
+"""
+
+import os
+import json
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+
+from src.model_cache import ModelCache
+
+BACKENDS = ('keras', 'tf-function', 'tflite', 'onnxruntime')
+
+def batch_buckets(max_size):
+    """
+    Batch sizes for variable-sized batches of up to max_size inputs.
+
+    Args:
+        max_size: Largest batch size
+
+    Returns:
+        The powers of two below max_size and max_size itself, e.g. (1, 2, 4, 8) for 8
+    """
+    sizes = []
+    size = 1
+    while size < max_size:
+        sizes.append(size)
+        size *= 2
+    sizes.append(max_size)
+    return tuple(sizes)
+
+class InferenceBackend(ABC):
+    """Base class for inference backends."""
+
+    name = None
+
+    def __init__(self):
+        self.calls = 0
+        self.images = 0
+        self.seconds = 0.0
+        self.batch_sizes = ()
+
+    def set_batch_sizes(self, batch_sizes):
+        """
+        Run batches at fixed sizes only, so each size is traced and allocated once.
+
+        A batch is zero-padded up to the smallest of the sizes that holds it. A batch
+        larger than all of them runs unpadded at its own size in one call, so it is
+        never split into smaller forward passes.
+
+        Args:
+            batch_sizes: Batch sizes the model is run at; empty to run batches as they come
+        """
+        self.batch_sizes = tuple(sorted(set(batch_sizes)))
+
+    def predict(self, batch):
+        """
+        Run the model on a batch.
+
+        Args:
+            batch: Float32 array or tensor of shape (batch, height, width, channels)
+
+        Returns:
+            List of output arrays in the order of the Keras model outputs
+        """
+        batch = np.asarray(batch, dtype=np.float32)
+        start = time.perf_counter()
+        if self.batch_sizes and len(batch):
+            outputs = self._run_padded(batch)
+        else:
+            outputs = self._run(batch)
+        self.seconds += time.perf_counter() - start
+        self.calls += 1
+        self.images += len(batch)
+        return outputs
+
+    @abstractmethod
+    def _run(self, batch):
+        """Run the model on a float32 batch and return its outputs in the Keras output order."""
+
+    def _run_padded(self, batch):
+        """Run a batch padded to the smallest configured batch size that holds it."""
+        count = len(batch)
+        size = next((size for size in self.batch_sizes if size >= count), count)
+        if size > count:
+            padding = np.zeros((size - count,) + batch.shape[1:], dtype=np.float32)
+            batch = np.concatenate([batch, padding])
+        return [np.asarray(output)[:count] for output in self._run(batch)]
+
+    def warm_up(self, input_shape, batch_size=None):
+        """
+        Run a zero batch so graph building and allocation happen before the
+        first real frame, then clear the statistics.
+
+        Args:
+            input_shape: Model input shape (height, width, channels)
+            batch_size: Batch size of the warm-up call; None to run once at every
+                        configured batch size (or at batch size 1 without them)
+        """
+        batch_sizes = [batch_size] if batch_size else self.batch_sizes or (1,)
+        for size in batch_sizes:
+            self.predict(np.zeros((size,) + tuple(input_shape), dtype=np.float32))
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Clear the throughput statistics."""
+        self.calls = 0
+        self.images = 0
+        self.seconds = 0.0
+
+    def throughput(self):
+        """
+        Throughput of the backend so far.
+
+        Returns:
+            Dictionary with call and image counts, images per second and mean call latency
+        """
+        return {
+            'backend': self.name,
+            'calls': self.calls,
+            'images': self.images,
+            'images_per_second': self.images / self.seconds if self.seconds > 0 else 0.0,
+            'mean_latency_ms': self.seconds / self.calls * 1000 if self.calls else 0.0
+        }
+
+class KerasBackend(InferenceBackend):
+    """Keras model.predict(), the reference backend."""
+
+    name = 'keras'
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def _run(self, batch):
+        outputs = self.model.predict(batch, verbose=0)
+        return outputs if isinstance(outputs, (list, tuple)) else [outputs]
+
+class TFFunctionBackend(InferenceBackend):
+    """Direct call of a traced model function, without predict() overhead."""
+
+    name = 'tf-function'
+
+    def __init__(self, model=None, saved_model=None):
+        """
+        Initialize the backend.
+
+        Args:
+            model: Keras model to wrap in a tf.function
+            saved_model: Restored SavedModel with a traced serve() function, e.g. from the model cache
+        """
+        super().__init__()
+        import tensorflow as tf
+
+        self.model = model
+        self.saved_model = saved_model
+        if saved_model is not None:
+            self._function = saved_model.serve
+        else:
+            self._function = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+
+    def _run(self, batch):
+        import tensorflow as tf
+
+        outputs = self._function(tf.convert_to_tensor(batch))
+        if not isinstance(outputs, (list, tuple)):
+            outputs = [outputs]
+        return [output.numpy() for output in outputs]
+
+class TFLiteBackend(InferenceBackend):
+    """TensorFlow Lite interpreter, used for the float16 and int8 exports."""
+
+    name = 'tflite'
+
+    def __init__(self, model_path, num_threads=None):
+        """
+        Initialize the interpreter.
+
+        Args:
+            model_path: Path to the .tflite file
+            num_threads: Number of CPU threads for the interpreter (optional)
+        """
+        super().__init__()
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.model_path = model_path
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.runner = self.interpreter.get_signature_runner()
+        signature = self.interpreter.get_signature_list()['serving_default']
+        self.input_name = signature['inputs'][0]
+        self.output_names = _order_outputs(signature['outputs'], load_export_metadata(model_path))
+
+        # Quantization parameters for models exported with integer inputs
+        input_details = self.runner.get_input_details()[self.input_name]
+        self.input_dtype = input_details['dtype']
+        self.input_quantization = input_details['quantization']
+
+    def _run(self, batch):
+        if self.input_dtype in (np.int8, np.uint8):
+            scale, zero_point = self.input_quantization
+            batch = np.round(batch / scale + zero_point)
+            info = np.iinfo(self.input_dtype)
+            batch = np.clip(batch, info.min, info.max).astype(self.input_dtype)
+
+        outputs = self.runner(**{self.input_name: batch})
+        output_details = self.runner.get_output_details()
+
+        results = []
+        for name in self.output_names:
+            output = outputs[name]
+            if output.dtype in (np.int8, np.uint8):
+                scale, zero_point = output_details[name]['quantization']
+                output = (output.astype(np.float32) - zero_point) * scale
+            results.append(output)
+        return results
+
+class ONNXBackend(InferenceBackend):
+    """ONNX Runtime CPU session."""
+
+    name = 'onnxruntime'
+
+    def __init__(self, model_path, num_threads=None):
+        """
+        Initialize the session.
+
+        Args:
+            model_path: Path to the .onnx file
+            num_threads: Number of intra-op threads (optional)
+        """
+        super().__init__()
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("The onnxruntime backend requires the onnxruntime package (pip install onnxruntime)")
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def _run(self, batch):
+        return self.session.run(None, {self.input_name: batch})
+
+def _order_outputs(signature_outputs, metadata):
+    """Order TFLite signature outputs like the outputs of the Keras model."""
+    output_names = metadata.get('output_names', [])
+    if output_names and all(name in signature_outputs for name in output_names):
+        return output_names
+
+    # Converted Keras 3 models name their outputs output_0, output_1, ...
+    def index(name):
+        suffix = name.rsplit('_', 1)[-1]
+        return int(suffix) if suffix.isdigit() else 0
+    return sorted(signature_outputs, key=index)
+
+def export_metadata_path(model_path):
+    """Path of the metadata file written next to an exported model."""
+    return os.path.splitext(model_path)[0] + '.json'
+
+def load_export_metadata(model_path):
+    """Load the metadata written next to an exported model, if any."""
+    path = export_metadata_path(model_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def resolve_model_path(model_path, backend, precision='int8'):
+    """
+    Find the model file a backend should load for a model.
+
+    Keras-based backends load the .h5 file itself. The TFLite and ONNX backends
+    load the file written by export_models.py next to it (model.int8.tflite,
+    model.fp16.tflite or model.onnx), unless model_path already points to one.
+
+    Args:
+        model_path: Path to the .h5 model (or to an exported model)
+        backend: Backend name
+        precision: TFLite precision to load ('int8' or 'fp16')
+
+    Returns:
+        Path to the model file
+    """
+    if backend in ('keras', 'tf-function'):
+        return model_path
+
+    extension = '.tflite' if backend == 'tflite' else '.onnx'
+    if model_path.endswith(extension):
+        return model_path
+
+    stem = os.path.splitext(model_path)[0]
+    if backend == 'tflite':
+        return f"{stem}.{precision}.tflite"
+    return f"{stem}.onnx"
+
+def uses_keras_model(backend, cache_dir=None):
+    """Whether a backend needs the Keras model loaded from the .h5 file."""
+    return backend == 'keras' or (backend == 'tf-function' and not cache_dir)
+
+def create_backend(backend, model_path=None, keras_model=None, precision='int8', num_threads=None, cache_dir=None):
+    """
+    Create an inference backend.
+
+    Args:
+        backend: 'keras', 'tf-function', 'tflite' or 'onnxruntime'
+        model_path: Path to the .h5 model (or to an exported model)
+        keras_model: Loaded Keras model (required for 'keras', and for 'tf-function' without a cache)
+        precision: TFLite precision to load ('int8' or 'fp16')
+        num_threads: Number of CPU threads for TFLite/ONNX Runtime (optional)
+        cache_dir: Model cache directory; 'tf-function' then loads a precompiled SavedModel (optional)
+
+    Returns:
+        InferenceBackend instance
+    """
+    if backend == 'keras':
+        return KerasBackend(keras_model)
+    elif backend == 'tf-function':
+        if cache_dir:
+            return TFFunctionBackend(saved_model=ModelCache(cache_dir).load(model_path))
+        return TFFunctionBackend(keras_model)
+
+    path = resolve_model_path(model_path, backend, precision)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Exported model not found: {path}. Run export_models.py first.")
+
+    if backend == 'tflite':
+        return TFLiteBackend(path, num_threads=num_threads)
+    elif backend == 'onnxruntime':
+        return ONNXBackend(path, num_threads=num_threads)
+    raise ValueError(f"Unknown inference backend: {backend}. Choose from {', '.join(BACKENDS)}")
@@ -0,0 +1,223 @@
+"""
+Batch image processing for the stadium monitoring system.
+This module runs a directory or glob of still images through the system in one process:
+a thread pool reads, hashes and decodes images ahead of inference, misses of the
+persistent result cache are inferred in batches, and unchanged images are skipped.
+"""
+
+import os
+import glob
+import time
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+from src.result_cache import ResultCache, result_fingerprint
+
+# File extensions picked up from image directories
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+
+def expand_image_inputs(inputs):
+    """
+    Expand directories and glob patterns into a sorted list of image files.
+
+    Args:
+        inputs: Directory, glob pattern or image path, or a list of them
+
+    Returns:
+        Sorted list of unique image paths
+    """
+    if isinstance(inputs, str):
+        inputs = [inputs]
+
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, '**', '*'), recursive=True)
+        else:
+            candidates = glob.glob(item, recursive=True)
+        paths.update(
+            path for path in candidates
+            if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)
+        )
+    return sorted(paths)
+
+class BatchImageProcessor:
+    """Processes many still images with prefetched decoding, batched inference and a result cache."""
+
+    def __init__(self, system, batch_size=8, num_workers=4, prefetch=None, cache_path='result_cache/results.db'):
+        """
+        Initialize the batch processor.
+
+        Args:
+            system: Initialized StadiumMonitoringSystem
+            batch_size: Images per detector call
+            num_workers: Threads reading, hashing and decoding images
+            prefetch: Images read ahead of inference (default: four batches)
+            cache_path: SQLite file of the persistent result cache, or None to disable it
+        """
+        self.system = system
+        self.batch_size = max(1, batch_size)
+        self.num_workers = max(1, num_workers)
+        self.prefetch = prefetch or 4 * self.batch_size
+        self.cache_path = cache_path
+        self.stats = {}
+
+        # Full batches run at the batch size and the last, smaller one is padded to it
+        if system.detector:
+            backend = system.detector.model.backend
+            if self.batch_size not in backend.batch_sizes:
+                backend.set_batch_sizes(backend.batch_sizes + (self.batch_size,))
+                if system.config['warm_up']:
+                    backend.warm_up(system.config['input_shape'], batch_size=self.batch_size)
+
+    def process_images(self, inputs, output_dir=None, generate_alerts=True):
+        """
+        Process every image of a directory or glob pattern.
+
+        Images whose content, models and result-relevant configuration match a
+        previous run are answered from the cache without being decoded; their
+        alerts were recorded in the alert log by that run and are not raised again.
+
+        Args:
+            inputs: Directory, glob pattern or image path, or a list of them
+            output_dir: Directory to save annotated images (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+
+        Returns:
+            Dictionary mapping each image path to its result: 'detections', 'alerts'
+            and 'cached' (True if it came from the cache), or None if it could not be read
+        """
+        if not self.system.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+
+        if not self.system.detector:
+            raise RuntimeError("Detector not available. Cannot process images.")
+
+        paths = expand_image_inputs(inputs)
+        if not paths:
+            raise FileNotFoundError(f"No images found for: {inputs}")
+
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        # Open the result cache under the fingerprint of the loaded models and configuration
+        cache = None
+        if self.cache_path:
+            fingerprint = result_fingerprint(self.system.model_paths, self.system.config, generate_alerts)
+            cache = ResultCache(self.cache_path, fingerprint)
+
+        start_time = time.time()
+        results = {}
+        self.stats = {'images': len(paths), 'cached': 0, 'inferred': 0, 'failed': 0, 'batches': 0}
+        print(f"Processing {len(paths)} images in batches of {self.batch_size}")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix='image-loader') as pool:
+                # Keep a bounded window of images loading ahead of inference, in input order
+                pending = deque()
+                next_path = iter(paths)
+                batch = []
+                while True:
+                    while len(pending) < self.prefetch:
+                        path = next(next_path, None)
+                        if path is None:
+                            break
+                        output_path = self._output_path(path, output_dir)
+                        pending.append(pool.submit(self._load, path, output_path, cache))
+
+                    if not pending:
+                        break
+
+                    item = pending.popleft().result()
+                    if item['error']:
+                        print(f"Warning: could not read {item['path']}: {item['error']}")
+                        results[item['path']] = None
+                        self.stats['failed'] += 1
+                    elif item['result'] is not None:
+                        results[item['path']] = self._use_cached(item)
+                    else:
+                        batch.append(item)
+
+                    # Infer a full batch, or what is left once nothing more is loading
+                    if len(batch) >= self.batch_size or (batch and not pending):
+                        results.update(self._process_batch(batch, cache, generate_alerts))
+                        batch = []
+        finally:
+            if cache is not None:
+                cache.close()
+
+        elapsed = time.time() - start_time
+        self.stats['seconds'] = elapsed
+        print(f"Processed {len(paths)} images in {elapsed:.1f}s ({len(paths) / max(elapsed, 1e-6):.1f} images/s): "
+              f"{self.stats['inferred']} inferred in {self.stats['batches']} batches, "
+              f"{self.stats['cached']} from cache, {self.stats['failed']} failed")
+
+        return {path: results.get(path) for path in paths}
+
+    def _output_path(self, path, output_dir):
+        """Path of the annotated copy of an image, or None without an output directory."""
+        if not output_dir:
+            return None
+        return os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + '_annotated.jpg')
+
+    def _load(self, path, output_path, cache):
+        """
+        Read and hash an image, and decode it unless its result is cached.
+
+        Runs on the loader threads; OpenCV releases the GIL while decoding and resizing.
+        """
+        item = {'path': path, 'output_path': output_path, 'hash': None, 'result': None, 'frame': None, 'error': None}
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            item['hash'] = hashlib.sha256(data).hexdigest()
+
+            # A cached result needs no decoding unless its annotated image is missing
+            if cache is not None:
+                item['result'] = cache.get(item['hash'])
+                if item['result'] is not None and (output_path is None or os.path.exists(output_path)):
+                    return item
+
+            frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                item['error'] = 'not a decodable image'
+                return item
+
+            # Resize to the model input here, so batches stack without further work
+            height, width = self.system.config['input_shape'][:2]
+            item['frame'] = cv2.resize(frame, (width, height))
+        except OSError as e:
+            item['error'] = str(e)
+        return item
+
+    def _use_cached(self, item):
+        """Return a cached result, drawing its annotated image if that is missing."""
+        self.stats['cached'] += 1
+        result = item['result']
+        if item['frame'] is not None and item['output_path']:
+            self.system._draw_detections(item['frame'], result['detections'])
+            cv2.imwrite(item['output_path'], item['frame'])
+        return dict(result, cached=True)
+
+    def _process_batch(self, batch, cache, generate_alerts):
+        """Run the detector once over a batch, then refine, alert, annotate and cache each image."""
+        self.stats['batches'] += 1
+        detections_list = self.system.detector.detect_batch([item['frame'] for item in batch])
+
+        results = {}
+        for item, detections in zip(batch, detections_list):
+            detections, alerts = self.system.process_detections(
+                item['frame'],
+                detections,
+                output_path=item['output_path'],
+                generate_alerts=generate_alerts
+            )
+            result = {'detections': detections, 'alerts': alerts}
+            if cache is not None:
+                cache.put(item['hash'], result)
+            results[item['path']] = dict(result, cached=False)
+            self.stats['inferred'] += 1
+        return results
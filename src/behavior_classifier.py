@@ -0,0 +1,262 @@
+"""
+Behavior classification module for stadium crowd detection system.
+This module focuses on classifying fan behaviors (sitting, cheering, fighting, throwing).
+"""
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, models, applications
+
+from src.backends import create_backend, uses_keras_model
+from src.crop_cache import load_crop_cache
+from src.training import precision_policy
+
+class BehaviorClassifier:
+    """Specialized classifier for fan behaviors in stadium images."""
+    
+    def __init__(self, input_shape=(128, 128, 3), num_actions=4):
+        """
+        Initialize the behavior classifier.
+        
+        Args:
+            input_shape: Input image shape for cropped fan images (height, width, channels)
+            num_actions: Number of action classes (sitting, cheering, fighting, throwing)
+        """
+        self.input_shape = input_shape
+        self.num_actions = num_actions
+        self.model = None
+        self.backend = None
+        self.action_mapping = {0: 'sitting', 1: 'cheering', 2: 'fighting', 3: 'throwing'}
+        self.action_mapping_inv = {'sitting': 0, 'cheering': 1, 'fighting': 2, 'throwing': 3}
+        
+    def build_model(self, jit_compile=False, steps_per_execution=1, mixed_precision=False):
+        """
+        Build the behavior classification model.
+        
+        Args:
+            jit_compile: Compile the training step with XLA
+            steps_per_execution: Training steps run per call of the compiled step function
+            mixed_precision: Compute in bfloat16 with float32 weights (outputs stay float32);
+                             only faster on CPUs with native bfloat16 support
+        """
+        with precision_policy(mixed_precision):
+            # Use a lightweight model for faster inference
+            base_model = applications.MobileNetV2(
+                input_shape=self.input_shape,
+                include_top=False,
+                weights='imagenet'
+            )
+            
+            # Freeze early layers
+            for layer in base_model.layers[:100]:
+                layer.trainable = False
+                
+            # Create the classification model
+            inputs = layers.Input(shape=self.input_shape)
+            x = base_model(inputs)
+            x = layers.GlobalAveragePooling2D()(x)
+            x = layers.Dropout(0.2)(x)
+            x = layers.Dense(128, activation='relu')(x)
+            x = layers.Dropout(0.2)(x)
+            outputs = layers.Dense(self.num_actions, activation='softmax', dtype='float32', name='action_output')(x)
+            
+            self.model = models.Model(inputs=inputs, outputs=outputs)
+        
+        # Compile the model
+        self.model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=0.0001),
+            loss='sparse_categorical_crossentropy',
+            metrics=['accuracy'],
+            jit_compile=jit_compile,
+            steps_per_execution=steps_per_execution
+        )
+        
+        return self.model
+    
+    def prepare_dataset(self, dataset_dir, batch_size=32, train_ratio=0.8, cache_dir=None, num_workers=4):
+        """
+        Prepare dataset for behavior classification training.
+        
+        Fan crops come from the shared crop cache (see src/crop_cache.py), which
+        is built once per dataset and crop shape and reused by both crop
+        classifiers. Batches are streamed from the memory-mapped cache.
+        
+        Args:
+            dataset_dir: Directory containing the dataset
+            batch_size: Batch size for training
+            train_ratio: Ratio of images to use for training
+            cache_dir: Crop cache directory (default: <dataset_dir>/crops_<height>x<width>)
+            num_workers: Number of worker threads used to build the crop cache
+            
+        Returns:
+            train_dataset, val_dataset: TensorFlow datasets for training and validation
+        """
+        cache = load_crop_cache(dataset_dir, self.input_shape, cache_dir=cache_dir, num_workers=num_workers)
+        return cache.training_datasets('actions', batch_size=batch_size, train_ratio=train_ratio)
+    
+    def train(self, train_dataset, val_dataset, epochs=20, callbacks=None):
+        """
+        Train the behavior classification model.
+        
+        Args:
+            train_dataset: TensorFlow dataset for training
+            val_dataset: TensorFlow dataset for validation
+            epochs: Number of training epochs
+            callbacks: List of Keras callbacks
+            
+        Returns:
+            Training history
+        """
+        if self.model is None:
+            self.build_model()
+            
+        # Default callbacks if none provided
+        if callbacks is None:
+            callbacks = [
+                tf.keras.callbacks.ModelCheckpoint(
+                    filepath='../models/behavior_classifier.h5',
+                    save_best_only=True,
+                    monitor='val_accuracy'
+                ),
+                tf.keras.callbacks.EarlyStopping(
+                    patience=5,
+                    monitor='val_accuracy'
+                ),
+                tf.keras.callbacks.ReduceLROnPlateau(
+                    factor=0.2,
+                    patience=3,
+                    monitor='val_accuracy'
+                )
+            ]
+            
+        history = self.model.fit(
+            train_dataset,
+            validation_data=val_dataset,
+            epochs=epochs,
+            callbacks=callbacks
+        )
+        
+        return history
+    
+    def predict(self, image):
+        """
+        Predict the action for a fan image.
+        
+        Args:
+            image: Input image tensor (cropped fan)
+            
+        Returns:
+            Predicted action and confidence score
+        """
+        if self.model is None and self.backend is None:
+            raise ValueError("Model has not been built or loaded yet")
+            
+        # Ensure image has batch dimension
+        if len(image.shape) == 3:
+            image = tf.expand_dims(image, axis=0)
+            
+        # Make prediction
+        if self.backend is not None:
+            predictions = self.backend.predict(image)[0]
+        else:
+            predictions = self.model.predict(image)
+        action_id = np.argmax(predictions[0])
+        confidence = float(predictions[0][action_id])
+        
+        return self.action_mapping[action_id], confidence
+    
+    def predict_batch(self, images, batch_size=64):
+        """
+        Predict the action for a batch of fan images with a single predict call.
+        
+        Args:
+            images: Batch tensor of cropped fans (num_crops, height, width, channels)
+            batch_size: Maximum number of crops per forward pass
+            
+        Returns:
+            List of (predicted action, confidence score) tuples, one per crop
+        """
+        if self.model is None and self.backend is None:
+            raise ValueError("Model has not been built or loaded yet")
+            
+        if len(images) == 0:
+            return []
+            
+        # Make prediction for all crops at once
+        if self.backend is not None:
+            images = np.asarray(images, dtype=np.float32)
+            predictions = np.concatenate([
+                self.backend.predict(images[i:i + batch_size])[0]
+                for i in range(0, len(images), batch_size)
+            ])
+        else:
+            predictions = self.model.predict(images, batch_size=batch_size)
+        action_ids = np.argmax(predictions, axis=1)
+        confidences = predictions[np.arange(len(action_ids)), action_ids]
+        
+        return [(self.action_mapping[int(action_id)], float(confidence))
+                for action_id, confidence in zip(action_ids, confidences)]
+    
+    def save_model(self, filepath):
+        """Save the model to disk."""
+        if self.model is None:
+            raise ValueError("Model has not been built or loaded yet")
+            
+        self.model.save(filepath)
+        print(f"Behavior classifier saved to {filepath}")
+        
+    def load_model(self, filepath, compile=True):
+        """Load a saved model from disk (compile=False skips restoring the training setup)."""
+        self.model = models.load_model(filepath, compile=compile)
+        print(f"Behavior classifier loaded from {filepath}")
+        
+        return self.model
+    
+    def load_backend(self, filepath, backend='keras', precision='int8', num_threads=None, cache_dir=None):
+        """
+        Load the model for inference through an inference backend.
+        
+        Args:
+            filepath: Path to the .h5 model (exported TFLite/ONNX models are found next to it)
+            backend: 'keras', 'tf-function', 'tflite' or 'onnxruntime'
+            precision: TFLite precision to load ('int8' or 'fp16')
+            num_threads: CPU threads for the TFLite and ONNX Runtime backends (optional)
+            cache_dir: Precompiled model cache used by the tf-function backend (optional)
+            
+        Returns:
+            InferenceBackend instance
+        """
+        if uses_keras_model(backend, cache_dir):
+            # Inference only: skip deserializing the optimizer, losses and metrics
+            self.load_model(filepath, compile=False)
+            
+        self.backend = create_backend(backend, filepath, keras_model=self.model, precision=precision,
+                                      num_threads=num_threads, cache_dir=cache_dir)
+        print(f"Behavior classifier using the {backend} inference backend")
+        
+        return self.backend
+    
+    def evaluate_problematic_behavior(self, action, confidence):
+        """
+        Evaluate if an action is problematic.
+        
+        Args:
+            action: Predicted action
+            confidence: Confidence score
+            
+        Returns:
+            is_problematic: Boolean indicating if the action is problematic
+            severity: Severity score (0-1) for the problematic behavior
+        """
+        # Define problematic actions
+        problematic_actions = ['fighting', 'throwing']
+        
+        is_problematic = action in problematic_actions
+        severity = 0.0
+        
+        if is_problematic:
+            # Calculate severity based on action type and confidence
+            base_severity = 0.7 if action == 'fighting' else 0.6  # Fighting is more severe than throwing
+            severity = base_severity * confidence
+            
+        return is_problematic, severity
@@ -0,0 +1,115 @@
+"""
+Bounding box utilities for stadium crowd detection system.
+This module provides vectorized IoU and (batched) non-maximum suppression on [x1, y1, x2, y2] boxes.
+"""
+
+import numpy as np
+
+def box_iou(boxes_a, boxes_b):
+    """
+    Compute the pairwise IoU between two sets of boxes.
+
+    Args:
+        boxes_a: Array of shape (N, 4) with [x1, y1, x2, y2] boxes
+        boxes_b: Array of shape (M, 4) with [x1, y1, x2, y2] boxes
+
+    Returns:
+        Array of shape (N, M) with IoU values
+    """
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    return _pairwise_iou(boxes_a, boxes_b)
+
+def _pairwise_iou(boxes_a, boxes_b):
+    """IoU between (..., N, 4) and (..., M, 4) box arrays, broadcast over leading dimensions."""
+    # Intersection corners via broadcasting
+    x1 = np.maximum(boxes_a[..., :, None, 0], boxes_b[..., None, :, 0])
+    y1 = np.maximum(boxes_a[..., :, None, 1], boxes_b[..., None, :, 1])
+    x2 = np.minimum(boxes_a[..., :, None, 2], boxes_b[..., None, :, 2])
+    y2 = np.minimum(boxes_a[..., :, None, 3], boxes_b[..., None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = np.clip(boxes_a[..., 2] - boxes_a[..., 0], 0, None) * np.clip(boxes_a[..., 3] - boxes_a[..., 1], 0, None)
+    area_b = np.clip(boxes_b[..., 2] - boxes_b[..., 0], 0, None) * np.clip(boxes_b[..., 3] - boxes_b[..., 1], 0, None)
+    union = area_a[..., :, None] + area_b[..., None, :] - intersection
+
+    return np.where(union > 0, intersection / np.maximum(union, 1e-9), 0.0)
+
+def non_max_suppression(boxes, scores, iou_threshold=0.5, max_detections=None):
+    """
+    Greedy non-maximum suppression over a set of boxes.
+
+    The IoU matrix is computed once, so each suppression step is a single
+    vectorized row lookup instead of a Python loop over the remaining boxes.
+
+    Args:
+        boxes: Array of shape (N, 4) with [x1, y1, x2, y2] boxes
+        scores: Array of shape (N,) with confidence scores
+        iou_threshold: Boxes overlapping a kept box by more than this are suppressed
+        max_detections: Maximum number of boxes to keep (optional)
+
+    Returns:
+        Array of kept indices, ordered by decreasing score
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+    if len(boxes) == 0:
+        return np.zeros((0,), dtype=np.int64)
+
+    order = np.argsort(-scores, kind='stable')
+    iou = box_iou(boxes[order], boxes[order])
+
+    suppressed = np.zeros(len(order), dtype=bool)
+    keep = []
+    for i in range(len(order)):
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        if max_detections is not None and len(keep) >= max_detections:
+            break
+        suppressed |= iou[i] > iou_threshold
+
+    return order[np.array(keep, dtype=np.int64)]
+
+def batched_non_max_suppression(boxes, scores, groups, iou_threshold=0.5):
+    """
+    Non-maximum suppression applied independently within groups, in one call.
+
+    The boxes of every group (e.g. the images of a batch) are padded into a
+    (groups, K, 4) array, so IoU is only computed within groups and each greedy
+    suppression step runs for all groups at once.
+
+    Args:
+        boxes: Array of shape (N, 4) with [x1, y1, x2, y2] boxes
+        scores: Array of shape (N,) with confidence scores
+        groups: Array of shape (N,) with the integer group of each box
+        iou_threshold: Boxes overlapping a kept box of their group by more than this are suppressed
+
+    Returns:
+        Array of kept indices, ordered by decreasing score
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+    groups = np.asarray(groups).reshape(-1)
+    if len(boxes) == 0:
+        return np.zeros((0,), dtype=np.int64)
+
+    # Sort by group, then by decreasing score, and find each box's slot in its group
+    order = np.lexsort((-scores, groups))
+    _, starts, counts = np.unique(groups[order], return_index=True, return_counts=True)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    slots = np.arange(len(order)) - np.repeat(starts, counts)
+
+    padded = np.zeros((len(counts), counts.max(), 4), dtype=np.float32)
+    padded[rows, slots] = boxes[order]
+    suppressed = np.ones(padded.shape[:2], dtype=bool)
+    suppressed[rows, slots] = False
+
+    # Greedy suppression, one slot at a time across all groups
+    overlaps = _pairwise_iou(padded, padded) > iou_threshold
+    later = np.triu(np.ones(overlaps.shape[1:], dtype=bool), 1)
+    for i in range(padded.shape[1]):
+        suppressed |= ~suppressed[:, i, None] & overlaps[:, i] & later[i]
+
+    keep = order[~suppressed[rows, slots]]
+    return keep[np.argsort(-scores[keep], kind='stable')]
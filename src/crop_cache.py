@@ -0,0 +1,224 @@
+"""
+Fan crop cache for training the stadium crowd crop classifiers.
+This module extracts every annotated fan crop from the dataset in a single pass,
+decoding each image once across a pool of worker threads, and stores the crops
+as one memory-mapped uint8 array shared by the behavior classifier and the team
+detector, which stream their training batches from it.
+"""
+
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import tensorflow as tf
+
+from src.data_utils import StadiumDataset
+from src.model_cache import file_hash
+
+class CropCache:
+    """Memory-mapped cache of annotated fan crops and their team/action labels."""
+
+    def __init__(self, cache_dir, crop_shape=(128, 128, 3)):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache files
+            crop_shape: Crop shape (height, width, channels)
+        """
+        self.cache_dir = cache_dir
+        self.crop_shape = tuple(crop_shape)
+        self.crops_path = os.path.join(cache_dir, 'crops.npy')
+        self.labels_path = os.path.join(cache_dir, 'labels.npz')
+        self.meta_path = os.path.join(cache_dir, 'meta.json')
+        self.crops = None
+        self.labels = None
+
+    def is_valid(self, source_hash):
+        """
+        Check whether the cache was built from the current annotations.
+
+        Args:
+            source_hash: Hash of the annotations file
+
+        Returns:
+            True if the cache exists and matches the annotations and crop shape
+        """
+        if not all(os.path.exists(path) for path in (self.crops_path, self.labels_path, self.meta_path)):
+            return False
+
+        with open(self.meta_path, 'r') as f:
+            meta = json.load(f)
+        return meta.get('source_hash') == source_hash and tuple(meta.get('crop_shape', ())) == self.crop_shape
+
+    def build(self, dataset, num_workers=4):
+        """
+        Extract all fan crops of a dataset into the cache.
+
+        Each worker decodes one image, crops all of its fans with a single
+        crop_and_resize call and writes them straight into the memory-mapped
+        array, so memory use does not grow with the dataset.
+
+        Args:
+            dataset: StadiumDataset with loaded annotations
+            num_workers: Number of worker threads
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Give every image a fixed range of rows in the crop array
+        image_ids = [image_id for image_id in dataset.image_ids if dataset.get_annotations_for_image(image_id)]
+        counts = [len(dataset.get_annotations_for_image(image_id)) for image_id in image_ids]
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        total = int(offsets[-1])
+
+        # Write to a temporary file first so an interrupted build is never picked up
+        temp_path = self.crops_path + '.tmp'
+        crops = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.uint8, shape=(total,) + self.crop_shape)
+        teams = np.zeros(total, dtype=np.int64)
+        actions = np.zeros(total, dtype=np.int64)
+        crop_image_ids = np.repeat(np.array(image_ids, dtype=np.int64), counts)
+
+        def extract(index):
+            image_id = image_ids[index]
+            start, end = offsets[index], offsets[index + 1]
+            anns = dataset.get_annotations_for_image(image_id)
+
+            image = tf.io.read_file(dataset.get_image_path(image_id))
+            image = tf.image.decode_png(image, channels=3)
+            height, width = image.shape[:2]
+
+            # Same normalized boxes and resize as StadiumMonitoringSystem uses at inference time
+            boxes = np.array([ann['bbox'] for ann in anns], dtype=np.float32)
+            normalized = np.stack([
+                boxes[:, 1] / height,
+                boxes[:, 0] / width,
+                (boxes[:, 1] + boxes[:, 3]) / height,
+                (boxes[:, 0] + boxes[:, 2]) / width
+            ], axis=1)
+            image_crops = tf.image.crop_and_resize(
+                image[tf.newaxis],
+                np.clip(normalized, 0.0, 1.0),
+                box_indices=np.zeros(len(anns), dtype=np.int32),
+                crop_size=self.crop_shape[:2]
+            )
+
+            crops[start:end] = np.clip(np.round(image_crops.numpy()), 0, 255).astype(np.uint8)
+            teams[start:end] = [dataset.team_mapping[ann['attributes']['team']] for ann in anns]
+            actions[start:end] = [dataset.action_mapping[ann['attributes']['action']] for ann in anns]
+
+        print(f"Extracting {total} fan crops from {len(image_ids)} images...")
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            list(executor.map(extract, range(len(image_ids))))
+
+        crops.flush()
+        del crops
+        os.replace(temp_path, self.crops_path)
+        np.savez(self.labels_path, teams=teams, actions=actions, image_ids=crop_image_ids)
+
+        with open(self.meta_path, 'w') as f:
+            json.dump({
+                'source_hash': file_hash(dataset.annotations_file),
+                'crop_shape': list(self.crop_shape),
+                'count': total
+            }, f, indent=2)
+
+        print(f"Crop cache written to {self.cache_dir}")
+
+    def load(self):
+        """Memory-map the cached crops and load their labels."""
+        self.crops = np.load(self.crops_path, mmap_mode='r')
+        with np.load(self.labels_path) as labels:
+            self.labels = {key: labels[key] for key in labels.files}
+        return self
+
+    def split(self, train_ratio=0.8, seed=42):
+        """
+        Split crop indexes into training and validation sets by image.
+
+        Crops of the same image stay in the same set, so near-identical
+        backgrounds do not leak from training into validation.
+
+        Args:
+            train_ratio: Ratio of images used for training
+            seed: Random seed of the split
+
+        Returns:
+            train_indices, val_indices: Arrays of crop indexes
+        """
+        image_ids = np.unique(self.labels['image_ids'])
+        np.random.RandomState(seed).shuffle(image_ids)
+        train_ids = image_ids[:int(len(image_ids) * train_ratio)]
+
+        is_train = np.isin(self.labels['image_ids'], train_ids)
+        return np.flatnonzero(is_train), np.flatnonzero(~is_train)
+
+    def training_datasets(self, label, batch_size=32, train_ratio=0.8, seed=42):
+        """
+        Stream training and validation batches for one label from the cache.
+
+        Args:
+            label: 'teams' or 'actions', or a dictionary mapping model output
+                   names to those keys for multi-output models
+            batch_size: Batch size
+            train_ratio: Ratio of images used for training
+            seed: Random seed of the split
+
+        Returns:
+            train_dataset, val_dataset: Datasets of (float32 crops in [0, 255], labels) batches,
+            where labels is an array or a dictionary like label
+        """
+        train_indices, val_indices = self.split(train_ratio, seed)
+        print(f"Training on {len(train_indices)} crops, validating on {len(val_indices)} crops")
+
+        return (self._stream(train_indices, label, batch_size, shuffle=True),
+                self._stream(val_indices, label, batch_size, shuffle=False))
+
+    def _stream(self, indices, label, batch_size, shuffle):
+        """Dataset that gathers batches of crops from the memory-mapped array."""
+        outputs = label if isinstance(label, dict) else {None: label}
+        labels = [self.labels[key] for key in outputs.values()]
+
+        def gather(batch_indices):
+            # Sorted reads keep the memory-mapped access mostly sequential
+            batch_indices = np.sort(batch_indices)
+            return [self.crops[batch_indices]] + [values[batch_indices] for values in labels]
+
+        def load_batch(batch_indices):
+            crops, *batch_labels = tf.numpy_function(
+                gather, [batch_indices], [tf.uint8] + [tf.int64] * len(labels)
+            )
+            crops = tf.ensure_shape(crops, (None,) + self.crop_shape)
+            batch_labels = [tf.ensure_shape(values, (None,)) for values in batch_labels]
+            if not isinstance(label, dict):
+                return tf.cast(crops, tf.float32), batch_labels[0]
+            return tf.cast(crops, tf.float32), dict(zip(outputs.keys(), batch_labels))
+
+        dataset = tf.data.Dataset.from_tensor_slices(indices)
+        if shuffle:
+            dataset = dataset.shuffle(max(1, len(indices)))
+        dataset = dataset.batch(batch_size)
+        dataset = dataset.map(load_batch, num_parallel_calls=tf.data.AUTOTUNE)
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+def load_crop_cache(dataset_dir, crop_shape=(128, 128, 3), cache_dir=None, num_workers=4):
+    """
+    Open the crop cache of a dataset, building it if it is missing or stale.
+
+    Args:
+        dataset_dir: Directory containing the dataset
+        crop_shape: Crop shape (height, width, channels)
+        cache_dir: Cache directory (default: <dataset_dir>/crops_<height>x<width>)
+        num_workers: Number of worker threads used to build the cache
+
+    Returns:
+        Loaded CropCache instance
+    """
+    dataset = StadiumDataset(dataset_dir)
+    cache_dir = cache_dir or os.path.join(dataset_dir, f"crops_{crop_shape[0]}x{crop_shape[1]}")
+    cache = CropCache(cache_dir, crop_shape)
+
+    if not cache.is_valid(file_hash(dataset.annotations_file)):
+        dataset.load_annotations()
+        cache.build(dataset, num_workers=num_workers)
+
+    return cache.load()
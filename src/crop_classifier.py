@@ -0,0 +1,278 @@
+"""
+Fused crop classification module for stadium crowd detection system.
+This module classifies team affiliation and behavior of a fan crop with one shared
+backbone and two heads, replacing the separate behavior classifier and team detector.
+"""
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, models, applications
+
+from src.backends import create_backend, uses_keras_model
+from src.crop_cache import load_crop_cache
+from src.training import precision_policy
+
+class FanCropClassifier:
+    """Shared-backbone classifier for fan team affiliation and behavior."""
+
+    def __init__(self, input_shape=(128, 128, 3), num_teams=2, num_actions=4):
+        """
+        Initialize the crop classifier.
+
+        Args:
+            input_shape: Input image shape for cropped fan images (height, width, channels)
+            num_teams: Number of team classes (hilal, ittihad)
+            num_actions: Number of action classes (sitting, cheering, fighting, throwing)
+        """
+        self.input_shape = input_shape
+        self.num_teams = num_teams
+        self.num_actions = num_actions
+        self.model = None
+        self.backend = None
+        self.team_mapping = {0: 'hilal', 1: 'ittihad'}
+        self.action_mapping = {0: 'sitting', 1: 'cheering', 2: 'fighting', 3: 'throwing'}
+
+    def loss_weights(self, team_weight=None, action_weight=None):
+        """
+        Loss weights of the team and action heads.
+
+        By default each cross-entropy is divided by its value for a uniform
+        prediction (log of the number of classes), so both heads start at the
+        same scale and the 4-class action loss does not dominate the 2-class
+        team loss.
+
+        Args:
+            team_weight: Explicit weight of the team loss (optional)
+            action_weight: Explicit weight of the action loss (optional)
+
+        Returns:
+            Dictionary mapping output names to loss weights
+        """
+        return {
+            'team_output': team_weight if team_weight is not None else float(1.0 / np.log(self.num_teams)),
+            'action_output': action_weight if action_weight is not None else float(1.0 / np.log(self.num_actions))
+        }
+
+    def build_model(self, team_weight=None, action_weight=None, learning_rate=0.0001, jit_compile=False,
+                    steps_per_execution=1, mixed_precision=False):
+        """
+        Build the fused crop classification model.
+
+        Args:
+            team_weight: Weight of the team loss (default: normalized, see loss_weights())
+            action_weight: Weight of the action loss (default: normalized, see loss_weights())
+            learning_rate: Adam learning rate
+            jit_compile: Compile the training step with XLA
+            steps_per_execution: Training steps run per call of the compiled step function
+            mixed_precision: Compute in bfloat16 with float32 weights (outputs stay float32);
+                             only faster on CPUs with native bfloat16 support
+        """
+        with precision_policy(mixed_precision):
+            # Use a lightweight model for faster inference
+            base_model = applications.MobileNetV2(
+                input_shape=self.input_shape,
+                include_top=False,
+                weights='imagenet'
+            )
+
+            # Freeze early layers
+            for layer in base_model.layers[:100]:
+                layer.trainable = False
+
+            # Shared features computed once per crop
+            inputs = layers.Input(shape=self.input_shape)
+            x = base_model(inputs)
+            x = layers.GlobalAveragePooling2D()(x)
+            x = layers.Dropout(0.2)(x)
+
+            # Team affiliation head
+            team_head = layers.Dense(64, activation='relu')(x)
+            team_head = layers.Dropout(0.2)(team_head)
+            team_output = layers.Dense(self.num_teams, activation='softmax', dtype='float32', name='team_output')(team_head)
+
+            # Behavior head
+            action_head = layers.Dense(128, activation='relu')(x)
+            action_head = layers.Dropout(0.2)(action_head)
+            action_output = layers.Dense(self.num_actions, activation='softmax', dtype='float32', name='action_output')(action_head)
+
+            self.model = models.Model(inputs=inputs, outputs=[team_output, action_output])
+
+        # Compile the model
+        self.model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+            loss={
+                'team_output': 'sparse_categorical_crossentropy',
+                'action_output': 'sparse_categorical_crossentropy'
+            },
+            loss_weights=self.loss_weights(team_weight, action_weight),
+            metrics={
+                'team_output': 'accuracy',
+                'action_output': 'accuracy'
+            },
+            jit_compile=jit_compile,
+            steps_per_execution=steps_per_execution
+        )
+
+        return self.model
+
+    def prepare_dataset(self, dataset_dir, batch_size=32, train_ratio=0.8, cache_dir=None, num_workers=4):
+        """
+        Prepare dataset for fused crop classifier training.
+
+        Uses the same crop cache as the separate classifiers (see src/crop_cache.py).
+
+        Args:
+            dataset_dir: Directory containing the dataset
+            batch_size: Batch size for training
+            train_ratio: Ratio of images to use for training
+            cache_dir: Crop cache directory (default: <dataset_dir>/crops_<height>x<width>)
+            num_workers: Number of worker threads used to build the crop cache
+
+        Returns:
+            train_dataset, val_dataset: Datasets of (crops, {'team_output', 'action_output'}) batches
+        """
+        cache = load_crop_cache(dataset_dir, self.input_shape, cache_dir=cache_dir, num_workers=num_workers)
+        return cache.training_datasets(
+            {'team_output': 'teams', 'action_output': 'actions'},
+            batch_size=batch_size,
+            train_ratio=train_ratio
+        )
+
+    def train(self, train_dataset, val_dataset, epochs=20, callbacks=None):
+        """
+        Train the fused crop classification model.
+
+        Args:
+            train_dataset: TensorFlow dataset for training
+            val_dataset: TensorFlow dataset for validation
+            epochs: Number of training epochs
+            callbacks: List of Keras callbacks
+
+        Returns:
+            Training history
+        """
+        if self.model is None:
+            self.build_model()
+
+        # Default callbacks if none provided
+        if callbacks is None:
+            callbacks = [
+                tf.keras.callbacks.ModelCheckpoint(
+                    filepath='../models/crop_classifier.h5',
+                    save_best_only=True,
+                    monitor='val_loss'
+                ),
+                tf.keras.callbacks.EarlyStopping(
+                    patience=5,
+                    monitor='val_loss'
+                ),
+                tf.keras.callbacks.ReduceLROnPlateau(
+                    factor=0.2,
+                    patience=3,
+                    monitor='val_loss'
+                )
+            ]
+
+        history = self.model.fit(
+            train_dataset,
+            validation_data=val_dataset,
+            epochs=epochs,
+            callbacks=callbacks
+        )
+
+        return history
+
+    def predict_batch(self, images, batch_size=64):
+        """
+        Predict team affiliation and behavior for a batch of fan images.
+
+        Args:
+            images: Batch tensor of cropped fans (num_crops, height, width, channels)
+            batch_size: Maximum number of crops per forward pass
+
+        Returns:
+            List of dictionaries with 'team', 'team_score', 'action' and 'action_score', one per crop
+        """
+        if self.model is None and self.backend is None:
+            raise ValueError("Model has not been built or loaded yet")
+
+        if len(images) == 0:
+            return []
+
+        # One forward pass gives both heads for all crops
+        if self.backend is not None:
+            images = np.asarray(images, dtype=np.float32)
+            outputs = [self.backend.predict(images[i:i + batch_size]) for i in range(0, len(images), batch_size)]
+            team_predictions = np.concatenate([output[0] for output in outputs])
+            action_predictions = np.concatenate([output[1] for output in outputs])
+        else:
+            team_predictions, action_predictions = self.model.predict(images, batch_size=batch_size, verbose=0)
+
+        team_ids = np.argmax(team_predictions, axis=1)
+        action_ids = np.argmax(action_predictions, axis=1)
+        rows = np.arange(len(team_ids))
+        team_scores = team_predictions[rows, team_ids]
+        action_scores = action_predictions[rows, action_ids]
+
+        return [
+            {
+                'team': self.team_mapping[int(team_id)],
+                'team_score': float(team_score),
+                'action': self.action_mapping[int(action_id)],
+                'action_score': float(action_score)
+            }
+            for team_id, team_score, action_id, action_score in zip(team_ids, team_scores, action_ids, action_scores)
+        ]
+
+    def predict(self, image):
+        """
+        Predict team affiliation and behavior for a single fan image.
+
+        Args:
+            image: Input image tensor (cropped fan)
+
+        Returns:
+            Dictionary with 'team', 'team_score', 'action' and 'action_score'
+        """
+        if len(image.shape) == 3:
+            image = np.asarray(image)[np.newaxis]
+        return self.predict_batch(image)[0]
+
+    def save_model(self, filepath):
+        """Save the model to disk."""
+        if self.model is None:
+            raise ValueError("Model has not been built or loaded yet")
+
+        self.model.save(filepath)
+        print(f"Crop classifier saved to {filepath}")
+
+    def load_model(self, filepath, compile=True):
+        """Load a saved model from disk (compile=False skips restoring the training setup)."""
+        self.model = models.load_model(filepath, compile=compile)
+        print(f"Crop classifier loaded from {filepath}")
+
+        return self.model
+
+    def load_backend(self, filepath, backend='keras', precision='int8', num_threads=None, cache_dir=None):
+        """
+        Load the model for inference through an inference backend.
+
+        Args:
+            filepath: Path to the .h5 model (exported TFLite/ONNX models are found next to it)
+            backend: 'keras', 'tf-function', 'tflite' or 'onnxruntime'
+            precision: TFLite precision to load ('int8' or 'fp16')
+            num_threads: CPU threads for the TFLite and ONNX Runtime backends (optional)
+            cache_dir: Precompiled model cache used by the tf-function backend (optional)
+
+        Returns:
+            InferenceBackend instance
+        """
+        if uses_keras_model(backend, cache_dir):
+            # Inference only: skip deserializing the optimizer, losses and metrics
+            self.load_model(filepath, compile=False)
+
+        self.backend = create_backend(backend, filepath, keras_model=self.model, precision=precision,
+                                      num_threads=num_threads, cache_dir=cache_dir)
+        print(f"Crop classifier using the {backend} inference backend")
+
+        return self.backend
@@ -0,0 +1,447 @@
+"""
+Data utilities for stadium crowd detection system.
+This module handles loading and preprocessing the synthetic dataset.
+"""
+
+import os
+import json
+import glob
+from collections import defaultdict
+import numpy as np
+from PIL import Image
+import tensorflow as tf
+
+from src.dense_head import IGNORE_LABEL, normalize_pixels
+
+class StadiumDataset:
+    """Class to handle the stadium crowd dataset."""
+    
+    def __init__(self, dataset_dir, image_size=(512, 384)):
+        """
+        Initialize the dataset handler.
+        
+        Args:
+            dataset_dir: Directory containing the dataset
+            image_size: Target image size (width, height)
+        """
+        self.dataset_dir = dataset_dir
+        self.image_size = image_size
+        self.images_dir = os.path.join(dataset_dir, 'images')
+        self.annotations_file = os.path.join(dataset_dir, 'annotations', 'labels.json')
+        self.annotations = None
+        self.image_ids = []
+        self.images_by_id = {}
+        self.annotations_by_image = {}
+        self.team_mapping = {'hilal': 0, 'ittihad': 1}
+        self.action_mapping = {'sitting': 0, 'cheering': 1, 'fighting': 2, 'throwing': 3}
+        
+    def load_annotations(self):
+        """Load annotations from JSON file."""
+        if not os.path.exists(self.annotations_file):
+            raise FileNotFoundError(f"Annotations file not found: {self.annotations_file}")
+            
+        with open(self.annotations_file, 'r') as f:
+            self.annotations = json.load(f)
+            
+        # Extract image IDs
+        self.image_ids = [img['id'] for img in self.annotations['images']]
+        
+        # Index images and annotations by image ID so lookups do not scan the lists
+        self.images_by_id = {img['id']: img for img in self.annotations['images']}
+        annotations_by_image = defaultdict(list)
+        for ann in self.annotations['annotations']:
+            annotations_by_image[ann['image_id']].append(ann)
+        self.annotations_by_image = dict(annotations_by_image)
+        print(f"Loaded {len(self.image_ids)} images and {len(self.annotations['annotations'])} annotations")
+        
+    def get_image_path(self, image_id):
+        """Get the file path for an image by ID."""
+        img = self.images_by_id.get(image_id)
+        if img is None:
+            return None
+        return os.path.join(self.images_dir, img['file_name'])
+    
+    def get_annotations_for_image(self, image_id):
+        """Get all annotations for a specific image."""
+        return self.annotations_by_image.get(image_id, [])
+    
+    def visualize_sample(self, image_id=None, figsize=(10, 8)):
+        """Visualize a sample image with bounding boxes and labels."""
+        if self.annotations is None:
+            self.load_annotations()
+            
+        if image_id is None:
+            # Pick a random image
+            image_id = np.random.choice(self.image_ids)
+            
+        image_path = self.get_image_path(image_id)
+        if image_path is None:
+            print(f"Image ID {image_id} not found")
+            return
+            
+        image = Image.open(image_path)
+        anns = self.get_annotations_for_image(image_id)
+        
+        # Import matplotlib only when a sample is visualized
+        import matplotlib.pyplot as plt
+        
+        plt.figure(figsize=figsize)
+        plt.imshow(image)
+        ax = plt.gca()
+        
+        for ann in anns:
+            x, y, w, h = ann['bbox']
+            team = ann['attributes']['team']
+            action = ann['attributes']['action']
+            
+            # Draw bounding box
+            rect = plt.Rectangle((x, y), w, h, fill=False, 
+                                edgecolor='red' if action in ['fighting', 'throwing'] else 'green', 
+                                linewidth=2)
+            ax.add_patch(rect)
+            
+            # Add label
+            plt.text(x, y-5, f"{team}/{action}", 
+                    color='white', backgroundcolor='blue' if team == 'hilal' else 'orange',
+                    fontsize=8, weight='bold')
+            
+        plt.title(f"Image ID: {image_id}")
+        plt.axis('off')
+        plt.tight_layout()
+        plt.show()
+        
+    def get_targets_for_image(self, image_id):
+        """
+        Get the detection targets of an image.
+        
+        Args:
+            image_id: Image ID
+            
+        Returns:
+            boxes, teams, actions: Normalized [ymin, xmin, ymax, xmax] boxes and
+            team/action class indexes, as lists with one entry per fan
+        """
+        boxes = []
+        teams = []
+        actions = []
+        
+        for ann in self.get_annotations_for_image(image_id):
+            x, y, w, h = ann['bbox']
+            
+            # Convert to normalized coordinates [ymin, xmin, ymax, xmax]
+            boxes.append([
+                y / self.image_size[1],
+                x / self.image_size[0],
+                (y + h) / self.image_size[1],
+                (x + w) / self.image_size[0]
+            ])
+            teams.append(self.team_mapping[ann['attributes']['team']])
+            actions.append(self.action_mapping[ann['attributes']['action']])
+            
+        return boxes, teams, actions
+    
+    def encode_targets(self, boxes, teams, actions, output_stride=8, min_sigma=0.5):
+        """
+        Encode the fans of one image as targets of the dense detection head.
+        
+        Every fan is assigned to the grid cell holding its box center. The heatmap
+        has a Gaussian peak of 1 at that cell whose spread grows with the fan's
+        size, the box target holds the distances from the cell center to the box
+        edges, and the team/action targets hold the fan's class indexes at that
+        cell and IGNORE_LABEL elsewhere. Written with TensorFlow ops so it runs
+        inside the tf.data pipeline.
+        
+        Args:
+            boxes: Tensor of shape (N, 4) with normalized [ymin, xmin, ymax, xmax] boxes
+            teams: Tensor of shape (N,) with team indexes
+            actions: Tensor of shape (N,) with action indexes
+            output_stride: Stride of the model's output grid
+            min_sigma: Smallest Gaussian spread in grid cells
+            
+        Returns:
+            Dictionary of targets keyed by model output name
+        """
+        grid_h = self.image_size[1] // output_stride
+        grid_w = self.image_size[0] // output_stride
+        boxes = tf.reshape(tf.cast(boxes, tf.float32), [-1, 4])
+        ymin, xmin, ymax, xmax = tf.unstack(boxes, axis=1)
+        
+        # Grid cell of every fan's box center
+        row = tf.clip_by_value(tf.cast(tf.floor((ymin + ymax) / 2 * grid_h), tf.int32), 0, grid_h - 1)
+        col = tf.clip_by_value(tf.cast(tf.floor((xmin + xmax) / 2 * grid_w), tf.int32), 0, grid_w - 1)
+        indices = tf.stack([row, col], axis=1)
+        
+        # Gaussian peaks on the grid; overlapping fans keep the larger value
+        sigma = tf.maximum(tf.minimum((ymax - ymin) * grid_h, (xmax - xmin) * grid_w) / 6, min_sigma)
+        ys = tf.range(grid_h, dtype=tf.float32)[tf.newaxis, :, tf.newaxis]
+        xs = tf.range(grid_w, dtype=tf.float32)[tf.newaxis, tf.newaxis, :]
+        dy = ys - tf.cast(row, tf.float32)[:, tf.newaxis, tf.newaxis]
+        dx = xs - tf.cast(col, tf.float32)[:, tf.newaxis, tf.newaxis]
+        gaussians = tf.exp(-(dy ** 2 + dx ** 2) / (2 * sigma[:, tf.newaxis, tf.newaxis] ** 2))
+        heatmap = tf.reduce_max(tf.concat([tf.zeros((1, grid_h, grid_w)), gaussians], axis=0), axis=0)
+        
+        # Distances from the cell center to the box edges, plus a mask channel marking fan centers
+        center_y = (tf.cast(row, tf.float32) + 0.5) / grid_h
+        center_x = (tf.cast(col, tf.float32) + 0.5) / grid_w
+        distances = tf.maximum(tf.stack([center_x - xmin, center_y - ymin, xmax - center_x, ymax - center_y], axis=1), 0.0)
+        box_target = tf.tensor_scatter_nd_update(
+            tf.zeros((grid_h, grid_w, 5)), indices, tf.concat([distances, tf.ones_like(distances[:, :1])], axis=1)
+        )
+        
+        # Class indexes at fan centers
+        def label_map(labels):
+            labels = tf.cast(tf.reshape(labels, [-1, 1]), tf.float32)
+            return tf.tensor_scatter_nd_update(tf.fill((grid_h, grid_w, 1), IGNORE_LABEL), indices, labels)
+            
+        return {
+            'bbox_output': box_target,
+            'class_output': heatmap[..., tf.newaxis],
+            'team_output': label_map(teams),
+            'action_output': label_map(actions)
+        }
+    
+    def write_shards(self, output_dir=None, num_shards=8, train_ratio=0.8, seed=42):
+        """
+        Convert the dataset into sharded TFRecord files for training.
+        
+        Each record holds the encoded PNG, the image ID and the ragged boxes,
+        teams and actions of one image, so training reads a few large files
+        instead of parsing labels.json and opening every image. This is a
+        one-time conversion; rerun it when the annotations change.
+        
+        Args:
+            output_dir: Directory for the shards (default: <dataset_dir>/shards)
+            num_shards: Number of shards per split
+            train_ratio: Ratio of images written to the training split
+            seed: Random seed of the train/validation split
+            
+        Returns:
+            Dictionary mapping 'train' and 'val' to lists of shard paths
+        """
+        if self.annotations is None:
+            self.load_annotations()
+            
+        output_dir = output_dir or os.path.join(self.dataset_dir, 'shards')
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Split image IDs into train and validation sets
+        image_ids = list(self.image_ids)
+        np.random.RandomState(seed).shuffle(image_ids)
+        split_idx = int(len(image_ids) * train_ratio)
+        splits = {'train': image_ids[:split_idx], 'val': image_ids[split_idx:]}
+        
+        shard_paths = {}
+        for split, ids in splits.items():
+            paths = [os.path.join(output_dir, f"{split}-{i:05d}-of-{num_shards:05d}.tfrecord")
+                     for i in range(num_shards)]
+            writers = [tf.io.TFRecordWriter(path) for path in paths]
+            
+            # Deal images round-robin so shards have similar sizes
+            for i, image_id in enumerate(ids):
+                writers[i % num_shards].write(self._serialize_example(image_id))
+                
+            for writer in writers:
+                writer.close()
+            shard_paths[split] = paths
+            print(f"Wrote {len(ids)} {split} images to {num_shards} shards in {output_dir}")
+            
+        return shard_paths
+    
+    def _serialize_example(self, image_id):
+        """Serialize one image and its targets as a tf.train.Example."""
+        with open(self.get_image_path(image_id), 'rb') as f:
+            encoded = f.read()
+        boxes, teams, actions = self.get_targets_for_image(image_id)
+        
+        feature = {
+            'image_id': tf.train.Feature(int64_list=tf.train.Int64List(value=[image_id])),
+            'image': tf.train.Feature(bytes_list=tf.train.BytesList(value=[encoded])),
+            'boxes': tf.train.Feature(float_list=tf.train.FloatList(value=np.ravel(boxes).tolist())),
+            'teams': tf.train.Feature(int64_list=tf.train.Int64List(value=teams)),
+            'actions': tf.train.Feature(int64_list=tf.train.Int64List(value=actions))
+        }
+        return tf.train.Example(features=tf.train.Features(feature=feature)).SerializeToString()
+    
+    def prepare_detection_dataset(self, train_ratio=0.8, batch_size=8, shards_dir=None, cache=True,
+                                  shuffle_buffer=256, target_stride=None, decoded_cache=None):
+        """
+        Prepare TensorFlow dataset for object detection.
+        
+        Boxes, teams and actions have a different length for every image, so
+        batches hold them as ragged tensors. With target_stride, they are encoded
+        as dense head targets instead (see encode_targets()) and batches are
+        (images, targets) pairs ready for FanDetectionModel.train().
+        
+        With decoded_cache, PNG decoding runs only in the first epoch: the decoded
+        uint8 images are kept in memory or in a tf.data snapshot on disk that later
+        epochs and training runs read back instead of decoding every image again.
+        
+        Args:
+            train_ratio: Ratio of data to use for training (ignored with shards_dir,
+                         where the split was fixed by write_shards())
+            batch_size: Batch size for training
+            shards_dir: Directory of TFRecord shards written by write_shards() (optional);
+                        without it images are read from the dataset directory
+            cache: Cache the encoded records in memory after the first epoch, or
+                   a file path to cache them on disk
+            shuffle_buffer: Number of records shuffled across for training
+            target_stride: Output stride of the dense detection head to encode targets for (optional)
+            decoded_cache: True to cache the decoded images in memory, or a directory
+                           to snapshot them on disk (optional); replaces cache. Snapshots
+                           are reused by later runs reading the same shards_dir, while
+                           the annotation split is reshuffled and re-snapshotted every run
+            
+        Returns:
+            train_dataset, val_dataset: TensorFlow datasets for training and validation
+        """
+        # Encoded records are not worth caching when the decoded images are
+        if decoded_cache:
+            cache = False
+            
+        if shards_dir:
+            train_dataset = self._load_shards(shards_dir, 'train', cache)
+            val_dataset = self._load_shards(shards_dir, 'val', cache)
+        else:
+            train_dataset, val_dataset = self._load_from_annotations(train_ratio, cache)
+            
+        # Shuffle the small encoded records unless the decoded images are cached
+        if not decoded_cache:
+            train_dataset = train_dataset.shuffle(shuffle_buffer)
+            
+        datasets = []
+        for split, dataset in (('train', train_dataset), ('val', val_dataset)):
+            dataset = dataset.map(self._decode_image, num_parallel_calls=tf.data.AUTOTUNE)
+            if decoded_cache:
+                if decoded_cache is True:
+                    dataset = dataset.cache()
+                else:
+                    dataset = dataset.snapshot(os.path.join(decoded_cache, split))
+                    
+                # Shuffle after the cache so every epoch sees a new order
+                if split == 'train':
+                    dataset = dataset.shuffle(shuffle_buffer)
+                
+            dataset = dataset.map(self._build_example, num_parallel_calls=tf.data.AUTOTUNE)
+            if target_stride:
+                # Dense targets have the same shape for every image, so batches stay dense
+                dataset = dataset.map(
+                    lambda example: (example['image'], self.encode_targets(
+                        example['boxes'], example['teams'], example['actions'], target_stride
+                    )),
+                    num_parallel_calls=tf.data.AUTOTUNE
+                )
+                dataset = dataset.batch(batch_size)
+            else:
+                dataset = dataset.ragged_batch(batch_size)
+            dataset = dataset.prefetch(tf.data.AUTOTUNE)
+            datasets.append(dataset)
+            
+        return tuple(datasets)
+    
+    def _load_shards(self, shards_dir, split, cache):
+        """Stream the records of one split from its shards with parallel interleave."""
+        paths = sorted(glob.glob(os.path.join(shards_dir, f"{split}-*.tfrecord")))
+        if not paths:
+            raise FileNotFoundError(f"No {split} shards found in {shards_dir}. Run write_shards() first.")
+            
+        files = tf.data.Dataset.from_tensor_slices(paths)
+        if split == 'train':
+            files = files.shuffle(len(paths))
+            
+        dataset = files.interleave(
+            tf.data.TFRecordDataset,
+            cycle_length=min(len(paths), 8),
+            num_parallel_calls=tf.data.AUTOTUNE,
+            deterministic=(split != 'train')
+        )
+        dataset = dataset.map(self._parse_example, num_parallel_calls=tf.data.AUTOTUNE)
+        print(f"Streaming {split} data from {len(paths)} shards in {shards_dir}")
+        return self._cache(dataset, cache, split)
+    
+    def _load_from_annotations(self, train_ratio, cache):
+        """Build the train and validation records from the annotation indexes."""
+        if self.annotations is None:
+            self.load_annotations()
+            
+        # Split image IDs into train and validation sets
+        np.random.shuffle(self.image_ids)
+        split_idx = int(len(self.image_ids) * train_ratio)
+        train_ids = self.image_ids[:split_idx]
+        val_ids = self.image_ids[split_idx:]
+        
+        print(f"Training on {len(train_ids)} images, validating on {len(val_ids)} images")
+        
+        datasets = []
+        for split, ids in (('train', train_ids), ('val', val_ids)):
+            # Targets are gathered in Python once, so the map functions stay in the graph
+            targets = [self.get_targets_for_image(image_id) for image_id in ids]
+            records = {
+                'image_id': tf.constant(ids, dtype=tf.int64),
+                'image': tf.constant([self.get_image_path(image_id) for image_id in ids]),
+                'boxes': tf.ragged.constant([t[0] for t in targets], dtype=tf.float32,
+                                            ragged_rank=1, inner_shape=(4,)),
+                'teams': tf.ragged.constant([t[1] for t in targets], dtype=tf.int64),
+                'actions': tf.ragged.constant([t[2] for t in targets], dtype=tf.int64)
+            }
+            dataset = tf.data.Dataset.from_tensor_slices(records)
+            dataset = dataset.map(self._read_example, num_parallel_calls=tf.data.AUTOTUNE)
+            datasets.append(self._cache(dataset, cache, split))
+            
+        return tuple(datasets)
+    
+    def _cache(self, dataset, cache, split):
+        """Cache encoded records in memory (cache=True) or under a file path."""
+        if cache is True:
+            return dataset.cache()
+        elif cache:
+            return dataset.cache(f"{cache}-{split}")
+        return dataset
+    
+    def _parse_example(self, serialized):
+        """Parse a serialized tf.train.Example written by write_shards()."""
+        features = tf.io.parse_single_example(serialized, {
+            'image_id': tf.io.FixedLenFeature([], tf.int64),
+            'image': tf.io.FixedLenFeature([], tf.string),
+            'boxes': tf.io.VarLenFeature(tf.float32),
+            'teams': tf.io.VarLenFeature(tf.int64),
+            'actions': tf.io.VarLenFeature(tf.int64)
+        })
+        return {
+            'image_id': features['image_id'],
+            'image': features['image'],
+            'boxes': tf.reshape(tf.sparse.to_dense(features['boxes']), [-1, 4]),
+            'teams': tf.sparse.to_dense(features['teams']),
+            'actions': tf.sparse.to_dense(features['actions'])
+        }
+    
+    def _read_example(self, record):
+        """Read the encoded image of a record built from the annotation indexes."""
+        record = dict(record)
+        record['image'] = tf.io.read_file(record['image'])
+        
+        # Ragged rows come out of from_tensor_slices() as ragged tensors of one image
+        for key in ('boxes', 'teams', 'actions'):
+            if isinstance(record[key], tf.RaggedTensor):
+                record[key] = record[key].to_tensor()
+        record['boxes'] = tf.reshape(record['boxes'], [-1, 4])
+        return record
+    
+    def _decode_image(self, record):
+        """Decode the PNG image of a record to uint8 pixels."""
+        record = dict(record)
+        image = tf.image.decode_png(record['image'], channels=3)
+        
+        # Dataset images have the target size; a static shape lets batches stay dense
+        record['image'] = tf.ensure_shape(image, (self.image_size[1], self.image_size[0], 3))
+        return record
+    
+    def _build_example(self, record):
+        """Build the detection example of a record with a decoded image."""
+        return {
+            'image': normalize_pixels(tf.cast(record['image'], tf.float32)),
+            'boxes': record['boxes'],
+            'classes': tf.ones_like(record['teams'], dtype=tf.int32),  # Only one class: 'fan'
+            'teams': tf.cast(record['teams'], tf.int32),
+            'actions': tf.cast(record['actions'], tf.int32),
+            'image_id': record['image_id']
+        }
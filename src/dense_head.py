@@ -0,0 +1,130 @@
+"""
+Dense anchor-free detection head for the stadium crowd detection model.
+This module holds the layout of the heatmap, box and team/action maps the detector
+predicts on its feature grid, and the vectorized decode that turns the maps of a
+whole batch into fan boxes with top-k peak picking and batched non-maximum suppression.
+The training losses of the maps are in src/dense_losses.py.
+"""
+
+import numpy as np
+
+from src.box_utils import batched_non_max_suppression
+
+# Stride of the output grid relative to the model input
+DEFAULT_OUTPUT_STRIDE = 8
+
+# MobileNetV2 activations at each stride, used to build the head's feature pyramid
+BACKBONE_LAYERS = {
+    4: 'block_3_expand_relu',
+    8: 'block_6_expand_relu',
+    16: 'block_13_expand_relu',
+    32: 'out_relu'
+}
+
+# Label of grid cells without a fan in the team and action targets
+IGNORE_LABEL = -1.0
+
+def normalize_pixels(image):
+    """
+    Scale RGB pixels from 0-255 to the [-1, 1] range the MobileNetV2 backbone was trained on.
+
+    This is the one input normalization of the detector: training, inference and
+    int8 calibration all apply it, so the model always sees the same value range.
+
+    Args:
+        image: Float RGB array or tensor with values 0-255
+
+    Returns:
+        Normalized array or tensor of the same shape
+    """
+    return image / 127.5 - 1.0
+
+def find_peaks(heatmaps):
+    """
+    Keep only the local maxima of a batch of heatmaps.
+
+    A cell is a peak if no cell in its 3x3 neighbourhood scores higher, which
+    replaces box-level suppression of neighbouring centers.
+
+    Args:
+        heatmaps: Array of shape (batch, grid_h, grid_w)
+
+    Returns:
+        Array of the same shape with every non-peak cell set to zero
+    """
+    padded = np.pad(heatmaps, ((0, 0), (1, 1), (1, 1)), constant_values=-np.inf)
+    neighbourhood = np.lib.stride_tricks.sliding_window_view(padded, (3, 3), axis=(1, 2)).max(axis=(-2, -1))
+    return np.where(heatmaps >= neighbourhood, heatmaps, 0.0)
+
+def decode_dense_predictions(heatmaps, boxes, team_probs, action_probs, image_size, score_threshold=0.5,
+                             max_detections=300, iou_threshold=0.5):
+    """
+    Decode the dense head outputs of a batch into fan boxes.
+
+    Peaks of every heatmap are picked with one top-k over the grid, their boxes
+    and team/action scores are gathered for the whole batch at once, and
+    overlapping boxes are removed with a single batched NMS call.
+
+    Args:
+        heatmaps: Center heatmaps of shape (batch, grid_h, grid_w, 1)
+        boxes: Edge distances of shape (batch, grid_h, grid_w, 4), normalized by the input size
+        team_probs: Team probabilities of shape (batch, grid_h, grid_w, num_teams)
+        action_probs: Action probabilities of shape (batch, grid_h, grid_w, num_actions)
+        image_size: (height, width) of the model input, the space boxes are returned in
+        score_threshold: Minimum heatmap peak score of a fan
+        max_detections: Maximum fans per image
+        iou_threshold: IoU above which overlapping boxes of an image are merged
+
+    Returns:
+        List with one dictionary per image holding 'boxes' ([x1, y1, x2, y2] pixel
+        boxes), 'scores', 'team_ids', 'team_scores', 'action_ids' and 'action_scores'
+        arrays, ordered by decreasing score
+    """
+    heatmaps = np.asarray(heatmaps, dtype=np.float32)[..., 0]
+    batch_size, grid_h, grid_w = heatmaps.shape
+    height, width = image_size[:2]
+
+    # Top-k peaks of every image
+    peaks = find_peaks(heatmaps).reshape(batch_size, -1)
+    k = min(max_detections, peaks.shape[1])
+    top = np.argpartition(-peaks, k - 1, axis=1)[:, :k]
+    scores = np.take_along_axis(peaks, top, axis=1)
+    image_ids, slots = np.nonzero(scores > score_threshold)
+    cells = top[image_ids, slots]
+    scores = scores[image_ids, slots]
+
+    # Assemble pixel boxes around the cell centers
+    rows, cols = np.divmod(cells, grid_w)
+    distances = np.asarray(boxes, dtype=np.float32).reshape(batch_size, -1, 4)[image_ids, cells]
+    center_x = (cols + 0.5) / grid_w
+    center_y = (rows + 0.5) / grid_h
+    pixel_boxes = np.stack([
+        (center_x - distances[:, 0]) * width,
+        (center_y - distances[:, 1]) * height,
+        (center_x + distances[:, 2]) * width,
+        (center_y + distances[:, 3]) * height
+    ], axis=1)
+    pixel_boxes = np.clip(pixel_boxes, 0, [width, height, width, height])
+
+    # Team and action of every fan
+    teams = np.asarray(team_probs, dtype=np.float32).reshape(batch_size, grid_h * grid_w, -1)[image_ids, cells]
+    actions = np.asarray(action_probs, dtype=np.float32).reshape(batch_size, grid_h * grid_w, -1)[image_ids, cells]
+    team_ids = np.argmax(teams, axis=1)
+    action_ids = np.argmax(actions, axis=1)
+
+    # Merge overlapping boxes within each image with one NMS call
+    keep = batched_non_max_suppression(pixel_boxes, scores, image_ids, iou_threshold)
+    keep = keep[np.argsort(image_ids[keep], kind='stable')]
+    splits = np.cumsum(np.bincount(image_ids[keep], minlength=batch_size))[:-1]
+
+    decoded = []
+    for indices in np.split(keep, splits):
+        decoded.append({
+            'boxes': pixel_boxes[indices],
+            'scores': scores[indices],
+            'team_ids': team_ids[indices],
+            'team_scores': teams[indices, team_ids[indices]],
+            'action_ids': action_ids[indices],
+            'action_scores': actions[indices, action_ids[indices]]
+        })
+    return decoded
@@ -0,0 +1,89 @@
+"""
+Training losses of the dense anchor-free detection head.
+This module holds the losses of the heatmap, box and team/action maps the detector
+predicts on its feature grid. It is only imported to build, train or load the
+compiled Keras model, so inference does not pull in TensorFlow through it.
+"""
+
+import tensorflow as tf
+
+@tf.keras.utils.register_keras_serializable(package='stadium')
+def heatmap_focal_loss(y_true, y_pred, alpha=2.0, beta=4.0):
+    """
+    Penalty-reduced focal loss of the center heatmap (CenterNet).
+
+    Cells at fan centers (target 1) are positives; the other cells are negatives
+    whose loss is reduced near a center by the Gaussian around it.
+
+    Args:
+        y_true: Target heatmaps of shape (batch, grid_h, grid_w, 1)
+        y_pred: Predicted heatmaps (sigmoid outputs) of the same shape
+
+    Returns:
+        Loss normalized by the number of fans in the batch
+    """
+    y_pred = tf.clip_by_value(tf.cast(y_pred, tf.float32), 1e-4, 1.0 - 1e-4)
+    y_true = tf.cast(y_true, tf.float32)
+    positive = tf.cast(tf.equal(y_true, 1.0), tf.float32)
+
+    positive_loss = -tf.math.log(y_pred) * tf.pow(1.0 - y_pred, alpha) * positive
+    negative_loss = (-tf.math.log(1.0 - y_pred) * tf.pow(y_pred, alpha)
+                     * tf.pow(1.0 - y_true, beta) * (1.0 - positive))
+
+    num_positive = tf.maximum(tf.reduce_sum(positive), 1.0)
+    return (tf.reduce_sum(positive_loss) + tf.reduce_sum(negative_loss)) / num_positive
+
+@tf.keras.utils.register_keras_serializable(package='stadium')
+def box_giou_loss(y_true, y_pred):
+    """
+    GIoU loss of the boxes predicted at fan centers.
+
+    Boxes are distances from the cell center to the left, top, right and bottom
+    edges, normalized by the input size; the IoU of two such boxes sharing a
+    center does not depend on the normalization.
+
+    Args:
+        y_true: Targets of shape (batch, grid_h, grid_w, 5) with the distances and
+                a mask channel that is 1 at fan centers
+        y_pred: Predicted distances of shape (batch, grid_h, grid_w, 4)
+
+    Returns:
+        Mean loss over the fans in the batch
+    """
+    y_true = tf.cast(y_true, tf.float32)
+    y_pred = tf.cast(y_pred, tf.float32)
+    target, mask = y_true[..., :4], y_true[..., 4]
+    l_t, t_t, r_t, b_t = tf.unstack(target, axis=-1)
+    l_p, t_p, r_p, b_p = tf.unstack(y_pred, axis=-1)
+
+    # Intersection, union and smallest enclosing box of boxes with a common anchor point
+    area_t = (l_t + r_t) * (t_t + b_t)
+    area_p = (l_p + r_p) * (t_p + b_p)
+    intersection = (tf.minimum(l_t, l_p) + tf.minimum(r_t, r_p)) * (tf.minimum(t_t, t_p) + tf.minimum(b_t, b_p))
+    union = area_t + area_p - intersection
+    enclosing = (tf.maximum(l_t, l_p) + tf.maximum(r_t, r_p)) * (tf.maximum(t_t, t_p) + tf.maximum(b_t, b_p))
+
+    iou = intersection / tf.maximum(union, 1e-9)
+    giou = iou - (enclosing - union) / tf.maximum(enclosing, 1e-9)
+
+    return tf.reduce_sum((1.0 - giou) * mask) / tf.maximum(tf.reduce_sum(mask), 1.0)
+
+@tf.keras.utils.register_keras_serializable(package='stadium')
+def masked_attribute_loss(y_true, y_pred):
+    """
+    Cross-entropy of the team or action predicted at fan centers.
+
+    Args:
+        y_true: Class indexes of shape (batch, grid_h, grid_w, 1), IGNORE_LABEL
+                where there is no fan
+        y_pred: Predicted class probabilities of shape (batch, grid_h, grid_w, num_classes)
+
+    Returns:
+        Mean loss over the fans in the batch
+    """
+    labels = tf.cast(y_true[..., 0], tf.float32)
+    mask = tf.cast(labels >= 0, tf.float32)
+    cross_entropy = tf.keras.losses.sparse_categorical_crossentropy(
+        tf.cast(tf.maximum(labels, 0.0), tf.int32), tf.cast(y_pred, tf.float32)
+    )
+    return tf.reduce_sum(cross_entropy * mask) / tf.maximum(tf.reduce_sum(mask), 1.0)
@@ -0,0 +1,885 @@
+"""
+Integration module for camera control, zoom functionality, and detection system.
+This module combines all components into a complete stadium monitoring system.
+"""
+
+import os
+import cv2
+import numpy as np
+import time
+from PIL import Image
+
+from src.system import StadiumMonitoringSystem
+from src.camera_control import CameraController
+from src.zoom_processor import ZoomProcessor
+from src.artifact_writer import PRIORITY_FRAME
+from src.live_capture import LiveLatency
+
+class EnhancedStadiumMonitoringSystem:
+    """Enhanced stadium monitoring system with camera control and zoom capabilities."""
+    
+    def __init__(self, config=None):
+        """
+        Initialize the enhanced monitoring system.
+        
+        Args:
+            config: Configuration dictionary (optional)
+        """
+        # Default configuration
+        self.config = {
+            'model_dir': 'models',
+            'input_shape': (384, 512, 3),
+            'detection_threshold': 0.5,
+            'alerts_dir': 'alerts',
+            'camera_outputs_dir': 'camera_outputs',
+            'zoom_outputs_dir': 'zoom_outputs',
+            'zoom_level': 2.5,
+            'scan_speed': 15,
+            'scan_pattern': 'grid',
+            'scan_batch_size': 16,  # Views per detector forward pass in scan mode
+            'scan_nms_iou_threshold': 0.5,  # IoU for merging detections from overlapping views
+            'save_scan_crops': True,  # Save every scanned view to zoom_outputs/scans
+            'zoom_render_plan': None,  # Overrides of the ZoomProcessor render plan (e.g. {'mp4': False})
+            'stadium_sections': {
+                'hilal': [0, 0, 256, 384],  # Left half of stadium (x1, y1, x2, y2)
+                'ittihad': [256, 0, 512, 384]  # Right half of stadium
+            }
+        }
+        
+        # Update with provided config
+        if config:
+            self.config.update(config)
+            
+        # Pad partial scan batches to the full scan batch size, so the detector runs at two batch sizes
+        self.config.setdefault('detector_batch_sizes', (1, self.config['scan_batch_size']))
+            
+        # Create output directories
+        os.makedirs(self.config['camera_outputs_dir'], exist_ok=True)
+        os.makedirs(self.config['zoom_outputs_dir'], exist_ok=True)
+        
+        # Initialize components
+        self.monitoring_system = StadiumMonitoringSystem(config=self.config)
+        self.metrics = self.monitoring_system.metrics
+        self.camera_controller = CameraController(output_dir=self.config['camera_outputs_dir'])
+        self.zoom_processor = ZoomProcessor(
+            output_dir=self.config['zoom_outputs_dir'],
+            writer=self.monitoring_system.artifact_writer,
+            metrics=self.metrics
+        )
+        
+        # Configure camera controller
+        self.camera_controller.scan_speed = self.config['scan_speed']
+        self.camera_controller.scan_pattern = self.config['scan_pattern']
+        
+        # Initialize system state
+        self.is_initialized = False
+        
+    def initialize(self, detector_path=None, behavior_classifier_path=None, team_detector_path=None,
+                   crop_classifier_path=None):
+        """
+        Initialize the system components.
+        
+        Args:
+            detector_path: Path to the trained detector model (optional)
+            behavior_classifier_path: Path to the trained behavior classifier (optional)
+            team_detector_path: Path to the trained team detector (optional)
+            crop_classifier_path: Path to the trained fused team/behavior crop classifier (optional)
+        """
+        # Initialize the monitoring system
+        self.monitoring_system.initialize(
+            detector_path=detector_path,
+            behavior_classifier_path=behavior_classifier_path,
+            team_detector_path=team_detector_path,
+            crop_classifier_path=crop_classifier_path
+        )
+        
+        self.is_initialized = True
+        print("Enhanced stadium monitoring system initialized successfully.")
+        
+    def process_image(self, image_path, output_path=None, generate_alerts=True, zoom_on_detections=True):
+        """
+        Process a single image with camera control and zoom.
+        
+        Args:
+            image_path: Path to the input image
+            output_path: Path to save the output image (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            zoom_on_detections: Whether to zoom in on detections
+            
+        Returns:
+            detections: List of detections
+            alerts: List of generated alerts
+            results: Dictionary with paths to all generated outputs
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        # Load the original image once for detection and camera operations
+        with self.metrics.timer('decode'):
+            image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError(f"Could not load image: {image_path}")
+            
+        # Process the image with the monitoring system
+        detections, alerts = self.monitoring_system.process_frame(
+            image,
+            output_path=None,  # We'll create our own output with zoom effects
+            generate_alerts=generate_alerts
+        )
+        
+        # Create results dictionary
+        results = {
+            'crops': [],
+            'zooms': [],
+            'sequences': [],
+            'animations': [],
+            'grids': []
+        }
+        
+        # Process each detection with camera control and zoom
+        problematic_crops = []
+        
+        for i, det in enumerate(detections):
+            # Extract bounding box
+            bbox = det['bbox']
+            
+            # Create detection info
+            detection_info = {
+                'type': det['action'],
+                'team': det['team'],
+                'confidence': det['action_score']
+            }
+            
+            # Zoom in on the detection
+            if zoom_on_detections:
+                # For problematic behaviors, render the zoom once and encode every output from it
+                if det['action'] in ['fighting', 'throwing']:
+                    outputs = self.zoom_processor.render_outputs(
+                        image,
+                        bbox,
+                        detection_info,
+                        plan=self.config['zoom_render_plan'],
+                        gif_path=os.path.join(
+                            self.config['zoom_outputs_dir'],
+                            'gifs',
+                            f"zoom_{det['action']}_{i+1}.gif"
+                        ),
+                        mp4_path=os.path.join(
+                            self.config['zoom_outputs_dir'],
+                            'gifs',
+                            f"animation_{det['action']}_{i+1}.mp4"
+                        )
+                    )
+                    self._collect_zoom_outputs(results, outputs)
+                    if outputs['tile'] is not None:
+                        problematic_crops.append(outputs['tile'])
+                else:
+                    # Save a cropped image
+                    crop_path = self.zoom_processor.save_crop(
+                        image, 
+                        bbox, 
+                        detection_info
+                    )
+                    results['crops'].append(crop_path)
+        
+        # Create a grid of problematic detections if any
+        if problematic_crops:
+            grid_path = os.path.join(
+                self.config['zoom_outputs_dir'],
+                'detection_grid.jpg'
+            )
+            self.zoom_processor.save_detection_grid(
+                problematic_crops,
+                grid_path
+            )
+            results['grids'].append(grid_path)
+        
+        # Create output image with highlighted detections
+        if output_path:
+            output_img = image.copy()
+            
+            for det in detections:
+                bbox = det['bbox']
+                
+                # Determine color based on action
+                color = (0, 0, 255) if det['action'] in ['fighting', 'throwing'] else (0, 255, 0)
+                
+                # Highlight detection with zoom box for problematic behaviors
+                if det['action'] in ['fighting', 'throwing']:
+                    output_img = self.zoom_processor.highlight_detection(
+                        output_img,
+                        bbox,
+                        color=color,
+                        zoom_box=True
+                    )
+                else:
+                    # Just draw bounding box for normal behaviors
+                    x1, y1, x2, y2 = bbox
+                    cv2.rectangle(output_img, (x1, y1), (x2, y2), color, 2)
+                    
+                    # Draw label
+                    label = f"{det['team']}/{det['action']}"
+                    cv2.putText(output_img, label, (x1, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+            
+            # Save the output image
+            cv2.imwrite(output_path, output_img)
+        
+        return detections, alerts, results
+    
+    def process_video(self, video_path, output_path=None, generate_alerts=True, zoom_on_detections=True, frame_interval=None):
+        """
+        Process a video with camera control and zoom.
+        
+        Args:
+            video_path: Path to the input video
+            output_path: Path to save the output video (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            zoom_on_detections: Whether to zoom in on detections
+            frame_interval: Process every Nth frame to reduce computation; None picks
+                            frames by motion (every 5th frame if adaptive_sampling is off)
+            
+        Returns:
+            all_detections: List of detections for each processed frame
+            all_alerts: List of generated alerts
+            all_results: Dictionary with paths to all generated outputs
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        # Open video
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+            
+        # Get video properties
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        
+        # Create output video writer if needed
+        out = None
+        if output_path:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+            
+        # Create output directory for video frames
+        frames_dir = os.path.join(self.config['zoom_outputs_dir'], 'video_frames')
+        os.makedirs(frames_dir, exist_ok=True)
+        
+        # Choose motion-gated sampling unless a fixed interval is requested
+        scheduler = self.monitoring_system.create_frame_scheduler(video_path) if frame_interval is None else None
+        frame_interval = frame_interval or 5
+        
+        # Process frames
+        all_detections = []
+        all_alerts = []
+        all_results = {
+            'crops': [],
+            'zooms': [],
+            'sequences': [],
+            'animations': [],
+            'grids': [],
+            'frames': []
+        }
+        
+        frame_count = 0
+        self.monitoring_system.reset_tracker(video_path)
+        problematic_frames = []
+        meter = self.metrics.stream(video_path, fps)
+        recorder = self.monitoring_system.create_event_recorder(video_path, fps)
+        
+        while cap.isOpened():
+            ret, frame = meter.read(cap)
+            if not ret:
+                break
+                
+            # Process frames with activity, or every Nth frame
+            if self.monitoring_system.should_process_frame(scheduler, frame, frame_count, frame_interval):
+                # Process the frame in memory, timed by its position in the video
+                detections, alerts = self.monitoring_system.process_frame(
+                    frame, 
+                    output_path=None,
+                    generate_alerts=generate_alerts,
+                    stream_id=video_path,
+                    timestamp=frame_count / fps if fps else None
+                )
+                
+                all_detections.append(detections)
+                all_alerts.extend(alerts)
+                
+                # Check if frame has problematic behaviors
+                has_problematic = any(det['action'] in ['fighting', 'throwing'] for det in detections)
+                
+                # Process each detection with camera control and zoom
+                for i, det in enumerate(detections):
+                    # Extract bounding box
+                    bbox = det['bbox']
+                    
+                    # Create detection info
+                    detection_info = {
+                        'type': det['action'],
+                        'team': det['team'],
+                        'confidence': det['action_score'],
+                        'frame': frame_count
+                    }
+                    
+                    # Zoom in on the detection
+                    if zoom_on_detections:
+                        # For problematic behaviors, render the zoom once and encode every output from it
+                        if det['action'] in ['fighting', 'throwing']:
+                            outputs = self.zoom_processor.render_outputs(
+                                frame,
+                                bbox,
+                                detection_info,
+                                plan=self._video_render_plan(),
+                                gif_path=os.path.join(
+                                    self.config['zoom_outputs_dir'],
+                                    'gifs',
+                                    f"zoom_{det['action']}_frame{frame_count}_{i+1}.gif"
+                                )
+                            )
+                            self._collect_zoom_outputs(all_results, outputs)
+                        else:
+                            # Save a cropped image
+                            crop_path = self.zoom_processor.save_crop(
+                                frame, 
+                                bbox, 
+                                detection_info
+                            )
+                            all_results['crops'].append(crop_path)
+                    
+                    # Draw bounding box on frame
+                    xmin, ymin, xmax, ymax = bbox
+                    
+                    # Determine color based on action
+                    color = (0, 0, 255) if det['action'] in ['fighting', 'throwing'] else (0, 255, 0)
+                    
+                    # Highlight detection with zoom box for problematic behaviors
+                    if det['action'] in ['fighting', 'throwing']:
+                        frame = self.zoom_processor.highlight_detection(
+                            frame,
+                            bbox,
+                            color=color,
+                            zoom_box=True
+                        )
+                    else:
+                        # Just draw bounding box for normal behaviors
+                        cv2.rectangle(frame, (xmin, ymin), (xmax, ymax), color, 2)
+                        
+                        # Draw label
+                        label = f"{det['team']}/{det['action']}"
+                        cv2.putText(frame, label, (xmin, ymin-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+                
+                # Save problematic frames, unless event clips already cover them
+                if has_problematic and recorder is None:
+                    frame_path = os.path.join(frames_dir, f"frame_{frame_count}.jpg")
+                    self._save_frame(frame_path, frame)
+                    problematic_frames.append(frame_path)
+                    all_results['frames'].append(frame_path)
+            
+            # Keep the frame for the pre-roll and post-roll of event clips
+            if recorder is not None:
+                recorder.push(frame, frame_count / fps if fps else None)
+                
+            # Write frame to output video
+            if out:
+                meter.write(out, frame)
+                
+            frame_count += 1
+            
+            # Print progress
+            if frame_count % 100 == 0:
+                print(f"Processed {frame_count}/{total_frames} frames ({frame_count/total_frames*100:.1f}%)")
+        
+        # Create a grid of problematic frames if any
+        if problematic_frames:
+            grid_path = os.path.join(
+                self.config['zoom_outputs_dir'],
+                'problematic_frames_grid.jpg'
+            )
+            self.zoom_processor.save_detection_grid(
+                problematic_frames,
+                grid_path,
+                grid_size=(2, 3),
+                cell_size=(320, 240)
+            )
+            all_results['grids'].append(grid_path)
+                
+        # Release resources
+        cap.release()
+        if out:
+            meter.release(out, output_path)
+        if recorder is not None:
+            all_results['clips'] = list(recorder.clips)
+            self.monitoring_system.close_event_recorder(video_path)
+            
+        self.monitoring_system.record_sampling_stats(video_path, scheduler)
+        
+        # Make sure all queued artifacts are written
+        self.monitoring_system.flush_artifacts()
+        
+        return all_detections, all_alerts, all_results
+    
+    def process_live_feed(self, camera_id=0, output_path=None, generate_alerts=True, zoom_on_detections=True, duration=None, frame_interval=None,
+                          display=None):
+        """
+        Process a live camera feed with camera control and zoom.
+        
+        Frames are taken from a capture thread as in StadiumMonitoringSystem.process_live_feed(),
+        so with live_latest_frame enabled the loop always works on the newest view.
+        
+        Args:
+            camera_id: Camera ID or RTSP URL
+            output_path: Path to save the output video (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            zoom_on_detections: Whether to zoom in on detections
+            duration: Duration to process in seconds (None for indefinite)
+            frame_interval: Process every Nth frame to reduce computation; None picks
+                            frames by motion (every 5th frame if adaptive_sampling is off)
+            display: Whether to show the preview windows (default: live_display config)
+            
+        Returns:
+            all_alerts: List of generated alerts, each with its capture timestamp and
+                        capture-to-alert latency in milliseconds
+            all_results: Dictionary with paths to all generated outputs
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        if display is None:
+            display = self.monitoring_system.config['live_display']
+            
+        # Open camera on its capture thread
+        meter = self.metrics.stream(camera_id)
+        capture = self.monitoring_system.open_live_capture(camera_id, meter)
+        meter.fps = capture.fps
+        width, height, fps = capture.width, capture.height, capture.fps
+        
+        # Create output video writer if needed
+        out = None
+        if output_path:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+            
+        # Create output directory for live frames
+        frames_dir = os.path.join(self.config['zoom_outputs_dir'], 'live_frames')
+        os.makedirs(frames_dir, exist_ok=True)
+        
+        # Create windows for display
+        if display:
+            cv2.namedWindow('Stadium Monitoring', cv2.WINDOW_NORMAL)
+            cv2.namedWindow('Detection Zoom', cv2.WINDOW_NORMAL)
+        
+        # Choose motion-gated sampling unless a fixed interval is requested
+        scheduler = self.monitoring_system.create_frame_scheduler(camera_id) if frame_interval is None else None
+        frame_interval = frame_interval or 5
+        
+        # Process frames
+        all_alerts = []
+        all_results = {
+            'crops': [],
+            'zooms': [],
+            'sequences': [],
+            'animations': [],
+            'grids': [],
+            'frames': []
+        }
+        
+        frame_count = 0
+        start_time = time.time()
+        latency = LiveLatency(camera_id, self.metrics)
+        recorder = self.monitoring_system.create_event_recorder(
+            camera_id, fps, name=f"camera{camera_id}" if isinstance(camera_id, int) else None
+        )
+        
+        try:
+            while True:
+                # Check if duration exceeded
+                if duration and time.time() - start_time > duration:
+                    break
+                    
+                # Take the newest frame; wake up regularly to check the duration
+                item = capture.read(timeout=0.5)
+                if item is None:
+                    if capture.finished:
+                        break
+                    continue
+                frame, _, capture_time = item
+                
+                # Process frames with activity, or every Nth frame
+                if self.monitoring_system.should_process_frame(scheduler, frame, frame_count, frame_interval):
+                    # Process the frame in memory
+                    detections, alerts = self.monitoring_system.process_frame(
+                        frame, 
+                        output_path=None,
+                        generate_alerts=generate_alerts,
+                        stream_id=camera_id,
+                        timestamp=capture_time,
+                        capture_time=capture_time
+                    )
+                    
+                    # Measure the latency from capture to results and alerts
+                    latency.record(capture_time, alerts)
+                    all_alerts.extend(alerts)
+                    
+                    # Check if frame has problematic behaviors
+                    has_problematic = any(det['action'] in ['fighting', 'throwing'] for det in detections)
+                    
+                    # Process each detection with camera control and zoom
+                    for i, det in enumerate(detections):
+                        # Extract bounding box
+                        bbox = det['bbox']
+                        
+                        # Create detection info
+                        detection_info = {
+                            'type': det['action'],
+                            'team': det['team'],
+                            'confidence': det['action_score']
+                        }
+                        
+                        # Zoom in on the detection
+                        if zoom_on_detections:
+                            # Get zoomed crop
+                            zoomed = self.zoom_processor.crop_detection(
+                                frame, 
+                                bbox, 
+                                padding=20
+                            )
+                            
+                            # Display the zoomed detection
+                            if display:
+                                cv2.imshow('Detection Zoom', zoomed)
+                            
+                            # For problematic behaviors, create enhanced visualizations
+                            if det['action'] in ['fighting', 'throwing']:
+                                # Save the problematic frame, unless event clips already cover it
+                                if recorder is None:
+                                    frame_path = os.path.join(frames_dir, f"frame_{int(time.time())}_{i+1}.jpg")
+                                    self._save_frame(frame_path, frame)
+                                    all_results['frames'].append(frame_path)
+                                
+                                # Render the zoom once and encode every output from it
+                                outputs = self.zoom_processor.render_outputs(
+                                    frame,
+                                    bbox,
+                                    detection_info,
+                                    plan=self._video_render_plan(),
+                                    gif_path=os.path.join(
+                                        self.config['zoom_outputs_dir'],
+                                        'gifs',
+                                        f"zoom_{det['action']}_{int(time.time())}_{i+1}.gif"
+                                    )
+                                )
+                                self._collect_zoom_outputs(all_results, outputs)
+                            else:
+                                # Save a cropped image
+                                crop_path = self.zoom_processor.save_crop(
+                                    frame, 
+                                    bbox, 
+                                    detection_info
+                                )
+                                all_results['crops'].append(crop_path)
+                        
+                        # Highlight detection with zoom box for problematic behaviors
+                        if det['action'] in ['fighting', 'throwing']:
+                            color = (0, 0, 255)  # Red for problematic behaviors
+                            frame = self.zoom_processor.highlight_detection(
+                                frame,
+                                bbox,
+                                color=color,
+                                zoom_box=True
+                            )
+                        else:
+                            # Just draw bounding box for normal behaviors
+                            color = (0, 255, 0)  # Green for normal behaviors
+                            xmin, ymin, xmax, ymax = bbox
+                            cv2.rectangle(frame, (xmin, ymin), (xmax, ymax), color, 2)
+                            
+                            # Draw label
+                            label = f"{det['team']}/{det['action']}"
+                            cv2.putText(frame, label, (xmin, ymin-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+                
+                # Keep the frame for the pre-roll and post-roll of event clips
+                if recorder is not None:
+                    recorder.push(frame, capture_time)
+                    
+                # Write frame to output video
+                if out:
+                    meter.write(out, frame)
+                    
+                frame_count += 1
+                
+                # Display frame and exit on 'q' key press
+                if display:
+                    cv2.imshow('Stadium Monitoring', frame)
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+        finally:
+            # Release resources
+            capture.stop()
+            
+        if out:
+            meter.release(out, output_path)
+        if recorder is not None:
+            all_results['clips'] = list(recorder.clips)
+            self.monitoring_system.close_event_recorder(camera_id)
+        if display:
+            cv2.destroyAllWindows()
+        
+        self.monitoring_system.record_sampling_stats(camera_id, scheduler)
+        self.monitoring_system.record_live_stats(camera_id, capture, latency)
+        
+        # Make sure all queued artifacts are written
+        self.monitoring_system.flush_artifacts()
+        
+        return all_alerts, all_results
+    
+    def scan_and_monitor(self, image_path, output_path=None, generate_alerts=True, save_scans=None):
+        """
+        Scan an image and monitor for problematic behaviors with camera movement.
+        
+        All views of the scan pattern are gathered up front and run through the
+        detector in batches, detections are mapped back to image coordinates and
+        duplicates from overlapping views are merged with non-maximum suppression.
+        
+        Args:
+            image_path: Path to the input image
+            output_path: Path to save the output image (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            save_scans: Whether to save each scanned view (default: config['save_scan_crops'])
+            
+        Returns:
+            detections: List of detections
+            alerts: List of generated alerts
+            results: Dictionary with paths to all generated outputs
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        if save_scans is None:
+            save_scans = self.config['save_scan_crops']
+            
+        # Load the image
+        with self.metrics.timer('decode'):
+            image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError(f"Could not load image: {image_path}")
+            
+        # Create a copy for visualization
+        vis_image = image.copy()
+        
+        # Initialize results
+        all_alerts = []
+        results = {
+            'crops': [],
+            'zooms': [],
+            'sequences': [],
+            'animations': [],
+            'grids': [],
+            'scans': []
+        }
+        
+        # Collect the views visited by the scan pattern
+        windows = self.camera_controller.scan_windows(image)
+        
+        # Optionally save the scanned views
+        if save_scans:
+            scans_dir = os.path.join(self.config['zoom_outputs_dir'], 'scans')
+            os.makedirs(scans_dir, exist_ok=True)
+            
+            for scan_count, (x1, y1, x2, y2) in enumerate(windows, start=1):
+                scan_path = os.path.join(scans_dir, f"scan_{scan_count}.jpg")
+                cv2.imwrite(scan_path, image[y1:y2, x1:x2])
+                results['scans'].append(scan_path)
+        
+        # Detect fans across all views with batched inference and global NMS
+        all_detections = []
+        if self.monitoring_system.detector:
+            with self.metrics.timer('scan'):
+                all_detections = self.monitoring_system.detect_tiles(
+                    image,
+                    windows,
+                    batch_size=self.config['scan_batch_size'],
+                    iou_threshold=self.config['scan_nms_iou_threshold']
+                )
+        else:
+            # Without a detector the scan still produces its views and outputs
+            print("Warning: Detector not available. Scan has no detections.")
+        self.metrics.increment('frames_processed')
+        self.metrics.increment('detections', len(all_detections))
+        
+        # Generate alerts against the full image
+        if generate_alerts and all_detections:
+            with self.metrics.timer('alerts'):
+                pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                all_alerts = self.monitoring_system.generate_detection_alerts(pil_image, all_detections)
+        
+        # Process each detection
+        problematic_crops = []
+        
+        for i, det in enumerate(all_detections):
+            bbox = det['bbox']
+            
+            # Create detection info
+            detection_info = {
+                'type': det['action'],
+                'team': det['team'],
+                'confidence': det['action_score']
+            }
+            
+            # For problematic behaviors, render the zoom once and encode every output from it
+            if det['action'] in ['fighting', 'throwing']:
+                outputs = self.zoom_processor.render_outputs(
+                    image,
+                    bbox,
+                    detection_info,
+                    plan=self.config['zoom_render_plan'],
+                    gif_path=os.path.join(
+                        self.config['zoom_outputs_dir'],
+                        'gifs',
+                        f"zoom_{det['action']}_{i+1}.gif"
+                    ),
+                    mp4_path=os.path.join(
+                        self.config['zoom_outputs_dir'],
+                        'gifs',
+                        f"animation_{det['action']}_{i+1}.mp4"
+                    )
+                )
+                self._collect_zoom_outputs(results, outputs)
+                if outputs['tile'] is not None:
+                    problematic_crops.append(outputs['tile'])
+            else:
+                # Save a zoomed crop
+                crop_path = self.zoom_processor.save_crop(
+                    image, 
+                    bbox, 
+                    detection_info
+                )
+                results['crops'].append(crop_path)
+            
+            # Highlight detection in visualization image
+            if det['action'] in ['fighting', 'throwing']:
+                color = (0, 0, 255)  # Red for problematic behaviors
+                vis_image = self.zoom_processor.highlight_detection(
+                    vis_image,
+                    bbox,
+                    color=color,
+                    zoom_box=True
+                )
+            else:
+                # Just draw bounding box for normal behaviors
+                color = (0, 255, 0)  # Green for normal behaviors
+                xmin, ymin, xmax, ymax = bbox
+                cv2.rectangle(vis_image, (xmin, ymin), (xmax, ymax), color, 2)
+                
+                # Draw label
+                label = f"{det['team']}/{det['action']}"
+                cv2.putText(vis_image, label, (xmin, ymin-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+        
+        # Create a grid of problematic detections if any
+        if problematic_crops:
+            grid_path = os.path.join(
+                self.config['zoom_outputs_dir'],
+                'problematic_detections_grid.jpg'
+            )
+            self.zoom_processor.save_detection_grid(
+                problematic_crops,
+                grid_path
+            )
+            results['grids'].append(grid_path)
+                
+        # Save the visualization image
+        if output_path:
+            cv2.imwrite(output_path, vis_image)
+            
+        print(f"Completed {len(windows)} scans, found {len(all_detections)} detections")
+        
+        # Make sure all queued artifacts are written
+        self.monitoring_system.flush_artifacts()
+        
+        return all_detections, all_alerts, results
+    
+    def _save_frame(self, frame_path, frame):
+        """Save a full frame, in the background when an artifact writer is available."""
+        writer = self.monitoring_system.artifact_writer
+        if writer is not None:
+            # Copy since the frame keeps being annotated after it is queued
+            writer.write_image(frame_path, frame.copy(), PRIORITY_FRAME)
+        else:
+            cv2.imwrite(frame_path, frame)
+    
+    def _video_render_plan(self):
+        """Render plan for video and live frames, which skip the MP4 animation."""
+        return dict(self.config['zoom_render_plan'] or {}, mp4=False, tile=False)
+    
+    def _collect_zoom_outputs(self, results, outputs):
+        """
+        Add the outputs of ZoomProcessor.render_outputs() to a results dictionary.
+        
+        Args:
+            results: Results dictionary with crops, sequences, zooms and animations lists
+            outputs: Dictionary returned by render_outputs()
+        """
+        if outputs['crop']:
+            results['crops'].append(outputs['crop'])
+        if outputs['sequence']:
+            results['sequences'].append(outputs['sequence'])
+        if outputs['gif']:
+            results['zooms'].append(outputs['gif'])
+        if outputs['mp4'] and 'animations' in results:
+            results['animations'].append(outputs['mp4'])
+    
+    def report_metrics(self):
+        """Print per-stage latencies and the pipeline counters."""
+        self.monitoring_system.report_metrics()
+    
+    def stop_metrics(self):
+        """Stop the metrics endpoint and write a final JSON snapshot."""
+        self.monitoring_system.stop_metrics()
+    
+    def generate_report(self, output_path=None):
+        """
+        Generate a summary report of the monitoring system.
+        
+        Args:
+            output_path: Path to save the report (optional)
+            
+        Returns:
+            Report text
+        """
+        # Generate alert report
+        report = self.monitoring_system.alert_system.generate_alert_report(output_path)
+        
+        return report
+    
+    def visualize_alerts(self, output_path=None):
+        """
+        Visualize the distribution of alerts.
+        
+        Args:
+            output_path: Path to save the visualization (optional)
+            
+        Returns:
+            Matplotlib figure
+        """
+        # Visualize alert distribution
+        fig = self.monitoring_system.alert_system.visualize_alert_distribution(output_path)
+        
+        return fig
+    
+    def visualize_section_timeline(self, output_path=None, bucket_seconds=60):
+        """
+        Visualize the number of alerts per stadium section over time.
+        
+        Args:
+            output_path: Path to save the visualization (optional)
+            bucket_seconds: Length of the time buckets in seconds (one of alert_bucket_sizes)
+            
+        Returns:
+            Matplotlib figure
+        """
+        # Visualize alerts per section from the time-bucketed counts
+        fig = self.monitoring_system.visualize_section_timeline(output_path, bucket_seconds)
+        
+        return fig
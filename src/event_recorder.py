@@ -0,0 +1,190 @@
+"""
+Event-clip recorder for the stadium monitoring system.
+This module keeps a fixed-size ring buffer of the most recent frames of a stream and,
+when an alert fires, writes a short clip from a few seconds before the incident until a
+few seconds after it, so disk writes scale with incidents instead of match length.
+"""
+
+import os
+import math
+import time
+from collections import deque
+import cv2
+import numpy as np
+
+from src.artifact_writer import PRIORITY_ANIMATION
+from src.metrics import MetricsRegistry
+
+class EventRecorder:
+    """Pre-roll ring buffer of one stream that writes clips around incidents."""
+
+    def __init__(self, output_dir='clips', name='stream', fps=25.0, pre_roll=5.0, post_roll=5.0,
+                 max_clip_length=60.0, buffer_format='jpeg', jpeg_quality=90, writer=None, metrics=None):
+        """
+        Initialize the event recorder.
+
+        Args:
+            output_dir: Directory to save clips
+            name: Stream name used in clip filenames
+            fps: Frame rate of the stream and of the written clips
+            pre_roll: Seconds of video kept before an incident
+            post_roll: Seconds of video recorded after the last incident of a clip
+            max_clip_length: Maximum clip length in seconds; incidents within the
+                             post-roll of a clip extend it up to this length
+            buffer_format: 'jpeg' to keep JPEG-compressed frames (small, costs an encode
+                           per frame) or 'raw' to copy frames into a preallocated array
+            jpeg_quality: JPEG quality of buffered frames with the 'jpeg' format
+            writer: ArtifactWriter used to encode clips in the background (optional)
+            metrics: MetricsRegistry timing buffering and clip encoding (optional)
+        """
+        if buffer_format not in ('jpeg', 'raw'):
+            raise ValueError(f"Unknown clip buffer format: {buffer_format}")
+
+        self.output_dir = output_dir
+        self.name = name
+        self.fps = fps if fps and fps > 0 else 25.0
+        self.pre_roll = pre_roll
+        self.post_roll = post_roll
+        self.max_clip_length = max_clip_length
+        self.buffer_format = buffer_format
+        self.jpeg_quality = jpeg_quality
+        self.writer = writer
+        self.metrics = metrics if metrics is not None else MetricsRegistry(enabled=False)
+        self.capacity = max(1, int(math.ceil(pre_roll * self.fps)))
+        self.last_timestamp = None
+        self.clips = []
+
+        # Ring of (timestamp, JPEG bytes) for the 'jpeg' format
+        self._jpeg_ring = deque(maxlen=self.capacity)
+
+        # Preallocated frames, timestamps and write position for the 'raw' format
+        self._raw_frames = None
+        self._raw_times = np.full(self.capacity, -np.inf)
+        self._raw_head = 0
+
+        # Clip currently recording its post-roll
+        self._clip = None
+
+        os.makedirs(output_dir, exist_ok=True)
+
+    def push(self, frame, timestamp=None):
+        """
+        Add a frame to the ring buffer and to the clip being recorded, if any.
+
+        Args:
+            frame: BGR image array
+            timestamp: Time of the frame in seconds (defaults to the current time)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self.last_timestamp = timestamp
+
+        with self.metrics.timer('clip_buffer'):
+            item = self._store(frame, timestamp)
+
+        # Feed the post-roll of the current clip and finish it once it is long enough
+        if self._clip is not None:
+            self._clip['frames'].append(item)
+            if timestamp >= self._clip['end']:
+                self._finish_clip()
+
+    def trigger(self, timestamp=None, label=None):
+        """
+        Record a clip around an incident.
+
+        An incident during the post-roll of the current clip extends that clip
+        (up to max_clip_length) instead of starting a new one.
+
+        Args:
+            timestamp: Time of the incident in seconds (defaults to the last pushed frame)
+            label: Short label used in the clip filename, e.g. the alert type (optional)
+
+        Returns:
+            Path the clip will be written to
+        """
+        if timestamp is None:
+            timestamp = self.last_timestamp if self.last_timestamp is not None else time.time()
+
+        # Extend the clip that is still recording
+        if self._clip is not None:
+            self._clip['end'] = min(
+                max(self._clip['end'], timestamp + self.post_roll),
+                self._clip['start'] + self.max_clip_length
+            )
+            return self._clip['path']
+
+        # Start a new clip with the buffered pre-roll
+        filename = f"clip_{self.name}_{label}_{len(self.clips) + 1}.mp4" if label else \
+            f"clip_{self.name}_{len(self.clips) + 1}.mp4"
+        path = os.path.join(self.output_dir, filename)
+        start = timestamp - self.pre_roll
+        self._clip = {
+            'path': path,
+            'start': start,
+            'end': min(timestamp + self.post_roll, start + self.max_clip_length),
+            'frames': self._pre_roll_frames(start)
+        }
+        self.clips.append(path)
+        return path
+
+    def close(self):
+        """Write the clip being recorded, if any, with the post-roll received so far."""
+        if self._clip is not None:
+            self._finish_clip()
+
+    def _store(self, frame, timestamp):
+        """Put a frame into the ring buffer and return the item clips keep for it."""
+        if self.buffer_format == 'jpeg':
+            ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            item = encoded.tobytes()
+            self._jpeg_ring.append((timestamp, item))
+            return item
+
+        # Allocate the ring once, or again if the frame size changes
+        if self._raw_frames is None or self._raw_frames.shape[1:] != frame.shape:
+            self._raw_frames = np.empty((self.capacity,) + frame.shape, dtype=frame.dtype)
+            self._raw_times[:] = -np.inf
+            self._raw_head = 0
+
+        slot = self._raw_head
+        self._raw_frames[slot] = frame
+        self._raw_times[slot] = timestamp
+        self._raw_head = (slot + 1) % self.capacity
+        return self._raw_frames[slot].copy() if self._clip is not None else None
+
+    def _pre_roll_frames(self, start):
+        """Copy the buffered frames at or after start, oldest first."""
+        if self.buffer_format == 'jpeg':
+            return [item for timestamp, item in self._jpeg_ring if timestamp >= start]
+
+        if self._raw_frames is None:
+            return []
+
+        # Walk the ring from the oldest slot; raw slots are copied since they get overwritten
+        order = (np.arange(self.capacity) + self._raw_head) % self.capacity
+        return [self._raw_frames[slot].copy() for slot in order if self._raw_times[slot] >= start]
+
+    def _finish_clip(self):
+        """Hand the finished clip to the encoder."""
+        clip, self._clip = self._clip, None
+        if not clip['frames']:
+            return
+
+        if self.writer is not None:
+            self.writer.submit(PRIORITY_ANIMATION, self._encode_clip, clip['frames'], clip['path'])
+        else:
+            self._encode_clip(clip['frames'], clip['path'])
+
+    def _encode_clip(self, frames, output_path):
+        """Encode buffered frames as an MP4 clip."""
+        with self.metrics.timer('clip_encode'):
+            out = None
+            for item in frames:
+                frame = cv2.imdecode(np.frombuffer(item, np.uint8), cv2.IMREAD_COLOR) if isinstance(item, bytes) else item
+                if out is None:
+                    height, width = frame.shape[:2]
+                    out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, (width, height))
+                out.write(frame)
+            out.release()
+        self.metrics.add_file_bytes(output_path, 'clip')
+
+        return output_path
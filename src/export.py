@@ -0,0 +1,173 @@
+"""
+Model export utilities for stadium crowd detection system.
+This module converts the trained .h5 models into TensorFlow Lite (float16 or
+int8 with calibration data from StadiumDataset) and ONNX models for the
+lightweight inference backends.
+"""
+
+import os
+import json
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import models
+
+from src.backends import export_metadata_path
+from src.dense_head import normalize_pixels
+
+EXPORT_FORMATS = ('tflite-fp16', 'tflite-int8', 'onnx')
+
+def detector_calibration_images(dataset, input_shape, num_samples=100):
+    """
+    Yield full stadium images for int8 calibration of the detector.
+
+    Images are preprocessed the same way as StadiumCrowdDetector.preprocess_image().
+
+    Args:
+        dataset: StadiumDataset with loaded annotations
+        input_shape: Detector input shape (height, width, channels)
+        num_samples: Maximum number of images
+
+    Yields:
+        Float32 arrays of shape (1, height, width, channels)
+    """
+    for image_id in dataset.image_ids[:num_samples]:
+        image = tf.io.read_file(dataset.get_image_path(image_id))
+        image = tf.image.decode_png(image, channels=3)
+        image = normalize_pixels(tf.image.resize(image, (input_shape[0], input_shape[1])))
+        yield image.numpy()[np.newaxis].astype(np.float32)
+
+def crop_calibration_images(dataset, crop_shape, num_samples=200):
+    """
+    Yield annotated fan crops for int8 calibration of the crop classifiers.
+
+    Crops are resized the same way as StadiumMonitoringSystem crops detections.
+
+    Args:
+        dataset: StadiumDataset with loaded annotations
+        crop_shape: Classifier input shape (height, width, channels)
+        num_samples: Maximum number of crops
+
+    Yields:
+        Float32 arrays of shape (1, height, width, channels)
+    """
+    count = 0
+    for image_id in dataset.image_ids:
+        image = tf.io.read_file(dataset.get_image_path(image_id))
+        image = tf.image.decode_png(image, channels=3)
+        height, width = image.shape[:2]
+
+        for ann in dataset.get_annotations_for_image(image_id):
+            x, y, w, h = ann['bbox']
+            box = [[y / height, x / width, (y + h) / height, (x + w) / width]]
+            crop = tf.image.crop_and_resize(image[tf.newaxis], box, [0], (crop_shape[0], crop_shape[1]))
+            yield crop.numpy().astype(np.float32)
+
+            count += 1
+            if count >= num_samples:
+                return
+
+def export_tflite(keras_model, output_path, precision='fp16', calibration_images=None):
+    """
+    Convert a Keras model to TensorFlow Lite.
+
+    Args:
+        keras_model: Loaded Keras model
+        output_path: Path of the .tflite file to write
+        precision: 'fp16' for float16 weights or 'int8' for full integer quantization
+        calibration_images: Callable returning an iterator of calibration batches
+                            (required for 'int8')
+
+    Returns:
+        Path to the written model
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if precision == 'fp16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif precision == 'int8':
+        if calibration_images is None:
+            raise ValueError("int8 export requires calibration images")
+        converter.representative_dataset = lambda: ([batch] for batch in calibration_images())
+        # Integer kernels throughout; inputs and outputs stay float so callers are unchanged
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    else:
+        raise ValueError(f"Unknown TFLite precision: {precision}")
+
+    with open(output_path, 'wb') as f:
+        f.write(converter.convert())
+
+    return output_path
+
+def export_onnx(keras_model, output_path, opset=13):
+    """
+    Convert a Keras model to ONNX.
+
+    Args:
+        keras_model: Loaded Keras model
+        output_path: Path of the .onnx file to write
+        opset: ONNX opset version
+
+    Returns:
+        Path to the written model
+    """
+    try:
+        import tf2onnx
+    except ImportError:
+        raise ImportError("ONNX export requires the tf2onnx package (pip install tf2onnx)")
+
+    input_shape = keras_model.inputs[0].shape
+    signature = (tf.TensorSpec((None,) + tuple(input_shape[1:]), tf.float32, name='input'),)
+    tf2onnx.convert.from_keras(keras_model, input_signature=signature, opset=opset, output_path=output_path)
+
+    return output_path
+
+def export_model(model_path, formats=EXPORT_FORMATS, calibration_images=None, output_dir=None):
+    """
+    Export a trained .h5 model to the requested formats.
+
+    Exported files are written next to the .h5 file (or to output_dir) as
+    <name>.fp16.tflite, <name>.int8.tflite and <name>.onnx, which is where
+    the inference backends look for them.
+
+    Args:
+        model_path: Path to the .h5 model
+        formats: Export formats ('tflite-fp16', 'tflite-int8', 'onnx')
+        calibration_images: Callable returning an iterator of calibration batches
+                            (required for 'tflite-int8')
+        output_dir: Directory for the exported models (optional)
+
+    Returns:
+        List of exported model paths
+    """
+    keras_model = models.load_model(model_path, compile=False)
+
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    output_dir = output_dir or os.path.dirname(model_path)
+    os.makedirs(output_dir or '.', exist_ok=True)
+
+    exported = []
+    for export_format in formats:
+        if export_format == 'tflite-fp16':
+            path = export_tflite(keras_model, os.path.join(output_dir, f"{stem}.fp16.tflite"), 'fp16')
+        elif export_format == 'tflite-int8':
+            path = export_tflite(keras_model, os.path.join(output_dir, f"{stem}.int8.tflite"), 'int8',
+                                 calibration_images)
+        elif export_format == 'onnx':
+            path = export_onnx(keras_model, os.path.join(output_dir, f"{stem}.onnx"))
+        else:
+            raise ValueError(f"Unknown export format: {export_format}")
+
+        # Record the output order so backends return outputs like the Keras model
+        with open(export_metadata_path(path), 'w') as f:
+            json.dump({
+                'source': model_path,
+                'format': export_format,
+                'input_shape': list(keras_model.inputs[0].shape[1:]),
+                'output_names': list(keras_model.output_names)
+            }, f, indent=2)
+
+        print(f"Exported {model_path} to {path}")
+        exported.append(path)
+
+    return exported
@@ -0,0 +1,343 @@
+"""
+Inference script for the stadium crowd detection model.
+This script loads a trained model and performs detection and classification on images.
+"""
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw
+from src.model import FanDetectionModel
+from src.metrics import MetricsRegistry
+from src.seat_map import SeatMap
+from src.dense_head import decode_dense_predictions, normalize_pixels
+
+class StadiumCrowdDetector:
+    """Class for detecting and classifying fans in stadium images."""
+    
+    def __init__(self, model_path, input_shape=(384, 512, 3), backend='keras', precision='int8', num_threads=None,
+                 cache_dir=None, metrics=None, score_threshold=0.5, max_detections=300, nms_iou_threshold=0.5):
+        """
+        Initialize the detector.
+        
+        Args:
+            model_path: Path to the trained model
+            input_shape: Input image shape (height, width, channels)
+            backend: Inference backend ('keras', 'tf-function', 'tflite' or 'onnxruntime')
+            precision: TFLite precision to load ('int8' or 'fp16')
+            num_threads: CPU threads for the TFLite and ONNX Runtime backends (optional)
+            cache_dir: Precompiled model cache used by the tf-function backend (optional)
+            metrics: MetricsRegistry timing the decode, preprocess, inference and postprocess stages (optional)
+            score_threshold: Minimum detection score of a fan
+            max_detections: Maximum fans decoded per image by the dense head
+            nms_iou_threshold: IoU above which the dense head's overlapping boxes are merged
+        """
+        self.input_shape = input_shape
+        self.score_threshold = score_threshold
+        self.max_detections = max_detections
+        self.nms_iou_threshold = nms_iou_threshold
+        self.metrics = metrics if metrics is not None else MetricsRegistry(enabled=False)
+        self.model = FanDetectionModel(input_shape=input_shape)
+        self.model.load_backend(model_path, backend=backend, precision=precision, num_threads=num_threads,
+                                cache_dir=cache_dir)
+        self.team_mapping = {0: 'hilal', 1: 'ittihad'}
+        self.action_mapping = {0: 'sitting', 1: 'cheering', 2: 'fighting', 3: 'throwing'}
+        
+    def preprocess_image(self, image_path):
+        """
+        Preprocess an image for inference.
+        
+        Args:
+            image_path: Path to the image file
+            
+        Returns:
+            Preprocessed image tensor
+        """
+        import tensorflow as tf
+        
+        with self.metrics.timer('decode'):
+            image = tf.io.read_file(image_path)
+            image = tf.image.decode_png(image, channels=3)
+        with self.metrics.timer('preprocess'):
+            image = tf.image.resize(image, (self.input_shape[0], self.input_shape[1]))
+            image = normalize_pixels(image)
+        return image
+    
+    def preprocess_array(self, frame):
+        """
+        Preprocess an in-memory frame for inference.
+        
+        Args:
+            frame: BGR image array as returned by cv2.imread / cv2.VideoCapture
+            
+        Returns:
+            Preprocessed float32 image array, normalized like preprocess_image()
+        """
+        with self.metrics.timer('preprocess'):
+            # Bilinear resize in float32, the same values tf.image.resize gives
+            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB).astype(np.float32)
+            image = cv2.resize(image, (self.input_shape[1], self.input_shape[0]), interpolation=cv2.INTER_LINEAR)
+        return normalize_pixels(image)
+    
+    def detect(self, image_path):
+        """
+        Detect and classify fans in an image.
+        
+        Args:
+            image_path: Path to the image file
+            
+        Returns:
+            Detections: list of dictionaries with bbox, team, action, and scores
+        """
+        # Preprocess the image
+        image = self.preprocess_image(image_path)
+        
+        return self._detect_preprocessed(image)
+    
+    def detect_array(self, frame):
+        """
+        Detect and classify fans in an in-memory frame without touching disk.
+        
+        Args:
+            frame: BGR image array as returned by cv2.imread / cv2.VideoCapture
+            
+        Returns:
+            Detections: list of dictionaries with bbox, team, action, and scores
+            (coordinates are in model input space, as for detect())
+        """
+        # Preprocess the frame
+        image = self.preprocess_array(frame)
+        
+        return self._detect_preprocessed(image)
+    
+    def detect_batch(self, frames):
+        """
+        Detect and classify fans in a batch of in-memory frames with one forward pass.
+        
+        Args:
+            frames: List of BGR image arrays (e.g. scan tiles of the same view size)
+            
+        Returns:
+            List with one detection list per frame (coordinates in model input space)
+        """
+        if not frames:
+            return []
+            
+        batch = np.stack([self.preprocess_array(frame) for frame in frames])
+            
+        # Make prediction
+        with self.metrics.timer('inference', model='detector'):
+            bbox_pred, class_pred, team_pred, action_pred = self.model.predict(batch)
+        
+        with self.metrics.timer('postprocess'):
+            return self._decode_batch(bbox_pred, class_pred, team_pred, action_pred)
+    
+    def _detect_preprocessed(self, image):
+        """Run the model on a preprocessed image tensor and decode its predictions."""
+        # Make prediction
+        with self.metrics.timer('inference', model='detector'):
+            bbox_pred, class_pred, team_pred, action_pred = self.model.predict(image)
+        
+        with self.metrics.timer('postprocess'):
+            return self._decode_batch(bbox_pred, class_pred, team_pred, action_pred)[0]
+    
+    def _decode_batch(self, bbox_pred, class_pred, team_pred, action_pred):
+        """Convert the model outputs for a batch into one detection list per image."""
+        # Single-box models predict one vector per image; decode them image by image
+        if np.ndim(class_pred) != 4:
+            return [
+                self._decode_predictions(bbox_pred[i], class_pred[i], team_pred[i], action_pred[i])
+                for i in range(len(class_pred))
+            ]
+            
+        # Dense head: decode the whole batch at once
+        decoded = decode_dense_predictions(
+            class_pred, bbox_pred, team_pred, action_pred,
+            image_size=self.input_shape[:2],
+            score_threshold=self.score_threshold,
+            max_detections=self.max_detections,
+            iou_threshold=self.nms_iou_threshold
+        )
+        
+        detections = []
+        for image in decoded:
+            boxes = np.round(image['boxes']).astype(int).tolist()
+            detections.append([
+                {
+                    'bbox': box,
+                    'team': self.team_mapping[int(team_idx)],
+                    'action': self.action_mapping[int(action_idx)],
+                    'class_score': float(score),
+                    'team_score': float(team_score),
+                    'action_score': float(action_score)
+                }
+                for box, score, team_idx, team_score, action_idx, action_score in zip(
+                    boxes, image['scores'], image['team_ids'], image['team_scores'],
+                    image['action_ids'], image['action_scores']
+                )
+            ])
+            
+        return detections
+    
+    def _decode_predictions(self, bbox_pred, class_pred, team_pred, action_pred):
+        """Convert the model outputs for a single image into detection dictionaries."""
+        # The single-box head predicts one box per image; decode it as a list of one
+        if np.ndim(bbox_pred) == 1:
+            bbox_pred = np.asarray(bbox_pred)[np.newaxis]
+            class_pred = np.asarray(class_pred).reshape(1)
+            team_pred = np.asarray(team_pred)[np.newaxis]
+            action_pred = np.asarray(action_pred)[np.newaxis]
+            
+        detections = []
+        for i in range(len(bbox_pred)):
+            # Only consider detections with high confidence
+            if class_pred[i] > self.score_threshold:
+                # Convert normalized coordinates to pixel coordinates
+                ymin, xmin, ymax, xmax = bbox_pred[i]
+                xmin = int(xmin * self.input_shape[1])
+                ymin = int(ymin * self.input_shape[0])
+                xmax = int(xmax * self.input_shape[1])
+                ymax = int(ymax * self.input_shape[0])
+                
+                # Get team and action predictions
+                team_idx = np.argmax(team_pred[i])
+                action_idx = np.argmax(action_pred[i])
+                
+                detections.append({
+                    'bbox': [xmin, ymin, xmax, ymax],
+                    'team': self.team_mapping[team_idx],
+                    'action': self.action_mapping[action_idx],
+                    'class_score': float(class_pred[i]),
+                    'team_score': float(team_pred[i][team_idx]),
+                    'action_score': float(action_pred[i][action_idx])
+                })
+                
+        return detections
+    
+    def visualize_detections(self, image_path, detections, output_path=None):
+        """
+        Visualize detections on an image.
+        
+        Args:
+            image_path: Path to the image file
+            detections: List of detection dictionaries
+            output_path: Path to save the output image (optional)
+            
+        Returns:
+            PIL Image with visualized detections
+        """
+        # Load the image
+        image = Image.open(image_path)
+        image = image.resize((self.input_shape[1], self.input_shape[0]))
+        draw = ImageDraw.Draw(image)
+        
+        # Draw detections
+        for det in detections:
+            xmin, ymin, xmax, ymax = det['bbox']
+            team = det['team']
+            action = det['action']
+            
+            # Determine color based on action (red for problematic behaviors)
+            color = 'red' if action in ['fighting', 'throwing'] else 'green'
+            
+            # Draw bounding box
+            draw.rectangle([xmin, ymin, xmax, ymax], outline=color, width=2)
+            
+            # Draw label
+            label = f"{team}/{action}"
+            draw.text((xmin, ymin-15), label, fill=color)
+            
+        # Save the image if output path is provided
+        if output_path:
+            image.save(output_path)
+            
+        return image
+    
+    def detect_problematic_behavior(self, detections, team_sections=None):
+        """
+        Detect problematic behavior and misplaced fans.
+        
+        Args:
+            detections: List of detection dictionaries
+            team_sections: SeatMap, or dictionary mapping team names to [x1, y1, x2, y2] seating sections (optional)
+            
+        Returns:
+            List of alerts with problematic detections
+        """
+        alerts = []
+        
+        # Check for problematic actions
+        for i, det in enumerate(detections):
+            if det['action'] in ['fighting', 'throwing']:
+                alerts.append({
+                    'type': 'problematic_action',
+                    'action': det['action'],
+                    'team': det['team'],
+                    'bbox': det['bbox'],
+                    'confidence': det['action_score'],
+                    'detection_id': i
+                })
+                
+        # Check for misplaced fans if team sections are provided
+        if team_sections and detections:
+            seat_map = team_sections
+            if not isinstance(seat_map, SeatMap):
+                seat_map = SeatMap.from_rectangles(team_sections, self.input_shape[:2])
+                
+            # Resolve the sections of all fans with one lookup
+            zones = seat_map.resolve([det['bbox'] for det in detections], [det['team'] for det in detections])
+            for i in np.flatnonzero(zones['misplaced']):
+                det = detections[i]
+                alerts.append({
+                    'type': 'misplaced_fan',
+                    'fan_team': det['team'],
+                    'section': zones['sections'][i],
+                    'section_team': ', '.join(zones['allowed_teams'][i]),
+                    'bbox': det['bbox'],
+                    'confidence': det['team_score'],
+                    'detection_id': int(i)
+                })
+                        
+        return alerts
+    
+    def generate_alert_image(self, image_path, alert, output_path=None):
+        """
+        Generate an image for an alert.
+        
+        Args:
+            image_path: Path to the image file
+            alert: Alert dictionary
+            output_path: Path to save the output image (optional)
+            
+        Returns:
+            PIL Image with highlighted alert
+        """
+        # Load the image
+        image = Image.open(image_path)
+        image = image.resize((self.input_shape[1], self.input_shape[0]))
+        draw = ImageDraw.Draw(image)
+        
+        # Draw alert bounding box
+        xmin, ymin, xmax, ymax = alert['bbox']
+        
+        # Use red for all alerts
+        color = 'red'
+        
+        # Draw bounding box with thicker width for emphasis
+        draw.rectangle([xmin, ymin, xmax, ymax], outline=color, width=3)
+        
+        # Draw alert type and details
+        if alert['type'] == 'problematic_action':
+            label = f"ALERT: {alert['action'].upper()} detected"
+        else:  # misplaced_fan
+            label = f"ALERT: {alert['fan_team']} fan in {alert['section_team']} section"
+            
+        # Draw label with background for better visibility
+        text_width, text_height = draw.textsize(label)
+        draw.rectangle([xmin, ymin-20, xmin+text_width, ymin], fill=color)
+        draw.text((xmin, ymin-20), label, fill='white')
+        
+        # Save the image if output path is provided
+        if output_path:
+            image.save(output_path)
+            
+        return image
@@ -0,0 +1,202 @@
+"""
+Low-latency live capture for the stadium monitoring system.
+This module reads a camera on a dedicated thread that keeps only the newest frame, so
+inference always works on the most recent view instead of a growing backlog, and
+measures the latency from frame capture to results and alerts.
+"""
+
+import os
+import time
+import threading
+import cv2
+
+from src.metrics import LatencyHistogram, MetricsRegistry
+
+class LatestFrameCapture:
+    """Capture thread that hands the newest frame of a live source to one consumer."""
+
+    def __init__(self, source, latest_only=True, realtime=None, meter=None):
+        """
+        Initialize the capture.
+
+        Args:
+            source: Camera index, RTSP URL or video file path passed to cv2.VideoCapture
+            latest_only: True to overwrite a frame the consumer has not taken yet
+                         (latest frame wins), False to hand over every frame in order
+            realtime: Release frames at the source's frame rate instead of as fast as
+                      they decode (default: True for video files, which would otherwise
+                      be read far faster than a camera delivers frames)
+            meter: StreamMeter counting and timing the captured frames (optional)
+        """
+        self.source = source
+        self.latest_only = latest_only
+        self.realtime = realtime
+        self.meter = meter
+        self.width = 0
+        self.height = 0
+        self.fps = 0.0
+        self.frames_captured = 0
+        self.frames_consumed = 0
+        self.frames_dropped = 0
+        self.finished = False
+        self._latest = None
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Open the source and start the capture thread."""
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open camera: {self.source}")
+
+        # Ask the driver not to queue frames of its own (ignored by backends without the property)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = cap.get(cv2.CAP_PROP_FPS)
+        if self.realtime is None:
+            self.realtime = isinstance(self.source, str) and os.path.isfile(self.source)
+
+        self._thread = threading.Thread(target=self._run, args=(cap,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Ask the capture thread to stop and wait for it."""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def read(self, timeout=None):
+        """
+        Take the newest frame not handed out before.
+
+        Args:
+            timeout: Seconds to wait for a new frame (None waits until one arrives
+                     or the stream ends)
+
+        Returns:
+            (frame, frame_index, capture_time) tuple, or None if no new frame arrived
+            in time or the stream ended (check finished to tell them apart)
+        """
+        with self._condition:
+            if self._latest is None and not self.finished:
+                self._condition.wait(timeout)
+
+            item, self._latest = self._latest, None
+            if item is not None:
+                self.frames_consumed += 1
+                # Wake the capture thread if it waits to hand over the next frame
+                self._condition.notify_all()
+            return item
+
+    def _run(self, cap):
+        """Capture loop."""
+        interval = 1.0 / self.fps if self.realtime and self.fps else 0.0
+        next_read = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                # Release file frames at their frame rate, like a camera would
+                if interval:
+                    delay = next_read - time.perf_counter()
+                    if delay > 0 and self._stop_event.wait(delay):
+                        break
+                    next_read += interval
+
+                ret, frame = self.meter.read(cap) if self.meter is not None else cap.read()
+                if not ret:
+                    break
+                capture_time = time.time()
+
+                with self._condition:
+                    if not self.latest_only:
+                        # Hand over every frame: wait until the consumer took the previous one
+                        while self._latest is not None and not self._stop_event.is_set():
+                            self._condition.wait(0.1)
+                    elif self._latest is not None:
+                        # The consumer never saw the previous frame; the newest one replaces it
+                        self.frames_dropped += 1
+                        if self.meter is not None:
+                            self.meter.registry.increment('frames_dropped', stream=self.meter.stream_id)
+
+                    self._latest = (frame, self.frames_captured, capture_time)
+                    self.frames_captured += 1
+                    self._condition.notify_all()
+        finally:
+            cap.release()
+            with self._condition:
+                self.finished = True
+                self._condition.notify_all()
+
+class LiveLatency:
+    """Capture-to-result and capture-to-alert latency of the frames of one live stream."""
+
+    def __init__(self, stream_id, metrics=None):
+        """
+        Initialize the latency tracker.
+
+        Args:
+            stream_id: Camera ID or other stream key used as the metrics label
+            metrics: MetricsRegistry receiving every per-frame latency (optional)
+        """
+        self.stream_id = str(stream_id)
+        self.metrics = metrics if metrics is not None else MetricsRegistry(enabled=False)
+        self.result = LatencyHistogram()
+        self.alert = LatencyHistogram()
+
+    def record(self, capture_time, alerts=()):
+        """
+        Record the latency of a processed frame.
+
+        The alerts themselves carry their own capture-to-alert latency, stamped when
+        they were generated (see StadiumMonitoringSystem.generate_detection_alerts).
+
+        Args:
+            capture_time: Time the frame was captured (time.time() seconds)
+            alerts: Alert dictionaries generated for the frame
+
+        Returns:
+            Latency from capture to the frame's results in seconds
+        """
+        latency = time.time() - capture_time
+        self.result.record(latency)
+        self.metrics.observe('capture_to_result', latency, stream=self.stream_id)
+
+        if alerts:
+            self.alert.record(latency)
+            self.metrics.observe('capture_to_alert', latency, stream=self.stream_id)
+
+        return latency
+
+    def stats(self, capture):
+        """
+        Summarize the stream.
+
+        Args:
+            capture: LatestFrameCapture the frames came from
+
+        Returns:
+            Dictionary with frame counts and capture-to-result/alert latency summaries
+        """
+        return {
+            'frames_captured': capture.frames_captured,
+            'frames_consumed': capture.frames_consumed,
+            'frames_dropped': capture.frames_dropped,
+            'frames_processed': self.result.count,
+            'capture_to_result': self.result.summary(),
+            'capture_to_alert': self.alert.summary()
+        }
+
+    def summary(self, capture):
+        """One-line summary of the stream's frame counts and latencies."""
+        result = self.result.summary()
+        alert = self.alert.summary()
+        line = (f"Live latency: {capture.frames_captured} frames captured, "
+                f"{capture.frames_dropped} dropped, {result['count']} processed; "
+                f"capture to result p50 {result['p50_ms']:.0f} ms, p99 {result['p99_ms']:.0f} ms")
+        if alert['count']:
+            line += f"; capture to alert p50 {alert['p50_ms']:.0f} ms, p99 {alert['p99_ms']:.0f} ms"
+        return line
@@ -0,0 +1,534 @@
+"""
+Pipeline metrics for the stadium monitoring system.
+This module records per-stage latencies in HDR-style histograms together with frame,
+detection, alert and byte counters, and exposes them as a periodic JSON snapshot and
+as Prometheus text on a local HTTP endpoint.
+"""
+
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+# Upper bounds (seconds) of the Prometheus histogram buckets exported for every stage
+PROMETHEUS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds. Below 2 * 2**precision_bits every
+    value has its own bucket; above, every power of two is split into
+    2**precision_bits equal buckets, so any recorded value is known to within
+    1/2**precision_bits (about 3% by default) at a fixed memory cost.
+    """
+
+    def __init__(self, precision_bits=5, max_value_us=1 << 36):
+        """
+        Initialize the histogram.
+
+        Args:
+            precision_bits: Linear sub-buckets per power of two, as a power of two
+            max_value_us: Largest trackable value in microseconds; larger values are clamped
+        """
+        self.precision_bits = precision_bits
+        self.sub_buckets = 1 << precision_bits
+        self.max_value_us = max_value_us
+        self.counts = [0] * (self._index(max_value_us) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value):
+        """Bucket index of a value in microseconds."""
+        shift = max(0, value.bit_length() - self.precision_bits - 1)
+        return shift * self.sub_buckets + (value >> shift)
+
+    def _upper_bound(self, index):
+        """Largest value in microseconds that falls into a bucket."""
+        shift = max(0, index // self.sub_buckets - 1)
+        base = index - shift * self.sub_buckets
+        return ((base + 1) << shift) - 1
+
+    def record(self, seconds):
+        """
+        Record one latency.
+
+        Args:
+            seconds: Latency in seconds
+        """
+        value = min(max(int(seconds * 1e6), 0), self.max_value_us)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total_us += value
+        if self.min_us is None or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+
+    def percentile(self, q):
+        """
+        Latency at a percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds (the upper bound of the bucket holding the percentile)
+        """
+        if self.count == 0:
+            return 0.0
+
+        cumulative = np.cumsum(self.counts)
+        rank = max(1, int(np.ceil(q / 100.0 * self.count)))
+        index = int(np.searchsorted(cumulative, rank))
+        return min(self._upper_bound(index), self.max_us) / 1e6
+
+    def count_at_or_below(self, seconds):
+        """Number of recorded latencies up to a bound, at bucket resolution."""
+        value = min(int(seconds * 1e6), self.max_value_us)
+        return int(sum(self.counts[:self._index(value) + 1]))
+
+    def summary(self):
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dictionary with count, mean, p50, p90, p99, p99.9 and max latency in milliseconds
+        """
+        return {
+            'count': self.count,
+            'mean_ms': self.total_us / self.count / 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'p999_ms': self.percentile(99.9) * 1000,
+            'max_ms': self.max_us / 1000
+        }
+
+class _StageTimer:
+    """Context manager that records the time spent in a pipeline stage."""
+
+    __slots__ = ('registry', 'key', 'start')
+
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry._record(self.key, time.perf_counter() - self.start)
+
+class _NullTimer:
+    """Timer used while metrics are disabled; entering and leaving it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+_NULL_TIMER = _NullTimer()
+
+def _key(name, labels):
+    """Hashable key of a metric name and its labels."""
+    return (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+
+class MetricsRegistry:
+    """Thread-safe store of stage latency histograms, counters and gauges."""
+
+    def __init__(self, enabled=True, namespace='stadium'):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled: Record metrics; when False every call returns immediately
+            namespace: Prefix of the exported Prometheus metric names
+        """
+        self.enabled = enabled
+        self.namespace = namespace
+        self.started = time.time()
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.gauge_callbacks = {}
+        self._lock = threading.Lock()
+
+    def timer(self, stage, **labels):
+        """
+        Time a pipeline stage.
+
+        Usage: with metrics.timer('inference'): ...
+
+        Args:
+            stage: Stage name (e.g. 'decode', 'preprocess', 'inference', 'alerts')
+            **labels: Extra labels, e.g. stream=camera_id
+
+        Returns:
+            Context manager recording the elapsed time on exit
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, _key(stage, labels))
+
+    def observe(self, stage, seconds, **labels):
+        """Record a latency measured elsewhere for a stage."""
+        if self.enabled:
+            self._record(_key(stage, labels), seconds)
+
+    def increment(self, name, amount=1, **labels):
+        """
+        Increase a counter.
+
+        Args:
+            name: Counter name (e.g. 'frames_in', 'detections', 'bytes_written')
+            amount: Increment
+            **labels: Extra labels, e.g. stream=camera_id
+        """
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        """Set a gauge to its current value."""
+        if self.enabled:
+            with self._lock:
+                self.gauges[_key(name, labels)] = value
+
+    def register_gauge(self, name, fn, **labels):
+        """
+        Register a gauge read from a callable whenever metrics are exported.
+
+        Args:
+            name: Gauge name (e.g. 'artifact_queue_depth')
+            fn: Callable returning the current value
+            **labels: Extra labels
+        """
+        with self._lock:
+            self.gauge_callbacks[_key(name, labels)] = fn
+
+    def add_file_bytes(self, path, kind):
+        """
+        Count the size of a written file towards the bytes_written counter.
+
+        Args:
+            path: Path of the written file
+            kind: Artifact kind label (e.g. 'alert_image', 'video')
+        """
+        if not self.enabled:
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        self.increment('bytes_written', size, kind=kind)
+
+    def stream(self, stream_id, fps=None):
+        """
+        Create a meter for the frames of one video or camera stream.
+
+        Args:
+            stream_id: Video path, camera ID or other stream key
+            fps: Nominal frame rate of the stream, used to measure lag (optional)
+
+        Returns:
+            StreamMeter instance
+        """
+        return StreamMeter(self, stream_id, fps)
+
+    def _record(self, key, seconds):
+        """Add a latency to the histogram of a stage."""
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def _current_gauges(self):
+        """Set gauges merged with the values of registered gauge callbacks."""
+        with self._lock:
+            gauges = dict(self.gauges)
+            callbacks = list(self.gauge_callbacks.items())
+        for key, fn in callbacks:
+            try:
+                gauges[key] = fn()
+            except Exception:
+                continue
+        return gauges
+
+    def snapshot(self):
+        """
+        Take a snapshot of all metrics.
+
+        Returns:
+            JSON-serializable dictionary with per-stage latency summaries, counters and gauges
+        """
+        with self._lock:
+            stages = [
+                dict({'stage': name, 'labels': dict(labels)}, **histogram.summary())
+                for (name, labels), histogram in sorted(self.histograms.items())
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+
+        gauges = [
+            {'name': name, 'labels': dict(labels), 'value': value}
+            for (name, labels), value in sorted(self._current_gauges().items())
+        ]
+
+        return {
+            'timestamp': time.time(),
+            'uptime_seconds': time.time() - self.started,
+            'stages': stages,
+            'counters': counters,
+            'gauges': gauges
+        }
+
+    def to_prometheus(self):
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Stage latencies become one histogram with a 'stage' label, counters
+        get a _total suffix and gauges are exported as they are.
+
+        Returns:
+            Exposition text
+        """
+        prefix = self.namespace
+        lines = []
+
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        # Stage latency histogram
+        name = f"{prefix}_stage_latency_seconds"
+        lines.append(f"# HELP {name} Time spent in each pipeline stage.")
+        lines.append(f"# TYPE {name} histogram")
+        for (stage, labels), histogram in histograms:
+            labels = (('stage', stage),) + labels
+            for bound in PROMETHEUS_BUCKETS:
+                count = histogram.count_at_or_below(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {count}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total_us / 1e6}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        # Counters, grouped by name
+        seen = set()
+        for (counter, labels), value in counters:
+            name = f"{prefix}_{counter}_total"
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        # Gauges, grouped by name
+        seen = set()
+        for (gauge, labels), value in sorted(self._current_gauges().items()):
+            name = f"{prefix}_{gauge}"
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Forget all recorded latencies, counters and set gauges."""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self.started = time.time()
+
+def _format_labels(labels):
+    """Render label pairs as a Prometheus label set."""
+    if not labels:
+        return ""
+    pairs = []
+    for label, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{label}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+class StreamMeter:
+    """Frame counters, decode/write timing and lag of one video or camera stream."""
+
+    def __init__(self, registry, stream_id, fps=None):
+        """
+        Initialize the meter.
+
+        Args:
+            registry: MetricsRegistry receiving the measurements
+            stream_id: Video path, camera ID or other stream key
+            fps: Nominal frame rate of the stream, used to measure lag (optional)
+        """
+        self.registry = registry
+        self.stream_id = str(stream_id)
+        self.fps = fps
+        self.frames_read = 0
+        self.started = time.time()
+
+    def read(self, cap):
+        """
+        Read the next frame from a cv2.VideoCapture, timing the decode.
+
+        Also updates the stream's lag: the wall time spent on the stream minus
+        the media time of the frames read so far, which grows while processing
+        falls behind the frame rate of a live source.
+
+        Args:
+            cap: cv2.VideoCapture
+
+        Returns:
+            (ret, frame) as returned by cap.read()
+        """
+        if not self.registry.enabled:
+            return cap.read()
+
+        with self.registry.timer('decode'):
+            ret, frame = cap.read()
+        if not ret:
+            return ret, frame
+
+        now = time.time()
+        self.frames_read += 1
+        self.registry.increment('frames_in', stream=self.stream_id)
+        self.registry.set_gauge('stream_last_frame_timestamp_seconds', now, stream=self.stream_id)
+        if self.fps:
+            lag = (now - self.started) - self.frames_read / self.fps
+            self.registry.set_gauge('stream_lag_seconds', lag, stream=self.stream_id)
+        return ret, frame
+
+    def write(self, writer, frame):
+        """Write a frame to a cv2.VideoWriter, timing the encode."""
+        with self.registry.timer('video_write'):
+            writer.write(frame)
+
+    def release(self, writer, path):
+        """Release a cv2.VideoWriter and count the size of the finished video."""
+        writer.release()
+        self.registry.add_file_bytes(path, 'video')
+
+class MetricsServer:
+    """Local HTTP endpoint serving Prometheus text at /metrics and a JSON snapshot at /metrics.json."""
+
+    def __init__(self, registry, host='127.0.0.1', port=9108):
+        """
+        Initialize the server.
+
+        Args:
+            registry: MetricsRegistry to serve
+            host: Interface to bind (local only by default)
+            port: TCP port (0 picks a free port)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Start serving in a background thread."""
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path in ('/', '/metrics'):
+                    body = registry.to_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/metrics.json':
+                    body = json.dumps(registry.snapshot(), indent=2).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes would otherwise print a line every few seconds
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+        print(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+class SnapshotWriter:
+    """Background thread that writes a JSON metrics snapshot to a file at a fixed interval."""
+
+    def __init__(self, registry, path, interval=10.0):
+        """
+        Initialize the snapshot writer.
+
+        Args:
+            registry: MetricsRegistry to snapshot
+            path: Output JSON file (replaced atomically on every write)
+            interval: Seconds between snapshots
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start writing snapshots in a background thread."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-snapshot', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the thread and write a final snapshot."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.write()
+
+    def write(self):
+        """Write one snapshot."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.registry.snapshot(), f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"Error writing metrics snapshot: {e}")
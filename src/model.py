@@ -0,0 +1,329 @@
+"""
+Model for stadium crowd detection and behavior classification.
+This module implements the object detection model for identifying fans and classifying their behavior.
+"""
+
+import numpy as np
+
+from src.backends import create_backend, uses_keras_model
+from src.dense_head import DEFAULT_OUTPUT_STRIDE, BACKBONE_LAYERS
+
+class FanDetectionModel:
+    """Model for detecting fans in stadium images."""
+    
+    def __init__(self, input_shape=(384, 512, 3), num_classes=1, num_teams=2, num_actions=4, head='dense',
+                 output_stride=DEFAULT_OUTPUT_STRIDE):
+        """
+        Initialize the fan detection model.
+        
+        Args:
+            input_shape: Input image shape (height, width, channels)
+            num_classes: Number of object classes (just 'fan' in this case)
+            num_teams: Number of team classes (hilal, ittihad)
+            num_actions: Number of action classes (sitting, cheering, fighting, throwing)
+            head: 'dense' for the anchor-free head that predicts heatmap, box, team and
+                  action maps on the feature grid (any number of fans per image), or
+                  'single' for the original head that regresses one box per image
+            output_stride: Stride of the dense head's output grid (4, 8, 16 or 32)
+        """
+        if head not in ('dense', 'single'):
+            raise ValueError(f"Unknown detection head: {head}")
+        if output_stride not in BACKBONE_LAYERS:
+            raise ValueError(f"Unsupported output stride: {output_stride}")
+            
+        self.input_shape = input_shape
+        self.num_classes = num_classes
+        self.num_teams = num_teams
+        self.num_actions = num_actions
+        self.head = head
+        self.output_stride = output_stride
+        self.model = None
+        self.backend = None
+        
+    def build_model(self, jit_compile=False, steps_per_execution=1, mixed_precision=False):
+        """
+        Build the detection and classification model.
+        
+        Args:
+            jit_compile: Compile the training step with XLA
+            steps_per_execution: Training steps run per call of the compiled step function
+            mixed_precision: Compute in bfloat16 with float32 weights (outputs stay float32);
+                             only faster on CPUs with native bfloat16 support
+        """
+        from tensorflow.keras import applications
+        from src.training import precision_policy
+        
+        compile_options = {'jit_compile': jit_compile, 'steps_per_execution': steps_per_execution}
+        
+        with precision_policy(mixed_precision):
+            # Use a pre-trained model as the backbone
+            base_model = applications.MobileNetV2(
+                input_shape=self.input_shape,
+                include_top=False,
+                weights='imagenet'
+            )
+            
+            # Freeze the base model layers
+            base_model.trainable = False
+            
+            if self.head == 'dense':
+                self.model = self._build_dense_model(base_model, compile_options)
+            else:
+                self.model = self._build_single_model(base_model, compile_options)
+                
+        return self.model
+    
+    def _build_dense_model(self, base_model, compile_options):
+        """
+        Build the anchor-free dense head (CenterNet/FCOS style).
+        
+        Every cell of the output grid predicts the probability that a fan is
+        centered in it (class_output), the distances from the cell center to the
+        fan's box edges (bbox_output), and the fan's team and action. One forward
+        pass therefore localizes every fan in the image.
+        """
+        import tensorflow as tf
+        from tensorflow.keras import layers, models
+        from src.dense_losses import heatmap_focal_loss, box_giou_loss, masked_attribute_loss
+        
+        # Backbone activations from the coarsest level down to the output stride
+        strides = sorted((stride for stride in BACKBONE_LAYERS if stride >= self.output_stride), reverse=True)
+        backbone = models.Model(
+            base_model.input,
+            [base_model.get_layer(BACKBONE_LAYERS[stride]).output for stride in strides],
+            name='backbone'
+        )
+        backbone.trainable = False
+        
+        inputs = layers.Input(shape=self.input_shape)
+        features = backbone(inputs)
+        if not isinstance(features, (list, tuple)):
+            features = [features]
+            
+        # Top-down feature pyramid: upsample the semantic coarse features and add the finer ones
+        x = layers.Conv2D(128, 1, padding='same', activation='relu')(features[0])
+        for skip in features[1:]:
+            x = layers.UpSampling2D(2, interpolation='bilinear')(x)
+            x = layers.Add()([x, layers.Conv2D(128, 1, padding='same', activation='relu')(skip)])
+            x = layers.Conv2D(128, 3, padding='same', activation='relu')(x)
+            
+        def head(num_outputs, activation, name, bias_initializer='zeros'):
+            """Small convolutional head predicting one map."""
+            h = layers.Conv2D(64, 3, padding='same', activation='relu')(x)
+            return layers.Conv2D(num_outputs, 1, activation=activation, bias_initializer=bias_initializer,
+                                 dtype='float32', name=name)(h)
+            
+        # Center heatmap, starting at a low fan prior so the background does not dominate early training
+        class_output = head(self.num_classes, 'sigmoid', 'class_output',
+                            bias_initializer=tf.keras.initializers.Constant(-2.19))
+        
+        # Distances from the cell center to the left, top, right and bottom box edges
+        bbox_output = head(4, 'softplus', 'bbox_output')
+        
+        # Team and action of the fan centered in each cell
+        team_output = head(self.num_teams, 'softmax', 'team_output')
+        action_output = head(self.num_actions, 'softmax', 'action_output')
+        
+        model = models.Model(
+            inputs=inputs,
+            outputs=[bbox_output, class_output, team_output, action_output]
+        )
+        
+        # Compile the model; targets come from StadiumDataset.encode_targets()
+        model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+            loss={
+                'bbox_output': box_giou_loss,
+                'class_output': heatmap_focal_loss,
+                'team_output': masked_attribute_loss,
+                'action_output': masked_attribute_loss
+            },
+            loss_weights={
+                'bbox_output': 1.0,
+                'class_output': 1.0,
+                'team_output': 0.5,
+                'action_output': 0.5
+            },
+            **compile_options
+        )
+        
+        return model
+    
+    def _build_single_model(self, base_model, compile_options):
+        """Build the original head that regresses a single box per image."""
+        import tensorflow as tf
+        from tensorflow.keras import layers, models
+        
+        # Create the detection and classification heads
+        inputs = layers.Input(shape=self.input_shape)
+        x = base_model(inputs)
+        
+        # Detection head
+        detection_head = layers.Conv2D(256, 3, padding='same', activation='relu')(x)
+        detection_head = layers.Conv2D(128, 3, padding='same', activation='relu')(detection_head)
+        detection_head = layers.GlobalAveragePooling2D()(detection_head)
+        detection_head = layers.Dense(128, activation='relu')(detection_head)
+        
+        # Bounding box regression
+        bbox_output = layers.Dense(4, dtype='float32', name='bbox_output')(detection_head)
+        
+        # Classification head
+        class_output = layers.Dense(self.num_classes, activation='sigmoid', dtype='float32',
+                                    name='class_output')(detection_head)
+        
+        # Team classification head
+        team_head = layers.Dense(64, activation='relu')(detection_head)
+        team_output = layers.Dense(self.num_teams, activation='softmax', dtype='float32', name='team_output')(team_head)
+        
+        # Action classification head
+        action_head = layers.Dense(64, activation='relu')(detection_head)
+        action_output = layers.Dense(self.num_actions, activation='softmax', dtype='float32',
+                                     name='action_output')(action_head)
+        
+        # Create the model
+        model = models.Model(
+            inputs=inputs,
+            outputs=[bbox_output, class_output, team_output, action_output]
+        )
+        
+        # Compile the model
+        model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+            loss={
+                'bbox_output': 'mse',
+                'class_output': 'binary_crossentropy',
+                'team_output': 'sparse_categorical_crossentropy',
+                'action_output': 'sparse_categorical_crossentropy'
+            },
+            loss_weights={
+                'bbox_output': 1.0,
+                'class_output': 1.0,
+                'team_output': 0.5,
+                'action_output': 0.5
+            },
+            metrics={
+                'class_output': 'accuracy',
+                'team_output': 'accuracy',
+                'action_output': 'accuracy'
+            },
+            **compile_options
+        )
+        
+        return model
+    
+    def train(self, train_dataset, val_dataset, epochs=10, callbacks=None):
+        """
+        Train the model.
+        
+        Args:
+            train_dataset: TensorFlow dataset for training
+            val_dataset: TensorFlow dataset for validation
+            epochs: Number of training epochs
+            callbacks: List of Keras callbacks
+            
+        Returns:
+            Training history
+        """
+        import tensorflow as tf
+        
+        if self.model is None:
+            self.build_model()
+            
+        # Default callbacks if none provided
+        if callbacks is None:
+            callbacks = [
+                tf.keras.callbacks.ModelCheckpoint(
+                    filepath='../models/fan_detection_model.h5',
+                    save_best_only=True,
+                    monitor='val_loss'
+                ),
+                tf.keras.callbacks.EarlyStopping(
+                    patience=5,
+                    monitor='val_loss'
+                ),
+                tf.keras.callbacks.ReduceLROnPlateau(
+                    factor=0.2,
+                    patience=3,
+                    monitor='val_loss'
+                )
+            ]
+            
+        history = self.model.fit(
+            train_dataset,
+            validation_data=val_dataset,
+            epochs=epochs,
+            callbacks=callbacks
+        )
+        
+        return history
+    
+    def predict(self, image):
+        """
+        Make predictions on a single image.
+        
+        Args:
+            image: Input image tensor
+            
+        Returns:
+            Bounding boxes, class scores, team predictions, action predictions
+            (per-cell maps of the output grid for the dense head)
+        """
+        if self.model is None and self.backend is None:
+            raise ValueError("Model has not been built or loaded yet")
+            
+        # Ensure image has batch dimension
+        if len(image.shape) == 3:
+            image = np.expand_dims(image, axis=0)
+            
+        # Make prediction
+        if self.backend is not None:
+            bbox_pred, class_pred, team_pred, action_pred = self.backend.predict(image)
+        else:
+            bbox_pred, class_pred, team_pred, action_pred = self.model.predict(image)
+        
+        return bbox_pred, class_pred, team_pred, action_pred
+    
+    def save_model(self, filepath):
+        """Save the model to disk."""
+        if self.model is None:
+            raise ValueError("Model has not been built or loaded yet")
+            
+        self.model.save(filepath)
+        print(f"Model saved to {filepath}")
+        
+    def load_model(self, filepath, compile=True):
+        """Load a saved model from disk (compile=False skips restoring the training setup)."""
+        from tensorflow.keras import models
+        
+        if compile:
+            # Registers the dense head's losses for deserialization
+            import src.dense_losses
+            
+        self.model = models.load_model(filepath, compile=compile)
+        print(f"Model loaded from {filepath}")
+        
+        return self.model
+    
+    def load_backend(self, filepath, backend='keras', precision='int8', num_threads=None, cache_dir=None):
+        """
+        Load the model for inference through an inference backend.
+        
+        Args:
+            filepath: Path to the .h5 model (exported TFLite/ONNX models are found next to it)
+            backend: 'keras', 'tf-function', 'tflite' or 'onnxruntime'
+            precision: TFLite precision to load ('int8' or 'fp16')
+            num_threads: CPU threads for the TFLite and ONNX Runtime backends (optional)
+            cache_dir: Precompiled model cache used by the tf-function backend (optional)
+            
+        Returns:
+            InferenceBackend instance
+        """
+        if uses_keras_model(backend, cache_dir):
+            # Inference only: skip deserializing the optimizer, losses and metrics
+            self.load_model(filepath, compile=False)
+            
+        self.backend = create_backend(backend, filepath, keras_model=self.model, precision=precision,
+                                      num_threads=num_threads, cache_dir=cache_dir)
+        print(f"Fan detection model using the {backend} inference backend")
+        
+        return self.backend
@@ -0,0 +1,102 @@
+"""
+Precompiled model cache for the stadium crowd detection models.
+This module converts .h5 models into SavedModels holding a traced serving
+function, keyed by the hash of the .h5 file, so later startups load the traced
+graph directly instead of rebuilding the Keras model and tracing it again.
+"""
+
+import os
+import shutil
+import hashlib
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    Compute the SHA-256 hash of a file.
+
+    Args:
+        path: File path
+        chunk_size: Bytes read per step
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ModelCache:
+    """Cache of SavedModel serving functions converted from .h5 models."""
+
+    def __init__(self, cache_dir):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached SavedModels
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry_path(self, model_path):
+        """
+        Get the cache directory of a model.
+
+        The key combines the model file name, the hash of its contents and the
+        TensorFlow version, so a retrained model or a TensorFlow upgrade never
+        reuses a stale graph.
+
+        Args:
+            model_path: Path to the .h5 model
+
+        Returns:
+            Path of the cached SavedModel directory
+        """
+        import tensorflow as tf
+
+        stem = os.path.splitext(os.path.basename(model_path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{file_hash(model_path)[:16]}-tf{tf.__version__}")
+
+    def load(self, model_path):
+        """
+        Load the cached SavedModel of a model, converting it on a cache miss.
+
+        Args:
+            model_path: Path to the .h5 model
+
+        Returns:
+            Restored SavedModel whose serve() maps a float32 batch to the list of
+            model outputs (keep a reference to it while serve() is in use)
+        """
+        import tensorflow as tf
+
+        path = self.entry_path(model_path)
+        if not os.path.exists(path):
+            self._convert(model_path, path)
+        else:
+            print(f"Loading cached model for {model_path}")
+
+        return tf.saved_model.load(path)
+
+    def _convert(self, model_path, path):
+        """Convert a .h5 model into a SavedModel with a traced serving function."""
+        import tensorflow as tf
+        from tensorflow.keras import models
+
+        print(f"Caching {model_path} as a SavedModel (first start only)...")
+        keras_model = models.load_model(model_path, compile=False)
+        input_shape = tuple(keras_model.inputs[0].shape[1:])
+
+        module = tf.Module()
+        module.model = keras_model
+        module.serve = tf.function(
+            lambda x: keras_model(x, training=False),
+            input_signature=[tf.TensorSpec((None,) + input_shape, tf.float32)]
+        )
+
+        # Write to a temporary directory first so an interrupted save is never picked up
+        temp_path = path + '.tmp'
+        shutil.rmtree(temp_path, ignore_errors=True)
+        tf.saved_model.save(module, temp_path)
+        os.replace(temp_path, path)
@@ -0,0 +1,207 @@
+"""
+Motion-gated frame scheduling for the stadium monitoring system.
+This module decides which video frames are worth running the detector on, using
+cheap frame differencing on a downscaled grayscale copy of each frame: static
+scenes are sampled at a minimum rate, and frames with crowd movement are
+sampled at up to the maximum rate.
+
+Activity is measured per block of a grid, and a single active block raises the
+sampling rate of the whole frame: the dense detector finds every fan of a frame
+in one forward pass, so running it on the active regions alone would not be
+cheaper and would lose the context around them. Per-section activity is
+reported in the statistics.
+"""
+
+import cv2
+import numpy as np
+
+class MotionScheduler:
+    """Adaptive frame scheduler driven by block motion energy."""
+
+    def __init__(self, min_interval=1, max_interval=15, motion_threshold=0.01, pixel_threshold=10,
+                 downscale_width=640, grid=(4, 4), sections=None, section_shape=None, seat_map=None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            min_interval: Minimum frames between inferences (bounds the maximum sampling rate)
+            max_interval: Maximum frames between inferences (bounds the minimum sampling rate)
+            motion_threshold: Fraction of changed pixels in a grid cell that counts as activity
+            pixel_threshold: Grayscale difference above which a pixel counts as changed
+            downscale_width: Width of the grayscale copy used for differencing; it must keep
+                             the arm movements of distant fans (a few pixels in a 720p
+                             frame) visible, so frames are not shrunk much further
+            grid: (rows, cols) of the blocks motion energy is measured over
+            sections: Dictionary of stadium sections [x1, y1, x2, y2] to report activity for (optional)
+            section_shape: (height, width) of the coordinate space the sections are given in
+            seat_map: SeatMap whose polygon sections activity is reported for, instead of sections (optional)
+        """
+        self.min_interval = max(1, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.motion_threshold = motion_threshold
+        self.pixel_threshold = pixel_threshold
+        self.downscale_width = downscale_width
+        self.grid = grid
+        self.sections = sections or {}
+        self.section_shape = section_shape
+        self.seat_map = seat_map
+        self.reset()
+
+    def reset(self):
+        """Forget the reference frame and clear the statistics."""
+        self._reference = None
+        self._frames_since_inference = None
+        self._section_masks = None
+        self.stats = {
+            'frames_read': 0,
+            'frames_inferred': 0,
+            'frames_skipped': 0,
+            'triggered_by_motion': 0,
+            'triggered_by_max_interval': 0,
+            'section_activity': {name: 0 for name in self._section_names()}
+        }
+
+    def should_process(self, frame):
+        """
+        Decide whether the detector should run on a frame.
+
+        Motion is measured against the last frame that was inferred, so slow
+        changes accumulate until they are noticed instead of being lost between
+        consecutive frames.
+
+        Args:
+            frame: BGR image array
+
+        Returns:
+            True if the frame should be processed
+        """
+        self.stats['frames_read'] += 1
+        small = self._downscale(frame)
+
+        # Always process the first frame
+        if self._reference is None:
+            return self._accept(small, 'triggered_by_max_interval')
+
+        self._frames_since_inference += 1
+        if self._frames_since_inference < self.min_interval:
+            return self._skip()
+
+        if self._frames_since_inference >= self.max_interval:
+            self._record_sections(self._changed_mask(small))
+            return self._accept(small, 'triggered_by_max_interval')
+
+        # Block motion energy: fraction of changed pixels in each grid cell
+        changed = self._changed_mask(small)
+        if self.block_energy(changed).max() >= self.motion_threshold:
+            self._record_sections(changed)
+            return self._accept(small, 'triggered_by_motion')
+
+        return self._skip()
+
+    def skip_undecoded(self):
+        """
+        Skip the next frame without looking at it if it falls within the minimum interval.
+
+        Frames closer than min_interval to the last inference are skipped whatever
+        they show, so callers can grab() them without decoding.
+
+        Returns:
+            True if the frame was counted as skipped; False if it must be decoded and
+            passed to should_process()
+        """
+        if self._reference is None or self._frames_since_inference + 1 >= self.min_interval:
+            return False
+
+        self.stats['frames_read'] += 1
+        self._frames_since_inference += 1
+        self._skip()
+        return True
+
+    def block_energy(self, changed):
+        """
+        Fraction of changed pixels in each grid cell.
+
+        Args:
+            changed: Boolean change mask of the downscaled frame
+
+        Returns:
+            Array of shape grid with values in [0, 1]
+        """
+        rows, cols = self.grid
+        height, width = changed.shape
+        cell_h, cell_w = max(1, height // rows), max(1, width // cols)
+
+        # Crop to a whole number of cells and average each cell with one reshape
+        cropped = changed[:cell_h * rows, :cell_w * cols].astype(np.float32)
+        return cropped.reshape(rows, cell_h, cols, cell_w).mean(axis=(1, 3))
+
+    def summary(self):
+        """One-line summary of the scheduling statistics."""
+        read = max(1, self.stats['frames_read'])
+        return (f"Inferred {self.stats['frames_inferred']}/{self.stats['frames_read']} frames "
+                f"({self.stats['frames_inferred'] / read * 100:.1f}%), "
+                f"skipped {self.stats['frames_skipped']}; "
+                f"{self.stats['triggered_by_motion']} triggered by motion, "
+                f"{self.stats['triggered_by_max_interval']} by the maximum interval")
+
+    def _downscale(self, frame):
+        """Grayscale, downscaled and blurred copy of a frame."""
+        height, width = frame.shape[:2]
+        small = frame
+        if width > self.downscale_width:
+            scale = self.downscale_width / float(width)
+            small = cv2.resize(frame, (self.downscale_width, max(1, int(round(height * scale)))),
+                               interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def _changed_mask(self, small):
+        """Pixels that differ from the reference frame."""
+        return cv2.absdiff(small, self._reference) > self.pixel_threshold
+
+    def _section_names(self):
+        """Names of the sections activity is reported for."""
+        if self.seat_map is not None:
+            return self.seat_map.section_names
+        return list(self.sections)
+
+    def _record_sections(self, changed):
+        """Count the stadium sections with activity in an inferred frame."""
+        if not self.sections and self.seat_map is None:
+            return
+
+        if self._section_masks is None:
+            self._section_masks = self._build_section_masks(changed.shape)
+
+        for name, mask in self._section_masks.items():
+            if mask.any() and changed[mask].mean() >= self.motion_threshold:
+                self.stats['section_activity'][name] += 1
+
+    def _build_section_masks(self, shape):
+        """Rasterize the stadium sections onto the downscaled frame."""
+        if self.seat_map is not None:
+            return self.seat_map.section_masks(shape)
+
+        height, width = shape
+        section_h, section_w = self.section_shape or shape
+        masks = {}
+        for name, (x1, y1, x2, y2) in self.sections.items():
+            mask = np.zeros(shape, dtype=bool)
+            mask[int(y1 * height / section_h):int(np.ceil(y2 * height / section_h)),
+                 int(x1 * width / section_w):int(np.ceil(x2 * width / section_w))] = True
+            masks[name] = mask
+        return masks
+
+    def _accept(self, small, trigger):
+        """Record an inferred frame and make it the new reference."""
+        self._reference = small
+        self._frames_since_inference = 0
+        self.stats['frames_inferred'] += 1
+        self.stats[trigger] += 1
+        return True
+
+    def _skip(self):
+        """Record a skipped frame."""
+        self.stats['frames_skipped'] += 1
+        return False
@@ -0,0 +1,438 @@
+"""
+Multi-camera ingest for the stadium monitoring system.
+This module runs one capture thread per camera and a single shared inference worker
+that batches frames across cameras, so one set of models serves every feed.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+import cv2
+
+from src.system import StadiumMonitoringSystem
+from src.backends import batch_buckets
+
+class FrameQueue:
+    """Bounded frame queue that drops the oldest frame when full."""
+
+    def __init__(self, maxsize, condition):
+        """
+        Initialize the frame queue.
+
+        Args:
+            maxsize: Maximum number of frames held
+            condition: Shared condition notified whenever a frame is added
+        """
+        self.frames = deque(maxlen=maxsize)
+        self.condition = condition
+        self.dropped = 0
+
+    def put(self, item):
+        """Add a frame, evicting the oldest one if the queue is full; returns True if a frame was dropped."""
+        with self.condition:
+            dropped = len(self.frames) == self.frames.maxlen
+            if dropped:
+                self.dropped += 1
+            self.frames.append(item)
+            self.condition.notify()
+        return dropped
+
+    def pop(self):
+        """Remove and return the oldest frame, or None if the queue is empty."""
+        with self.condition:
+            if self.frames:
+                return self.frames.popleft()
+            return None
+
+    def __len__(self):
+        return len(self.frames)
+
+class CameraStream:
+    """Capture thread that pushes frames from one source into a bounded queue."""
+
+    def __init__(self, camera_id, source, queue, frame_interval=1, scheduler=None, meter=None, realtime=None):
+        """
+        Initialize the camera stream.
+
+        Args:
+            camera_id: Name of the camera used to key results
+            source: Camera index, RTSP URL or video file path passed to cv2.VideoCapture
+            queue: FrameQueue receiving (camera_id, frame_index, timestamp, frame) tuples
+            frame_interval: Push every Nth captured frame
+            scheduler: MotionScheduler choosing the frames to push instead of a fixed interval (optional)
+            meter: StreamMeter counting and timing the captured frames (optional)
+            realtime: Read frames at the source's frame rate instead of as fast as they
+                      decode (default: True for video files, whose frames would otherwise
+                      flood the queue and be dropped depending on decode speed)
+        """
+        self.camera_id = camera_id
+        self.source = source
+        self.queue = queue
+        self.frame_interval = frame_interval
+        self.scheduler = scheduler
+        self.meter = meter
+        self.realtime = realtime
+        self.fps = 0.0
+        self.frames_captured = 0
+        self.frames_queued = 0
+        self.finished = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Open the source and start the capture thread."""
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open camera: {self.source}")
+
+        self.fps = cap.get(cv2.CAP_PROP_FPS)
+        if self.realtime is None:
+            self.realtime = isinstance(self.source, str) and os.path.isfile(self.source)
+
+        self._thread = threading.Thread(target=self._run, args=(cap,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Ask the capture thread to stop and wait for it."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self, cap):
+        """Capture loop."""
+        interval = 1.0 / self.fps if self.realtime and self.fps else 0.0
+        next_read = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                # Release file frames at their frame rate, like a camera would
+                if interval:
+                    delay = next_read - time.perf_counter()
+                    if delay > 0 and self._stop_event.wait(delay):
+                        break
+                    next_read += interval
+
+                ret, frame = self.meter.read(cap) if self.meter is not None else cap.read()
+                if not ret:
+                    break
+
+                # Motion gating runs here so static frames never reach the inference worker
+                if self.scheduler is not None:
+                    push = self.scheduler.should_process(frame)
+                else:
+                    push = self.frames_captured % self.frame_interval == 0
+
+                if push:
+                    if self.queue.put((self.camera_id, self.frames_captured, time.time(), frame)) and self.meter is not None:
+                        self.meter.registry.increment('frames_dropped', stream=self.camera_id)
+                    self.frames_queued += 1
+
+                self.frames_captured += 1
+        finally:
+            cap.release()
+            self.finished = True
+            # Wake the inference worker so it can notice the end of the stream
+            with self.queue.condition:
+                self.queue.condition.notify()
+
+class MultiCameraMonitoringSystem:
+    """Monitoring system serving many camera feeds from one set of models."""
+
+    def __init__(self, config=None):
+        """
+        Initialize the multi-camera monitoring system.
+
+        Args:
+            config: Configuration dictionary (optional)
+        """
+        # Default configuration
+        self.config = {
+            'model_dir': 'models',
+            'input_shape': (384, 512, 3),
+            'detection_threshold': 0.5,
+            'alerts_dir': 'alerts',
+            'max_batch_size': 8,  # Maximum frames per detector forward pass
+            'max_batch_wait_ms': 20,  # Maximum time to wait for a batch to fill
+            'camera_queue_size': 4,  # Frames buffered per camera before dropping the oldest
+            'frame_interval': None,  # Queue every Nth frame of each camera; None for motion-gated sampling
+            'results_per_camera': 100,  # Most recent frame results kept per camera in self.results
+            'alerts_per_camera': 1000,  # Most recent alerts per camera returned by process_feeds (all are in the alert log)
+            'stadium_sections': {
+                'hilal': [0, 0, 256, 384],  # Left half of stadium (x1, y1, x2, y2)
+                'ittihad': [256, 0, 512, 384]  # Right half of stadium
+            }
+        }
+
+        # Update with provided config
+        if config:
+            self.config.update(config)
+
+        # Batches hold as many frames as are queued; pad them to powers of two up to max_batch_size
+        self.config.setdefault('detector_batch_sizes', batch_buckets(self.config['max_batch_size']))
+
+        # Initialize components
+        self.monitoring_system = StadiumMonitoringSystem(config=self.config)
+        self.streams = {}
+        self.results = {}
+        self.stats = {}
+        self._condition = threading.Condition()
+
+        # Initialize system state
+        self.is_initialized = False
+
+    def initialize(self, detector_path=None, behavior_classifier_path=None, team_detector_path=None,
+                   crop_classifier_path=None):
+        """
+        Initialize the system components.
+
+        Args:
+            detector_path: Path to the trained detector model (optional)
+            behavior_classifier_path: Path to the trained behavior classifier (optional)
+            team_detector_path: Path to the trained team detector (optional)
+            crop_classifier_path: Path to the trained fused team/behavior crop classifier (optional)
+        """
+        # Initialize the shared monitoring system (models are loaded once)
+        self.monitoring_system.initialize(
+            detector_path=detector_path,
+            behavior_classifier_path=behavior_classifier_path,
+            team_detector_path=team_detector_path,
+            crop_classifier_path=crop_classifier_path
+        )
+
+        self.is_initialized = True
+        print("Multi-camera monitoring system initialized successfully.")
+
+    def process_feeds(self, sources, output_dir=None, generate_alerts=True, duration=None):
+        """
+        Process several camera feeds with a shared, dynamically batched inference worker.
+
+        Args:
+            sources: Dictionary mapping camera names to cv2.VideoCapture sources,
+                     or a list of sources (named cam0, cam1, ...)
+            output_dir: Directory to save annotated processed frames per camera (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            duration: Duration to process in seconds (None until all feeds end)
+
+        Returns:
+            all_alerts: Dictionary mapping camera names to their most recent alerts (at most
+                        alerts_per_camera each; stats['cameras'] counts all of them)
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+
+        if not self.monitoring_system.detector:
+            raise RuntimeError("Detector not available. Cannot process feeds.")
+
+        if not isinstance(sources, dict):
+            sources = {f"cam{i}": source for i, source in enumerate(sources)}
+
+        # Keep only the latest results per camera so long runs do not grow without bound
+        self.streams = {}
+        self.results = {camera_id: deque(maxlen=self.config['results_per_camera']) for camera_id in sources}
+        frames_processed = {camera_id: 0 for camera_id in sources}
+        alerts_generated = {camera_id: 0 for camera_id in sources}
+        all_alerts = {camera_id: deque(maxlen=self.config['alerts_per_camera']) for camera_id in sources}
+        batch_sizes = []
+        try:
+            # Start one capture thread per camera, each with fresh tracks; a camera that
+            # fails to open stops the ones already started
+            for camera_id, source in sources.items():
+                self.monitoring_system.reset_tracker(camera_id)
+                queue = FrameQueue(self.config['camera_queue_size'], self._condition)
+                scheduler = None
+                if self.config['frame_interval'] is None:
+                    scheduler = self.monitoring_system.create_frame_scheduler(camera_id)
+                meter = self.monitoring_system.metrics.stream(camera_id)
+                stream = CameraStream(camera_id, source, queue, self.config['frame_interval'] or 5, scheduler, meter)
+                stream.start()
+                self.streams[camera_id] = stream
+
+                if output_dir:
+                    os.makedirs(os.path.join(output_dir, str(camera_id)), exist_ok=True)
+
+            # Run the shared inference worker in this thread
+            start_time = time.time()
+            while True:
+                if duration and time.time() - start_time > duration:
+                    break
+
+                batch = self._collect_batch()
+                if batch is None:
+                    break
+                if not batch:
+                    continue
+
+                batch_sizes.append(len(batch))
+
+                # Time frames spent queued; a growing wait means inference is falling behind the cameras
+                metrics = self.monitoring_system.metrics
+                if metrics.enabled:
+                    now = time.time()
+                    for camera_id, _, timestamp, _ in batch:
+                        metrics.observe('queue_wait', now - timestamp, stream=camera_id)
+                        metrics.set_gauge('stream_lag_seconds', now - timestamp, stream=camera_id)
+
+                # One detector call for frames from all cameras
+                frames = [item[3] for item in batch]
+                batch_detections = self.monitoring_system.detector.detect_batch(frames)
+
+                # Fan the results back out per camera
+                for (camera_id, frame_index, timestamp, frame), detections in zip(batch, batch_detections):
+                    output_path = None
+                    if output_dir:
+                        output_path = os.path.join(output_dir, str(camera_id), f"frame_{frame_index}.jpg")
+
+                    detections, alerts = self.monitoring_system.process_detections(
+                        frame,
+                        detections,
+                        output_path=output_path,
+                        generate_alerts=generate_alerts,
+                        stream_id=camera_id,
+                        timestamp=timestamp
+                    )
+
+                    self.results[camera_id].append({
+                        'frame_index': frame_index,
+                        'timestamp': timestamp,
+                        'detections': detections,
+                        'alerts': alerts
+                    })
+                    frames_processed[camera_id] += 1
+                    alerts_generated[camera_id] += len(alerts)
+                    all_alerts[camera_id].extend(alerts)
+        finally:
+            for stream in self.streams.values():
+                stream.stop()
+
+        # Finish writing queued alert images and annotated frames
+        self.monitoring_system.flush_artifacts()
+
+        # Collect per-camera statistics
+        self.stats = {
+            'batches': len(batch_sizes),
+            'mean_batch_size': sum(batch_sizes) / len(batch_sizes) if batch_sizes else 0.0,
+            'cameras': {
+                camera_id: {
+                    'frames_captured': stream.frames_captured,
+                    'frames_queued': stream.frames_queued,
+                    'frames_dropped': stream.queue.dropped,
+                    'frames_processed': frames_processed[camera_id],
+                    'alerts': alerts_generated[camera_id],
+                    'sampling': stream.scheduler.stats if stream.scheduler is not None else None
+                }
+                for camera_id, stream in self.streams.items()
+            }
+        }
+
+        print(f"Processed {sum(batch_sizes)} frames from {len(self.streams)} cameras "
+              f"in {len(batch_sizes)} batches (mean batch size {self.stats['mean_batch_size']:.1f})")
+
+        return {camera_id: list(alerts) for camera_id, alerts in all_alerts.items()}
+
+    def _collect_batch(self):
+        """
+        Assemble a cross-camera batch.
+
+        Frames are taken round-robin from the camera queues until max_batch_size
+        frames are gathered or max_batch_wait_ms has passed since the first frame.
+
+        Returns:
+            List of queued frame tuples, or None once every feed has ended and drained
+        """
+        max_batch_size = self.config['max_batch_size']
+        max_wait = self.config['max_batch_wait_ms'] / 1000.0
+        batch = []
+        deadline = None
+
+        while len(batch) < max_batch_size:
+            took_frame = False
+            for stream in self.streams.values():
+                item = stream.queue.pop()
+                if item is not None:
+                    batch.append(item)
+                    took_frame = True
+                    if len(batch) >= max_batch_size:
+                        break
+
+            if batch and deadline is None:
+                deadline = time.time() + max_wait
+
+            if took_frame:
+                continue
+
+            # Nothing queued right now
+            if all(stream.finished and len(stream.queue) == 0 for stream in self.streams.values()):
+                return batch or None
+
+            if not batch:
+                # Wait briefly, then hand control back so the caller can check its duration
+                with self._condition:
+                    self._condition.wait(timeout=max_wait)
+                return batch
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+
+            with self._condition:
+                self._condition.wait(timeout=remaining)
+
+        return batch
+
+    def report_throughput(self):
+        """Print the inference throughput of each loaded model."""
+        self.monitoring_system.report_throughput()
+
+    def report_metrics(self):
+        """Print per-stage latencies and the pipeline counters."""
+        self.monitoring_system.report_metrics()
+
+    def stop_metrics(self):
+        """Stop the metrics endpoint and write a final JSON snapshot."""
+        self.monitoring_system.stop_metrics()
+
+    def generate_report(self, output_path=None):
+        """
+        Generate a summary report of the monitoring system.
+
+        Args:
+            output_path: Path to save the report (optional)
+
+        Returns:
+            Report text
+        """
+        # Generate alert report
+        report = self.monitoring_system.alert_system.generate_alert_report(output_path)
+
+        return report
+
+    def visualize_alerts(self, output_path=None):
+        """
+        Visualize the distribution of alerts.
+
+        Args:
+            output_path: Path to save the visualization (optional)
+
+        Returns:
+            Matplotlib figure
+        """
+        # Visualize alert distribution
+        fig = self.monitoring_system.alert_system.visualize_alert_distribution(output_path)
+
+        return fig
+
+    def visualize_section_timeline(self, output_path=None, bucket_seconds=60):
+        """
+        Visualize the number of alerts per stadium section over time.
+
+        Args:
+            output_path: Path to save the visualization (optional)
+            bucket_seconds: Length of the time buckets in seconds (one of alert_bucket_sizes)
+
+        Returns:
+            Matplotlib figure
+        """
+        # Visualize alerts per section from the time-bucketed counts
+        fig = self.monitoring_system.visualize_section_timeline(output_path, bucket_seconds)
+
+        return fig
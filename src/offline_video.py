@@ -0,0 +1,353 @@
+"""
+Parallel offline video processing for the stadium monitoring system.
+This module splits a recorded video into frame-index segments, processes them in a
+pool of worker processes that each load their own models, skips unprocessed frames
+with grab() instead of decoding them, and merges the results back in frame order.
+"""
+
+import os
+import time
+import shutil
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import cv2
+
+# Monitoring system of the current worker process, created by _init_worker()
+_worker_system = None
+
+def split_segments(total_frames, num_segments):
+    """
+    Split a video into contiguous frame-index segments of nearly equal length.
+
+    Args:
+        total_frames: Number of frames in the video
+        num_segments: Number of segments to create
+
+    Returns:
+        List of (start, end) frame indices, end exclusive; the last segment's end
+        is None so it reads until the end of the video
+    """
+    num_segments = max(1, min(num_segments, total_frames))
+    bounds = [round(i * total_frames / num_segments) for i in range(num_segments + 1)]
+    segments = [(bounds[i], bounds[i + 1]) for i in range(num_segments)]
+
+    # Frame counts reported by containers can be off, so let the last segment run to the end
+    segments[-1] = (segments[-1][0], None)
+    return segments
+
+def merge_sampling_stats(stats_list):
+    """Sum the MotionScheduler statistics of several segments."""
+    merged = {}
+    for stats in stats_list:
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                section_activity = merged.setdefault(key, {})
+                for name, count in value.items():
+                    section_activity[name] = section_activity.get(name, 0) + count
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+def concat_videos(part_paths, output_path, fps, size):
+    """
+    Concatenate segment videos into one output video.
+
+    Uses ffmpeg's concat demuxer to join the parts without re-encoding when
+    ffmpeg is installed, and re-encodes the frames with OpenCV otherwise.
+
+    Args:
+        part_paths: Segment video paths in order
+        output_path: Path of the joined video
+        fps: Frame rate of the output video
+        size: (width, height) of the output video
+    """
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg:
+        list_path = output_path + '.parts.txt'
+        with open(list_path, 'w') as f:
+            for path in part_paths:
+                f.write(f"file '{os.path.abspath(path)}'\n")
+        try:
+            result = subprocess.run(
+                [ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path],
+                capture_output=True
+            )
+        finally:
+            os.remove(list_path)
+        if result.returncode == 0:
+            return
+        print(f"Warning: ffmpeg concat failed, re-encoding instead: {result.stderr.decode(errors='replace').strip()}")
+
+    # Re-encode every frame of the parts into the output video
+    out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    for path in part_paths:
+        cap = cv2.VideoCapture(path)
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            out.write(frame)
+        cap.release()
+    out.release()
+
+def _init_worker(config, model_paths, threads):
+    """Load the models of a worker process once, before it takes any segment."""
+    global _worker_system
+
+    import tensorflow as tf
+    from src.system import StadiumMonitoringSystem
+
+    # Split the cores between the workers instead of letting each one use all of them
+    cv2.setNumThreads(1)
+    if threads:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    _worker_system = StadiumMonitoringSystem(config=config)
+    _worker_system.initialize(**model_paths)
+
+def _process_segment(task):
+    """
+    Process one segment of a video in a worker process.
+
+    Args:
+        task: Dictionary with the video path, segment index, start and end frame,
+              frame interval, alert flag and the path of the segment's output video
+
+    Returns:
+        Dictionary with the segment's processed frames, alerts, alert records,
+        sampling statistics and frame count
+    """
+    system = _worker_system
+    video_path = task['video_path']
+    start, end = task['start'], task['end']
+
+    # Alert IDs must not collide with those of the other segments
+    system.alert_system.id_prefix = f"ALERT_S{task['segment']}"
+    first_record = len(system.alert_system.alerts_log)
+
+    # Seek to the start of the segment
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if start > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    # Create the segment's output video if needed
+    out = None
+    if task['part_path']:
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        out = cv2.VideoWriter(task['part_path'], cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+
+    # Tracks and motion references start fresh in every segment
+    frame_interval = task['frame_interval']
+    scheduler = system.create_frame_scheduler(video_path) if frame_interval is None else None
+    frame_interval = frame_interval or 5
+    system.reset_tracker(video_path)
+    name = f"{os.path.splitext(os.path.basename(video_path))[0]}_s{task['segment']}"
+    recorder = system.create_event_recorder(video_path, fps, name=name)
+
+    frames = []
+    alerts = []
+    frame_index = start
+    while end is None or frame_index < end:
+        # Without an output video or event clips, skip frames that will not be processed without decoding them
+        if out is None and recorder is None:
+            if scheduler is None:
+                skip = frame_index % frame_interval != 0
+            else:
+                skip = scheduler.skip_undecoded()
+            if skip:
+                if not cap.grab():
+                    break
+                frame_index += 1
+                continue
+
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        # Process frames with activity, or every Nth frame of the whole video
+        if system.should_process_frame(scheduler, frame, frame_index, frame_interval):
+            detections, frame_alerts = system.process_frame(
+                frame,
+                output_path=None,
+                generate_alerts=task['generate_alerts'],
+                stream_id=video_path,
+                timestamp=frame_index / fps if fps else None
+            )
+
+            for alert in frame_alerts:
+                alert['frame'] = frame_index
+            frames.append((frame_index, detections))
+            alerts.extend(frame_alerts)
+
+            # Draw detections on frame
+            if out is not None or recorder is not None:
+                system._draw_detections(frame, detections)
+
+        if recorder is not None:
+            recorder.push(frame, frame_index / fps if fps else None)
+        if out is not None:
+            out.write(frame)
+
+        frame_index += 1
+
+    # Release resources and make sure the alert images are written
+    cap.release()
+    if out is not None:
+        out.release()
+    system.close_event_recorder(video_path)
+    system.flush_artifacts()
+
+    return {
+        'segment': task['segment'],
+        'frames': frames,
+        'alerts': alerts,
+        'records': system.alert_system.alerts_log[first_record:],
+        'sampling': scheduler.stats if scheduler is not None else None,
+        'frames_read': frame_index - start
+    }
+
+class OfflineVideoProcessor:
+    """Processes recorded videos in parallel segments across a pool of worker processes."""
+
+    def __init__(self, system, num_workers=None, segments_per_worker=2, threads_per_worker=None):
+        """
+        Initialize the offline video processor.
+
+        Args:
+            system: Initialized StadiumMonitoringSystem; its configuration and model paths
+                    are used by the workers and the merged alerts are added to its log
+            num_workers: Number of worker processes (default: CPU count)
+            segments_per_worker: Segments per worker; more segments balance uneven
+                                 segments better at the cost of more track restarts
+            threads_per_worker: CPU threads each worker's models may use
+                                (default: CPU count divided by the number of workers)
+        """
+        self.system = system
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.segments_per_worker = max(1, segments_per_worker)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.num_workers)
+
+    def _worker_config(self):
+        """Configuration of the worker systems."""
+        config = dict(self.system.config)
+        config.update({
+            'alert_store': 'memory',  # Workers return their alerts; only this process writes the log
+            'metrics': False,
+            'metrics_port': None,
+            'metrics_snapshot_path': None
+        })
+        if config.get('inference_threads') is None:
+            config['inference_threads'] = self.threads_per_worker
+        return config
+
+    def process_video(self, video_path, output_path=None, generate_alerts=True, frame_interval=None):
+        """
+        Process a recorded video in parallel segments.
+
+        Results match StadiumMonitoringSystem.process_video(), except that fan tracks
+        and motion references restart at every segment boundary.
+
+        Args:
+            video_path: Path to the input video
+            output_path: Path to save the output video (optional); every frame has to
+                         be decoded to write it, so frames are only skipped with grab()
+                         without an output video or event clips
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            frame_interval: Process every Nth frame; None picks frames by motion
+                            (every 5th frame if adaptive_sampling is off)
+
+        Returns:
+            all_detections: List of detections for each processed frame, in frame order
+            all_alerts: List of generated alerts in frame order, each with its frame index
+        """
+        if not self.system.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+
+        if not self.system.model_paths.get('detector_path'):
+            raise RuntimeError("Detector not available. Cannot process video.")
+
+        # Get video properties
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        if frame_interval is None and not self.system.config['adaptive_sampling']:
+            frame_interval = 5
+
+        # Split the video into segments
+        segments = split_segments(total_frames, self.num_workers * self.segments_per_worker)
+        parts_dir = output_path + '.parts' if output_path else None
+        if parts_dir:
+            os.makedirs(parts_dir, exist_ok=True)
+
+        tasks = [
+            {
+                'video_path': video_path,
+                'segment': i,
+                'start': start,
+                'end': end,
+                'frame_interval': frame_interval,
+                'generate_alerts': generate_alerts,
+                'part_path': os.path.join(parts_dir, f"segment_{i:04d}.mp4") if parts_dir else None
+            }
+            for i, (start, end) in enumerate(segments)
+        ]
+
+        # Process the segments across the pool; spawn keeps TensorFlow state out of the workers
+        start_time = time.time()
+        results = []
+        num_workers = min(self.num_workers, len(tasks))
+        print(f"Processing {total_frames} frames in {len(tasks)} segments with {num_workers} workers")
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self._worker_config(), self.system.model_paths, self.threads_per_worker)
+        ) as executor:
+            futures = [executor.submit(_process_segment, task) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                print(f"Finished segment {len(results)}/{len(tasks)} "
+                      f"({result['frames_read']} frames, {len(result['frames'])} processed)")
+
+        # Merge the segments back in frame order
+        results.sort(key=lambda result: result['segment'])
+        all_detections = []
+        all_alerts = []
+        for result in results:
+            all_detections.extend(detections for _, detections in result['frames'])
+            all_alerts.extend(result['alerts'])
+            self.system.alert_system.add_alerts(result['records'])
+            self.system.metrics.increment('frames_processed', len(result['frames']), stream=video_path)
+            self.system.metrics.increment(
+                'detections', sum(len(detections) for _, detections in result['frames']), stream=video_path
+            )
+
+        # Keep the merged frame sampling statistics
+        sampling = [result['sampling'] for result in results if result['sampling'] is not None]
+        if sampling:
+            self.system.sampling_stats[video_path] = merge_sampling_stats(sampling)
+
+        # Join the segment videos into one output video
+        if output_path:
+            concat_videos([task['part_path'] for task in tasks], output_path, fps, (width, height))
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+        frames_read = sum(result['frames_read'] for result in results)
+        elapsed = time.time() - start_time
+        print(f"Processed {frames_read} frames in {elapsed:.1f}s "
+              f"({frames_read / max(elapsed, 1e-6):.1f} frames/s, {len(all_detections)} inferred)")
+
+        return all_detections, all_alerts
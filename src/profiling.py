@@ -0,0 +1,218 @@
+"""
+Profiling helpers for the stadium monitoring benchmarks.
+This module measures per-frame latency percentiles, peak resident memory and bytes
+written by a benchmark run, and compares benchmark results against a stored baseline.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import threading
+import numpy as np
+
+# Metrics where a higher value is better; for all others lower is better
+HIGHER_IS_BETTER = ('frames_per_second', 'processed_frames_per_second')
+
+def current_rss():
+    """
+    Resident set size of this process in bytes.
+
+    Returns:
+        RSS in bytes, or None if it cannot be read on this platform
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        return usage if sys.platform == 'darwin' else usage * 1024
+    except ImportError:
+        return None
+
+class PeakMemorySampler:
+    """Background thread that records the peak RSS while a benchmark runs."""
+
+    def __init__(self, interval=0.005):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.peak = 0
+        self.baseline = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.baseline = current_rss() or 0
+        self.peak = self.baseline
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        rss = current_rss()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+
+class LatencyRecorder:
+    """Collects per-frame latencies of a benchmark run."""
+
+    def __init__(self):
+        self.latencies = []
+        self.starts = []
+
+    def wrap(self, fn):
+        """
+        Wrap a function so every call is timed.
+
+        Args:
+            fn: Function processing one frame
+
+        Returns:
+            Wrapped function with the same signature
+        """
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.starts.append(start)
+                self.latencies.append(time.perf_counter() - start)
+        return timed
+
+    def summary(self, since=None):
+        """
+        Latency percentiles in milliseconds.
+
+        Args:
+            since: time.perf_counter() value; calls started before it (e.g. during
+                   warm-up) are left out (optional)
+
+        Returns:
+            Dictionary with count, mean, p50, p90, p99 and max latency
+        """
+        latencies = [latency for start, latency in zip(self.starts, self.latencies) if since is None or start >= since]
+        if not latencies:
+            return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p90_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+
+        latencies = np.array(latencies) * 1000
+        return {
+            'count': len(latencies),
+            'mean_ms': float(latencies.mean()),
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p90_ms': float(np.percentile(latencies, 90)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'max_ms': float(latencies.max())
+        }
+
+def directory_bytes(path):
+    """
+    Total size of all files under a directory.
+
+    Args:
+        path: Directory path
+
+    Returns:
+        Size in bytes (0 if the directory does not exist)
+    """
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def environment_info():
+    """Describe the machine and library versions a benchmark ran on."""
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__
+    }
+    for module_name in ('tensorflow', 'cv2'):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            info[module_name] = getattr(module, '__version__', 'unknown')
+    return info
+
+def save_results(results, path):
+    """Write benchmark results to a JSON file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+def load_results(path):
+    """Load benchmark results from a JSON file."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def compare_results(current, baseline, tolerance=0.10, metrics=None):
+    """
+    Compare benchmark results against a baseline.
+
+    A metric regresses when it is worse than the baseline by more than the
+    tolerance: throughput lower, or latency, memory and bytes written higher.
+
+    Args:
+        current: Results of the current run (as written by save_results)
+        baseline: Baseline results
+        tolerance: Allowed relative change before a metric counts as a regression
+        metrics: Metric names to compare (default: captured and processed throughput,
+                 p50/p99 latency, peak RSS, bytes written and the live mode's p99
+                 capture-to-result latency)
+
+    Returns:
+        List of comparison dictionaries with scenario, metric, baseline, current,
+        relative change and whether it is a regression
+    """
+    metrics = metrics or ('frames_per_second', 'processed_frames_per_second', 'p50_ms', 'p99_ms', 'peak_rss_mb',
+                          'bytes_written', 'capture_to_result_p99_ms')
+
+    comparisons = []
+    for scenario, result in current.get('scenarios', {}).items():
+        reference = baseline.get('scenarios', {}).get(scenario)
+        if reference is None or 'error' in result or 'error' in reference:
+            continue
+
+        for metric in metrics:
+            if metric not in result or metric not in reference or not reference[metric]:
+                continue
+
+            change = (result[metric] - reference[metric]) / abs(reference[metric])
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            comparisons.append({
+                'scenario': scenario,
+                'metric': metric,
+                'baseline': reference[metric],
+                'current': result[metric],
+                'change': change,
+                'regression': worse > tolerance
+            })
+
+    return comparisons
@@ -0,0 +1,137 @@
+"""
+Persistent result cache for the stadium monitoring system.
+This module stores the detections and alerts of processed images in a local SQLite
+database keyed by the image content hash and a fingerprint of the models and
+configuration, so re-running over unchanged images skips decoding and inference.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+
+from src.model_cache import file_hash
+
+# Configuration keys that change the detections or alerts of an image
+RESULT_CONFIG_KEYS = (
+    'input_shape',
+    'detection_threshold',
+    'max_detections',
+    'detection_nms_iou_threshold',
+    'crop_shape',
+    'refine_with_classifiers',
+    'inference_backend',
+    'tflite_precision',
+    'stadium_sections',
+    'seat_map'
+)
+
+def _to_json(value):
+    """Convert NumPy values in results to JSON types."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def result_fingerprint(model_paths, config, generate_alerts=True):
+    """
+    Fingerprint the models and configuration results depend on.
+
+    Args:
+        model_paths: Dictionary of model paths as passed to StadiumMonitoringSystem.initialize()
+        config: System configuration
+        generate_alerts: Whether alerts are generated for the images
+
+    Returns:
+        Hex digest string; results cached under another fingerprint are not reused
+    """
+    settings = {
+        'models': {name: file_hash(path) for name, path in sorted(model_paths.items()) if path},
+        'config': {key: config.get(key) for key in RESULT_CONFIG_KEYS},
+        'generate_alerts': generate_alerts
+    }
+
+    # A seat map is identified by its content, not its path
+    if config.get('seat_map') and os.path.exists(config['seat_map']):
+        settings['seat_map_hash'] = file_hash(config['seat_map'])
+
+    encoded = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """SQLite cache of per-image results keyed by image content hash and fingerprint."""
+
+    def __init__(self, path, fingerprint):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path to the SQLite database file
+            fingerprint: Fingerprint of the models and configuration (see result_fingerprint())
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'fingerprint TEXT NOT NULL, '
+            'image_hash TEXT NOT NULL, '
+            'created REAL NOT NULL, '
+            'data TEXT NOT NULL, '
+            'PRIMARY KEY (fingerprint, image_hash))'
+        )
+        self._conn.commit()
+
+    def get(self, image_hash):
+        """
+        Look up the result of an image.
+
+        Args:
+            image_hash: SHA-256 hex digest of the image file
+
+        Returns:
+            Cached result dictionary, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM results WHERE fingerprint = ? AND image_hash = ?',
+                (self.fingerprint, image_hash)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, image_hash, result):
+        """
+        Store the result of an image.
+
+        Args:
+            image_hash: SHA-256 hex digest of the image file
+            result: JSON-serializable result dictionary (NumPy values are converted)
+        """
+        data = json.dumps(result, default=_to_json)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results (fingerprint, image_hash, created, data) VALUES (?, ?, ?, ?)',
+                (self.fingerprint, image_hash, time.time(), data)
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,214 @@
+"""
+Seat map of the stadium stands for the stadium monitoring system.
+This module rasterizes polygon sections (stands, blocks, aisles and buffer zones) with
+their allowed teams into a per-camera label image once, so the section of every fan
+in a frame is resolved with a single vectorized lookup instead of per-section tests.
+"""
+
+import json
+import cv2
+import numpy as np
+
+# Label of pixels outside every section
+NO_SECTION = 0
+
+class SeatMap:
+    """Label image of polygon stadium sections with per-section team rules."""
+
+    def __init__(self, sections, shape, source_shape=None):
+        """
+        Initialize and rasterize the seat map.
+
+        Each section is a dictionary with:
+            name: Section name used in alerts and statistics
+            polygon: List of [x, y] vertices
+            teams: Teams allowed in the section; a fan of any other team is misplaced
+                   (empty or missing: no restriction)
+            buffer: True for buffer zones such as aisles between rival stands, where
+                    fans are flagged but never reported as misplaced (optional)
+
+        Sections are drawn in order, so where polygons overlap the later section wins.
+
+        Args:
+            sections: List of section dictionaries
+            shape: (height, width) of the frames the map is looked up with (model input space)
+            source_shape: (height, width) of the coordinate space the polygons are given in
+                          (default: shape)
+        """
+        self.shape = tuple(shape[:2])
+        self.sections = [dict(section) for section in sections]
+        self.section_names = [section['name'] for section in self.sections]
+        self.teams = sorted({team for section in self.sections for team in section.get('teams', [])})
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+
+        # Per-label tables; label 0 is "no section", label i + 1 is sections[i]
+        num_labels = len(self.sections) + 1
+        self.names = np.array([None] + self.section_names, dtype=object)
+        self.allowed_teams = [()] + [tuple(section.get('teams', [])) for section in self.sections]
+        self.is_buffer = np.zeros(num_labels, dtype=bool)
+        self.is_restricted = np.zeros(num_labels, dtype=bool)
+
+        # Allowed-team matrix with an extra column for teams no section mentions
+        self.allowed = np.zeros((num_labels, len(self.teams) + 1), dtype=bool)
+        for label, section in enumerate(self.sections, start=1):
+            self.is_buffer[label] = bool(section.get('buffer', False))
+            self.is_restricted[label] = bool(section.get('teams'))
+            for team in section.get('teams', []):
+                self.allowed[label, self.team_index[team]] = True
+
+        self.labels = self._rasterize(source_shape or self.shape)
+
+    @classmethod
+    def from_rectangles(cls, stadium_sections, shape):
+        """
+        Build a seat map from the legacy stadium_sections configuration.
+
+        Args:
+            stadium_sections: Dictionary mapping team names to [x1, y1, x2, y2] sections
+            shape: (height, width) of the frames the map is looked up with
+
+        Returns:
+            SeatMap with one section per team, named after the team
+        """
+        sections = [
+            {
+                'name': team,
+                'teams': [team],
+                'polygon': [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+            }
+            for team, (x1, y1, x2, y2) in stadium_sections.items()
+        ]
+        return cls(sections, shape)
+
+    def _rasterize(self, source_shape):
+        """Draw every section polygon into the label image."""
+        dtype = np.uint16 if len(self.sections) < np.iinfo(np.uint16).max else np.int32
+        labels = np.zeros(self.shape, dtype=dtype)
+        scale = np.array([self.shape[1] / source_shape[1], self.shape[0] / source_shape[0]])
+
+        for label, section in enumerate(self.sections, start=1):
+            polygon = np.round(np.array(section['polygon'], dtype=np.float64) * scale).astype(np.int32)
+            cv2.fillPoly(labels, [polygon], int(label))
+
+        return labels
+
+    def lookup(self, points):
+        """
+        Find the section label of many points at once.
+
+        Args:
+            points: Array-like of (x, y) points in frame coordinates
+
+        Returns:
+            Array of section labels (NO_SECTION outside every section)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        height, width = self.shape
+        xs = np.floor(points[:, 0]).astype(np.int64)
+        ys = np.floor(points[:, 1]).astype(np.int64)
+
+        # Gather from the label image; points outside the frame are in no section
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        labels = np.full(len(points), NO_SECTION, dtype=np.int64)
+        labels[inside] = self.labels[ys[inside], xs[inside]]
+        return labels
+
+    def resolve(self, boxes, teams=None, frame_shape=None):
+        """
+        Resolve the section, allowed teams and buffer flag of every detection of a frame.
+
+        Args:
+            boxes: Array-like of [x1, y1, x2, y2] boxes; each fan is placed at its box center
+            teams: Team of each detection (optional); needed for the misplaced flags
+            frame_shape: (height, width) of the frame the boxes are in, e.g. a full-resolution
+                         panorama of the camera view; boxes are scaled into the map
+                         (default: the map's own shape)
+
+        Returns:
+            Dictionary with
+                section_ids: Array of section labels (NO_SECTION outside every section)
+                sections: List of section names (None outside every section)
+                allowed_teams: List of tuples of the teams allowed where each fan is
+                buffer: Boolean array, True for fans in a buffer zone
+                misplaced: Boolean array, True for fans of a team not allowed in their
+                           (non-buffer) section; all False without teams
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        centers = np.stack([(boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2], axis=1)
+        if frame_shape is not None:
+            centers *= [self.shape[1] / frame_shape[1], self.shape[0] / frame_shape[0]]
+        section_ids = self.lookup(centers)
+
+        misplaced = np.zeros(len(section_ids), dtype=bool)
+        if teams is not None:
+            unknown = len(self.teams)
+            team_ids = np.array([self.team_index.get(team, unknown) for team in teams], dtype=np.int64)
+            misplaced = (self.is_restricted[section_ids]
+                         & ~self.is_buffer[section_ids]
+                         & ~self.allowed[section_ids, team_ids])
+
+        return {
+            'section_ids': section_ids,
+            'sections': self.names[section_ids].tolist(),
+            'allowed_teams': [self.allowed_teams[label] for label in section_ids],
+            'buffer': self.is_buffer[section_ids],
+            'misplaced': misplaced
+        }
+
+    def section_for_point(self, point):
+        """Get the name of the section containing a point, or None."""
+        return self.names[self.lookup([point])[0]]
+
+    def section_masks(self, shape):
+        """
+        Masks of every section on a frame of another size.
+
+        Args:
+            shape: (height, width) of the target frame
+
+        Returns:
+            Dictionary mapping section names to boolean masks
+        """
+        labels = cv2.resize(self.labels, (shape[1], shape[0]), interpolation=cv2.INTER_NEAREST)
+        return {name: labels == label for label, name in enumerate(self.section_names, start=1)}
+
+def load_seat_maps(path, shape):
+    """
+    Load the seat maps of all cameras from a JSON file.
+
+    The file holds default sections and optional per-camera sections:
+
+        {
+            "shape": [384, 512],
+            "sections": [
+                {"name": "north_lower", "teams": ["hilal"], "polygon": [[0, 0], [240, 0], [200, 384], [0, 384]]},
+                {"name": "north_aisle", "buffer": true, "polygon": [[240, 0], [272, 0], [232, 384], [200, 384]]}
+            ],
+            "cameras": {
+                "cam1": {"shape": [720, 1280], "sections": [...]}
+            }
+        }
+
+    "shape" is the (height, width) the polygons are drawn in; it defaults to the
+    frame shape.
+
+    Args:
+        path: Path to the seat-map JSON file
+        shape: (height, width) of the frames the maps are looked up with
+
+    Returns:
+        Dictionary mapping camera IDs (as strings) to SeatMap instances, with the
+        default seat map under None if the file defines default sections
+    """
+    with open(path, 'r') as f:
+        config = json.load(f)
+
+    seat_maps = {}
+    if 'sections' in config:
+        seat_maps[None] = SeatMap(config['sections'], shape, config.get('shape'))
+
+    for camera_id, camera_config in config.get('cameras', {}).items():
+        source_shape = camera_config.get('shape', config.get('shape'))
+        seat_maps[str(camera_id)] = SeatMap(camera_config['sections'], shape, source_shape)
+
+    return seat_maps
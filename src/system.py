@@ -0,0 +1,1168 @@
+"""
+Main integration module for the stadium crowd monitoring system.
+This module integrates all components into a complete system.
+"""
+
+import os
+import time
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.alert_system import SecurityAlertSystem
+from src.inference import StadiumCrowdDetector
+from src.box_utils import non_max_suppression
+from src.artifact_writer import ArtifactWriter
+from src.tracker import FanTracker, ALERT_NEW, ALERT_ESCALATION
+from src.motion_scheduler import MotionScheduler
+from src.metrics import MetricsRegistry, MetricsServer, SnapshotWriter
+from src.seat_map import SeatMap, load_seat_maps
+from src.event_recorder import EventRecorder
+from src.live_capture import LatestFrameCapture, LiveLatency
+
+class StadiumMonitoringSystem:
+    """Integrated system for stadium crowd monitoring."""
+    
+    def __init__(self, config=None):
+        """
+        Initialize the stadium monitoring system.
+        
+        Args:
+            config: Configuration dictionary (optional)
+        """
+        # Default configuration
+        self.config = {
+            'model_dir': 'models',
+            'input_shape': (384, 512, 3),
+            'detection_threshold': 0.5,
+            'max_detections': 300,  # Maximum fans per frame decoded from the dense detection head
+            'detection_nms_iou_threshold': 0.5,  # IoU above which overlapping fan boxes of a frame are merged
+            'alerts_dir': 'alerts',
+            'crop_shape': (128, 128, 3),  # Input shape of the crop classifiers
+            'refine_with_classifiers': True,  # Use loaded crop classifiers to refine labels
+            'async_artifacts': True,  # Write alert images and other artifacts in the background
+            'artifact_writer_workers': 2,  # Background writer threads
+            'artifact_queue_size': 64,  # Queued artifacts before producers block
+            'alert_store': 'jsonl',  # Alert log backend: 'jsonl', 'sqlite' or 'memory' (not persisted)
+            'alert_bucket_sizes': (60, 300),  # Seconds per time bucket of the running alert counts
+            'alert_artifacts': 'compact',  # 'compact': fan crop + thumbnail per alert and one shared image per frame; 'full': annotated frame per alert
+            'alert_image_format': 'jpeg',  # Alert image format: 'jpeg', 'webp' or 'png' (lossless)
+            'alert_image_quality': 90,  # JPEG/WebP quality of alert images
+            'alert_thumbnail_width': 160,  # Width of the context thumbnail saved with each alert crop
+            'alert_crop_padding': 0.25,  # Context around the fan box in alert crops (fraction of the box size per side)
+            'inference_backend': 'keras',  # 'keras', 'tf-function', 'tflite' or 'onnxruntime'
+            'tflite_precision': 'int8',  # Exported TFLite model to load: 'int8' or 'fp16'
+            'inference_threads': None,  # CPU threads for the TFLite/ONNX Runtime backends
+            'model_cache': True,  # Cache precompiled models in <model_dir>/cache for the tf-function backend
+            'warm_up': True,  # Run each model once at its input shape during initialize()
+            'detector_batch_sizes': (1,),  # Detector batches are zero-padded up to one of these sizes (larger ones run as they come); each is warmed up
+            'crop_batch_sizes': (4, 16, 64),  # Same for the fan crops of a frame in the crop classifiers
+            'track_fans': True,  # Track fans across video frames and alert once per episode
+            'track_iou_threshold': 0.3,  # Minimum IoU to continue a track
+            'track_max_centroid_distance': 0.5,  # Centroid match distance as a fraction of the box diagonal
+            'track_max_age': 10,  # Processed frames a track survives without a match
+            'track_smoothing': 0.4,  # Weight of the newest frame in smoothed team/action scores
+            'alert_confirm_frames': 2,  # Frames a condition must persist on a track before alerting
+            'alert_cooldown': 30.0,  # Seconds before a track repeats the same alert type
+            'alert_episode_gap': 10.0,  # Seconds without the condition that end an alert episode
+            'alert_escalation_delta': 0.15,  # Confidence rise that escalates an ongoing episode
+            'adaptive_sampling': True,  # Pick video frames by motion instead of a fixed interval
+            'motion_min_interval': 2,  # Minimum frames between inferences (maximum sampling rate)
+            'motion_max_interval': 15,  # Maximum frames between inferences (minimum sampling rate)
+            'motion_threshold': 0.01,  # Fraction of changed pixels in a block that counts as activity
+            'motion_pixel_threshold': 10,  # Grayscale difference that counts a pixel as changed
+            'motion_downscale_width': 640,  # Width of the frame copy used for differencing (wider frames are shrunk to it)
+            'motion_grid': (4, 4),  # Blocks (rows, cols) motion energy is measured over
+            'metrics': False,  # Record per-stage latencies and frame/alert/byte counters
+            'metrics_port': None,  # Serve Prometheus text on http://<metrics_host>:<port>/metrics (enables metrics)
+            'metrics_host': '127.0.0.1',  # Interface the metrics endpoint binds to
+            'metrics_snapshot_path': None,  # Write a JSON metrics snapshot to this file periodically (enables metrics)
+            'metrics_snapshot_interval': 10.0,  # Seconds between JSON snapshots
+            'seat_map': None,  # JSON file with polygon sections per camera (replaces stadium_sections)
+            'event_clips': False,  # Record a short clip around every alert from a pre-roll ring buffer
+            'clips_dir': 'clips',  # Directory for event clips
+            'clip_pre_roll': 5.0,  # Seconds of video before an alert kept in each clip
+            'clip_post_roll': 5.0,  # Seconds of video after the last alert of a clip
+            'clip_max_length': 60.0,  # Maximum clip length; later alerts start a new clip
+            'clip_buffer': 'jpeg',  # Pre-roll buffer: 'jpeg' (compressed) or 'raw' (preallocated frames)
+            'live_latest_frame': True,  # Live mode: capture on a thread that keeps only the newest frame
+            'live_display': True,  # Live mode: show the preview window (disable on headless servers)
+            'stadium_sections': {
+                'hilal': [0, 0, 256, 384],  # Left half of stadium (x1, y1, x2, y2)
+                'ittihad': [256, 0, 512, 384]  # Right half of stadium
+            }
+        }
+        
+        # Update with provided config
+        if config:
+            self.config.update(config)
+            
+        # Create model directory if it doesn't exist
+        os.makedirs(self.config['model_dir'], exist_ok=True)
+        
+        # Stage timers and counters (no-ops unless metrics are enabled)
+        self.metrics = MetricsRegistry(enabled=bool(
+            self.config['metrics'] or self.config['metrics_port'] is not None or self.config['metrics_snapshot_path']
+        ))
+        self.metrics_server = None
+        self.metrics_snapshots = None
+        
+        # Initialize components
+        self.detector = None
+        self.behavior_classifier = None
+        self.team_detector = None
+        self.crop_classifier = None
+        self.artifact_writer = None
+        if self.config['async_artifacts']:
+            self.artifact_writer = ArtifactWriter(
+                num_workers=self.config['artifact_writer_workers'],
+                max_pending=self.config['artifact_queue_size'],
+                metrics=self.metrics
+            )
+            self.metrics.register_gauge('artifact_queue_depth', self.artifact_writer.jobs.qsize)
+        self.alert_system = SecurityAlertSystem(
+            output_dir=self.config['alerts_dir'],
+            writer=self.artifact_writer,
+            store=self.config['alert_store'],
+            metrics=self.metrics,
+            bucket_sizes=self.config['alert_bucket_sizes'],
+            artifact_policy=self.config['alert_artifacts'],
+            image_format=self.config['alert_image_format'],
+            image_quality=self.config['alert_image_quality'],
+            thumbnail_width=self.config['alert_thumbnail_width'],
+            crop_padding=self.config['alert_crop_padding']
+        )
+        
+        # Per-stream fan trackers, seat maps and frame sampling statistics
+        self.trackers = {}
+        self.recorders = {}
+        self.seat_maps = None
+        self.model_paths = {}
+        self.sampling_stats = {}
+        self.live_stats = {}
+        self.startup_times = {}
+        
+        # Initialize system state
+        self.is_initialized = False
+        
+    def initialize(self, detector_path=None, behavior_classifier_path=None, team_detector_path=None,
+                   crop_classifier_path=None):
+        """
+        Initialize the system components.
+        
+        Args:
+            detector_path: Path to the trained detector model (optional)
+            behavior_classifier_path: Path to the trained behavior classifier (optional)
+            team_detector_path: Path to the trained team detector (optional)
+            crop_classifier_path: Path to the trained fused team/behavior crop classifier (optional);
+                                  when present it replaces the behavior classifier and team detector
+        """
+        start_time = time.time()
+        self.startup_times = {}
+        
+        # Remember the model paths so worker processes can load the same models
+        self.model_paths = {
+            'detector_path': detector_path,
+            'behavior_classifier_path': behavior_classifier_path,
+            'team_detector_path': team_detector_path,
+            'crop_classifier_path': crop_classifier_path
+        }
+        
+        backend_options = self.backend_options()
+        
+        # Initialize detector
+        step_start = time.time()
+        if detector_path and os.path.exists(detector_path):
+            self.detector = StadiumCrowdDetector(detector_path, **self.detector_options())
+            self.startup_times['detector'] = time.time() - step_start
+        else:
+            print("Warning: Detector model not found. System will not be able to detect fans.")
+            
+        # Initialize the fused crop classifier, or the separate behavior and team classifiers
+        step_start = time.time()
+        if crop_classifier_path and os.path.exists(crop_classifier_path):
+            from src.crop_classifier import FanCropClassifier
+            
+            self.crop_classifier = FanCropClassifier(input_shape=self.config['crop_shape'])
+            self.crop_classifier.load_backend(crop_classifier_path, **backend_options)
+            self.startup_times['crop_classifier'] = time.time() - step_start
+        else:
+            # Initialize behavior classifier
+            if behavior_classifier_path and os.path.exists(behavior_classifier_path):
+                from src.behavior_classifier import BehaviorClassifier
+                
+                self.behavior_classifier = BehaviorClassifier()
+                self.behavior_classifier.load_backend(behavior_classifier_path, **backend_options)
+                self.startup_times['behavior_classifier'] = time.time() - step_start
+            else:
+                print("Warning: Behavior classifier not found. Using detector's built-in classification.")
+            
+            # Initialize team detector
+            step_start = time.time()
+            if team_detector_path and os.path.exists(team_detector_path):
+                from src.team_detector import TeamAffiliationDetector
+                
+                self.team_detector = TeamAffiliationDetector()
+                self.team_detector.load_backend(team_detector_path, **backend_options)
+                self.startup_times['team_detector'] = time.time() - step_start
+            else:
+                print("Warning: Team detector not found. Using detector's built-in classification.")
+            
+        # Run the models at fixed batch sizes so each size is traced and allocated once
+        if self.detector:
+            self.detector.model.backend.set_batch_sizes(self.config['detector_batch_sizes'])
+        for classifier in (self.crop_classifier, self.behavior_classifier, self.team_detector):
+            if classifier is not None:
+                classifier.backend.set_batch_sizes(self.config['crop_batch_sizes'])
+                
+        # Pay graph building and allocation now instead of on the first frame
+        if self.config['warm_up']:
+            step_start = time.time()
+            self.warm_up()
+            self.startup_times['warm_up'] = time.time() - step_start
+            
+        self.startup_times['total'] = time.time() - start_time
+        
+        # Warm-up calls are not representative of the pipeline
+        self.metrics.reset()
+        self.start_metrics()
+        
+        self.is_initialized = True
+        print(f"Stadium monitoring system initialized successfully in {self.startup_times['total']:.2f}s")
+        for step, seconds in self.startup_times.items():
+            if step != 'total':
+                print(f"  {step}: {seconds:.2f}s")
+    
+    def start_metrics(self):
+        """Start the metrics endpoint and periodic JSON snapshots if they are configured."""
+        if self.config['metrics_port'] is not None and self.metrics_server is None:
+            self.metrics_server = MetricsServer(
+                self.metrics,
+                host=self.config['metrics_host'],
+                port=self.config['metrics_port']
+            ).start()
+            
+        if self.config['metrics_snapshot_path'] and self.metrics_snapshots is None:
+            self.metrics_snapshots = SnapshotWriter(
+                self.metrics,
+                self.config['metrics_snapshot_path'],
+                interval=self.config['metrics_snapshot_interval']
+            ).start()
+    
+    def stop_metrics(self):
+        """Stop the metrics endpoint and write a final JSON snapshot."""
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+            
+        if self.metrics_snapshots is not None:
+            self.metrics_snapshots.stop()
+            self.metrics_snapshots = None
+    
+    def report_metrics(self):
+        """Print per-stage latencies and the pipeline counters."""
+        if not self.metrics.enabled:
+            return
+            
+        snapshot = self.metrics.snapshot()
+        print("\nPipeline stages:")
+        for stage in snapshot['stages']:
+            labels = ''.join(f" {key}={value}" for key, value in stage['labels'].items())
+            print(f"  {stage['stage']}{labels}: {stage['count']} calls, mean {stage['mean_ms']:.1f} ms, "
+                  f"p50 {stage['p50_ms']:.1f} ms, p99 {stage['p99_ms']:.1f} ms, max {stage['max_ms']:.1f} ms")
+        for counter in snapshot['counters']:
+            labels = ''.join(f" {key}={value}" for key, value in counter['labels'].items())
+            print(f"  {counter['name']}{labels}: {counter['value']}")
+    
+    def backend_options(self):
+        """Inference backend options every model of the system is loaded with."""
+        return {
+            'backend': self.config['inference_backend'],
+            'precision': self.config['tflite_precision'],
+            'num_threads': self.config['inference_threads'],
+            'cache_dir': os.path.join(self.config['model_dir'], 'cache') if self.config['model_cache'] else None
+        }
+        
+    def detector_options(self):
+        """Keyword arguments of the system's StadiumCrowdDetector (or a subclass of it)."""
+        return dict(
+            self.backend_options(),
+            input_shape=self.config['input_shape'],
+            metrics=self.metrics,
+            score_threshold=self.config['detection_threshold'],
+            max_detections=self.config['max_detections'],
+            nms_iou_threshold=self.config['detection_nms_iou_threshold']
+        )
+        
+    def warm_up(self):
+        """Run each loaded model at its configured input shape and batch sizes, and the preprocessing ops once."""
+        if self.detector:
+            self.detector.preprocess_array(np.zeros(self.config['input_shape'], dtype=np.uint8))
+            self.detector.model.backend.warm_up(self.config['input_shape'])
+            
+        if self._has_crop_classifiers():
+            # Also traces the batched crop op used by refine_detections()
+            image = np.zeros(self.config['input_shape'], dtype=np.uint8)
+            self._crop_detections(image, [{'bbox': [0, 0, 1, 1]}])
+            for classifier in (self.crop_classifier, self.behavior_classifier, self.team_detector):
+                if classifier is not None:
+                    classifier.backend.warm_up(self.config['crop_shape'])
+        
+    def process_image(self, image_path, output_path=None, generate_alerts=True):
+        """
+        Process a single image for crowd monitoring.
+        
+        Args:
+            image_path: Path to the input image
+            output_path: Path to save the output image (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            
+        Returns:
+            detections: List of detections
+            alerts: List of generated alerts (if generate_alerts is True)
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        if not self.detector:
+            raise RuntimeError("Detector not available. Cannot process image.")
+            
+        # Decode the image once and run it through the in-memory frame path
+        with self.metrics.timer('decode'):
+            image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError(f"Could not load image: {image_path}")
+            
+        return self.process_frame(image, output_path, generate_alerts)
+    
+    def process_frame(self, frame, output_path=None, generate_alerts=True, stream_id=None, timestamp=None,
+                      capture_time=None):
+        """
+        Process an in-memory frame for crowd monitoring.
+        
+        This is the ndarray-native counterpart of process_image(): the BGR frame
+        coming from cv2.VideoCapture is passed straight through detection, alerting
+        and annotation without being written to disk and decoded again.
+        
+        Args:
+            frame: BGR image array
+            output_path: Path to save the output image (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            stream_id: Video or camera the frame belongs to; enables fan tracking (optional)
+            timestamp: Time of the frame in seconds (defaults to the current time)
+            capture_time: time.time() the frame was captured; its alerts record their latency from it (optional)
+            
+        Returns:
+            detections: List of detections (in model input coordinates)
+            alerts: List of generated alerts (if generate_alerts is True)
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        if not self.detector:
+            raise RuntimeError("Detector not available. Cannot process frame.")
+            
+        with self.metrics.timer('frame'):
+            # Detect fans in the frame
+            detections = self.detector.detect_array(frame)
+            
+            return self.process_detections(frame, detections, output_path, generate_alerts, stream_id, timestamp,
+                                           capture_time)
+    
+    def process_detections(self, frame, detections, output_path=None, generate_alerts=True, stream_id=None, timestamp=None,
+                           capture_time=None):
+        """
+        Run refinement, alerting and annotation for detections of one frame.
+        
+        This is the part of process_frame() that follows the detector, split out
+        so callers that batch detector calls across frames (e.g. the multi-camera
+        worker) can reuse it.
+        
+        Args:
+            frame: BGR image array the detections were computed on
+            detections: List of detections (in model input coordinates)
+            output_path: Path to save the output image (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            stream_id: Video or camera the frame belongs to; enables fan tracking (optional)
+            timestamp: Time of the frame in seconds (defaults to the current time)
+            capture_time: time.time() the frame was captured; its alerts record their latency from it (optional)
+            
+        Returns:
+            detections: List of (refined, tracked) detections
+            alerts: List of generated alerts (if generate_alerts is True)
+        """
+        # Resize once for refinement, alert images and visualization
+        with self.metrics.timer('resize'):
+            resized = cv2.resize(frame, (self.config['input_shape'][1], self.config['input_shape'][0]))
+            rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+        
+        # Refine team/action labels with the dedicated crop classifiers
+        self.refine_detections(rgb, detections)
+        
+        # Assign track IDs and smooth labels across frames of the same stream
+        tracker = None
+        if stream_id is not None and self.config['track_fans']:
+            if timestamp is None:
+                timestamp = time.time()
+            tracker = self.get_tracker(stream_id)
+            with self.metrics.timer('track'):
+                tracker.update(detections, timestamp)
+                
+        stream_labels = {'stream': stream_id} if stream_id is not None else {}
+        self.metrics.increment('frames_processed', **stream_labels)
+        self.metrics.increment('detections', len(detections), **stream_labels)
+        
+        # Process each detection
+        alerts = []
+        if generate_alerts:
+            with self.metrics.timer('alerts'):
+                image = Image.fromarray(rgb)
+                alerts = self.generate_detection_alerts(image, detections, tracker, timestamp, stream_id, capture_time)
+            
+        # Visualize detections
+        if output_path:
+            with self.metrics.timer('annotate'):
+                self._draw_detections(resized, detections)
+            with self.metrics.timer('image_write'):
+                cv2.imwrite(output_path, resized)
+            self.metrics.add_file_bytes(output_path, 'frame')
+            
+        return detections, alerts
+    
+    def detect_tiles(self, image, windows, batch_size=16, iou_threshold=0.5):
+        """
+        Detect fans across many views of one image with batched inference.
+        
+        The views are cropped from the image, run through the detector in batches
+        of up to batch_size tiles per forward pass, mapped back to image
+        coordinates and merged with non-maximum suppression so that fans seen in
+        overlapping views are only reported once.
+        
+        Args:
+            image: BGR image array (e.g. a stadium panorama)
+            windows: List of (x1, y1, x2, y2) view windows in image coordinates
+            batch_size: Maximum number of views per forward pass
+            iou_threshold: IoU above which overlapping detections are merged
+            
+        Returns:
+            detections: List of merged detections in image coordinates
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        if not self.detector:
+            raise RuntimeError("Detector not available. Cannot process tiles.")
+            
+        input_height, input_width = self.config['input_shape'][:2]
+        
+        # Run the detector once per batch of views
+        candidates = []
+        boxes = []
+        for start in range(0, len(windows), batch_size):
+            batch_windows = windows[start:start + batch_size]
+            tiles = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in batch_windows]
+            batch_detections = self.detector.detect_batch(tiles)
+            
+            for (x1, y1, x2, y2), detections in zip(batch_windows, batch_detections):
+                if not detections:
+                    continue
+                    
+                # Map from model input space to the view, then offset by the view origin
+                scale = np.array([(x2 - x1) / input_width, (y2 - y1) / input_height] * 2)
+                offset = np.array([x1, y1, x1, y1])
+                tile_boxes = np.array([det['bbox'] for det in detections], dtype=np.float32)
+                boxes.append(np.round(tile_boxes * scale + offset).astype(int))
+                candidates.extend(detections)
+                
+        if not candidates:
+            return []
+            
+        # Merge duplicates from overlapping views
+        boxes = np.concatenate(boxes)
+        scores = np.array([det['class_score'] for det in candidates])
+        keep = non_max_suppression(boxes, scores, iou_threshold)
+        
+        merged = []
+        for i in keep:
+            det = dict(candidates[i])
+            det['bbox'] = boxes[i].tolist()
+            merged.append(det)
+            
+        # Refine the merged detections against the full image
+        if self._has_crop_classifiers():
+            self.refine_detections(np.ascontiguousarray(image[..., ::-1]), merged)
+            
+        return merged
+    
+    def refine_detections(self, image, detections):
+        """
+        Refine team and action labels with the dedicated crop classifiers.
+        
+        All detections of a frame are cropped and resized in one batched op and
+        each available classifier runs once over the whole batch, so the cost is
+        one forward pass per classifier per frame rather than one per fan. The
+        fused crop classifier gives both labels from a single forward pass.
+        
+        Args:
+            image: RGB image array the detection coordinates refer to
+            detections: List of detections (updated in place)
+            
+        Returns:
+            The refined detections
+        """
+        if not detections or not self._has_crop_classifiers():
+            return detections
+            
+        with self.metrics.timer('crop'):
+            crops = self._crop_detections(image, detections)
+        
+        # Team and behavior from one shared backbone
+        if self.crop_classifier is not None:
+            with self.metrics.timer('classify', model='crop_classifier'):
+                predictions = self.crop_classifier.predict_batch(crops)
+            for det, prediction in zip(detections, predictions):
+                det.update(prediction)
+            return detections
+        
+        # Behavior classification for all fans in the frame
+        if self.behavior_classifier is not None:
+            with self.metrics.timer('classify', model='behavior_classifier'):
+                predictions = self.behavior_classifier.predict_batch(crops)
+            for det, (action, confidence) in zip(detections, predictions):
+                det['action'] = action
+                det['action_score'] = confidence
+                
+        # Team affiliation for all fans in the frame
+        if self.team_detector is not None:
+            with self.metrics.timer('classify', model='team_detector'):
+                predictions = self.team_detector.predict_batch(crops)
+            for det, (team, confidence) in zip(detections, predictions):
+                det['team'] = team
+                det['team_score'] = confidence
+                
+        return detections
+    
+    def _has_crop_classifiers(self):
+        """Check whether crop-level refinement is enabled and a classifier is loaded."""
+        return self.config['refine_with_classifiers'] and (
+            self.crop_classifier is not None or self.behavior_classifier is not None or self.team_detector is not None
+        )
+    
+    def _crop_detections(self, image, detections):
+        """Crop every detection from an image and resize the crops as one batch."""
+        import tensorflow as tf
+        
+        height, width = image.shape[:2]
+        boxes = np.array([det['bbox'] for det in detections], dtype=np.float32)
+        
+        # crop_and_resize expects normalized [ymin, xmin, ymax, xmax] boxes
+        normalized = boxes[:, [1, 0, 3, 2]] / np.array([height, width, height, width], dtype=np.float32)
+        normalized = np.clip(normalized, 0.0, 1.0)
+        
+        crop_height, crop_width = self.config['crop_shape'][:2]
+        crops = tf.image.crop_and_resize(
+            image[np.newaxis],
+            normalized,
+            box_indices=np.zeros(len(detections), dtype=np.int32),
+            crop_size=(crop_height, crop_width)
+        )
+        
+        return crops
+    
+    def generate_detection_alerts(self, image, detections, tracker=None, timestamp=None, stream_id=None, capture_time=None):
+        """
+        Generate alerts for problematic behaviors and misplaced fans.
+        
+        Without a tracker every matching detection raises an alert. With a
+        tracker, each track raises one alert per episode of a condition, plus
+        escalations while the episode continues (see FanTracker.check_alert).
+        
+        Args:
+            image: PIL Image the detection coordinates refer to
+            detections: List of detections
+            tracker: FanTracker that assigned the detections' track IDs (optional)
+            timestamp: Time of the frame in seconds (required with a tracker)
+            stream_id: Camera the frame belongs to, selecting its seat map (optional)
+            capture_time: time.time() the frame was captured; stored and returned alerts then
+                          carry it as capture_timestamp with their latency_ms (optional)
+            
+        Returns:
+            List of generated alerts
+        """
+        # Resolve the seat-map section of every fan in the frame with one lookup; the image may be
+        # larger than the model input the map is rasterized at (e.g. a scanned panorama)
+        seat_map = self.get_seat_map(stream_id)
+        zones = None
+        if detections and seat_map is not None:
+            zones = seat_map.resolve([det['bbox'] for det in detections], [det['team'] for det in detections],
+                                     frame_shape=(image.height, image.width))
+            
+        alerts = []
+        for i, det in enumerate(detections):
+            section = zones['sections'][i] if zones is not None else None
+            
+            # Check for problematic behaviors
+            if det['action'] in ['fighting', 'throwing']:
+                details = f"Team: {det['team']}"
+                decision = ALERT_NEW
+                if tracker is not None:
+                    decision = tracker.check_alert(det['track_id'], det['action'], det['action_score'], timestamp)
+                    details = self._track_details(details, tracker, det, det['action'], decision)
+                    
+                if decision is not None:
+                    # Generate alert
+                    clip_path = self.record_event_clip(stream_id, timestamp, det['action'])
+                    latency = self._alert_latency(capture_time)
+                    alert_id = self.alert_system.generate_alert(
+                        image=image,
+                        detection=det,
+                        alert_type=det['action'],
+                        location=f"Position: ({det['bbox'][0]}, {det['bbox'][1]})",
+                        confidence=det['action_score'],
+                        details=details,
+                        section=section,
+                        track_id=det.get('track_id'),
+                        clip_path=clip_path,
+                        team=det['team'],
+                        **latency
+                    )
+                    
+                    alerts.append({
+                        'alert_id': alert_id,
+                        'type': det['action'],
+                        'team': det['team'],
+                        'location': f"({det['bbox'][0]}, {det['bbox'][1]})",
+                        'confidence': det['action_score'],
+                        'track_id': det.get('track_id'),
+                        'escalation': decision == ALERT_ESCALATION,
+                        'clip_path': clip_path,
+                        **latency
+                    })
+                
+            # Check for misplaced fans
+            if zones is not None and zones['misplaced'][i]:
+                details = f"{det['team']} fan in {section} section"
+                decision = ALERT_NEW
+                if tracker is not None:
+                    decision = tracker.check_alert(det['track_id'], 'misplaced_fan', det['team_score'], timestamp)
+                    details = self._track_details(details, tracker, det, 'misplaced_fan', decision)
+                if decision is None:
+                    continue
+                    
+                # Generate alert for misplaced fan
+                clip_path = self.record_event_clip(stream_id, timestamp, 'misplaced_fan')
+                latency = self._alert_latency(capture_time)
+                alert_id = self.alert_system.generate_alert(
+                    image=image,
+                    detection=det,
+                    alert_type='misplaced_fan',
+                    location=f"Position: ({det['bbox'][0]}, {det['bbox'][1]})",
+                    confidence=det['team_score'],
+                    details=details,
+                    section=section,
+                    track_id=det.get('track_id'),
+                    clip_path=clip_path,
+                    team=det['team'],
+                    **latency
+                )
+                
+                alerts.append({
+                    'alert_id': alert_id,
+                    'type': 'misplaced_fan',
+                    'fan_team': det['team'],
+                    'section': section,
+                    'section_team': ', '.join(zones['allowed_teams'][i]),
+                    'location': f"({det['bbox'][0]}, {det['bbox'][1]})",
+                    'confidence': det['team_score'],
+                    'track_id': det.get('track_id'),
+                    'escalation': decision == ALERT_ESCALATION,
+                    'clip_path': clip_path,
+                    **latency
+                })
+                    
+        # All alerts of the frame are known; queue the frame image they share
+        if alerts:
+            self.alert_system.finish_frame()
+            
+        return alerts
+    
+    def _alert_latency(self, capture_time):
+        """Capture timestamp and capture-to-alert latency fields of an alert, if the capture time is known."""
+        if capture_time is None:
+            return {}
+        return {'capture_timestamp': capture_time, 'latency_ms': (time.time() - capture_time) * 1000}
+    
+    def _track_details(self, details, tracker, det, alert_type, decision):
+        """Append track information to an alert's details text."""
+        details += f" (track {det['track_id']}"
+        if decision == ALERT_ESCALATION:
+            details += f", escalated after {tracker.episode_duration(det['track_id'], alert_type):.0f}s"
+        return details + ")"
+    
+    def get_tracker(self, stream_id):
+        """
+        Get the fan tracker of a video or camera stream, creating it if needed.
+        
+        Args:
+            stream_id: Video path, camera ID or other stream key
+            
+        Returns:
+            FanTracker instance
+        """
+        if stream_id not in self.trackers:
+            self.trackers[stream_id] = FanTracker(
+                iou_threshold=self.config['track_iou_threshold'],
+                max_centroid_distance=self.config['track_max_centroid_distance'],
+                max_age=self.config['track_max_age'],
+                smoothing=self.config['track_smoothing'],
+                confirm_frames=self.config['alert_confirm_frames'],
+                cooldown=self.config['alert_cooldown'],
+                episode_gap=self.config['alert_episode_gap'],
+                escalation_delta=self.config['alert_escalation_delta']
+            )
+        return self.trackers[stream_id]
+    
+    def reset_tracker(self, stream_id):
+        """Forget the tracks of a stream, e.g. before processing a video again."""
+        self.trackers.pop(stream_id, None)
+    
+    def create_event_recorder(self, stream_id, fps, name=None):
+        """
+        Start recording event clips for a video or camera stream.
+        
+        Args:
+            stream_id: Video path or camera ID the recorder belongs to
+            fps: Frame rate of the stream
+            name: Name used in clip filenames (default: derived from stream_id)
+            
+        Returns:
+            EventRecorder instance, or None if event clips are disabled
+        """
+        if not self.config['event_clips']:
+            return None
+            
+        if name is None:
+            name = os.path.splitext(os.path.basename(str(stream_id)))[0] or 'stream'
+        self.recorders[stream_id] = EventRecorder(
+            output_dir=self.config['clips_dir'],
+            name=name,
+            fps=fps,
+            pre_roll=self.config['clip_pre_roll'],
+            post_roll=self.config['clip_post_roll'],
+            max_clip_length=self.config['clip_max_length'],
+            buffer_format=self.config['clip_buffer'],
+            writer=self.artifact_writer,
+            metrics=self.metrics
+        )
+        return self.recorders[stream_id]
+    
+    def record_event_clip(self, stream_id, timestamp=None, label=None):
+        """Record a clip around an alert of a stream; returns the clip path, or None without a recorder."""
+        recorder = self.recorders.get(stream_id) if stream_id is not None else None
+        if recorder is None:
+            return None
+        return recorder.trigger(timestamp, label)
+    
+    def close_event_recorder(self, stream_id):
+        """Write the stream's last clip and stop recording."""
+        recorder = self.recorders.pop(stream_id, None)
+        if recorder is not None:
+            recorder.close()
+    
+    def get_seat_map(self, stream_id=None):
+        """
+        Get the seat map of a camera.
+        
+        The seat maps are rasterized once, from the seat_map file if one is
+        configured and from the stadium_sections rectangles otherwise.
+        
+        Args:
+            stream_id: Camera ID, video path or other stream key (optional)
+            
+        Returns:
+            SeatMap of the camera, the default SeatMap if the camera has none,
+            or None if no seat map covers it
+        """
+        if self.seat_maps is None:
+            shape = self.config['input_shape'][:2]
+            if self.config['seat_map']:
+                self.seat_maps = load_seat_maps(self.config['seat_map'], shape)
+            else:
+                self.seat_maps = {None: SeatMap.from_rectangles(self.config['stadium_sections'], shape)}
+                
+        if stream_id is not None and str(stream_id) in self.seat_maps:
+            return self.seat_maps[str(stream_id)]
+        return self.seat_maps.get(None)
+    
+    def create_frame_scheduler(self, stream_id=None):
+        """
+        Create a motion-gated frame scheduler for one video or camera stream.
+        
+        Args:
+            stream_id: Camera ID or video path, selecting the seat map activity is reported for (optional)
+            
+        Returns:
+            MotionScheduler instance, or None if adaptive sampling is disabled
+        """
+        if not self.config['adaptive_sampling']:
+            return None
+            
+        return MotionScheduler(
+            min_interval=self.config['motion_min_interval'],
+            max_interval=self.config['motion_max_interval'],
+            motion_threshold=self.config['motion_threshold'],
+            pixel_threshold=self.config['motion_pixel_threshold'],
+            downscale_width=self.config['motion_downscale_width'],
+            grid=self.config['motion_grid'],
+            seat_map=self.get_seat_map(stream_id)
+        )
+    
+    def _draw_detections(self, frame, detections):
+        """Draw detection boxes and labels onto a BGR frame in place."""
+        for det in detections:
+            xmin, ymin, xmax, ymax = det['bbox']
+            
+            # Determine color based on action
+            color = (0, 0, 255) if det['action'] in ['fighting', 'throwing'] else (0, 255, 0)
+            
+            # Draw bounding box
+            cv2.rectangle(frame, (xmin, ymin), (xmax, ymax), color, 2)
+            
+            # Draw label
+            label = f"{det['team']}/{det['action']}"
+            cv2.putText(frame, label, (xmin, ymin-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+            
+        return frame
+    
+    def process_video(self, video_path, output_path=None, generate_alerts=True, frame_interval=None):
+        """
+        Process a video for crowd monitoring.
+        
+        Args:
+            video_path: Path to the input video
+            output_path: Path to save the output video (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            frame_interval: Process every Nth frame to reduce computation; None picks
+                            frames by motion (every 5th frame if adaptive_sampling is off)
+            
+        Returns:
+            all_detections: List of detections for each processed frame
+            all_alerts: List of generated alerts
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        if not self.detector:
+            raise RuntimeError("Detector not available. Cannot process video.")
+            
+        # Open video
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+            
+        # Get video properties
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        
+        # Create output video writer if needed
+        out = None
+        if output_path:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+            
+        # Choose motion-gated sampling unless a fixed interval is requested
+        scheduler = self.create_frame_scheduler(video_path) if frame_interval is None else None
+        frame_interval = frame_interval or 5
+            
+        # Process frames
+        all_detections = []
+        all_alerts = []
+        frame_count = 0
+        self.reset_tracker(video_path)
+        meter = self.metrics.stream(video_path, fps)
+        recorder = self.create_event_recorder(video_path, fps)
+        
+        while cap.isOpened():
+            ret, frame = meter.read(cap)
+            if not ret:
+                break
+                
+            # Process frames with activity, or every Nth frame
+            if self.should_process_frame(scheduler, frame, frame_count, frame_interval):
+                # Process the frame in memory, timed by its position in the video
+                detections, alerts = self.process_frame(
+                    frame, 
+                    output_path=None,
+                    generate_alerts=generate_alerts,
+                    stream_id=video_path,
+                    timestamp=frame_count / fps if fps else None
+                )
+                
+                all_detections.append(detections)
+                all_alerts.extend(alerts)
+                
+                # Draw detections on frame
+                with self.metrics.timer('annotate'):
+                    self._draw_detections(frame, detections)
+                    
+            # Keep the frame for the pre-roll and post-roll of event clips
+            if recorder is not None:
+                recorder.push(frame, frame_count / fps if fps else None)
+                
+            # Write frame to output video
+            if out:
+                meter.write(out, frame)
+                
+            frame_count += 1
+            
+            # Print progress
+            if frame_count % 100 == 0:
+                print(f"Processed {frame_count}/{total_frames} frames ({frame_count/total_frames*100:.1f}%)")
+                
+        # Release resources
+        cap.release()
+        if out:
+            meter.release(out, output_path)
+        self.close_event_recorder(video_path)
+            
+        self.record_sampling_stats(video_path, scheduler)
+            
+        # Make sure all alert images are written
+        self.flush_artifacts()
+            
+        return all_detections, all_alerts
+    
+    def process_live_feed(self, camera_id=0, output_path=None, generate_alerts=True, duration=None, frame_interval=None,
+                          display=None):
+        """
+        Process a live camera feed for crowd monitoring.
+        
+        With live_latest_frame enabled, a capture thread keeps only the newest frame,
+        so a slow frame makes the loop skip ahead to the current view instead of
+        falling further behind; the output video and event clips then contain the
+        frames the loop took.
+        
+        Args:
+            camera_id: Camera ID or RTSP URL
+            output_path: Path to save the output video (optional)
+            generate_alerts: Whether to generate alerts for problematic behaviors
+            duration: Duration to process in seconds (None for indefinite)
+            frame_interval: Process every Nth frame to reduce computation; None picks
+                            frames by motion (every 5th frame if adaptive_sampling is off)
+            display: Whether to show the preview window (default: live_display config)
+            
+        Returns:
+            all_alerts: List of generated alerts, each with its capture timestamp and
+                        capture-to-alert latency in milliseconds
+        """
+        if not self.is_initialized:
+            raise RuntimeError("System not initialized. Call initialize() first.")
+            
+        if not self.detector:
+            raise RuntimeError("Detector not available. Cannot process live feed.")
+            
+        if display is None:
+            display = self.config['live_display']
+            
+        # Open camera on its capture thread
+        meter = self.metrics.stream(camera_id)
+        capture = self.open_live_capture(camera_id, meter)
+        meter.fps = capture.fps
+        
+        # Create output video writer if needed
+        out = None
+        if output_path:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, capture.fps, (capture.width, capture.height))
+            
+        # Choose motion-gated sampling unless a fixed interval is requested
+        scheduler = self.create_frame_scheduler(camera_id) if frame_interval is None else None
+        frame_interval = frame_interval or 5
+            
+        # Process frames
+        all_alerts = []
+        frame_count = 0
+        start_time = time.time()
+        latency = LiveLatency(camera_id, self.metrics)
+        recorder = self.create_event_recorder(camera_id, capture.fps, name=f"camera{camera_id}" if isinstance(camera_id, int) else None)
+        
+        try:
+            while True:
+                # Check if duration exceeded
+                if duration and time.time() - start_time > duration:
+                    break
+                    
+                # Take the newest frame; wake up regularly to check the duration
+                item = capture.read(timeout=0.5)
+                if item is None:
+                    if capture.finished:
+                        break
+                    continue
+                frame, _, capture_time = item
+                
+                # Process frames with activity, or every Nth frame
+                if self.should_process_frame(scheduler, frame, frame_count, frame_interval):
+                    # Process the frame in memory
+                    detections, alerts = self.process_frame(
+                        frame, 
+                        output_path=None,
+                        generate_alerts=generate_alerts,
+                        stream_id=camera_id,
+                        timestamp=capture_time,
+                        capture_time=capture_time
+                    )
+                    
+                    # Measure the latency from capture to results and alerts
+                    latency.record(capture_time, alerts)
+                    all_alerts.extend(alerts)
+                    
+                    # Draw detections on frame
+                    with self.metrics.timer('annotate'):
+                        self._draw_detections(frame, detections)
+                        
+                # Keep the frame for the pre-roll and post-roll of event clips
+                if recorder is not None:
+                    recorder.push(frame, capture_time)
+                    
+                # Write frame to output video
+                if out:
+                    meter.write(out, frame)
+                    
+                frame_count += 1
+                
+                # Display frame and exit on 'q' key press
+                if display:
+                    cv2.imshow('Stadium Monitoring', frame)
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+        finally:
+            # Release resources
+            capture.stop()
+            
+        if out:
+            meter.release(out, output_path)
+        self.close_event_recorder(camera_id)
+        if display:
+            cv2.destroyAllWindows()
+            
+        self.record_sampling_stats(camera_id, scheduler)
+        self.record_live_stats(camera_id, capture, latency)
+        
+        # Make sure all alert images are written
+        self.flush_artifacts()
+        
+        return all_alerts
+    
+    def open_live_capture(self, camera_id, meter=None):
+        """
+        Open a live source on a capture thread.
+        
+        Args:
+            camera_id: Camera ID, RTSP URL or video file path
+            meter: StreamMeter counting and timing the captured frames (optional)
+            
+        Returns:
+            Started LatestFrameCapture
+        """
+        capture = LatestFrameCapture(camera_id, latest_only=self.config['live_latest_frame'], meter=meter)
+        capture.start()
+        return capture
+    
+    def record_live_stats(self, stream_id, capture, latency):
+        """Keep and print the frame counts and latencies of a finished live stream."""
+        self.live_stats[stream_id] = latency.stats(capture)
+        print(latency.summary(capture))
+    
+    def should_process_frame(self, scheduler, frame, frame_count, frame_interval):
+        """Decide whether to run inference on a frame of a video or camera stream."""
+        if scheduler is not None:
+            return scheduler.should_process(frame)
+        return frame_count % frame_interval == 0
+    
+    def record_sampling_stats(self, stream_id, scheduler):
+        """Keep and print the frame sampling statistics of a finished stream."""
+        if scheduler is not None:
+            self.sampling_stats[stream_id] = scheduler.stats
+            print(scheduler.summary())
+    
+    def flush_artifacts(self):
+        """Block until all queued alert images and other artifacts are on disk."""
+        # Queue the shared image of the last frame with alerts
+        self.alert_system.finish_frame()
+        if self.artifact_writer is not None:
+            self.artifact_writer.flush()
+    
+    def get_backend_throughput(self):
+        """
+        Get the inference throughput of each loaded model.
+        
+        Returns:
+            Dictionary mapping model names to backend throughput statistics
+        """
+        components = {
+            'detector': self.detector.model if self.detector else None,
+            'crop_classifier': self.crop_classifier,
+            'behavior_classifier': self.behavior_classifier,
+            'team_detector': self.team_detector
+        }
+        
+        return {
+            name: component.backend.throughput()
+            for name, component in components.items()
+            if component is not None and getattr(component, 'backend', None) is not None
+        }
+    
+    def report_throughput(self):
+        """Print the inference throughput of each loaded model."""
+        for name, stats in self.get_backend_throughput().items():
+            if stats['calls']:
+                print(f"{name} ({stats['backend']}): {stats['images_per_second']:.1f} images/s, "
+                      f"{stats['mean_latency_ms']:.1f} ms per call over {stats['calls']} calls")
+    
+    def generate_report(self, output_path=None):
+        """
+        Generate a summary report of the monitoring system.
+        
+        Args:
+            output_path: Path to save the report (optional)
+            
+        Returns:
+            Report text
+        """
+        # Generate alert report
+        report = self.alert_system.generate_alert_report(output_path)
+        
+        return report
+    
+    def visualize_alerts(self, output_path=None):
+        """
+        Visualize the distribution of alerts.
+        
+        Args:
+            output_path: Path to save the visualization (optional)
+            
+        Returns:
+            Matplotlib figure
+        """
+        # Visualize alert distribution
+        fig = self.alert_system.visualize_alert_distribution(output_path)
+        
+        return fig
+    
+    def visualize_section_timeline(self, output_path=None, bucket_seconds=60):
+        """
+        Visualize the number of alerts per stadium section over time.
+        
+        Args:
+            output_path: Path to save the visualization (optional)
+            bucket_seconds: Length of the time buckets in seconds (one of alert_bucket_sizes)
+            
+        Returns:
+            Matplotlib figure
+        """
+        # Visualize alerts per section from the time-bucketed counts
+        fig = self.alert_system.visualize_section_timeline(output_path, bucket_seconds)
+        
+        return fig
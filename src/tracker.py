@@ -0,0 +1,281 @@
+"""
+Cross-frame fan tracking for the stadium monitoring system.
+This module associates detections across frames so each fan keeps a persistent
+track ID, smooths their team/action scores over time and decides when a track
+should raise an alert, so an ongoing incident produces one alert per episode
+instead of one per frame.
+"""
+
+import numpy as np
+
+from src.box_utils import box_iou
+
+# Alert decisions returned by FanTracker.check_alert()
+ALERT_NEW = 'new'
+ALERT_ESCALATION = 'escalation'
+
+class Track:
+    """State of one tracked fan."""
+
+    def __init__(self, track_id, detection, timestamp):
+        """
+        Initialize a track from its first detection.
+
+        Args:
+            track_id: Persistent track ID
+            detection: Detection dictionary that started the track
+            timestamp: Time of the frame the detection came from
+        """
+        self.track_id = track_id
+        self.bbox = np.asarray(detection['bbox'], dtype=np.float32)
+        self.velocity = np.zeros(4, dtype=np.float32)
+        self.hits = 1
+        self.misses = 0
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.action_scores = {detection['action']: float(detection['action_score'])}
+        self.team_scores = {detection['team']: float(detection['team_score'])}
+        self.episodes = {}  # Alert type -> episode state
+        self.last_alert_time = {}  # Alert type -> time of the last alert raised
+
+    def predicted_bbox(self):
+        """Box expected in the next processed frame under constant velocity."""
+        return self.bbox + self.velocity * (self.misses + 1)
+
+    def update(self, detection, timestamp, smoothing):
+        """
+        Update the track with a matched detection.
+
+        Args:
+            detection: Matched detection dictionary
+            timestamp: Time of the frame
+            smoothing: Weight of the new observation in the score moving averages
+        """
+        bbox = np.asarray(detection['bbox'], dtype=np.float32)
+        self.velocity = 0.5 * self.velocity + 0.5 * (bbox - self.bbox) / (self.misses + 1)
+        self.bbox = bbox
+        self.hits += 1
+        self.misses = 0
+        self.last_seen = timestamp
+        self.action_scores = _smooth_scores(self.action_scores, detection['action'], detection['action_score'], smoothing)
+        self.team_scores = _smooth_scores(self.team_scores, detection['team'], detection['team_score'], smoothing)
+
+    def smoothed_action(self):
+        """Most likely action and its smoothed score."""
+        action = max(self.action_scores, key=self.action_scores.get)
+        return action, self.action_scores[action]
+
+    def smoothed_team(self):
+        """Most likely team and its smoothed score."""
+        team = max(self.team_scores, key=self.team_scores.get)
+        return team, self.team_scores[team]
+
+def _smooth_scores(scores, label, score, smoothing):
+    """Exponential moving average of per-label scores with a one-hot observation."""
+    smoothed = {key: (1 - smoothing) * value for key, value in scores.items()}
+    smoothed[label] = smoothed.get(label, 0.0) + smoothing * float(score)
+    return smoothed
+
+class FanTracker:
+    """Lightweight IoU/centroid multi-object tracker with per-track alert episodes."""
+
+    def __init__(self, iou_threshold=0.3, max_centroid_distance=0.5, max_age=10, smoothing=0.4,
+                 confirm_frames=2, cooldown=30.0, episode_gap=10.0, escalation_delta=0.15):
+        """
+        Initialize the tracker.
+
+        Args:
+            iou_threshold: Minimum IoU for a detection to match a track
+            max_centroid_distance: Maximum centroid distance, as a fraction of the track
+                                   box diagonal, for matching boxes that do not overlap enough
+            max_age: Processed frames a track survives without a matching detection
+            smoothing: Weight of the newest frame in the team/action score moving averages
+            confirm_frames: Frames a condition must be seen on a track before it alerts
+            cooldown: Seconds before the same track can raise the same alert type again
+            episode_gap: Seconds without the condition after which an episode ends
+            escalation_delta: Confidence increase over the last alert that escalates
+                              an ongoing episode before its cooldown has passed
+        """
+        self.iou_threshold = iou_threshold
+        self.max_centroid_distance = max_centroid_distance
+        self.max_age = max_age
+        self.smoothing = smoothing
+        self.confirm_frames = confirm_frames
+        self.cooldown = cooldown
+        self.episode_gap = episode_gap
+        self.escalation_delta = escalation_delta
+        self.tracks = {}
+        self.next_track_id = 1
+        self.alerts_raised = 0
+        self.alerts_suppressed = 0
+
+    def update(self, detections, timestamp):
+        """
+        Associate a frame's detections with the current tracks.
+
+        Each detection gets a 'track_id', and its 'action'/'team' labels and
+        scores are replaced by the track's smoothed values (the per-frame values
+        are kept as 'raw_action', 'raw_action_score', 'raw_team' and 'raw_team_score').
+
+        Args:
+            detections: List of detections for the frame (modified in place)
+            timestamp: Time of the frame in seconds
+
+        Returns:
+            The list of detections
+        """
+        track_ids = list(self.tracks.keys())
+        matches = self._associate(detections, [self.tracks[t] for t in track_ids])
+
+        matched_tracks = set()
+        for det_idx, det in enumerate(detections):
+            det['raw_action'], det['raw_action_score'] = det['action'], det['action_score']
+            det['raw_team'], det['raw_team_score'] = det['team'], det['team_score']
+
+            if det_idx in matches:
+                track = self.tracks[track_ids[matches[det_idx]]]
+                track.update(det, timestamp, self.smoothing)
+                matched_tracks.add(track.track_id)
+            else:
+                # Start a new track
+                track = Track(self.next_track_id, det, timestamp)
+                self.tracks[track.track_id] = track
+                self.next_track_id += 1
+                matched_tracks.add(track.track_id)
+
+            det['track_id'] = track.track_id
+            det['action'], det['action_score'] = track.smoothed_action()
+            det['team'], det['team_score'] = track.smoothed_team()
+
+        # Age unmatched tracks and drop the stale ones
+        for track_id in track_ids:
+            if track_id not in matched_tracks:
+                track = self.tracks[track_id]
+                track.misses += 1
+                if track.misses > self.max_age:
+                    del self.tracks[track_id]
+
+        return detections
+
+    def _associate(self, detections, tracks):
+        """
+        Greedily match detections to tracks.
+
+        Pairs are matched in order of decreasing affinity. Each round matches every
+        detection and track that are each other's best remaining candidate with
+        NumPy row and column argmaxes, then masks their rows and columns, so the
+        Python work is one iteration per round instead of one per candidate pair.
+
+        Args:
+            detections: List of detections
+            tracks: List of Track objects
+
+        Returns:
+            Dictionary mapping detection index to track index
+        """
+        if not detections or not tracks:
+            return {}
+
+        det_boxes = np.array([det['bbox'] for det in detections], dtype=np.float32)
+        track_boxes = np.stack([track.predicted_bbox() for track in tracks])
+
+        # Pairwise overlap and normalized centroid distance, all vectorized
+        iou = box_iou(det_boxes, track_boxes)
+        det_centers = (det_boxes[:, :2] + det_boxes[:, 2:]) / 2
+        track_centers = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+        track_diag = np.linalg.norm(track_boxes[:, 2:] - track_boxes[:, :2], axis=1)
+        distance = np.linalg.norm(det_centers[:, None, :] - track_centers[None, :, :], axis=2)
+        distance = distance / np.maximum(track_diag[None, :], 1.0)
+
+        valid = (iou >= self.iou_threshold) | (distance <= self.max_centroid_distance)
+        affinity = np.where(valid, iou - 1e-3 * distance, -np.inf)
+
+        # Match mutual best pairs until no valid pair is left
+        matches = {}
+        rows = np.arange(len(detections))
+        while True:
+            best_track = np.argmax(affinity, axis=1)
+            best_det = np.argmax(affinity, axis=0)
+            mutual = (best_det[best_track] == rows) & np.isfinite(affinity[rows, best_track])
+            if not mutual.any():
+                break
+
+            det_idx = rows[mutual]
+            track_idx = best_track[mutual]
+            matches.update(zip(det_idx.tolist(), track_idx.tolist()))
+            affinity[det_idx, :] = -np.inf
+            affinity[:, track_idx] = -np.inf
+
+        return matches
+
+    def check_alert(self, track_id, alert_type, confidence, timestamp):
+        """
+        Decide whether a track showing an alert condition should raise an alert.
+
+        An episode starts the first time a condition is seen on a track and ends
+        once it has not been seen for episode_gap seconds. An episode alerts once
+        it has been seen on confirm_frames frames, and after that only escalates
+        when its confidence rises by escalation_delta or the cooldown has passed
+        while it is still ongoing.
+
+        Args:
+            track_id: Track showing the condition
+            alert_type: Alert type ('fighting', 'throwing', 'misplaced_fan')
+            confidence: Smoothed confidence of the condition in this frame
+            timestamp: Time of the frame in seconds
+
+        Returns:
+            ALERT_NEW, ALERT_ESCALATION or None if the alert should be suppressed
+        """
+        track = self.tracks.get(track_id)
+        if track is None:
+            return None
+
+        episode = track.episodes.get(alert_type)
+        if episode is None or timestamp - episode['last_seen'] > self.episode_gap:
+            episode = {
+                'start': timestamp,
+                'last_seen': timestamp,
+                'frames': 0,
+                'alerted_confidence': None,
+                'escalations': 0
+            }
+            track.episodes[alert_type] = episode
+
+        episode['frames'] += 1
+        episode['last_seen'] = timestamp
+
+        decision = None
+        last_alert = track.last_alert_time.get(alert_type)
+        cooled_down = last_alert is None or timestamp - last_alert >= self.cooldown
+        if episode['frames'] >= self.confirm_frames:
+            if episode['alerted_confidence'] is None:
+                if cooled_down:
+                    decision = ALERT_NEW
+            elif cooled_down or confidence >= episode['alerted_confidence'] + self.escalation_delta:
+                decision = ALERT_ESCALATION
+                episode['escalations'] += 1
+
+        if decision is None:
+            self.alerts_suppressed += 1
+            return None
+
+        episode['alerted_confidence'] = confidence
+        track.last_alert_time[alert_type] = timestamp
+        self.alerts_raised += 1
+        return decision
+
+    def episode_duration(self, track_id, alert_type):
+        """Seconds an ongoing alert episode of a track has lasted, or 0."""
+        track = self.tracks.get(track_id)
+        if track is None or alert_type not in track.episodes:
+            return 0.0
+        episode = track.episodes[alert_type]
+        return episode['last_seen'] - episode['start']
+
+    def reset(self):
+        """Drop all tracks and alert episodes."""
+        self.tracks = {}
+        self.next_track_id = 1
+        self.alerts_raised = 0
+        self.alerts_suppressed = 0
@@ -0,0 +1,115 @@
+"""
+Training throughput utilities for the stadium crowd detection models.
+This module switches the Keras precision policy while a model is built, so bfloat16
+mixed precision can be used for training only, and provides a callback that reports
+images/s and where the time of every training epoch went.
+"""
+
+import time
+from contextlib import contextmanager
+import tensorflow as tf
+
+@contextmanager
+def precision_policy(mixed_precision=False):
+    """
+    Build layers under the bfloat16 mixed-precision policy.
+
+    Layers created inside the context compute in bfloat16 and keep float32
+    weights; the previous global policy is restored afterwards, so models built
+    later (e.g. for inference) are not affected.
+
+    Args:
+        mixed_precision: True for 'mixed_bfloat16', False to leave the policy unchanged
+    """
+    if not mixed_precision:
+        yield
+        return
+
+    previous = tf.keras.mixed_precision.global_policy()
+    tf.keras.mixed_precision.set_global_policy('mixed_bfloat16')
+    try:
+        yield
+    finally:
+        tf.keras.mixed_precision.set_global_policy(previous)
+
+class ThroughputCallback(tf.keras.callbacks.Callback):
+    """Logs images/s and a step-time breakdown of every training epoch."""
+
+    def __init__(self, batch_size, verbose=True):
+        """
+        Initialize the callback.
+
+        Args:
+            batch_size: Training batch size, used to turn steps into images
+            verbose: Print a summary line at the end of every epoch
+        """
+        super().__init__()
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.epochs = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        now = time.perf_counter()
+        self._epoch_start = now
+        self._batch_start = None
+        self._last_batch_end = now
+        self._steps = 0
+        self._first_call = None
+        self._first_call_steps = 0
+        self._step_time = 0.0
+        self._host_time = 0.0
+        self._validation_time = 0.0
+
+    def on_train_batch_begin(self, batch, logs=None):
+        now = time.perf_counter()
+        # Time between two calls is spent in Python: callbacks, logging and dispatch
+        self._host_time += now - self._last_batch_end
+        self._batch_start = now
+
+    def on_train_batch_end(self, batch, logs=None):
+        now = time.perf_counter()
+        duration = now - self._batch_start
+
+        # With steps_per_execution the hooks run once per call, and batch is the last step of the call
+        steps = batch + 1 - self._steps
+        self._steps = batch + 1
+
+        # The first call of an epoch waits for the input pipeline (and for tracing/XLA compilation in the first epoch)
+        if self._first_call is None:
+            self._first_call = duration
+            self._first_call_steps = steps
+        else:
+            self._step_time += duration
+        self._last_batch_end = now
+
+    def on_test_begin(self, logs=None):
+        self._validation_start = time.perf_counter()
+
+    def on_test_end(self, logs=None):
+        self._validation_time += time.perf_counter() - self._validation_start
+
+    def on_epoch_end(self, epoch, logs=None):
+        train_time = (self._first_call or 0.0) + self._step_time
+        steady_steps = self._steps - self._first_call_steps
+        record = {
+            'epoch': epoch + 1,
+            'steps': self._steps,
+            'images': self._steps * self.batch_size,
+            'images_per_second': self._steps * self.batch_size / train_time if train_time > 0 else 0.0,
+            'step_ms': self._step_time / steady_steps * 1000 if steady_steps else 0.0,
+            'first_call_seconds': self._first_call or 0.0,
+            'steps_seconds': self._step_time,
+            'host_seconds': self._host_time,
+            'validation_seconds': self._validation_time,
+            'epoch_seconds': time.perf_counter() - self._epoch_start
+        }
+        self.epochs.append(record)
+        if logs is not None:
+            logs['images_per_second'] = record['images_per_second']
+
+        if self.verbose:
+            print(f"\nEpoch {record['epoch']} throughput: {record['images_per_second']:.1f} images/s, "
+                  f"{record['step_ms']:.1f} ms/step over {record['steps']} steps; "
+                  f"first call {record['first_call_seconds']:.2f}s, steps {record['steps_seconds']:.2f}s, "
+                  f"host {record['host_seconds']:.2f}s, validation {record['validation_seconds']:.2f}s "
+                  f"(epoch {record['epoch_seconds']:.2f}s)")
@@ -0,0 +1,681 @@
+"""
+Enhanced zoom and crop functionality for stadium monitoring system.
+This module provides specialized functions for zooming, cropping, and creating visual sequences.
+"""
+
+import os
+import cv2
+import numpy as np
+import time
+from PIL import Image
+
+from src.artifact_writer import PRIORITY_CROP, PRIORITY_SEQUENCE, PRIORITY_GRID, PRIORITY_ANIMATION
+from src.metrics import MetricsRegistry
+
+# Outputs render_outputs() encodes from a single zoom render; every output is optional
+DEFAULT_RENDER_PLAN = {
+    'crop': True,  # Save the padded detection crop as a JPEG
+    'tile': True,  # Return the crop in memory for a detection grid
+    'sequence': True,  # Save a subset of the zoom frames as JPEGs
+    'gif': True,  # Encode the sequence frames as an animated GIF
+    'mp4': True,  # Encode every zoom frame as an MP4 animation
+    'num_frames': 10,  # Zoom frames rendered (all of them go into the MP4)
+    'sequence_frames': 5,  # Frames picked evenly from the render for the JPEG sequence and GIF
+    'zoom_start': 1.0,
+    'zoom_end': 3.0,
+    'padding': 10,
+    'gif_duration': 200,  # Milliseconds per GIF frame
+    'fps': 5  # MP4 frame rate
+}
+
+class ZoomProcessor:
+    """Specialized processor for zoom and crop operations."""
+    
+    def __init__(self, output_dir='zoom_crops', writer=None, metrics=None):
+        """
+        Initialize the zoom processor.
+        
+        Args:
+            output_dir: Directory to save zoom outputs
+            writer: ArtifactWriter used to encode and save outputs in the background (optional)
+            metrics: MetricsRegistry timing zoom rendering and encoding (optional)
+        """
+        self.output_dir = output_dir
+        self.writer = writer
+        self.metrics = metrics if metrics is not None else MetricsRegistry(enabled=False)
+        self.crop_count = 0
+        
+        # Create output directory if it doesn't exist
+        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(os.path.join(output_dir, 'sequences'), exist_ok=True)
+        os.makedirs(os.path.join(output_dir, 'gifs'), exist_ok=True)
+        
+    def crop_detection(self, image, bbox, padding=10):
+        """
+        Crop a detection from an image.
+        
+        Args:
+            image: Input image (numpy array)
+            bbox: Bounding box [x1, y1, x2, y2] or [x, y, w, h]
+            padding: Padding around the bounding box
+            
+        Returns:
+            Cropped image
+        """
+        # Convert bbox format if needed
+        if len(bbox) == 4:
+            if bbox[2] < bbox[0] or bbox[3] < bbox[1]:
+                # Format is [x, y, width, height]
+                x1, y1, w, h = bbox
+                x2, y2 = x1 + w, y1 + h
+            else:
+                # Format is [x1, y1, x2, y2]
+                x1, y1, x2, y2 = bbox
+        
+        # Add padding
+        height, width = image.shape[:2]
+        x1 = max(0, x1 - padding)
+        y1 = max(0, y1 - padding)
+        x2 = min(width, x2 + padding)
+        y2 = min(height, y2 + padding)
+        
+        # Crop the image
+        cropped = image[y1:y2, x1:x2]
+        
+        return cropped
+    
+    def save_crop(self, image, bbox, detection_info=None, padding=10):
+        """
+        Save a cropped detection.
+        
+        Args:
+            image: Input image (numpy array or path)
+            bbox: Bounding box [x1, y1, x2, y2] or [x, y, w, h]
+            detection_info: Additional information about the detection
+            padding: Padding around the bounding box
+            
+        Returns:
+            Path to the saved crop
+        """
+        # Load image if path is provided
+        if isinstance(image, str):
+            image = cv2.imread(image)
+            if image is None:
+                raise ValueError(f"Could not load image: {image}")
+        
+        # Crop the detection
+        cropped = self.crop_detection(image, bbox, padding)
+        
+        # Create filename
+        self.crop_count += 1
+        timestamp = int(time.time())
+        if detection_info and 'type' in detection_info:
+            filename = f"crop_{detection_info['type']}_{timestamp}_{self.crop_count}.jpg"
+        else:
+            filename = f"crop_{timestamp}_{self.crop_count}.jpg"
+            
+        # Save the crop
+        output_path = os.path.join(self.output_dir, filename)
+        self._write_image(output_path, cropped.copy(), PRIORITY_CROP)
+        
+        return output_path
+    
+    def create_zoom_sequence(self, image, bbox, num_frames=5, zoom_start=1.0, zoom_end=3.0, padding=10):
+        """
+        Create a sequence of frames zooming in on a detection.
+        
+        Args:
+            image: Input image (numpy array or path)
+            bbox: Bounding box [x1, y1, x2, y2] or [x, y, w, h]
+            num_frames: Number of frames in the sequence
+            zoom_start: Starting zoom level
+            zoom_end: Ending zoom level
+            padding: Padding around the bounding box
+            
+        Returns:
+            List of frames showing progressive zoom
+        """
+        # Load image if path is provided
+        if isinstance(image, str):
+            image = cv2.imread(image)
+            if image is None:
+                raise ValueError(f"Could not load image: {image}")
+        
+        # Render the frames once and split the buffer into a list
+        return list(self.render_zoom(image, bbox, num_frames, zoom_start, zoom_end, padding))
+    
+    def render_zoom(self, image, bbox, num_frames=10, zoom_start=1.0, zoom_end=3.0, padding=10):
+        """
+        Render the frames of a zoom on a detection into one preallocated array.
+        
+        Every frame is a single cv2.warpAffine of the source image (scale and
+        translate), so no intermediate crops are allocated. The zoom window is
+        kept inside the image near its borders.
+        
+        Args:
+            image: Input image (numpy array)
+            bbox: Bounding box [x1, y1, x2, y2] or [x, y, w, h]
+            num_frames: Number of frames to render
+            zoom_start: Starting zoom level
+            zoom_end: Ending zoom level
+            padding: Padding around the bounding box
+            
+        Returns:
+            Array of shape (num_frames, height, width, 3) with the padded detection size
+        """
+        start_time = time.perf_counter()
+        
+        # Convert bbox format if needed
+        if len(bbox) == 4:
+            if bbox[2] < bbox[0] or bbox[3] < bbox[1]:
+                # Format is [x, y, width, height]
+                x1, y1, w, h = bbox
+                x2, y2 = x1 + w, y1 + h
+            else:
+                # Format is [x1, y1, x2, y2]
+                x1, y1, x2, y2 = bbox
+        
+        # Calculate center and padded size of the detection
+        center_x = (x1 + x2) // 2
+        center_y = (y1 + y2) // 2
+        out_width = int(x2 - x1 + 2 * padding)
+        out_height = int(y2 - y1 + 2 * padding)
+        image_height, image_width = image.shape[:2]
+        
+        # Scale and top-left corner of the source window of every frame
+        zooms = np.linspace(zoom_start, zoom_end, num_frames) if num_frames > 1 else np.array([zoom_start])
+        scales = 1.0 / zooms
+        left = np.clip(center_x - out_width * scales / 2, 0, np.maximum(0, image_width - out_width * scales))
+        top = np.clip(center_y - out_height * scales / 2, 0, np.maximum(0, image_height - out_height * scales))
+        
+        # Destination-to-source matrices, sampling at pixel centers like cv2.resize
+        matrices = np.zeros((len(zooms), 2, 3), dtype=np.float64)
+        matrices[:, 0, 0] = scales
+        matrices[:, 1, 1] = scales
+        matrices[:, 0, 2] = left + 0.5 * scales - 0.5
+        matrices[:, 1, 2] = top + 0.5 * scales - 0.5
+        
+        # Warp every frame straight into the preallocated buffer
+        frames = np.empty((len(zooms), out_height, out_width) + image.shape[2:], dtype=image.dtype)
+        for i, matrix in enumerate(matrices):
+            cv2.warpAffine(
+                image,
+                matrix,
+                (out_width, out_height),
+                dst=frames[i],
+                flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+                borderMode=cv2.BORDER_REPLICATE
+            )
+            
+        self.metrics.observe('zoom_sequence', time.perf_counter() - start_time)
+        return frames
+    
+    def save_zoom_sequence(self, image, bbox, detection_info=None, num_frames=5, zoom_start=1.0, zoom_end=3.0, padding=10):
+        """
+        Save a sequence of frames zooming in on a detection.
+        
+        Args:
+            image: Input image (numpy array or path)
+            bbox: Bounding box [x1, y1, x2, y2] or [x, y, w, h]
+            detection_info: Additional information about the detection
+            num_frames: Number of frames in the sequence
+            zoom_start: Starting zoom level
+            zoom_end: Ending zoom level
+            padding: Padding around the bounding box
+            
+        Returns:
+            List of paths to the saved frames
+        """
+        # Create the sequence
+        sequence = self.create_zoom_sequence(image, bbox, num_frames, zoom_start, zoom_end, padding)
+        
+        # Create base filename
+        self.crop_count += 1
+        timestamp = int(time.time())
+        if detection_info and 'type' in detection_info:
+            base_filename = f"sequence_{detection_info['type']}_{timestamp}_{self.crop_count}"
+        else:
+            base_filename = f"sequence_{timestamp}_{self.crop_count}"
+            
+        # Save each frame
+        output_paths = []
+        for i, frame in enumerate(sequence):
+            filename = f"{base_filename}_{i+1}.jpg"
+            output_path = os.path.join(self.output_dir, 'sequences', filename)
+            self._write_image(output_path, frame, PRIORITY_SEQUENCE)
+            output_paths.append(output_path)
+            
+        return output_paths
+    
+    def create_gif(self, sequence, output_path=None, duration=200):
+        """
+        Create a GIF from a sequence of frames.
+        
+        Args:
+            sequence: List of frames or paths to frames
+            output_path: Path to save the GIF (optional)
+            duration: Duration of each frame in milliseconds
+            
+        Returns:
+            Path to the saved GIF
+        """
+        # Create default output path if not provided
+        if output_path is None:
+            timestamp = int(time.time())
+            output_path = os.path.join(self.output_dir, 'gifs', f"zoom_sequence_{timestamp}.gif")
+            
+        # Convert frames to PIL Images if they're not already
+        images = []
+        for frame in sequence:
+            if isinstance(frame, str):
+                # Frame is a path (possibly still queued for writing)
+                frame = self._read_image(frame)
+            img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            images.append(img)
+            
+        # Save as GIF
+        if self.writer is not None:
+            self.writer.submit(PRIORITY_ANIMATION, self._save_gif, images, output_path, duration)
+        else:
+            self._save_gif(images, output_path, duration)
+        
+        return output_path
+    
+    def _save_gif(self, images, output_path, duration):
+        """Encode PIL images as an animated GIF."""
+        with self.metrics.timer('gif_encode'):
+            images[0].save(
+                output_path,
+                save_all=True,
+                append_images=images[1:],
+                duration=duration,
+                loop=0
+            )
+        self.metrics.add_file_bytes(output_path, 'gif')
+        
+        return output_path
+    
+    def create_mp4(self, sequence, output_path=None, fps=5):
+        """
+        Create an MP4 video from a sequence of frames.
+        
+        Args:
+            sequence: List of frames or paths to frames
+            output_path: Path to save the MP4 (optional)
+            fps: Frames per second
+            
+        Returns:
+            Path to the saved MP4
+        """
+        # Create default output path if not provided
+        if output_path is None:
+            timestamp = int(time.time())
+            output_path = os.path.join(self.output_dir, 'gifs', f"zoom_sequence_{timestamp}.mp4")
+            
+        # Load frames if paths are provided
+        frames = []
+        for frame in sequence:
+            if isinstance(frame, str):
+                # Frame is a path (possibly still queued for writing)
+                img = self._read_image(frame)
+            else:
+                # Frame is a numpy array
+                img = frame
+            frames.append(img)
+            
+        # Encode the video
+        if self.writer is not None:
+            self.writer.submit(PRIORITY_ANIMATION, self._write_mp4, frames, output_path, fps)
+        else:
+            self._write_mp4(frames, output_path, fps)
+        
+        return output_path
+    
+    def _write_mp4(self, frames, output_path, fps):
+        """Encode frames as an MP4 video."""
+        # Get frame dimensions
+        height, width = frames[0].shape[:2]
+        
+        with self.metrics.timer('mp4_encode'):
+            # Create video writer
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+            
+            # Write frames
+            for frame in frames:
+                out.write(frame)
+                
+            # Release resources
+            out.release()
+        self.metrics.add_file_bytes(output_path, 'mp4')
+        
+        return output_path
+    
+    def highlight_detection(self, image, bbox, color=(0, 0, 255), thickness=2, zoom_box=True, zoom_factor=1.5):
+        """
+        Highlight a detection in an image.
+        
+        Args:
+            image: Input image (numpy array)
+            bbox: Bounding box [x1, y1, x2, y2] or [x, y, w, h]
+            color: Color of the highlight (B, G, R)
+            thickness: Thickness of the highlight
+            zoom_box: Whether to add a zoom box effect
+            zoom_factor: Factor to scale the zoom box
+            
+        Returns:
+            Image with highlighted detection
+        """
+        start_time = time.perf_counter()
+        
+        # Create a copy of the image
+        result = image.copy()
+        
+        # Convert bbox format if needed
+        if len(bbox) == 4:
+            if bbox[2] < bbox[0] or bbox[3] < bbox[1]:
+                # Format is [x, y, width, height]
+                x1, y1, w, h = bbox
+                x2, y2 = x1 + w, y1 + h
+            else:
+                # Format is [x1, y1, x2, y2]
+                x1, y1, x2, y2 = bbox
+        
+        # Draw bounding box
+        cv2.rectangle(result, (x1, y1), (x2, y2), color, thickness)
+        
+        # Add zoom box effect
+        if zoom_box:
+            # Calculate center of detection
+            center_x = (x1 + x2) // 2
+            center_y = (y1 + y2) // 2
+            
+            # Calculate dimensions of zoom box
+            zoom_width = int((x2 - x1) * zoom_factor)
+            zoom_height = int((y2 - y1) * zoom_factor)
+            
+            # Calculate position of zoom box (offset to the right)
+            zoom_x1 = min(image.shape[1] - zoom_width, x2 + 20)
+            zoom_y1 = max(0, center_y - zoom_height // 2)
+            zoom_x2 = zoom_x1 + zoom_width
+            zoom_y2 = zoom_y1 + zoom_height
+            
+            # Draw zoom box
+            cv2.rectangle(result, (zoom_x1, zoom_y1), (zoom_x2, zoom_y2), color, thickness)
+            
+            # Draw connecting lines
+            cv2.line(result, (x2, center_y), (zoom_x1, center_y), color, 1)
+            
+            # Crop and resize the detection
+            cropped = image[y1:y2, x1:x2]
+            zoomed = cv2.resize(cropped, (zoom_width, zoom_height))
+            
+            # Place the zoomed detection in the zoom box
+            result[zoom_y1:zoom_y2, zoom_x1:zoom_x2] = zoomed
+            
+        self.metrics.observe('zoom_highlight', time.perf_counter() - start_time)
+        return result
+    
+    def create_detection_grid(self, crops, grid_size=(3, 3), cell_size=(200, 200), background_color=(255, 255, 255)):
+        """
+        Create a grid of detection crops.
+        
+        Args:
+            crops: List of cropped images or paths to crops
+            grid_size: Size of the grid (rows, cols)
+            cell_size: Size of each cell (width, height)
+            background_color: Color of the background (B, G, R)
+            
+        Returns:
+            Grid image
+        """
+        rows, cols = grid_size
+        cell_width, cell_height = cell_size
+        
+        # Create blank grid image
+        grid_width = cols * cell_width
+        grid_height = rows * cell_height
+        grid = np.ones((grid_height, grid_width, 3), dtype=np.uint8) * np.array(background_color, dtype=np.uint8)
+        
+        # Load crops if paths are provided
+        crop_images = []
+        for crop in crops:
+            if isinstance(crop, str):
+                # Crop is a path (possibly still queued for writing)
+                img = self._read_image(crop)
+                if img is not None:
+                    crop_images.append(img)
+            else:
+                # Crop is a numpy array
+                crop_images.append(crop)
+                
+        # Place crops in grid
+        for i, crop in enumerate(crop_images):
+            if i >= rows * cols:
+                break
+                
+            # Calculate position in grid
+            row = i // cols
+            col = i % cols
+            
+            # Calculate position in image
+            x = col * cell_width
+            y = row * cell_height
+            
+            # Resize crop to fit cell
+            resized = cv2.resize(crop, (cell_width, cell_height))
+            
+            # Place crop in grid
+            grid[y:y+cell_height, x:x+cell_width] = resized
+            
+        return grid
+    
+    def save_detection_grid(self, crops, output_path=None, grid_size=(3, 3), cell_size=(200, 200)):
+        """
+        Save a grid of detection crops.
+        
+        Args:
+            crops: List of cropped images or paths to crops
+            output_path: Path to save the grid (optional)
+            grid_size: Size of the grid (rows, cols)
+            cell_size: Size of each cell (width, height)
+            
+        Returns:
+            Path to the saved grid
+        """
+        # Create default output path if not provided
+        if output_path is None:
+            timestamp = int(time.time())
+            output_path = os.path.join(self.output_dir, f"detection_grid_{timestamp}.jpg")
+            
+        # Create the grid
+        with self.metrics.timer('zoom_grid'):
+            grid = self.create_detection_grid(crops, grid_size, cell_size)
+        
+        # Save the grid
+        self._write_image(output_path, grid, PRIORITY_GRID)
+        
+        return output_path
+    
+    def create_zoom_animation(self, image, bbox, output_path=None, num_frames=10, zoom_end=3.0, fps=5):
+        """
+        Create a smooth zoom animation focusing on a detection.
+        
+        Args:
+            image: Input image (numpy array or path)
+            bbox: Bounding box [x1, y1, x2, y2] or [x, y, w, h]
+            output_path: Path to save the animation (optional)
+            num_frames: Number of frames in the animation
+            zoom_end: Maximum zoom level
+            fps: Frames per second
+            
+        Returns:
+            Path to the saved animation
+        """
+        # Create default output path if not provided
+        if output_path is None:
+            timestamp = int(time.time())
+            output_path = os.path.join(self.output_dir, 'gifs', f"zoom_animation_{timestamp}.mp4")
+            
+        # Create the zoom sequence
+        sequence = self.create_zoom_sequence(
+            image, 
+            bbox, 
+            num_frames=num_frames, 
+            zoom_start=1.0, 
+            zoom_end=zoom_end
+        )
+        
+        # Create the animation
+        return self.create_mp4(sequence, output_path, fps)
+    
+    def render_outputs(self, image, bbox, detection_info=None, plan=None, gif_path=None, mp4_path=None):
+        """
+        Render the zoom on a detection once and encode every requested output from it.
+        
+        The zoom frames are rendered into one in-memory buffer with render_zoom().
+        The JPEG sequence, GIF and MP4 are then encoded from that buffer in a single
+        artifact-writer job, so nothing is re-read from disk or rendered twice.
+        
+        Args:
+            image: Input image (numpy array or path)
+            bbox: Bounding box [x1, y1, x2, y2] or [x, y, w, h]
+            detection_info: Additional information about the detection
+            plan: Dictionary overriding DEFAULT_RENDER_PLAN (optional)
+            gif_path: Path to save the GIF (optional)
+            mp4_path: Path to save the MP4 (optional)
+            
+        Returns:
+            Dictionary with the crop path, sequence paths, GIF path and MP4 path
+            (None or empty for outputs not in the plan) and the in-memory crop as tile
+        """
+        plan = dict(DEFAULT_RENDER_PLAN, **(plan or {}))
+        
+        # Load image if path is provided
+        if isinstance(image, str):
+            image = cv2.imread(image)
+            if image is None:
+                raise ValueError(f"Could not load image: {image}")
+                
+        # Create base filename
+        self.crop_count += 1
+        timestamp = int(time.time())
+        if detection_info and 'type' in detection_info:
+            base_name = f"{detection_info['type']}_{timestamp}_{self.crop_count}"
+        else:
+            base_name = f"{timestamp}_{self.crop_count}"
+            
+        outputs = {'crop': None, 'tile': None, 'sequence': [], 'gif': None, 'mp4': None}
+        
+        # Crop the detection for the crop JPEG and the grid tile
+        if plan['crop'] or plan['tile']:
+            cropped = self.crop_detection(image, bbox, plan['padding']).copy()
+            if plan['crop']:
+                outputs['crop'] = os.path.join(self.output_dir, f"crop_{base_name}.jpg")
+                self._write_image(outputs['crop'], cropped, PRIORITY_CROP)
+            if plan['tile']:
+                outputs['tile'] = cropped
+                
+        if not (plan['sequence'] or plan['gif'] or plan['mp4']):
+            return outputs
+            
+        # Render the zoom frames once
+        frames = self.render_zoom(
+            image,
+            bbox,
+            num_frames=plan['num_frames'],
+            zoom_start=plan['zoom_start'],
+            zoom_end=plan['zoom_end'],
+            padding=plan['padding']
+        )
+        
+        # Pick the sequence frames evenly, always including the first and last
+        num_picks = max(1, min(plan['sequence_frames'], len(frames)))
+        picks = np.unique(np.round(np.linspace(0, len(frames) - 1, num_picks)).astype(int))
+        
+        # Fill in the output paths of the plan
+        if plan['sequence']:
+            outputs['sequence'] = [
+                os.path.join(self.output_dir, 'sequences', f"sequence_{base_name}_{i+1}.jpg")
+                for i in range(len(picks))
+            ]
+        if plan['gif']:
+            outputs['gif'] = gif_path or os.path.join(self.output_dir, 'gifs', f"zoom_{base_name}.gif")
+        if plan['mp4']:
+            outputs['mp4'] = mp4_path or os.path.join(self.output_dir, 'gifs', f"animation_{base_name}.mp4")
+            
+        # Encode everything from the frame buffer in one job
+        job = (frames, picks, outputs['sequence'], outputs['gif'], outputs['mp4'], plan['gif_duration'], plan['fps'])
+        if self.writer is not None:
+            self.writer.submit(PRIORITY_SEQUENCE, self._encode_outputs, *job)
+        else:
+            self._encode_outputs(*job)
+            
+        return outputs
+    
+    def _encode_outputs(self, frames, picks, sequence_paths, gif_path, mp4_path, duration, fps):
+        """Encode the sequence JPEGs, GIF and MP4 of a rendered zoom."""
+        # Sequence frames
+        for output_path, frame in zip(sequence_paths, frames[picks]):
+            with self.metrics.timer('image_write'):
+                cv2.imwrite(output_path, frame)
+            self.metrics.add_file_bytes(output_path, 'image')
+            
+        # GIF of the sequence frames, sharing one palette
+        if gif_path:
+            self._save_gif(self._palette_frames(frames[picks]), gif_path, duration)
+            
+        # MP4 of every frame
+        if mp4_path:
+            self._write_mp4(frames, mp4_path, fps)
+            
+        return gif_path or mp4_path or sequence_paths
+    
+    def _palette_frames(self, frames):
+        """
+        Convert BGR frames to palette images that share a single palette.
+        
+        The frames of a zoom show the same scene, so one palette quantized over
+        all of them at once is much cheaper than PIL's per-frame adaptive
+        palettes with dithering, and the GIF needs no local color tables.
+        
+        Args:
+            frames: Array of shape (num_frames, height, width, 3) in BGR order
+            
+        Returns:
+            List of PIL images in "P" mode
+        """
+        num_frames, height, width = frames.shape[:3]
+        
+        # Quantize all frames stacked vertically, reversing the channel axis to RGB
+        strip = np.ascontiguousarray(frames[..., ::-1]).reshape(num_frames * height, width, 3)
+        quantized = Image.fromarray(strip).quantize(
+            colors=256,
+            method=Image.Quantize.FASTOCTREE,
+            dither=Image.Dither.NONE
+        )
+        palette = quantized.getpalette()
+        
+        # Split the indexed strip back into frames
+        images = []
+        for indices in np.asarray(quantized).reshape(num_frames, height, width):
+            image = Image.fromarray(indices, 'P')
+            image.putpalette(palette)
+            images.append(image)
+            
+        return images
+    
+    def _write_image(self, output_path, image, priority):
+        """Write an image now, or queue it on the artifact writer if one is set."""
+        if self.writer is not None:
+            self.writer.write_image(output_path, image, priority)
+        else:
+            with self.metrics.timer('image_write'):
+                cv2.imwrite(output_path, image)
+            self.metrics.add_file_bytes(output_path, 'image')
+    
+    def _read_image(self, path):
+        """Read an image, using the artifact writer's pending buffers if available."""
+        if self.writer is not None:
+            return self.writer.read_image(path)
+        return cv2.imread(path)
@@ -0,0 +1,83 @@
+"""
+Unit tests for the running alert aggregates.
+"""
+
+import os
+import sys
+import unittest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.alert_aggregates import AlertAggregates
+
+def make_alert(index, timestamp, alert_type='fighting', section='hilal', team='hilal'):
+    """Create an alert record as stored by SecurityAlertSystem."""
+    return {
+        'alert_id': f"ALERT_{index}",
+        'timestamp': timestamp,
+        'alert_type': alert_type,
+        'section': section,
+        'team': team
+    }
+
+class TestAlertAggregates(unittest.TestCase):
+    """Test cases for counts, rollups and newest alerts."""
+
+    def setUp(self):
+        """Set up aggregates over alerts in minutes 0, 1 and 3 of a match."""
+        self.aggregates = AlertAggregates(recent_size=3)
+        self.alerts = [
+            make_alert(0, 6000.0),
+            make_alert(1, 6010.0, 'throwing', 'ittihad', 'ittihad'),
+            make_alert(2, 6075.0, 'fighting', 'ittihad', 'hilal'),
+            make_alert(3, 6200.0, 'misplaced_fan', None, 'hilal'),
+            # Arrives late, with an earlier capture time
+            make_alert(4, 6020.0)
+        ]
+        for alert in self.alerts:
+            self.aggregates.add(alert)
+
+    def test_summary(self):
+        """Test the running counts."""
+        summary = self.aggregates.summary()
+        self.assertEqual(summary['total'], 5)
+        self.assertEqual(summary['by_type'], {'fighting': 3, 'throwing': 1, 'misplaced_fan': 1})
+        self.assertEqual(summary['by_section'], {'hilal': 2, 'ittihad': 2})
+        self.assertEqual(summary['by_team'], {'hilal': 4, 'ittihad': 1})
+        self.assertEqual((summary['first_timestamp'], summary['last_timestamp']), (6000.0, 6200.0))
+
+    def test_recent_follows_timestamps(self):
+        """Test that the newest alerts are ordered by timestamp, not arrival."""
+        self.assertEqual([a['alert_id'] for a in self.aggregates.get_recent(3)], ['ALERT_3', 'ALERT_2', 'ALERT_4'])
+
+    def test_timeline_fills_gaps(self):
+        """Test per-minute section counts, including the empty minute."""
+        starts, series = self.aggregates.timeline(60)
+        self.assertEqual(starts, [6000.0, 6060.0, 6120.0, 6180.0])
+        self.assertEqual(series, {'hilal': [2, 0, 0, 0], 'ittihad': [1, 1, 0, 0]})
+
+    def test_timeline_groups(self):
+        """Test type and total timelines over 5-minute buckets."""
+        starts, series = self.aggregates.timeline(300, group='types')
+        self.assertEqual(starts, [6000.0])
+        self.assertEqual(series, {'fighting': [3], 'misplaced_fan': [1], 'throwing': [1]})
+        self.assertEqual(self.aggregates.timeline(60, group=None)[1], {'total': [3, 1, 0, 1]})
+
+    def test_timeline_errors_and_empty(self):
+        """Test unknown bucket lengths and empty aggregates."""
+        with self.assertRaises(ValueError):
+            self.aggregates.timeline(120)
+        self.assertEqual(AlertAggregates().timeline(60), ([], {}))
+
+    def test_oldest_buckets_are_dropped(self):
+        """Test that only max_buckets buckets are kept per bucket size."""
+        aggregates = AlertAggregates(bucket_sizes=(60,), max_buckets=3)
+        for minute in range(5):
+            aggregates.add(make_alert(minute, minute * 60.0))
+        starts, _ = aggregates.timeline(60, group=None)
+        self.assertEqual(starts, [120.0, 180.0, 240.0])
+        self.assertEqual(aggregates.summary()['total'], 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Unit tests for the alert artifact policies.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.alert_system import SecurityAlertSystem
+
+class TestAlertArtifacts(unittest.TestCase):
+    """Test cases for the images saved with alerts."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+        self.frame = Image.new('RGB', (640, 480), (30, 120, 30))
+        self.fighter = {'bbox': [100, 100, 140, 180]}
+        self.thrower = {'bbox': [400, 200, 440, 280]}
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def images(self):
+        """Names of the saved alert images."""
+        return sorted(os.listdir(os.path.join(self.test_dir, 'images')))
+
+    def test_compact_policy(self):
+        """Test one crop and thumbnail per fan and one annotated image per frame."""
+        alert_system = SecurityAlertSystem(output_dir=self.test_dir)
+        first = alert_system.generate_alert(self.frame, self.fighter, 'fighting', confidence=0.9)
+        alert_system.generate_alert(self.frame, self.fighter, 'misplaced_fan', confidence=0.8)
+        alert_system.generate_alert(self.frame, self.thrower, 'throwing', confidence=0.7)
+        alert_system.close()
+
+        alerts = list(alert_system.alerts_log)
+        self.assertEqual(alerts[0]['image_path'], alerts[1]['image_path'])
+        self.assertNotEqual(alerts[0]['image_path'], alerts[2]['image_path'])
+        self.assertEqual(len({alert['frame_path'] for alert in alerts}), 1)
+        self.assertEqual(alerts[0]['frame_path'], os.path.join(self.test_dir, 'images', f"{first}_frame.jpg"))
+
+        # Two fans with a crop and a thumbnail each, plus the shared frame
+        self.assertEqual(len(self.images()), 5)
+        crop = Image.open(alerts[0]['image_path'])
+        self.assertEqual(crop.size, (60, 120))
+        thumbnail = Image.open(alerts[0]['thumbnail_path'])
+        self.assertEqual(thumbnail.size, (160, 120))
+
+    def test_new_frame_finishes_the_previous_one(self):
+        """Test that an alert on another frame writes the shared image of the previous one."""
+        alert_system = SecurityAlertSystem(output_dir=self.test_dir)
+        alert_system.generate_alert(self.frame, self.fighter, 'fighting')
+        self.assertFalse(any(name.endswith('_frame.jpg') for name in self.images()))
+
+        alert_system.generate_alert(self.frame.copy(), self.fighter, 'fighting')
+        self.assertEqual(sum(name.endswith('_frame.jpg') for name in self.images()), 1)
+        alert_system.close()
+        self.assertEqual(sum(name.endswith('_frame.jpg') for name in self.images()), 2)
+
+    def test_full_policy(self):
+        """Test one annotated full image per alert in the configured format."""
+        alert_system = SecurityAlertSystem(output_dir=self.test_dir, artifact_policy='full', image_format='png')
+        alert_system.generate_alert(self.frame, self.fighter, 'fighting')
+        alert_system.generate_alert(self.frame, self.fighter, 'misplaced_fan')
+        alert_system.close()
+
+        alerts = list(alert_system.alerts_log)
+        self.assertEqual(len(self.images()), 2)
+        self.assertIsNone(alerts[0]['thumbnail_path'])
+        self.assertEqual(Image.open(alerts[0]['image_path']).size, (640, 480))
+        self.assertTrue(alerts[0]['image_path'].endswith('.png'))
+
+    def test_unknown_settings(self):
+        """Test that unknown policies and formats are rejected."""
+        with self.assertRaises(ValueError):
+            SecurityAlertSystem(output_dir=self.test_dir, artifact_policy='none')
+        with self.assertRaises(ValueError):
+            SecurityAlertSystem(output_dir=self.test_dir, image_format='bmp')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Unit tests for the alert storage backends.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.alert_store import AlertStore, JSONLAlertStore, SQLiteAlertStore, AlertLog, create_alert_store
+from src.alert_system import SecurityAlertSystem
+
+def make_alert(index, alert_type='fighting', section='hilal', timestamp=None):
+    """Create an alert record as stored by SecurityAlertSystem."""
+    return {
+        'alert_id': f"ALERT_{index}",
+        'timestamp': 1000.0 + index if timestamp is None else timestamp,
+        'alert_type': alert_type,
+        'section': section,
+        'details': {'note': f"alert {index}"}
+    }
+
+class AlertStoreTests:
+    """Behavior shared by every alert store backend."""
+
+    def open_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+        self.store = self.open_store()
+        self.alerts = [
+            make_alert(0, 'fighting', 'hilal'),
+            make_alert(1, 'throwing', 'ittihad'),
+            make_alert(2, 'fighting', 'ittihad'),
+            make_alert(3, 'misplaced_fan', None, timestamp=1001.5),
+            make_alert(4, 'fighting', 'hilal')
+        ]
+        for alert in self.alerts:
+            self.store.append(alert)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.store.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_lookups(self):
+        """Test lookups by ID, type and section."""
+        self.assertEqual(self.store.count(), 5)
+        self.assertEqual(self.store.get('ALERT_2'), self.alerts[2])
+        self.assertIsNone(self.store.get('ALERT_9'))
+        self.assertEqual([a['alert_id'] for a in self.store.by_type('fighting')], ['ALERT_0', 'ALERT_2', 'ALERT_4'])
+        self.assertEqual([a['alert_id'] for a in self.store.by_section('ittihad')], ['ALERT_1', 'ALERT_2'])
+
+    def test_recent_and_time_range(self):
+        """Test the newest alerts and time range queries, which follow timestamps."""
+        self.assertEqual([a['alert_id'] for a in self.store.recent(3)], ['ALERT_4', 'ALERT_2', 'ALERT_3'])
+        self.assertEqual([a['alert_id'] for a in self.store.time_range(1001.0, 1002.0)],
+                         ['ALERT_1', 'ALERT_3', 'ALERT_2'])
+
+    def test_iteration_and_positions(self):
+        """Test streaming and positional reads in insertion order."""
+        self.assertEqual(list(self.store.iter_alerts()), self.alerts)
+        self.assertEqual(self.store.by_position(1, 3), self.alerts[1:3])
+        self.assertEqual(self.store.by_position(4, 10), self.alerts[4:])
+
+    def test_alert_log_view(self):
+        """Test the list view of the store."""
+        log = AlertLog(self.store)
+        self.assertEqual(len(log), 5)
+        self.assertEqual(log[0], self.alerts[0])
+        self.assertEqual(log[-1], self.alerts[-1])
+        self.assertEqual(log[3:], self.alerts[3:])
+        self.assertEqual(log[::2], self.alerts[::2])
+        self.assertEqual(log, self.alerts)
+        with self.assertRaises(IndexError):
+            log[5]
+
+class TestJSONLAlertStore(AlertStoreTests, unittest.TestCase):
+    """Test cases for the JSON Lines alert store."""
+
+    def open_store(self):
+        return JSONLAlertStore(os.path.join(self.test_dir, 'alerts_log.jsonl'))
+
+    def test_keeps_offsets_only(self):
+        """Test that the store keeps line offsets rather than the alerts themselves."""
+        self.assertTrue(all(isinstance(entry, int) for entry in self.store._alerts))
+
+    def test_reopen_rebuilds_indexes(self):
+        """Test that reopening the log rebuilds the indexes and appends after it."""
+        self.store.close()
+        self.store = self.open_store()
+        self.store.append(make_alert(5, 'throwing', 'hilal'))
+        self.assertEqual(self.store.count(), 6)
+        self.assertEqual(self.store.get('ALERT_3'), self.alerts[3])
+        self.assertEqual([a['alert_id'] for a in self.store.by_type('throwing')], ['ALERT_1', 'ALERT_5'])
+        self.assertEqual(list(self.store.iter_alerts())[:5], self.alerts)
+
+class TestSQLiteAlertStore(AlertStoreTests, unittest.TestCase):
+    """Test cases for the SQLite alert store."""
+
+    def open_store(self):
+        return SQLiteAlertStore(os.path.join(self.test_dir, 'alerts.db'))
+
+class TestMemoryAlertStore(AlertStoreTests, unittest.TestCase):
+    """Test cases for the in-memory alert store."""
+
+    def open_store(self):
+        return create_alert_store('memory', self.test_dir)
+
+class TestAlertStoreInterface(unittest.TestCase):
+    """Test cases for the alert store interface."""
+
+    def test_incomplete_store_fails_on_creation(self):
+        """Test that a store missing an interface method cannot be created."""
+        class AppendOnlyStore(AlertStore):
+            """Store implementing only append()."""
+
+            def append(self, alert):
+                pass
+
+        with self.assertRaises(TypeError):
+            AppendOnlyStore()
+
+class TestAlertLogLoading(unittest.TestCase):
+    """Test cases for loading an existing alert log into the alert system."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_reload_feeds_aggregates(self):
+        """Test that a reopened alert system counts the stored alerts without holding them."""
+        store = create_alert_store('jsonl', self.test_dir)
+        for i in range(4):
+            store.append(make_alert(i, 'fighting' if i % 2 else 'throwing'))
+        store.close()
+
+        alert_system = SecurityAlertSystem(output_dir=self.test_dir)
+        self.assertEqual(alert_system.alert_count, 4)
+        self.assertEqual(len(alert_system.alerts_log), 4)
+        self.assertEqual(alert_system.aggregates.summary()['by_type'], {'throwing': 2, 'fighting': 2})
+        self.assertEqual(alert_system.alerts_log[2:], [make_alert(2, 'throwing'), make_alert(3, 'fighting')])
+        alert_system.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Unit tests for the background artifact writer.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifact_writer import ArtifactWriter, PRIORITY_ALERT, PRIORITY_FRAME, PRIORITY_ANIMATION
+
+class TestArtifactWriter(unittest.TestCase):
+    """Test cases for queued artifact writes."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+        self.writer = ArtifactWriter(num_workers=1, max_pending=8)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.writer.shutdown()
+        shutil.rmtree(self.test_dir)
+
+    def test_write_and_read_back(self):
+        """Test that queued images are readable before and after they are written."""
+        image = np.full((8, 8, 3), 200, dtype=np.uint8)
+        path = os.path.join(self.test_dir, 'alert.png')
+
+        # Hold the worker so the image is still pending
+        release = threading.Event()
+        self.writer.submit(PRIORITY_ALERT, release.wait)
+        future = self.writer.write_image(path, image)
+        self.assertIs(self.writer.read_image(path), image)
+
+        release.set()
+        self.assertEqual(future.result(timeout=10), path)
+        self.assertEqual(self.writer.pending_images, {})
+        np.testing.assert_array_equal(self.writer.read_image(path), image)
+
+    def test_priority_order(self):
+        """Test that queued alerts are written before lower-priority artifacts."""
+        release = threading.Event()
+        self.writer.submit(PRIORITY_ALERT, release.wait)
+
+        order = []
+        for priority, name in ((PRIORITY_ANIMATION, 'gif'), (PRIORITY_FRAME, 'frame'), (PRIORITY_ALERT, 'alert')):
+            self.writer.submit(priority, order.append, name)
+        release.set()
+        self.writer.flush()
+        self.assertEqual(order, ['alert', 'frame', 'gif'])
+        self.assertEqual(self.writer.jobs_written, 4)
+
+    def test_failed_job(self):
+        """Test that a failing job reports its error through its future."""
+        future = self.writer.submit(PRIORITY_FRAME, cv2.imwrite, os.path.join(self.test_dir, 'frame.unknown'),
+                                    np.zeros((4, 4, 3), dtype=np.uint8))
+        with self.assertRaises(cv2.error):
+            future.result(timeout=10)
+        self.writer.flush()
+        self.assertEqual(self.writer.jobs_failed, 1)
+
+    def test_submit_after_shutdown(self):
+        """Test that a shut down writer rejects new jobs."""
+        self.writer.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.writer.submit(PRIORITY_FRAME, print)
+
+if __name__ == '__main__':
+    unittest.main()
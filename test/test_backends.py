@@ -0,0 +1,80 @@
+"""
+Unit tests for the batch padding of the inference backends.
+"""
+
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backends import InferenceBackend, batch_buckets
+
+class RecordingBackend(InferenceBackend):
+    """Backend that records the batch sizes it runs and sums each input."""
+
+    name = 'recording'
+
+    def __init__(self):
+        super().__init__()
+        self.run_sizes = []
+
+    def _run(self, batch):
+        self.run_sizes.append(len(batch))
+        return [batch.sum(axis=(1, 2, 3)), batch[:, 0, 0, :]]
+
+class TestBatchPadding(unittest.TestCase):
+    """Test cases for fixed-size batches."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.backend = RecordingBackend()
+        self.batch = np.random.default_rng(0).random((19, 2, 2, 3)).astype(np.float32)
+
+    def test_batch_buckets(self):
+        """Test the padded batch sizes for a maximum batch size."""
+        self.assertEqual(batch_buckets(8), (1, 2, 4, 8))
+        self.assertEqual(batch_buckets(6), (1, 2, 4, 6))
+        self.assertEqual(batch_buckets(1), (1,))
+
+    def test_unpadded_by_default(self):
+        """Test that batches run as they come without batch sizes."""
+        self.backend.predict(self.batch[:3])
+        self.assertEqual(self.backend.run_sizes, [3])
+
+    def test_padding(self):
+        """Test that batches are padded to the smallest configured size that holds them."""
+        self.backend.set_batch_sizes((8, 1, 4))
+        sums, corners = self.backend.predict(self.batch[:3])
+
+        # 3 inputs run padded to 4; outputs cover exactly the real inputs, in order
+        self.assertEqual(self.backend.run_sizes, [4])
+        np.testing.assert_allclose(sums, self.batch[:3].sum(axis=(1, 2, 3)), rtol=1e-6)
+        np.testing.assert_array_equal(corners, self.batch[:3, 0, 0, :])
+
+    def test_oversize_batch_runs_whole(self):
+        """Test that a batch larger than every configured size runs in one call at its own size."""
+        self.backend.set_batch_sizes((1,))
+        sums, corners = self.backend.predict(self.batch)
+
+        self.assertEqual(self.backend.run_sizes, [19])
+        np.testing.assert_allclose(sums, self.batch.sum(axis=(1, 2, 3)), rtol=1e-6)
+        np.testing.assert_array_equal(corners, self.batch[:, 0, 0, :])
+        self.assertEqual(self.backend.images, 19)
+
+    def test_backend_needs_run(self):
+        """Test that a backend without _run() cannot be created."""
+        with self.assertRaises(TypeError):
+            InferenceBackend()
+
+    def test_warm_up_runs_every_batch_size(self):
+        """Test that warm-up runs each configured batch size once and clears the statistics."""
+        self.backend.set_batch_sizes(batch_buckets(8))
+        self.backend.warm_up((2, 2, 3))
+        self.assertEqual(self.backend.run_sizes, [1, 2, 4, 8])
+        self.assertEqual(self.backend.calls, 0)
+
+if __name__ == '__main__':
+    unittest.main()
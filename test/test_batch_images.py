@@ -0,0 +1,119 @@
+"""
+Unit tests for batch processing of still images.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, models
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.batch_images import BatchImageProcessor
+from src.system import StadiumMonitoringSystem
+
+def empty_detector_model(input_shape):
+    """A dense-head detector whose heatmap stays far below the detection threshold."""
+    inputs = layers.Input(input_shape)
+    features = layers.AveragePooling2D(8)(inputs)
+    outputs = [
+        layers.Conv2D(4, 1, activation='softplus', name='bbox_output')(features),
+        layers.Conv2D(1, 1, activation='sigmoid', kernel_initializer='zeros',
+                      bias_initializer=tf.keras.initializers.Constant(-5.0), name='class_output')(features),
+        layers.Conv2D(2, 1, activation='softmax', name='team_output')(features),
+        layers.Conv2D(4, 1, activation='softmax', name='action_output')(features)
+    ]
+    return models.Model(inputs, outputs)
+
+class TestBatchImageProcessor(unittest.TestCase):
+    """Test cases for batched inference, the result cache and unreadable files."""
+
+    def setUp(self):
+        """Set up a system with a small detector and a directory of five images."""
+        self.test_dir = tempfile.mkdtemp()
+        detector_path = os.path.join(self.test_dir, 'fan_detection_model.h5')
+        empty_detector_model((64, 96, 3)).save(detector_path)
+
+        self.system = StadiumMonitoringSystem(config={
+            'model_dir': os.path.join(self.test_dir, 'models'),
+            'alerts_dir': os.path.join(self.test_dir, 'alerts'),
+            'input_shape': (64, 96, 3),
+            'async_artifacts': False
+        })
+        self.system.initialize(detector_path=detector_path)
+
+        self.images_dir = os.path.join(self.test_dir, 'images')
+        os.makedirs(self.images_dir)
+        for i in range(5):
+            cv2.imwrite(os.path.join(self.images_dir, f"img_{i}.png"), np.full((48, 80, 3), 40 * i, dtype=np.uint8))
+        self.output_dir = os.path.join(self.test_dir, 'annotated')
+        self.cache_path = os.path.join(self.test_dir, 'cache', 'results.db')
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.system.alert_system.close()
+        shutil.rmtree(self.test_dir)
+
+    def processor(self):
+        """A processor running batches of four images."""
+        return BatchImageProcessor(self.system, batch_size=4, num_workers=2, cache_path=self.cache_path)
+
+    def test_batches_run_at_the_batch_size(self):
+        """Test that the detector runs whole batches, padded to the batch size."""
+        backend = self.system.detector.model.backend
+        processor = self.processor()
+        self.assertIn(4, backend.batch_sizes)
+
+        results = processor.process_images(self.images_dir)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(processor.stats['batches'], 2)
+        self.assertEqual((backend.calls, backend.images), (2, 5))
+
+    def test_cache_hits_are_skipped(self):
+        """Test that unchanged images are answered from the cache without inference."""
+        self.processor().process_images(self.images_dir)
+
+        processor = self.processor()
+        backend = self.system.detector.model.backend
+        backend.reset_stats()
+        results = processor.process_images(self.images_dir)
+
+        self.assertTrue(all(result['cached'] for result in results.values()))
+        self.assertEqual((processor.stats['cached'], processor.stats['inferred']), (5, 0))
+        self.assertEqual(backend.calls, 0)
+
+    def test_missing_annotated_image_is_redrawn(self):
+        """Test that a cache hit whose annotated image was deleted draws it again."""
+        self.processor().process_images(self.images_dir, output_dir=self.output_dir)
+        annotated = os.path.join(self.output_dir, 'img_2_annotated.jpg')
+        os.remove(annotated)
+
+        processor = self.processor()
+        processor.process_images(self.images_dir, output_dir=self.output_dir)
+        self.assertTrue(os.path.exists(annotated))
+        self.assertEqual((processor.stats['cached'], processor.stats['inferred']), (5, 0))
+
+    def test_unreadable_file_fails(self):
+        """Test that a file that cannot be decoded is recorded as failed and not cached."""
+        broken = os.path.join(self.images_dir, 'broken.png')
+        with open(broken, 'wb') as f:
+            f.write(b'not an image')
+
+        processor = self.processor()
+        results = processor.process_images(self.images_dir)
+        self.assertIsNone(results[broken])
+        self.assertEqual((processor.stats['failed'], processor.stats['inferred']), (1, 5))
+
+        processor = self.processor()
+        results = processor.process_images(self.images_dir)
+        self.assertIsNone(results[broken])
+        self.assertEqual((processor.stats['failed'], processor.stats['cached']), (1, 5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Unit tests for the synthetic benchmark scenes and the scene detector.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import argparse
+import unittest
+from collections import Counter
+import numpy as np
+from tensorflow.keras import layers, models
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import ACTIONS, VIOLENT_ACTIONS, create_scene, fan_color, render_scene, build_system, SceneDetector
+
+class TestSyntheticScene(unittest.TestCase):
+    """Test cases for generating benchmark scenes."""
+
+    def test_scene_composition(self):
+        """Test that teams are split evenly and misplaced fans sit in the other team's half."""
+        fans = create_scene(400, violent_share=0.1, misplaced_share=0.05, width=1280, height=720)
+        self.assertEqual(len(fans), 400)
+        self.assertEqual(Counter(fan['team'] for fan in fans), {'hilal': 200, 'ittihad': 200})
+        self.assertEqual(sum(fan['misplaced'] for fan in fans), 20)
+        self.assertEqual(sum(fan['action'] in VIOLENT_ACTIONS for fan in fans), 40)
+
+        for fan in fans:
+            in_left_half = fan['x'] < 640
+            self.assertEqual(in_left_half, (fan['team'] == 'hilal') != fan['misplaced'])
+
+    def test_scene_is_seeded(self):
+        """Test that the same seed gives the same scene."""
+        self.assertEqual(create_scene(50, seed=3), create_scene(50, seed=3))
+        self.assertNotEqual(create_scene(50, seed=3), create_scene(50, seed=4))
+
+    def test_fan_colors(self):
+        """Test that every team and action has its own color."""
+        colors = {fan_color(team, action) for team in ('hilal', 'ittihad') for action in ACTIONS}
+        self.assertEqual(len(colors), 2 * len(ACTIONS))
+
+class TestSceneDetector(unittest.TestCase):
+    """Test cases for reading fans back from rendered scenes."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Save a small stand-in detector model for the forward pass."""
+        cls.test_dir = tempfile.mkdtemp()
+        inputs = layers.Input((192, 256, 3))
+        features = layers.GlobalAveragePooling2D()(inputs)
+        outputs = [layers.Dense(units)(features) for units in (4, 1, 2, 4)]  # Boxes, fan, team and action heads
+        cls.model_path = os.path.join(cls.test_dir, 'fan_detection_model.h5')
+        models.Model(inputs, outputs).save(cls.model_path)
+        cls.detector = SceneDetector(cls.model_path, input_shape=(192, 256, 3))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test environment."""
+        shutil.rmtree(cls.test_dir)
+
+    def test_detect_batch(self):
+        """Test that every fan is found with its team and action."""
+        scenes = [create_scene(num_fans, width=256, height=192, seed=num_fans) for num_fans in (10, 100)]
+        frames = [render_scene(fans, 256, 192) for fans in scenes]
+        results = self.detector.detect_batch(frames)
+
+        self.assertEqual(len(results), 2)
+        for fans, detections in zip(scenes, results):
+            self.assertEqual(Counter((det['team'], det['action']) for det in detections),
+                             Counter((fan['team'], fan['action']) for fan in fans))
+            for det in detections:
+                x1, y1, x2, y2 = det['bbox']
+                self.assertTrue(0 <= x1 < x2 <= 256 and 0 <= y1 < y2 <= 192)
+
+    def test_empty_batch(self):
+        """Test that an empty batch gives no results."""
+        self.assertEqual(self.detector.detect_batch([]), [])
+
+    def test_build_system(self):
+        """Test that the scene detector is loaded like the system's own detector."""
+        inputs = layers.Input((None, None, 3))
+        features = layers.GlobalAveragePooling2D()(inputs)
+        model_path = os.path.join(self.test_dir, 'any_size_model.h5')
+        models.Model(inputs, [layers.Dense(units)(features) for units in (4, 1, 2, 4)]).save(model_path)
+        args = argparse.Namespace(model_dir=os.path.join(self.test_dir, 'models'), backend='keras',
+                                  tflite_precision='int8', threads=None, detections='scene')
+
+        _, monitoring_system = build_system('image', os.path.join(self.test_dir, 'image'),
+                                            {'detector_path': model_path}, args)
+        detector = monitoring_system.detector
+        self.assertIsInstance(detector, SceneDetector)
+        self.assertIs(detector.metrics, monitoring_system.metrics)
+        self.assertEqual(detector.model.backend.batch_sizes, tuple(monitoring_system.config['detector_batch_sizes']))
+        self.assertEqual(detector.score_threshold, monitoring_system.config['detection_threshold'])
+        monitoring_system.alert_system.close()
+
+if __name__ == '__main__':
+    unittest.main()
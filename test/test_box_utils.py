@@ -0,0 +1,93 @@
+"""
+Unit tests for the bounding box utilities.
+"""
+
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.box_utils import box_iou, non_max_suppression, batched_non_max_suppression
+
+def reference_nms(boxes, scores, iou_threshold):
+    """Plain greedy NMS, one box at a time."""
+    keep = []
+    for i in np.argsort(-np.asarray(scores), kind='stable'):
+        if all(box_iou(boxes[i], boxes[j])[0, 0] <= iou_threshold for j in keep):
+            keep.append(i)
+    return keep
+
+def random_boxes(rng, count, size=100):
+    """Random [x1, y1, x2, y2] boxes with many overlaps."""
+    corners = rng.uniform(0, size, (count, 2))
+    extents = rng.uniform(5, 30, (count, 2))
+    return np.hstack([corners, corners + extents]).astype(np.float32)
+
+class TestBoxIoU(unittest.TestCase):
+    """Test cases for pairwise IoU."""
+
+    def test_iou_values(self):
+        """Test IoU of identical, overlapping, disjoint and empty boxes."""
+        boxes = [[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30], [0, 0, 0, 0]]
+        iou = box_iou(boxes, boxes)
+        self.assertEqual(iou.shape, (4, 4))
+        np.testing.assert_allclose(np.diag(iou)[:3], 1.0)
+        self.assertAlmostEqual(iou[0, 1], 50 / 150)
+        self.assertEqual(iou[0, 2], 0.0)
+        self.assertEqual(iou[3, 3], 0.0)
+
+class TestNonMaxSuppression(unittest.TestCase):
+    """Test cases for greedy non-maximum suppression."""
+
+    def test_suppresses_overlaps(self):
+        """Test that the best box of each cluster is kept, ordered by score."""
+        boxes = [[0, 0, 10, 10], [1, 1, 11, 11], [50, 50, 60, 60], [2, 0, 12, 10]]
+        scores = [0.6, 0.9, 0.7, 0.8]
+        keep = non_max_suppression(boxes, scores, iou_threshold=0.5)
+        self.assertEqual(keep.tolist(), [1, 2])
+
+    def test_matches_reference(self):
+        """Test that the vectorized NMS keeps the same boxes as the plain greedy loop."""
+        rng = np.random.default_rng(0)
+        boxes = random_boxes(rng, 200)
+        scores = rng.random(200)
+        for threshold in (0.3, 0.5, 0.7):
+            keep = non_max_suppression(boxes, scores, iou_threshold=threshold)
+            self.assertEqual(keep.tolist(), reference_nms(boxes, scores, threshold))
+
+    def test_max_detections_and_empty(self):
+        """Test the detection limit and empty inputs."""
+        boxes = [[0, 0, 10, 10], [20, 20, 30, 30], [40, 40, 50, 50]]
+        keep = non_max_suppression(boxes, [0.1, 0.3, 0.2], max_detections=2)
+        self.assertEqual(keep.tolist(), [1, 2])
+        self.assertEqual(len(non_max_suppression(np.zeros((0, 4)), [])), 0)
+
+class TestBatchedNonMaxSuppression(unittest.TestCase):
+    """Test cases for non-maximum suppression within groups."""
+
+    def test_groups_do_not_suppress_each_other(self):
+        """Test that identical boxes in different groups are all kept."""
+        boxes = [[0, 0, 10, 10]] * 4
+        keep = batched_non_max_suppression(boxes, [0.5, 0.9, 0.7, 0.6], [0, 0, 1, 1])
+        self.assertEqual(keep.tolist(), [1, 2])
+
+    def test_matches_per_group_nms(self):
+        """Test that the batched NMS keeps what NMS on each group separately keeps."""
+        rng = np.random.default_rng(1)
+        boxes = random_boxes(rng, 300)
+        scores = rng.random(300)
+        groups = rng.integers(0, 5, 300)
+
+        keep = batched_non_max_suppression(boxes, scores, groups, iou_threshold=0.4)
+        expected = []
+        for group in range(5):
+            indices = np.flatnonzero(groups == group)
+            expected.extend(indices[non_max_suppression(boxes[indices], scores[indices], iou_threshold=0.4)])
+        self.assertEqual(sorted(keep.tolist()), sorted(expected))
+        self.assertTrue(np.all(np.diff(scores[keep]) <= 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for the fan crop cache.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.crop_cache import CropCache, load_crop_cache
+from src.model_cache import file_hash
+
+class TestCropCache(unittest.TestCase):
+    """Test cases for building and streaming the crop cache on a small synthetic dataset."""
+
+    def setUp(self):
+        """Write five images whose fans are filled with a gray level encoding image and fan."""
+        self.test_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.test_dir, 'images'))
+        os.makedirs(os.path.join(self.test_dir, 'annotations'))
+
+        images, annotations = [], []
+        for image_id in range(5):
+            pixels = np.zeros((48, 64, 3), dtype=np.uint8)
+            for fan in range(image_id % 2 + 1):
+                x = 8 + 24 * fan
+                pixels[8:40, x:x + 16] = self.level(image_id, fan)
+                annotations.append({
+                    'image_id': image_id,
+                    'bbox': [x, 8, 16, 32],
+                    'attributes': {'team': ('hilal', 'ittihad')[fan], 'action': ('sitting', 'throwing')[image_id % 2]}
+                })
+            file_name = f"img_{image_id}.png"
+            Image.fromarray(pixels).save(os.path.join(self.test_dir, 'images', file_name))
+            images.append({'id': image_id, 'file_name': file_name})
+
+        # An image without fans adds no crops
+        Image.fromarray(np.zeros((48, 64, 3), dtype=np.uint8)).save(os.path.join(self.test_dir, 'images', 'empty.png'))
+        images.append({'id': 5, 'file_name': 'empty.png'})
+
+        self.labels_path = os.path.join(self.test_dir, 'annotations', 'labels.json')
+        with open(self.labels_path, 'w') as f:
+            json.dump({'images': images, 'annotations': annotations}, f)
+        self.cache_dir = os.path.join(self.test_dir, 'crops')
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    @staticmethod
+    def level(image_id, fan):
+        """Gray level of a fan."""
+        return 20 + 40 * image_id + 20 * fan
+
+    def test_build_and_load(self):
+        """Test that every fan is cropped once with its labels, in image order."""
+        cache = load_crop_cache(self.test_dir, crop_shape=(16, 8, 3), cache_dir=self.cache_dir, num_workers=2)
+        self.assertEqual(cache.crops.shape, (7, 16, 8, 3))
+        self.assertIsInstance(cache.crops, np.memmap)
+
+        expected = [(image_id, fan) for image_id in range(5) for fan in range(image_id % 2 + 1)]
+        self.assertEqual(cache.labels['image_ids'].tolist(), [image_id for image_id, _ in expected])
+        self.assertEqual(cache.labels['teams'].tolist(), [fan for _, fan in expected])
+        self.assertEqual(cache.labels['actions'].tolist(), [3 * (image_id % 2) for image_id, _ in expected])
+        for crop, (image_id, fan) in zip(cache.crops, expected):
+            # Crops sample up to the box edges, so only their centers are uniform
+            self.assertTrue(np.all(crop[2:-2, 2:-2] == self.level(image_id, fan)))
+
+    def test_rebuilt_when_stale(self):
+        """Test that the cache is reused until the annotations or crop shape change."""
+        load_crop_cache(self.test_dir, crop_shape=(16, 8, 3), cache_dir=self.cache_dir)
+        built = os.path.getmtime(os.path.join(self.cache_dir, 'crops.npy'))
+
+        load_crop_cache(self.test_dir, crop_shape=(16, 8, 3), cache_dir=self.cache_dir)
+        self.assertEqual(os.path.getmtime(os.path.join(self.cache_dir, 'crops.npy')), built)
+        self.assertTrue(CropCache(self.cache_dir, (16, 8, 3)).is_valid(file_hash(self.labels_path)))
+        self.assertFalse(CropCache(self.cache_dir, (32, 16, 3)).is_valid(file_hash(self.labels_path)))
+
+        with open(self.labels_path) as f:
+            labels = json.load(f)
+        labels['annotations'] = labels['annotations'][:3]
+        with open(self.labels_path, 'w') as f:
+            json.dump(labels, f)
+        cache = load_crop_cache(self.test_dir, crop_shape=(16, 8, 3), cache_dir=self.cache_dir)
+        self.assertEqual(len(cache.crops), 3)
+
+    def test_split_and_stream(self):
+        """Test that crops of one image stay in one split and stream with their labels."""
+        cache = load_crop_cache(self.test_dir, crop_shape=(16, 8, 3), cache_dir=self.cache_dir)
+        train_indices, val_indices = cache.split(train_ratio=0.6)
+        self.assertEqual(sorted(np.concatenate([train_indices, val_indices]).tolist()), list(range(7)))
+        image_ids = cache.labels['image_ids']
+        self.assertFalse(set(image_ids[train_indices]) & set(image_ids[val_indices]))
+
+        _, val = cache.training_datasets({'team_output': 'teams', 'action_output': 'actions'},
+                                         batch_size=8, train_ratio=0.6)
+        crops, labels = next(iter(val))
+        self.assertEqual(crops.shape[1:], (16, 8, 3))
+        self.assertEqual(labels['team_output'].numpy().tolist(), cache.labels['teams'][val_indices].tolist())
+        self.assertEqual(labels['action_output'].numpy().tolist(), cache.labels['actions'][val_indices].tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for refining detections with the crop classifiers.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system import StadiumMonitoringSystem
+
+class MeanClassifier:
+    """Classifier stand-in that labels each crop by its mean brightness and records its batches."""
+
+    def __init__(self, dark_label, bright_label):
+        self.labels = (dark_label, bright_label)
+        self.batches = []
+
+    def predict_batch(self, crops):
+        crops = np.asarray(crops)
+        self.batches.append(crops.shape)
+        return [(self.labels[int(crop.mean() > 127)], float(crop.mean()) / 255) for crop in crops]
+
+class FusedClassifier(MeanClassifier):
+    """Fused classifier stand-in returning both labels from one batch."""
+
+    def predict_batch(self, crops):
+        return [{'team': team, 'team_score': score, 'action': 'cheering', 'action_score': score}
+                for team, score in super().predict_batch(crops)]
+
+class TestCropRefinement(unittest.TestCase):
+    """Test cases for batched crop classification of a frame's detections."""
+
+    def setUp(self):
+        """Set up a frame with a dark fan on the left and a bright fan on the right."""
+        self.test_dir = tempfile.mkdtemp()
+        self.system = StadiumMonitoringSystem(config={
+            'model_dir': os.path.join(self.test_dir, 'models'),
+            'alerts_dir': os.path.join(self.test_dir, 'alerts'),
+            'crop_shape': (32, 16, 3),
+            'async_artifacts': False
+        })
+        self.image = np.zeros((120, 160, 3), dtype=np.uint8)
+        self.image[20:100, 100:140] = 255
+        self.detections = [
+            {'bbox': [20, 20, 60, 100], 'team': 'hilal', 'team_score': 0.5, 'action': 'sitting', 'action_score': 0.5},
+            {'bbox': [100, 20, 140, 100], 'team': 'hilal', 'team_score': 0.5, 'action': 'sitting', 'action_score': 0.5}
+        ]
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.system.alert_system.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_separate_classifiers(self):
+        """Test that each classifier runs once on all fans of the frame."""
+        self.system.behavior_classifier = MeanClassifier('sitting', 'fighting')
+        self.system.team_detector = MeanClassifier('hilal', 'ittihad')
+        self.system.refine_detections(self.image, self.detections)
+
+        self.assertEqual([det['action'] for det in self.detections], ['sitting', 'fighting'])
+        self.assertEqual([det['team'] for det in self.detections], ['hilal', 'ittihad'])
+        self.assertEqual(self.system.behavior_classifier.batches, [(2, 32, 16, 3)])
+        self.assertEqual(self.system.team_detector.batches, [(2, 32, 16, 3)])
+
+    def test_fused_classifier(self):
+        """Test that the fused classifier gives both labels and replaces the separate ones."""
+        self.system.crop_classifier = FusedClassifier('hilal', 'ittihad')
+        self.system.behavior_classifier = MeanClassifier('sitting', 'fighting')
+        self.system.refine_detections(self.image, self.detections)
+
+        self.assertEqual([det['team'] for det in self.detections], ['hilal', 'ittihad'])
+        self.assertEqual([det['action'] for det in self.detections], ['cheering', 'cheering'])
+        self.assertEqual(self.system.crop_classifier.batches, [(2, 32, 16, 3)])
+        self.assertEqual(self.system.behavior_classifier.batches, [])
+
+    def test_disabled_refinement(self):
+        """Test that labels are kept without classifiers or with refinement disabled."""
+        self.system.refine_detections(self.image, self.detections)
+        self.assertEqual([det['team'] for det in self.detections], ['hilal', 'hilal'])
+
+        self.system.team_detector = MeanClassifier('hilal', 'ittihad')
+        self.system.config['refine_with_classifiers'] = False
+        self.system.refine_detections(self.image, self.detections)
+        self.assertEqual(self.system.team_detector.batches, [])
+
+if __name__ == '__main__':
+    unittest.main()
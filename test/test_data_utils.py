@@ -0,0 +1,116 @@
+"""
+Unit tests for the stadium dataset loader.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_utils import StadiumDataset
+from src.dense_head import decode_dense_predictions
+
+class TestStadiumDataset(unittest.TestCase):
+    """Test cases for annotation indexes and TFRecord shards on a small synthetic dataset."""
+
+    def setUp(self):
+        """Write six 64x48 images with one to three fans each."""
+        self.test_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.test_dir, 'images'))
+        os.makedirs(os.path.join(self.test_dir, 'annotations'))
+
+        images, annotations = [], []
+        for image_id in range(6):
+            file_name = f"img_{image_id}.png"
+            Image.fromarray(np.full((48, 64, 3), image_id * 40, dtype=np.uint8)).save(
+                os.path.join(self.test_dir, 'images', file_name))
+            images.append({'id': image_id, 'file_name': file_name})
+            for fan in range(image_id % 3 + 1):
+                annotations.append({
+                    'image_id': image_id,
+                    'bbox': [8 * fan, 4, 8, 16],
+                    'attributes': {'team': ('hilal', 'ittihad')[fan % 2], 'action': 'fighting' if fan else 'sitting'}
+                })
+        with open(os.path.join(self.test_dir, 'annotations', 'labels.json'), 'w') as f:
+            json.dump({'images': images, 'annotations': annotations}, f)
+
+        self.dataset = StadiumDataset(self.test_dir, image_size=(64, 48))
+        self.dataset.load_annotations()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_indexed_lookups(self):
+        """Test image paths, annotations and targets looked up by image ID."""
+        self.assertEqual(self.dataset.get_image_path(4), os.path.join(self.test_dir, 'images', 'img_4.png'))
+        self.assertIsNone(self.dataset.get_image_path(99))
+        self.assertEqual(len(self.dataset.get_annotations_for_image(5)), 3)
+        self.assertEqual(self.dataset.get_annotations_for_image(99), [])
+
+        boxes, teams, actions = self.dataset.get_targets_for_image(1)
+        np.testing.assert_allclose(boxes, [[4 / 48, 0, 20 / 48, 8 / 64], [4 / 48, 8 / 64, 20 / 48, 16 / 64]])
+        self.assertEqual((teams, actions), ([0, 1], [0, 2]))
+
+    def test_shards_match_annotations(self):
+        """Test that records streamed from shards hold the same images and targets."""
+        shard_paths = self.dataset.write_shards(num_shards=2, train_ratio=0.5)
+        self.assertEqual([len(paths) for paths in shard_paths.values()], [2, 2])
+
+        shards_dir = os.path.join(self.test_dir, 'shards')
+        train, val = self.dataset.prepare_detection_dataset(batch_size=2, shards_dir=shards_dir)
+        seen = set()
+        for batch in list(train) + list(val):
+            for i, image_id in enumerate(batch['image_id'].numpy()):
+                seen.add(int(image_id))
+                boxes, teams, actions = self.dataset.get_targets_for_image(int(image_id))
+                np.testing.assert_allclose(batch['boxes'][i].numpy(), boxes, rtol=1e-6)
+                self.assertEqual(batch['teams'][i].numpy().tolist(), teams)
+                self.assertEqual(batch['actions'][i].numpy().tolist(), actions)
+                self.assertAlmostEqual(float(batch['image'][i].numpy().mean()), image_id * 40 / 127.5 - 1, places=5)
+        self.assertEqual(seen, set(range(6)))
+
+    def test_split_from_annotations(self):
+        """Test the train/validation split built from the annotation indexes."""
+        train, val = self.dataset.prepare_detection_dataset(train_ratio=0.5, batch_size=3)
+        train_ids = [int(i) for batch in train for i in batch['image_id'].numpy()]
+        val_ids = [int(i) for batch in val for i in batch['image_id'].numpy()]
+        self.assertEqual((len(train_ids), len(val_ids)), (3, 3))
+        self.assertEqual(sorted(train_ids + val_ids), list(range(6)))
+
+        batch = next(iter(val))
+        self.assertEqual(batch['image'].shape, (3, 48, 64, 3))
+        self.assertEqual(batch['boxes'].row_lengths().numpy().tolist(),
+                         [len(self.dataset.get_annotations_for_image(int(i))) for i in batch['image_id'].numpy()])
+
+    def test_targets_decode_to_boxes(self):
+        """Test that dense targets decode back to the annotated boxes, teams and actions."""
+        dataset = StadiumDataset(self.test_dir, image_size=(128, 96))
+        boxes = np.array([[0.1, 0.1, 0.4, 0.3], [0.5, 0.6, 0.9, 0.8], [0.2, 0.7, 0.5, 0.95]], dtype=np.float32)
+        targets = dataset.encode_targets(boxes, [0, 1, 1], [3, 0, 2], output_stride=8)
+
+        decoded = decode_dense_predictions(
+            targets['class_output'].numpy()[np.newaxis],
+            targets['bbox_output'].numpy()[np.newaxis, ..., :4],  # Drop the mask channel
+            tf.one_hot(tf.cast(targets['team_output'][..., 0], tf.int32), 2).numpy()[np.newaxis],
+            tf.one_hot(tf.cast(targets['action_output'][..., 0], tf.int32), 4).numpy()[np.newaxis],
+            image_size=(96, 128), score_threshold=0.9
+        )[0]
+
+        # The fans are annotated left to right
+        order = np.argsort(decoded['boxes'][:, 0])
+        expected = boxes[:, [1, 0, 3, 2]] * [128, 96, 128, 96]  # [x1, y1, x2, y2] pixels
+        np.testing.assert_allclose(decoded['boxes'][order], expected, atol=1e-4)
+        self.assertEqual(decoded['team_ids'][order].tolist(), [0, 1, 1])
+        self.assertEqual(decoded['action_ids'][order].tolist(), [3, 0, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Unit tests for the dense detection head decode.
+"""
+
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dense_head import find_peaks, decode_dense_predictions
+
+class TestDenseDecode(unittest.TestCase):
+    """Test cases for turning dense head maps into fan boxes."""
+
+    def setUp(self):
+        """Set up two 8x8 grids: two fans in the first image, none in the second."""
+        grid = 8
+        self.heatmaps = np.zeros((2, grid, grid, 1), dtype=np.float32)
+        self.boxes = np.full((2, grid, grid, 4), 1 / 16, dtype=np.float32)
+        self.teams = np.zeros((2, grid, grid, 3), dtype=np.float32)
+        self.actions = np.zeros((2, grid, grid, 4), dtype=np.float32)
+
+        # Fan at cell (2, 3) with a weaker neighbour, fan at cell (6, 6)
+        self.heatmaps[0, 2, 3, 0] = 0.9
+        self.heatmaps[0, 2, 4, 0] = 0.8
+        self.heatmaps[0, 6, 6, 0] = 0.7
+        self.teams[0, 2, 3] = [0.1, 0.8, 0.1]
+        self.actions[0, 2, 3] = [0.1, 0.1, 0.7, 0.1]
+        self.teams[0, 6, 6] = [0.6, 0.2, 0.2]
+        self.actions[0, 6, 6] = [0.9, 0.0, 0.1, 0.0]
+
+    def test_find_peaks(self):
+        """Test that only local maxima survive."""
+        peaks = find_peaks(self.heatmaps[..., 0])
+        self.assertEqual(np.count_nonzero(peaks), 2)
+        self.assertEqual(peaks[0, 2, 4], 0.0)
+
+    def test_decode(self):
+        """Test boxes, scores and labels decoded per image."""
+        decoded = decode_dense_predictions(self.heatmaps, self.boxes, self.teams, self.actions, (64, 64),
+                                           score_threshold=0.5)
+        self.assertEqual(len(decoded), 2)
+        self.assertEqual(len(decoded[1]['boxes']), 0)
+
+        first = decoded[0]
+        np.testing.assert_allclose(first['scores'], [0.9, 0.7])
+        # Cell centers at (28, 20) and (52, 52) pixels, 4 pixels to every edge
+        np.testing.assert_allclose(first['boxes'], [[24, 16, 32, 24], [48, 48, 56, 56]], atol=1e-4)
+        self.assertEqual(first['team_ids'].tolist(), [1, 0])
+        self.assertEqual(first['action_ids'].tolist(), [2, 0])
+        np.testing.assert_allclose(first['team_scores'], [0.8, 0.6])
+
+    def test_threshold_and_limit(self):
+        """Test the score threshold and the per-image detection limit."""
+        decoded = decode_dense_predictions(self.heatmaps, self.boxes, self.teams, self.actions, (64, 64),
+                                           score_threshold=0.75)
+        self.assertEqual(decoded[0]['scores'].tolist(), [np.float32(0.9)])
+        decoded = decode_dense_predictions(self.heatmaps, self.boxes, self.teams, self.actions, (64, 64),
+                                           score_threshold=0.5, max_detections=1)
+        self.assertEqual(len(decoded[0]['boxes']), 1)
+
+    def test_overlapping_peaks_are_merged(self):
+        """Test that separate peaks with overlapping boxes are merged by NMS."""
+        self.heatmaps[0, 2, 5, 0] = 0.85
+        self.boxes[0, 2, 3] = 5 / 16
+        self.boxes[0, 2, 5] = 5 / 16
+        decoded = decode_dense_predictions(self.heatmaps, self.boxes, self.teams, self.actions, (64, 64),
+                                           score_threshold=0.5, iou_threshold=0.3)
+        np.testing.assert_allclose(decoded[0]['scores'], [0.9, 0.7])
+
+if __name__ == '__main__':
+    unittest.main()
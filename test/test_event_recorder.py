@@ -0,0 +1,101 @@
+"""
+Unit tests for the event-clip recorder.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.event_recorder import EventRecorder
+
+class ClipCollector:
+    """Artifact writer stand-in that keeps the frames of every clip instead of encoding them."""
+
+    def __init__(self):
+        self.clips = {}
+
+    def submit(self, priority, fn, frames, path):
+        self.clips[path] = frames
+
+def frame_indices(frames):
+    """Index of every buffered frame, where frame i has gray level 6 * i + 3."""
+    indices = []
+    for item in frames:
+        frame = cv2.imdecode(np.frombuffer(item, np.uint8), cv2.IMREAD_COLOR) if isinstance(item, bytes) else item
+        indices.append(int(round((frame.mean() - 3) / 6)))
+    return indices
+
+class TestEventRecorder(unittest.TestCase):
+    """Test cases for clips around incidents, with both buffer formats."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def record(self, buffer_format, triggers, num_frames=40, writer=None, **kwargs):
+        """Push frames at 10 frames/s and trigger at the given frame indices."""
+        recorder = EventRecorder(output_dir=self.test_dir, name='cam', fps=10.0, pre_roll=1.0, post_roll=1.0,
+                                 buffer_format=buffer_format, writer=writer, **kwargs)
+        for i in range(num_frames):
+            recorder.push(np.full((32, 32, 3), 6 * i + 3, dtype=np.uint8), timestamp=i / 10)
+            if i in triggers:
+                recorder.trigger(label='fighting')
+        recorder.close()
+        return recorder
+
+    def test_pre_and_post_roll(self):
+        """Test that a clip spans the buffered pre-roll before and the post-roll after the incident."""
+        for buffer_format in ('jpeg', 'raw'):
+            collector = ClipCollector()
+            recorder = self.record(buffer_format, triggers={20}, writer=collector)
+            self.assertEqual(recorder.clips, [os.path.join(self.test_dir, 'clip_cam_fighting_1.mp4')])
+
+            # The one-second ring holds frames 11-20; the clip ends with the frame at 3.0 s
+            self.assertEqual(frame_indices(collector.clips[recorder.clips[0]]), list(range(11, 31)), buffer_format)
+
+    def test_incidents_extend_the_clip(self):
+        """Test that an incident within the post-roll extends the clip up to its maximum length."""
+        collector = ClipCollector()
+        recorder = self.record('raw', triggers={12, 18}, writer=collector)
+        self.assertEqual(len(recorder.clips), 1)
+        self.assertEqual(frame_indices(collector.clips[recorder.clips[0]]), list(range(3, 29)))
+
+        collector = ClipCollector()
+        recorder = self.record('raw', triggers={12, 18}, writer=collector, max_clip_length=2.0)
+        self.assertEqual(frame_indices(collector.clips[recorder.clips[0]]), list(range(3, 23)))
+
+    def test_separate_incidents(self):
+        """Test that incidents after the post-roll start new clips."""
+        collector = ClipCollector()
+        recorder = self.record('jpeg', triggers={5, 30}, writer=collector)
+        self.assertEqual(len(recorder.clips), 2)
+        self.assertEqual(frame_indices(collector.clips[recorder.clips[0]]), list(range(0, 16)))
+
+        # The last clip is cut short by close()
+        self.assertEqual(frame_indices(collector.clips[recorder.clips[1]]), list(range(21, 40)))
+
+    def test_encoded_clip(self):
+        """Test that clips are encoded as MP4 files without a writer."""
+        recorder = self.record('jpeg', triggers={20})
+        cap = cv2.VideoCapture(recorder.clips[0])
+        self.assertEqual(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 20)
+        cap.release()
+
+    def test_unknown_buffer_format(self):
+        """Test that unknown buffer formats are rejected."""
+        with self.assertRaises(ValueError):
+            EventRecorder(output_dir=self.test_dir, buffer_format='png')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Unit tests for model export and the exported-model inference backends.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, models
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backends import create_backend, resolve_model_path
+from src.export import export_model
+
+class TestExportedBackends(unittest.TestCase):
+    """Test cases for exporting a small two-output model and running it on every backend."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Save a small convolutional model with a box and a class output."""
+        cls.test_dir = tempfile.mkdtemp()
+        tf.keras.utils.set_random_seed(0)
+        inputs = layers.Input((16, 16, 3))
+        features = layers.GlobalAveragePooling2D()(layers.Conv2D(8, 3, activation='relu')(inputs))
+        boxes = layers.Dense(4, activation='sigmoid', name='bbox_output')(features)
+        classes = layers.Dense(3, activation='softmax', name='class_output')(features)
+        cls.model = models.Model(inputs, [boxes, classes])
+        cls.model_path = os.path.join(cls.test_dir, 'tiny_model.h5')
+        cls.model.save(cls.model_path)
+
+        rng = np.random.default_rng(0)
+        cls.batch = rng.random((5, 16, 16, 3)).astype(np.float32)
+        calibration = lambda: (rng.random((1, 16, 16, 3)).astype(np.float32) for _ in range(20))
+        cls.exported = export_model(cls.model_path, formats=('tflite-fp16', 'tflite-int8'),
+                                    calibration_images=calibration)
+        cls.expected = cls.model.predict(cls.batch, verbose=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test environment."""
+        shutil.rmtree(cls.test_dir)
+
+    def assert_outputs_close(self, backend, atol):
+        """Check that a backend returns the Keras outputs in the Keras order."""
+        outputs = backend.predict(self.batch)
+        self.assertEqual([output.shape for output in outputs], [(5, 4), (5, 3)])
+        for output, expected in zip(outputs, self.expected):
+            np.testing.assert_allclose(output, expected, atol=atol)
+
+    def test_exported_paths(self):
+        """Test that exports are written where the backends look for them."""
+        self.assertEqual(self.exported, [resolve_model_path(self.model_path, 'tflite', 'fp16'),
+                                         resolve_model_path(self.model_path, 'tflite', 'int8')])
+        self.assertEqual(resolve_model_path(self.model_path, 'keras'), self.model_path)
+        self.assertTrue(resolve_model_path(self.model_path, 'onnxruntime').endswith('tiny_model.onnx'))
+
+    def test_keras_backends(self):
+        """Test the Keras and tf.function backends."""
+        self.assert_outputs_close(create_backend('keras', keras_model=self.model), 1e-6)
+        self.assert_outputs_close(create_backend('tf-function', keras_model=self.model), 1e-5)
+
+    def test_tflite_backends(self):
+        """Test the float16 and int8 TFLite exports against the Keras model."""
+        self.assert_outputs_close(create_backend('tflite', self.model_path, precision='fp16'), 1e-2)
+        self.assert_outputs_close(create_backend('tflite', self.model_path, precision='int8'), 5e-2)
+
+    def test_missing_export(self):
+        """Test that a backend without an exported model points to the export script."""
+        with self.assertRaises(FileNotFoundError):
+            create_backend('onnxruntime', self.model_path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Unit tests for in-memory frame processing.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from tensorflow.keras import layers, models
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.inference import StadiumCrowdDetector
+from src.system import StadiumMonitoringSystem
+
+class RecordingDetector:
+    """Detector stand-in that finds no fans and records the frames it is given."""
+
+    def __init__(self):
+        self.frames = []
+
+    def detect_array(self, frame):
+        self.frames.append(frame)
+        return []
+
+class TestPreprocessing(unittest.TestCase):
+    """Test cases for preprocessing in-memory frames like image files."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Save a small stand-in detector model and a textured 192x256 image."""
+        cls.test_dir = tempfile.mkdtemp()
+        inputs = layers.Input((96, 128, 3))
+        features = layers.GlobalAveragePooling2D()(inputs)
+        model_path = os.path.join(cls.test_dir, 'fan_detection_model.h5')
+        models.Model(inputs, [layers.Dense(units)(features) for units in (4, 1, 2, 4)]).save(model_path)
+        cls.detector = StadiumCrowdDetector(model_path, input_shape=(96, 128, 3))
+
+        frame = np.random.default_rng(0).integers(0, 256, (192, 256, 3), dtype=np.uint8)
+        cls.frame = cv2.GaussianBlur(frame, (5, 5), 0)
+        cls.image_path = os.path.join(cls.test_dir, 'frame.png')
+        cv2.imwrite(cls.image_path, cls.frame)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test environment."""
+        shutil.rmtree(cls.test_dir)
+
+    def test_array_matches_image_file(self):
+        """Test that a BGR frame is preprocessed to the same input as the image file it came from."""
+        from_array = self.detector.preprocess_array(self.frame)
+        from_file = np.asarray(self.detector.preprocess_image(self.image_path))
+
+        self.assertEqual(from_array.shape, (96, 128, 3))
+        self.assertEqual(from_array.dtype, np.float32)
+        np.testing.assert_allclose(from_array, from_file, atol=1e-3)
+
+    def test_predictions_match(self):
+        """Test that the model gives the same outputs for a frame and its image file."""
+        from_array = self.detector.model.predict(self.detector.preprocess_array(self.frame))
+        from_file = self.detector.model.predict(self.detector.preprocess_image(self.image_path))
+        for array_output, file_output in zip(from_array, from_file):
+            np.testing.assert_allclose(array_output, file_output, atol=1e-4)
+
+class TestProcessVideo(unittest.TestCase):
+    """Test cases for processing video frames without temporary files."""
+
+    def setUp(self):
+        """Set up a system with a recording detector and a short video."""
+        self.test_dir = tempfile.mkdtemp()
+        self.video_path = os.path.join(self.test_dir, 'match.avi')
+        writer = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for i in range(6):
+            writer.write(np.full((48, 64, 3), i * 40, dtype=np.uint8))
+        writer.release()
+
+        self.system = StadiumMonitoringSystem(config={
+            'model_dir': os.path.join(self.test_dir, 'models'),
+            'alerts_dir': os.path.join(self.test_dir, 'alerts'),
+            'async_artifacts': False
+        })
+        self.system.initialize()
+        self.system.detector = RecordingDetector()
+
+        # Run from an empty working directory, where a temporary frame would have been written
+        self.work_dir = os.path.join(self.test_dir, 'work')
+        os.makedirs(self.work_dir)
+        self.cwd = os.getcwd()
+        os.chdir(self.work_dir)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        os.chdir(self.cwd)
+        self.system.alert_system.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_frames_stay_in_memory(self):
+        """Test that every frame reaches the detector as an array and no temporary image is written."""
+        all_detections, _ = self.system.process_video(self.video_path, frame_interval=1)
+
+        self.assertEqual(len(all_detections), 6)
+        self.assertEqual(len(self.system.detector.frames), 6)
+        self.assertTrue(all(frame.shape == (48, 64, 3) for frame in self.system.detector.frames))
+        self.assertEqual(os.listdir(self.work_dir), [])
+
+if __name__ == '__main__':
+    unittest.main()
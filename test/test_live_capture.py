@@ -0,0 +1,145 @@
+"""
+Unit tests for live capture and capture-to-alert latency.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.live_capture import LatestFrameCapture, LiveLatency
+from src.system import StadiumMonitoringSystem
+
+class FightDetector:
+    """Detector stand-in that finds one fighting fan in every frame."""
+
+    def detect_array(self, frame):
+        return [{'bbox': [10, 10, 30, 40], 'team': 'hilal', 'action': 'fighting',
+                 'class_score': 0.9, 'team_score': 0.9, 'action_score': 0.9}]
+
+def frame_index(frame):
+    """Frame number encoded in the gray level of a test frame."""
+    return int(round(frame.mean() / 20))
+
+class TestLatestFrameCapture(unittest.TestCase):
+    """Test cases for handing frames of a video file to one consumer."""
+
+    def setUp(self):
+        """Write a 12-frame video at 10 frames/s whose gray level encodes the frame number."""
+        self.test_dir = tempfile.mkdtemp()
+        self.video_path = os.path.join(self.test_dir, 'feed.avi')
+        writer = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for i in range(12):
+            writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def read_all(self, capture):
+        """Read frames until the stream ends."""
+        items = []
+        while True:
+            item = capture.read(timeout=0.5)
+            if item is None:
+                if capture.finished:
+                    return items
+                continue
+            items.append(item)
+
+    def test_latest_frame_wins(self):
+        """Test that a consumer that falls behind gets the newest frame and the rest are counted as dropped."""
+        capture = LatestFrameCapture(self.video_path, realtime=False)
+        capture.start()
+        while not capture.finished:
+            time.sleep(0.01)
+
+        frame, index, _ = capture.read()
+        self.assertEqual((index, frame_index(frame)), (11, 11))
+        self.assertIsNone(capture.read(timeout=0.1))
+        capture.stop()
+        self.assertEqual((capture.frames_captured, capture.frames_consumed, capture.frames_dropped), (12, 1, 11))
+
+    def test_every_frame_in_order(self):
+        """Test that without latest-frame-wins every frame is handed over in order."""
+        capture = LatestFrameCapture(self.video_path, latest_only=False, realtime=False)
+        capture.start()
+        items = self.read_all(capture)
+        capture.stop()
+
+        self.assertEqual([index for _, index, _ in items], list(range(12)))
+        self.assertEqual([frame_index(frame) for frame, _, _ in items], list(range(12)))
+        self.assertEqual(capture.frames_dropped, 0)
+
+    def test_files_are_paced(self):
+        """Test that video files are released at their frame rate by default."""
+        capture = LatestFrameCapture(self.video_path, latest_only=False)
+        start = time.perf_counter()
+        capture.start()
+        items = self.read_all(capture)
+        capture.stop()
+
+        self.assertTrue(capture.realtime)
+        self.assertEqual(len(items), 12)
+        self.assertGreaterEqual(time.perf_counter() - start, 1.0)
+        capture_times = [capture_time for _, _, capture_time in items]
+        self.assertGreater(capture_times[-1] - capture_times[0], 1.0)
+
+class TestAlertLatency(unittest.TestCase):
+    """Test cases for the capture-to-alert latency of live frames."""
+
+    def setUp(self):
+        """Set up a system whose detector finds a fighting fan in every frame."""
+        self.test_dir = tempfile.mkdtemp()
+        self.system = StadiumMonitoringSystem(config={
+            'model_dir': os.path.join(self.test_dir, 'models'),
+            'alerts_dir': os.path.join(self.test_dir, 'alerts'),
+            'async_artifacts': False,
+            'track_fans': False  # Alert on the first frame
+        })
+        self.system.initialize()
+        self.system.detector = FightDetector()
+        self.frame = np.zeros((96, 128, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.system.alert_system.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_stored_alerts_carry_latency(self):
+        """Test that the stored alert and the returned one carry the same capture time and latency."""
+        capture_time = time.time() - 0.05
+        _, alerts = self.system.process_frame(self.frame, stream_id='cam', timestamp=capture_time,
+                                              capture_time=capture_time)
+
+        self.assertEqual(len(alerts), 1)
+        stored = self.system.alert_system.store.get(alerts[0]['alert_id'])
+        self.assertEqual(stored['capture_timestamp'], capture_time)
+        self.assertGreaterEqual(stored['latency_ms'], 50)
+        self.assertEqual(stored['latency_ms'], alerts[0]['latency_ms'])
+
+    def test_no_latency_without_capture_time(self):
+        """Test that frames without a capture time store alerts without latency fields."""
+        _, alerts = self.system.process_frame(self.frame)
+        stored = self.system.alert_system.store.get(alerts[0]['alert_id'])
+        self.assertNotIn('latency_ms', stored)
+        self.assertNotIn('latency_ms', alerts[0])
+
+    def test_live_latency_histograms(self):
+        """Test that frame and alert latencies are recorded separately."""
+        latency = LiveLatency('cam')
+        latency.record(time.time() - 0.02)
+        latency.record(time.time() - 0.04, alerts=[{'alert_id': 'a'}])
+        self.assertEqual((latency.result.count, latency.alert.count), (2, 1))
+        self.assertGreaterEqual(latency.alert.summary()['p50_ms'], 40)
+
+if __name__ == '__main__':
+    unittest.main()
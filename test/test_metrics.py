@@ -0,0 +1,89 @@
+"""
+Unit tests for the pipeline metrics.
+"""
+
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.metrics import LatencyHistogram, MetricsRegistry
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for the log-linear latency histogram."""
+
+    def setUp(self):
+        """Set up a histogram of log-normal latencies around 20 ms."""
+        self.histogram = LatencyHistogram()
+        self.latencies = np.random.default_rng(0).lognormal(np.log(0.02), 0.5, 5000)
+        for seconds in self.latencies:
+            self.histogram.record(seconds)
+
+    def test_percentiles_within_precision(self):
+        """Test that percentiles are within the histogram's relative precision."""
+        for q in (50, 90, 99, 99.9):
+            exact = np.percentile(self.latencies, q, method='inverted_cdf')
+            self.assertAlmostEqual(self.histogram.percentile(q) / exact, 1.0, delta=1 / 32)
+            self.assertGreaterEqual(self.histogram.percentile(q), int(exact * 1e6) / 1e6)
+
+    def test_summary(self):
+        """Test count, mean and max of the summary."""
+        summary = self.histogram.summary()
+        self.assertEqual(summary['count'], 5000)
+        self.assertAlmostEqual(summary['mean_ms'], self.latencies.mean() * 1000, delta=0.01)
+        self.assertAlmostEqual(summary['max_ms'], self.latencies.max() * 1000, delta=0.001)
+        self.assertLessEqual(summary['p999_ms'], summary['max_ms'])
+
+    def test_small_values_are_exact(self):
+        """Test that values below the linear range are recorded exactly."""
+        histogram = LatencyHistogram()
+        for us in (1, 5, 17, 40):
+            histogram.record(us / 1e6)
+        self.assertEqual(histogram.percentile(50), 5e-6)
+        self.assertEqual(histogram.percentile(100), 40e-6)
+        self.assertEqual(histogram.count_at_or_below(17e-6), 3)
+
+    def test_empty(self):
+        """Test that an empty histogram reports zeros."""
+        self.assertEqual(LatencyHistogram().summary()['p99_ms'], 0.0)
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for the metrics registry and its exports."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.registry = MetricsRegistry()
+        for seconds in (0.002, 0.004, 0.2):
+            self.registry.observe('inference', seconds, stream='cam1')
+        self.registry.increment('frames_in', 3, stream='cam1')
+        self.registry.set_gauge('stream_lag_seconds', 0.5, stream='cam1')
+
+    def test_snapshot(self):
+        """Test stages, counters and gauges of a snapshot."""
+        snapshot = self.registry.snapshot()
+        stage = snapshot['stages'][0]
+        self.assertEqual((stage['stage'], stage['labels'], stage['count']), ('inference', {'stream': 'cam1'}, 3))
+        self.assertEqual(snapshot['counters'], [{'name': 'frames_in', 'labels': {'stream': 'cam1'}, 'value': 3}])
+        self.assertEqual(snapshot['gauges'][0]['value'], 0.5)
+
+    def test_prometheus_buckets(self):
+        """Test that the exported histogram buckets are cumulative."""
+        text = self.registry.to_prometheus()
+        self.assertIn('stadium_stage_latency_seconds_bucket{stage="inference",stream="cam1",le="0.005"} 2', text)
+        self.assertIn('stadium_stage_latency_seconds_bucket{stage="inference",stream="cam1",le="+Inf"} 3', text)
+        self.assertIn('stadium_frames_in_total{stream="cam1"} 3', text)
+
+    def test_disabled(self):
+        """Test that a disabled registry records nothing."""
+        registry = MetricsRegistry(enabled=False)
+        with registry.timer('decode'):
+            pass
+        registry.increment('frames_in')
+        self.assertEqual(registry.snapshot()['stages'], [])
+        self.assertEqual(registry.snapshot()['counters'], [])
+
+if __name__ == '__main__':
+    unittest.main()
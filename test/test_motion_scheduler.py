@@ -0,0 +1,61 @@
+"""
+Unit tests for the motion-gated frame scheduler, run on the synthetic benchmark streams.
+"""
+
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import create_scene, render_scene
+from src.motion_scheduler import MotionScheduler
+
+def schedule(frames):
+    """Run a scheduler with the system's default interval bounds over frames."""
+    scheduler = MotionScheduler(min_interval=2, max_interval=15)
+    for frame in frames:
+        scheduler.should_process(frame)
+    return scheduler.stats
+
+class TestMotionScheduler(unittest.TestCase):
+    """Test cases for motion-gated sampling with the default thresholds."""
+
+    num_frames = 30
+
+    def scene_frames(self, num_fans, static=False):
+        """Render a synthetic stadium stream; static streams have every fan sitting."""
+        fans = create_scene(num_fans, seed=0)
+        if static:
+            for fan in fans:
+                fan['action'] = 'sitting'
+        return [render_scene(fans, frame_index=i) for i in range(self.num_frames)]
+
+    def test_crowd_motion_triggers_inference(self):
+        """Test that the arm movements of small and large crowds trigger inference."""
+        for num_fans in (10, 100, 1000):
+            stats = schedule(self.scene_frames(num_fans))
+            self.assertGreater(stats['triggered_by_motion'], 5, f"{num_fans} fans: {stats}")
+            self.assertLessEqual(stats['frames_inferred'], self.num_frames // 2)
+
+    def test_static_scene_uses_max_interval(self):
+        """Test that a static crowd, even with sensor noise, is only inferred at the minimum rate."""
+        rng = np.random.default_rng(0)
+        frames = self.scene_frames(1000, static=True)
+        noisy = [np.clip(frame + rng.normal(0, 4, frame.shape), 0, 255).astype(np.uint8) for frame in frames]
+        for stream in (frames, noisy):
+            stats = schedule(stream)
+            self.assertEqual(stats['triggered_by_motion'], 0)
+            self.assertEqual(stats['frames_inferred'], 2)
+            self.assertEqual(stats['frames_skipped'], self.num_frames - 2)
+
+    def test_small_frames_are_not_upscaled(self):
+        """Test that frames narrower than the differencing width are used as they are."""
+        scheduler = MotionScheduler()
+        small = scheduler._downscale(np.zeros((240, 320, 3), dtype=np.uint8))
+        self.assertEqual(small.shape, (240, 320))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for the multi-camera ingest of the stadium monitoring system.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import threading
+import unittest
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.multi_camera import FrameQueue, MultiCameraMonitoringSystem
+
+class EmptyDetector:
+    """Detector stand-in that finds no fans, so feeds run without trained models."""
+
+    def detect_batch(self, frames):
+        return [[] for _ in frames]
+
+class FightDetector:
+    """Detector stand-in that finds one fighting fan in every frame."""
+
+    def detect_batch(self, frames):
+        return [[{'bbox': [10, 10, 30, 40], 'team': 'hilal', 'action': 'fighting',
+                  'class_score': 0.9, 'team_score': 0.9, 'action_score': 0.9}] for _ in frames]
+
+class TestFrameQueue(unittest.TestCase):
+    """Test cases for the bounded frame queue."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.queue = FrameQueue(3, threading.Condition())
+
+    def test_drop_oldest(self):
+        """Test that a full queue evicts its oldest frame."""
+        dropped = [self.queue.put(i) for i in range(5)]
+        self.assertEqual(dropped, [False, False, False, True, True])
+        self.assertEqual(self.queue.dropped, 2)
+        self.assertEqual(len(self.queue), 3)
+        self.assertEqual([self.queue.pop() for _ in range(3)], [2, 3, 4])
+
+    def test_pop_empty(self):
+        """Test that popping an empty queue returns None."""
+        self.assertIsNone(self.queue.pop())
+
+class TestMultiCameraFeeds(unittest.TestCase):
+    """Test cases for processing camera feeds."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+        self.video_path = os.path.join(self.test_dir, 'feed.avi')
+        writer = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for i in range(12):
+            writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+        writer.release()
+
+        self.system = MultiCameraMonitoringSystem(config={
+            'model_dir': os.path.join(self.test_dir, 'models'),
+            'alerts_dir': os.path.join(self.test_dir, 'alerts'),
+            'frame_interval': 1,
+            'camera_queue_size': 64,
+            'results_per_camera': 5,
+            'warm_up': False
+        })
+        self.system.initialize()
+        self.system.monitoring_system.detector = EmptyDetector()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_failed_camera_stops_started_streams(self):
+        """Test that a camera that cannot be opened stops the streams already started."""
+        sources = {'ok': self.video_path, 'missing': os.path.join(self.test_dir, 'missing.avi')}
+        with self.assertRaises(ValueError):
+            self.system.process_feeds(sources)
+
+        stream = self.system.streams['ok']
+        self.assertTrue(stream._stop_event.is_set())
+        self.assertFalse(stream._thread.is_alive())
+        self.assertNotIn('missing', self.system.streams)
+
+    def test_results_are_bounded(self):
+        """Test that only the latest results are kept while every frame is counted."""
+        self.system.process_feeds({'cam': self.video_path}, generate_alerts=False)
+
+        results = self.system.results['cam']
+        self.assertEqual(len(results), 5)
+        self.assertEqual([result['frame_index'] for result in results], list(range(7, 12)))
+        self.assertEqual(self.system.stats['cameras']['cam']['frames_processed'], 12)
+
+    def test_video_files_are_paced(self):
+        """Test that a video file is read at its frame rate, so a short queue drops no frames."""
+        self.system.config['camera_queue_size'] = 2
+        start = time.perf_counter()
+        self.system.process_feeds({'cam': self.video_path}, generate_alerts=False)
+
+        # 12 frames at 10 frames/s
+        self.assertGreaterEqual(time.perf_counter() - start, 1.0)
+        camera = self.system.stats['cameras']['cam']
+        self.assertEqual((camera['frames_dropped'], camera['frames_processed']), (0, 12))
+
+    def test_returned_alerts_are_bounded(self):
+        """Test that only the latest alerts are returned while every alert is counted."""
+        self.system.config['alerts_per_camera'] = 3
+        self.system.monitoring_system.config['track_fans'] = False  # Alert on every frame
+        self.system.monitoring_system.detector = FightDetector()
+        all_alerts = self.system.process_feeds({'cam': self.video_path})
+
+        self.assertEqual(len(all_alerts['cam']), 3)
+        self.assertGreater(self.system.stats['cameras']['cam']['alerts'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
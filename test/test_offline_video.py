@@ -0,0 +1,90 @@
+"""
+Unit tests for the parallel offline video helpers.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.offline_video import split_segments, merge_sampling_stats, concat_videos
+
+class TestSplitSegments(unittest.TestCase):
+    """Test cases for splitting a video into frame-index segments."""
+
+    def test_contiguous_segments(self):
+        """Test that segments cover every frame once and differ in length by at most one."""
+        for total_frames, num_segments in ((100, 4), (101, 8), (7, 3)):
+            segments = split_segments(total_frames, num_segments)
+            self.assertEqual(len(segments), num_segments)
+            self.assertEqual(segments[0][0], 0)
+            self.assertIsNone(segments[-1][1])
+
+            bounds = [start for start, _ in segments] + [total_frames]
+            self.assertEqual([end for _, end in segments[:-1]], bounds[1:-1])
+            lengths = np.diff(bounds)
+            self.assertLessEqual(lengths.max() - lengths.min(), 1)
+
+    def test_more_segments_than_frames(self):
+        """Test that short videos get at most one segment per frame."""
+        self.assertEqual(split_segments(2, 8), [(0, 1), (1, None)])
+        self.assertEqual(split_segments(0, 4), [(0, None)])
+
+class TestMergeSamplingStats(unittest.TestCase):
+    """Test cases for merging per-segment sampling statistics."""
+
+    def test_merge(self):
+        """Test that counters and per-section activity are summed."""
+        merged = merge_sampling_stats([
+            {'frames_inferred': 3, 'frames_skipped': 7, 'section_activity': {'hilal': 2}},
+            {'frames_inferred': 1, 'frames_skipped': 9, 'section_activity': {'hilal': 1, 'ittihad': 4}}
+        ])
+        self.assertEqual(merged, {
+            'frames_inferred': 4,
+            'frames_skipped': 16,
+            'section_activity': {'hilal': 3, 'ittihad': 4}
+        })
+
+class TestConcatVideos(unittest.TestCase):
+    """Test cases for joining segment videos."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_parts_are_joined_in_order(self):
+        """Test that the output holds the frames of every part in order."""
+        part_paths = []
+        for part in range(3):
+            path = os.path.join(self.test_dir, f"part_{part}.mp4")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (64, 48))
+            for _ in range(4):
+                writer.write(np.full((48, 64, 3), 20 + part * 100, dtype=np.uint8))
+            writer.release()
+            part_paths.append(path)
+
+        output_path = os.path.join(self.test_dir, 'joined.mp4')
+        concat_videos(part_paths, output_path, 10, (64, 48))
+
+        cap = cv2.VideoCapture(output_path)
+        levels = []
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            levels.append(int(round((frame.mean() - 20) / 100)))
+        cap.release()
+        self.assertEqual(levels, [0] * 4 + [1] * 4 + [2] * 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Unit tests for the benchmark profiling helpers.
+"""
+
+import os
+import sys
+import time
+import unittest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.profiling import LatencyRecorder, compare_results
+
+class TestLatencyRecorder(unittest.TestCase):
+    """Test cases for per-call latency recording."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.recorder = LatencyRecorder()
+        self.sleep = self.recorder.wrap(time.sleep)
+
+    def test_summary(self):
+        """Test that every wrapped call is counted."""
+        for _ in range(3):
+            self.sleep(0.01)
+        summary = self.recorder.summary()
+        self.assertEqual(summary['count'], 3)
+        self.assertGreaterEqual(summary['p50_ms'], 10.0)
+
+    def test_summary_since(self):
+        """Test that calls started before the warm-up ended are left out."""
+        self.sleep(0.05)
+        warmup_end = time.perf_counter()
+        self.sleep(0.0)
+        self.sleep(0.0)
+        summary = self.recorder.summary(since=warmup_end)
+        self.assertEqual(summary['count'], 2)
+        self.assertLess(summary['max_ms'], 50.0)
+        self.assertEqual(self.recorder.summary(since=time.perf_counter())['count'], 0)
+
+class TestCompareResults(unittest.TestCase):
+    """Test cases for baseline comparisons."""
+
+    def test_processed_throughput_regression(self):
+        """Test that a drop in processed frames/s counts as a regression."""
+        baseline = {'scenarios': {'live/fans=10': {'frames_per_second': 25.0, 'processed_frames_per_second': 2.0}}}
+        current = {'scenarios': {'live/fans=10': {'frames_per_second': 25.0, 'processed_frames_per_second': 1.0}}}
+        regressions = [c['metric'] for c in compare_results(current, baseline) if c['regression']]
+        self.assertEqual(regressions, ['processed_frames_per_second'])
+
+if __name__ == '__main__':
+    unittest.main()
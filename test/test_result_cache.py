@@ -0,0 +1,86 @@
+"""
+Unit tests for the persistent result cache.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.result_cache import ResultCache, result_fingerprint
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for caching per-image results."""
+
+    def setUp(self):
+        """Set up test environment with a model file and a configuration."""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, 'cache', 'results.db')
+        self.model_path = os.path.join(self.test_dir, 'fan_detection_model.h5')
+        with open(self.model_path, 'wb') as f:
+            f.write(b'weights v1')
+        self.model_paths = {'detector_model_path': self.model_path, 'team_classifier_path': None}
+        self.config = {'input_shape': (224, 224, 3), 'detection_threshold': 0.5, 'alerts_dir': 'alerts'}
+        self.result = {
+            'detections': [{'bbox': np.array([1.0, 2.0, 3.0, 4.0]), 'team_score': np.float32(0.5)}],
+            'alerts': []
+        }
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_hit_and_miss(self):
+        """Test that stored results are found by image hash and counted."""
+        cache = ResultCache(self.cache_path, result_fingerprint(self.model_paths, self.config))
+        self.assertIsNone(cache.get('image-a'))
+        cache.put('image-a', self.result)
+
+        cached = cache.get('image-a')
+        self.assertEqual(cached['detections'][0]['bbox'], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(cached['detections'][0]['team_score'], 0.5)
+        self.assertIsNone(cache.get('image-b'))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        cache.close()
+
+    def test_results_persist(self):
+        """Test that a reopened cache with the same fingerprint reuses results."""
+        fingerprint = result_fingerprint(self.model_paths, self.config)
+        cache = ResultCache(self.cache_path, fingerprint)
+        cache.put('image-a', self.result)
+        cache.close()
+
+        cache = ResultCache(self.cache_path, fingerprint)
+        self.assertIsNotNone(cache.get('image-a'))
+        cache.close()
+
+    def test_fingerprint_changes(self):
+        """Test that the fingerprint follows the model contents and result settings only."""
+        fingerprint = result_fingerprint(self.model_paths, self.config)
+
+        # Output directories do not change results
+        self.assertEqual(result_fingerprint(self.model_paths, dict(self.config, alerts_dir='elsewhere')), fingerprint)
+
+        # Thresholds, alert generation and model weights do
+        self.assertNotEqual(result_fingerprint(self.model_paths, dict(self.config, detection_threshold=0.6)), fingerprint)
+        self.assertNotEqual(result_fingerprint(self.model_paths, self.config, generate_alerts=False), fingerprint)
+        with open(self.model_path, 'wb') as f:
+            f.write(b'weights v2')
+        changed = result_fingerprint(self.model_paths, self.config)
+        self.assertNotEqual(changed, fingerprint)
+
+        # Results of other models are not reused
+        cache = ResultCache(self.cache_path, fingerprint)
+        cache.put('image-a', self.result)
+        cache.close()
+        cache = ResultCache(self.cache_path, changed)
+        self.assertIsNone(cache.get('image-a'))
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
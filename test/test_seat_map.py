@@ -0,0 +1,139 @@
+"""
+Unit tests for the polygon seat map.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.seat_map import SeatMap, NO_SECTION, load_seat_maps
+from src.system import StadiumMonitoringSystem
+
+# Two slanted stands split by an aisle, in a 200x400 frame
+SECTIONS = [
+    {'name': 'north', 'teams': ['hilal'], 'polygon': [[0, 0], [200, 0], [160, 200], [0, 200]]},
+    {'name': 'south', 'teams': ['ittihad'], 'polygon': [[220, 0], [400, 0], [400, 200], [180, 200]]},
+    {'name': 'aisle', 'buffer': True, 'polygon': [[200, 0], [220, 0], [180, 200], [160, 200]]}
+]
+
+def box_at(x, y):
+    """A 10x10 box centered at (x, y)."""
+    return [x - 5, y - 5, x + 5, y + 5]
+
+class TestSeatMap(unittest.TestCase):
+    """Test cases for resolving fan sections."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.seat_map = SeatMap(SECTIONS, (200, 400))
+
+    def test_resolve_sections(self):
+        """Test that box centers resolve to the polygon containing them."""
+        boxes = [box_at(20, 100), box_at(195, 10), box_at(205, 10), box_at(300, 150), box_at(500, 100)]
+        resolved = self.seat_map.resolve(boxes)
+        self.assertEqual(resolved['sections'], ['north', 'north', 'aisle', 'south', None])
+        self.assertEqual(resolved['section_ids'][-1], NO_SECTION)
+        self.assertEqual(resolved['buffer'].tolist(), [False, False, True, False, False])
+        self.assertEqual(resolved['allowed_teams'][0], ('hilal',))
+
+    def test_misplaced_fans(self):
+        """Test that fans of other teams are misplaced, except in buffers and outside sections."""
+        boxes = [box_at(20, 100), box_at(20, 100), box_at(300, 150), box_at(205, 10), box_at(500, 100),
+                 box_at(300, 150)]
+        teams = ['hilal', 'ittihad', 'ittihad', 'ittihad', 'hilal', 'visitors']
+        resolved = self.seat_map.resolve(boxes, teams)
+        self.assertEqual(resolved['misplaced'].tolist(), [False, True, False, False, False, True])
+        self.assertFalse(self.seat_map.resolve(boxes)['misplaced'].any())
+
+    def test_boxes_of_a_larger_frame(self):
+        """Test that boxes of a frame larger than the map are scaled into it."""
+        boxes = [box_at(40, 200), box_at(600, 300), box_at(410, 20)]
+        resolved = self.seat_map.resolve(boxes, ['ittihad', 'hilal', 'hilal'], frame_shape=(400, 800))
+        self.assertEqual(resolved['sections'], ['north', 'south', 'aisle'])
+        self.assertEqual(resolved['misplaced'].tolist(), [True, True, False])
+
+    def test_from_rectangles(self):
+        """Test the legacy rectangle configuration."""
+        seat_map = SeatMap.from_rectangles({'hilal': [0, 0, 200, 200], 'ittihad': [200, 0, 400, 200]}, (200, 400))
+        self.assertEqual(seat_map.section_for_point((50, 50)), 'hilal')
+        self.assertEqual(seat_map.section_for_point((350, 50)), 'ittihad')
+
+    def test_section_masks(self):
+        """Test section masks on a frame of another size."""
+        masks = self.seat_map.section_masks((100, 200))
+        self.assertEqual(masks['north'].shape, (100, 200))
+        self.assertTrue(masks['north'][50, 10])
+        self.assertTrue(masks['south'][50, 190])
+
+class TestLoadSeatMaps(unittest.TestCase):
+    """Test cases for loading seat maps from JSON."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_scaled_camera_maps(self):
+        """Test default and per-camera maps drawn in another coordinate space."""
+        path = os.path.join(self.test_dir, 'seat_map.json')
+        with open(path, 'w') as f:
+            json.dump({
+                'shape': [200, 400],
+                'sections': SECTIONS,
+                'cameras': {
+                    '1': {
+                        'shape': [400, 800],
+                        'sections': [{'name': 'east', 'polygon': [[0, 0], [800, 0], [800, 400], [0, 400]]}]
+                    }
+                }
+            }, f)
+
+        seat_maps = load_seat_maps(path, (100, 200))
+        self.assertEqual(set(seat_maps), {None, '1'})
+        self.assertEqual(seat_maps[None].section_for_point((150, 50)), 'south')
+        self.assertEqual(seat_maps['1'].section_for_point((199, 99)), 'east')
+        np.testing.assert_array_equal(seat_maps['1'].labels.shape, (100, 200))
+
+class TestPanoramaAlerts(unittest.TestCase):
+    """Test cases for misplaced-fan alerts on images larger than the model input."""
+
+    def setUp(self):
+        """Set up a system whose seat map splits the stadium into a Hilal and an Ittihad half."""
+        self.test_dir = tempfile.mkdtemp()
+        self.system = StadiumMonitoringSystem(config={
+            'model_dir': os.path.join(self.test_dir, 'models'),
+            'alerts_dir': os.path.join(self.test_dir, 'alerts'),
+            'async_artifacts': False
+        })
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.system.alert_system.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_sections_of_a_panorama(self):
+        """Test that fans in a panorama twice the input size are checked against the right half."""
+        panorama = Image.new('RGB', (1024, 768))
+        detections = [
+            {'bbox': box_at(300, 400), 'team': 'ittihad', 'action': 'sitting', 'team_score': 0.9},
+            {'bbox': box_at(700, 400), 'team': 'hilal', 'action': 'sitting', 'team_score': 0.9},
+            {'bbox': box_at(900, 400), 'team': 'ittihad', 'action': 'sitting', 'team_score': 0.9}
+        ]
+        alerts = self.system.generate_detection_alerts(panorama, detections)
+
+        self.assertEqual([(alert['fan_team'], alert['section']) for alert in alerts],
+                         [('ittihad', 'hilal'), ('hilal', 'ittihad')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for cross-frame fan tracking and alert episodes.
+"""
+
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tracker import FanTracker, Track, ALERT_NEW, ALERT_ESCALATION
+
+def detection(x, y, action='fighting', action_score=0.9, team='hilal', team_score=0.8):
+    """Create a 20x40 detection at (x, y)."""
+    return {
+        'bbox': [x, y, x + 20, y + 40],
+        'action': action,
+        'action_score': action_score,
+        'team': team,
+        'team_score': team_score
+    }
+
+class TestTrackAssociation(unittest.TestCase):
+    """Test cases for keeping track IDs across frames."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.tracker = FanTracker(max_age=2)
+
+    def test_moving_fans_keep_their_ids(self):
+        """Test that two moving fans keep their track IDs."""
+        first = self.tracker.update([detection(0, 0), detection(100, 0)], 0.0)
+        ids = [det['track_id'] for det in first]
+        for step in range(1, 5):
+            # Detections arrive in reverse order to rule out matching by position in the list
+            frame = self.tracker.update([detection(100 + 3 * step, 0), detection(3 * step, 0)], float(step))
+            self.assertEqual([det['track_id'] for det in frame], ids[::-1])
+        self.assertEqual(len(self.tracker.tracks), 2)
+
+    def test_crowded_association(self):
+        """Test that a crowd of jittering fans keeps one track per fan."""
+        rng = np.random.default_rng(0)
+        positions = np.stack(np.meshgrid(np.arange(20) * 30, np.arange(15) * 50), axis=-1).reshape(-1, 2)
+        first = self.tracker.update([detection(x, y) for x, y in positions], 0.0)
+        ids = np.array([det['track_id'] for det in first])
+
+        for step in range(1, 4):
+            order = rng.permutation(len(positions))
+            moved = positions[order] + rng.integers(-3, 4, positions.shape)
+            frame = self.tracker.update([detection(x, y) for x, y in moved], float(step))
+            self.assertEqual([det['track_id'] for det in frame], ids[order].tolist())
+        self.assertEqual(len(self.tracker.tracks), 300)
+
+    def test_greedy_matching_order(self):
+        """Test that the best pair is matched first even when it leaves another detection unmatched."""
+        tracks = [Track(1, detection(0, 0), 0.0), Track(2, detection(40, 0), 0.0)]
+        # The first detection overlaps both tracks a little; the second one sits on the first track
+        detections = [detection(12, 0), detection(1, 0)]
+        self.assertEqual(self.tracker._associate(detections, tracks), {1: 0})
+
+    def test_stale_tracks_are_dropped(self):
+        """Test that tracks unmatched for more than max_age frames are dropped."""
+        self.tracker.update([detection(0, 0)], 0.0)
+        for step in range(3):
+            self.tracker.update([], float(step + 1))
+        self.assertEqual(self.tracker.tracks, {})
+        frame = self.tracker.update([detection(0, 0)], 4.0)
+        self.assertEqual(frame[0]['track_id'], 2)
+
+    def test_scores_are_smoothed(self):
+        """Test that a single-frame label change does not flip the smoothed action."""
+        self.tracker.update([detection(0, 0, action='sitting')], 0.0)
+        self.tracker.update([detection(0, 0, action='sitting')], 1.0)
+        frame = self.tracker.update([detection(0, 0, action='fighting')], 2.0)
+        self.assertEqual(frame[0]['action'], 'sitting')
+        self.assertEqual(frame[0]['raw_action'], 'fighting')
+
+class TestAlertEpisodes(unittest.TestCase):
+    """Test cases for alerting once per episode."""
+
+    def setUp(self):
+        """Set up test environment with one tracked fan."""
+        self.tracker = FanTracker(confirm_frames=2, cooldown=30.0, episode_gap=10.0, escalation_delta=0.15)
+        self.track_id = self.tracker.update([detection(0, 0)], 0.0)[0]['track_id']
+
+    def check(self, timestamp, confidence=0.6):
+        """Report the fighting condition on the tracked fan."""
+        return self.tracker.check_alert(self.track_id, 'fighting', confidence, timestamp)
+
+    def test_one_alert_per_episode(self):
+        """Test that an ongoing episode alerts once after confirmation."""
+        decisions = [self.check(float(t)) for t in range(10)]
+        self.assertEqual(decisions, [None, ALERT_NEW] + [None] * 8)
+        self.assertEqual(self.tracker.alerts_raised, 1)
+        self.assertEqual(self.tracker.alerts_suppressed, 9)
+        self.assertEqual(self.tracker.episode_duration(self.track_id, 'fighting'), 9.0)
+
+    def test_escalation(self):
+        """Test that a confidence rise or an elapsed cooldown escalates the episode."""
+        self.check(0.0)
+        self.assertEqual(self.check(1.0), ALERT_NEW)
+        self.assertIsNone(self.check(2.0, confidence=0.7))
+        self.assertEqual(self.check(3.0, confidence=0.8), ALERT_ESCALATION)
+
+        # Still ongoing once the cooldown has passed since the last alert
+        for t in range(4, 33, 5):
+            self.assertIsNone(self.check(float(t), confidence=0.8))
+        self.assertEqual(self.check(33.0, confidence=0.8), ALERT_ESCALATION)
+
+    def test_new_episode_after_gap_and_cooldown(self):
+        """Test that a condition seen again after the gap starts a new episode, once cooled down."""
+        self.check(0.0)
+        self.assertEqual(self.check(1.0), ALERT_NEW)
+
+        # A new episode within the cooldown is confirmed but stays suppressed
+        self.assertIsNone(self.check(15.0))
+        self.assertIsNone(self.check(16.0))
+
+        # After the cooldown, a new episode alerts again
+        self.assertIsNone(self.check(45.0))
+        self.assertEqual(self.check(46.0), ALERT_NEW)
+
+    def test_unknown_track(self):
+        """Test that unknown tracks never alert."""
+        self.assertIsNone(self.tracker.check_alert(99, 'fighting', 0.9, 0.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Unit tests for the training throughput utilities.
+"""
+
+import os
+import sys
+import unittest
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, models
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.training import precision_policy, ThroughputCallback
+
+def small_model():
+    """A small classifier model."""
+    return models.Sequential([layers.Input((8,)), layers.Dense(16, activation='relu'), layers.Dense(2)])
+
+class TestPrecisionPolicy(unittest.TestCase):
+    """Test cases for building models under mixed precision."""
+
+    def test_policy_is_restored(self):
+        """Test that only layers built inside the context use bfloat16."""
+        with precision_policy(mixed_precision=True):
+            mixed = small_model()
+        plain = small_model()
+
+        self.assertEqual(mixed.layers[0].compute_dtype, 'bfloat16')
+        self.assertEqual(mixed.layers[0].variable_dtype, 'float32')
+        self.assertEqual(plain.layers[0].compute_dtype, 'float32')
+        self.assertEqual(tf.keras.mixed_precision.global_policy().name, 'float32')
+
+    def test_disabled(self):
+        """Test that the policy is left alone without mixed precision."""
+        with precision_policy(mixed_precision=False):
+            model = small_model()
+        self.assertEqual(model.layers[0].compute_dtype, 'float32')
+
+class TestThroughputCallback(unittest.TestCase):
+    """Test cases for the per-epoch throughput report."""
+
+    def test_epoch_records(self):
+        """Test that every epoch reports its steps, images and time breakdown."""
+        model = small_model()
+        model.compile(optimizer='sgd', loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=True),
+                      steps_per_execution=2)
+        rng = np.random.default_rng(0)
+        x = rng.random((40, 8)).astype(np.float32)
+        y = rng.integers(0, 2, 40)
+
+        callback = ThroughputCallback(batch_size=4, verbose=False)
+        history = model.fit(x, y, batch_size=4, epochs=2, validation_data=(x[:8], y[:8]), callbacks=[callback],
+                            verbose=0)
+
+        self.assertEqual([record['epoch'] for record in callback.epochs], [1, 2])
+        for record in callback.epochs:
+            self.assertEqual(record['steps'], 10)
+            self.assertEqual(record['images'], 40)
+            self.assertGreater(record['images_per_second'], 0)
+            self.assertGreater(record['validation_seconds'], 0)
+            self.assertLessEqual(record['first_call_seconds'] + record['steps_seconds'], record['epoch_seconds'])
+        self.assertEqual(len(history.history['images_per_second']), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Unit tests for zoom rendering and the outputs encoded from it.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.artifact_writer import ArtifactWriter
+from src.zoom_processor import ZoomProcessor
+
+class TestZoomProcessor(unittest.TestCase):
+    """Test cases for rendering a zoom once and encoding every output from it."""
+
+    def setUp(self):
+        """Set up a textured 240x320 image with a fan box in the middle."""
+        self.test_dir = tempfile.mkdtemp()
+        self.processor = ZoomProcessor(output_dir=self.test_dir)
+        self.image = np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+        self.image = cv2.GaussianBlur(self.image, (9, 9), 0)
+        self.bbox = [140, 100, 180, 160]
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_render_zoom(self):
+        """Test that the first frame is the padded crop and later frames zoom in on the box center."""
+        frames = self.processor.render_zoom(self.image, self.bbox, num_frames=5, zoom_start=1.0, zoom_end=2.0)
+        self.assertEqual(frames.shape, (5, 80, 60, 3))
+        np.testing.assert_array_equal(frames[0], self.processor.crop_detection(self.image, self.bbox))
+
+        # At 2x the frame shows the central 30x40 window scaled up
+        expected = cv2.resize(self.image[110:150, 145:175], (60, 80), interpolation=cv2.INTER_LINEAR)
+        self.assertLess(np.abs(frames[-1].astype(int) - expected).mean(), 1.0)
+
+    def test_zoom_stays_inside_the_image(self):
+        """Test that zooms near the border shift the window instead of padding it."""
+        frames = self.processor.render_zoom(self.image, [0, 0, 20, 20], num_frames=3, padding=10)
+        self.assertEqual(frames.shape, (3, 40, 40, 3))
+        np.testing.assert_array_equal(frames[0], self.image[:40, :40])
+
+    def test_render_outputs(self):
+        """Test the crop, sequence, GIF and MP4 encoded from one render."""
+        outputs = self.processor.render_outputs(self.image, self.bbox, detection_info={'type': 'fighting'})
+
+        np.testing.assert_array_equal(outputs['tile'], self.processor.crop_detection(self.image, self.bbox))
+        self.assertTrue(os.path.basename(outputs['crop']).startswith('crop_fighting_'))
+        self.assertEqual(len(outputs['sequence']), 5)
+        self.assertTrue(all(os.path.exists(path) for path in [outputs['crop']] + outputs['sequence']))
+
+        with Image.open(outputs['gif']) as gif:
+            self.assertEqual(gif.n_frames, 5)
+        cap = cv2.VideoCapture(outputs['mp4'])
+        self.assertEqual(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 10)
+        cap.release()
+
+    def test_render_plan(self):
+        """Test that outputs left out of the plan are neither rendered nor written."""
+        outputs = self.processor.render_outputs(self.image, self.bbox, plan={'crop': False, 'sequence': False,
+                                                                             'gif': False, 'mp4': False})
+        self.assertEqual(outputs['sequence'], [])
+        self.assertIsNone(outputs['crop'])
+        self.assertIsNotNone(outputs['tile'])
+        self.assertEqual(os.listdir(os.path.join(self.test_dir, 'sequences')), [])
+        self.assertEqual(os.listdir(os.path.join(self.test_dir, 'gifs')), [])
+
+    def test_background_writer(self):
+        """Test that outputs are encoded on the artifact writer."""
+        writer = ArtifactWriter(num_workers=1)
+        processor = ZoomProcessor(output_dir=self.test_dir, writer=writer)
+        outputs = processor.render_outputs(self.image, self.bbox, plan={'mp4': False})
+        writer.shutdown()
+        self.assertTrue(all(os.path.exists(path) for path in [outputs['crop'], outputs['gif']] + outputs['sequence']))
+        self.assertEqual(writer.jobs_written, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ import tensorflow as tf
 import matplotlib.pyplot as plt
 from src.data_utils import StadiumDataset
 from src.model import FanDetectionModel
+from src.training import ThroughputCallback
 
 # Set up GPU memory growth to avoid OOM errors
 gpus = tf.config.experimental.list_physical_devices('GPU')
@@ -20,10 +21,17 @@ if gpus:
 
 # Configuration
 DATASET_DIR = 'stadium_dataset'  # Path to the dataset directory
+SHARDS_DIR = os.path.join(DATASET_DIR, 'shards')  # Preprocessed TFRecord shards (None to read images directly)
+NUM_SHARDS = 8
 MODEL_DIR = 'models'
 BATCH_SIZE = 8
 EPOCHS = 20
 INPUT_SHAPE = (384, 512, 3)  # Height, width, channels
+OUTPUT_STRIDE = 8  # Stride of the dense detection head's output grid
+DECODED_CACHE = os.path.join(DATASET_DIR, 'decoded')  # Snapshot of the decoded images (True for memory, None to decode every epoch)
+JIT_COMPILE = True  # Compile the training step with XLA
+STEPS_PER_EXECUTION = 8  # Training steps per call of the compiled step function
+MIXED_PRECISION = False  # bfloat16 compute; only faster on CPUs with AVX512-BF16/AMX or on GPUs
 
 # Create model directory if it doesn't exist
 os.makedirs(MODEL_DIR, exist_ok=True)
@@ -38,20 +46,33 @@ print("Visualizing a sample image...")
 sample_id = dataset.image_ids[0]
 dataset.visualize_sample(sample_id)
 
+# Convert the dataset into TFRecord shards once
+if SHARDS_DIR and not os.path.exists(SHARDS_DIR):
+    print("Converting dataset to TFRecord shards...")
+    dataset.write_shards(SHARDS_DIR, num_shards=NUM_SHARDS, train_ratio=0.8)
+
 # Prepare datasets for training
 print("Preparing datasets for training...")
 train_dataset, val_dataset = dataset.prepare_detection_dataset(
     train_ratio=0.8, 
-    batch_size=BATCH_SIZE
+    batch_size=BATCH_SIZE,
+    shards_dir=SHARDS_DIR,
+    target_stride=OUTPUT_STRIDE,
+    decoded_cache=DECODED_CACHE
 )
 
 # Build and train the model
 print("Building model...")
-model = FanDetectionModel(input_shape=INPUT_SHAPE)
-model.build_model()
+model = FanDetectionModel(input_shape=INPUT_SHAPE, output_stride=OUTPUT_STRIDE)
+model.build_model(
+    jit_compile=JIT_COMPILE,
+    steps_per_execution=STEPS_PER_EXECUTION,
+    mixed_precision=MIXED_PRECISION
+)
 
 # Define callbacks
 callbacks = [
+    ThroughputCallback(BATCH_SIZE),
     tf.keras.callbacks.ModelCheckpoint(
         filepath=os.path.join(MODEL_DIR, 'fan_detection_model.h5'),
         save_best_only=True,
@@ -93,12 +114,13 @@ plt.ylabel('Loss')
 plt.legend()
 
 plt.subplot(1, 2, 2)
-plt.plot(history.history['class_output_accuracy'], label='Class Accuracy')
-plt.plot(history.history['team_output_accuracy'], label='Team Accuracy')
-plt.plot(history.history['action_output_accuracy'], label='Action Accuracy')
-plt.title('Accuracy')
+plt.plot(history.history['class_output_loss'], label='Heatmap Loss')
+plt.plot(history.history['bbox_output_loss'], label='Box Loss')
+plt.plot(history.history['team_output_loss'], label='Team Loss')
+plt.plot(history.history['action_output_loss'], label='Action Loss')
+plt.title('Head Losses')
 plt.xlabel('Epoch')
-plt.ylabel('Accuracy')
+plt.ylabel('Loss')
 plt.legend()
 
 plt.tight_layout()
@@ -0,0 +1,88 @@
+"""
+Training script for the fused team/behavior crop classifier.
+This script extracts the fan crops of the synthetic dataset once and trains one
+shared-backbone model for team affiliation and behavior, which replaces the
+separate behavior classifier and team detector at inference time.
+"""
+
+import os
+import tensorflow as tf
+from src.crop_classifier import FanCropClassifier
+from src.training import ThroughputCallback
+
+# Set up GPU memory growth to avoid OOM errors
+gpus = tf.config.experimental.list_physical_devices('GPU')
+if gpus:
+    try:
+        for gpu in gpus:
+            tf.config.experimental.set_memory_growth(gpu, True)
+    except RuntimeError as e:
+        print(e)
+
+# Configuration
+DATASET_DIR = 'stadium_dataset'  # Path to the dataset directory
+MODEL_DIR = 'models'
+BATCH_SIZE = 32
+EPOCHS = 20
+CROP_SHAPE = (128, 128, 3)  # Height, width, channels
+TEAM_LOSS_WEIGHT = None  # None normalizes each head's loss by its chance-level value
+ACTION_LOSS_WEIGHT = None
+JIT_COMPILE = True  # Compile the training step with XLA
+STEPS_PER_EXECUTION = 16  # Training steps per call of the compiled step function
+MIXED_PRECISION = False  # bfloat16 compute; only faster on CPUs with AVX512-BF16/AMX or on GPUs
+
+# Create model directory if it doesn't exist
+os.makedirs(MODEL_DIR, exist_ok=True)
+
+# Prepare datasets from the shared crop cache
+print("Preparing crop datasets...")
+classifier = FanCropClassifier(input_shape=CROP_SHAPE)
+train_dataset, val_dataset = classifier.prepare_dataset(
+    DATASET_DIR,
+    batch_size=BATCH_SIZE,
+    train_ratio=0.8
+)
+
+# Build the model with the multi-task loss weights
+print("Building model...")
+classifier.build_model(
+    team_weight=TEAM_LOSS_WEIGHT,
+    action_weight=ACTION_LOSS_WEIGHT,
+    jit_compile=JIT_COMPILE,
+    steps_per_execution=STEPS_PER_EXECUTION,
+    mixed_precision=MIXED_PRECISION
+)
+print(f"Loss weights: {classifier.loss_weights(TEAM_LOSS_WEIGHT, ACTION_LOSS_WEIGHT)}")
+
+# Define callbacks
+model_path = os.path.join(MODEL_DIR, 'crop_classifier.h5')
+callbacks = [
+    ThroughputCallback(BATCH_SIZE),
+    tf.keras.callbacks.ModelCheckpoint(
+        filepath=model_path,
+        save_best_only=True,
+        monitor='val_loss'
+    ),
+    tf.keras.callbacks.EarlyStopping(
+        patience=5,
+        monitor='val_loss'
+    ),
+    tf.keras.callbacks.ReduceLROnPlateau(
+        factor=0.2,
+        patience=3,
+        monitor='val_loss'
+    )
+]
+
+# Train the model
+print("Training model...")
+history = classifier.train(
+    train_dataset=train_dataset,
+    val_dataset=val_dataset,
+    epochs=EPOCHS,
+    callbacks=callbacks
+)
+
+print(f"Team accuracy: {history.history['val_team_output_accuracy'][-1]:.3f}, "
+      f"action accuracy: {history.history['val_action_output_accuracy'][-1]:.3f}")
+print(f"Crop classifier training completed. Model saved to {model_path}")